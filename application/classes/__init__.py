@@ -1,16 +1,36 @@
 """
 Classes package initialization.
+
+Exports are resolved lazily so that headless callers can import the
+non-GUI classes (settings, project, undo/redo) without loading imgui.
 """
 
-from .file_dialog import ImGuiFileDialog
-from .gauge import GaugeWindow
-from .interactive_timeline import InteractiveFunscriptTimeline
-from .movement_bar import MovementBarWindow
-# Backward compatibility alias
-LRDialWindow = MovementBarWindow
-from .menu import MainMenu
-from .project_manager import ProjectManager
-from .settings_manager import AppSettings
-from .shortcut_manager import ShortcutManager
-from .undo_redo_manager import UndoRedoManager
-from .simulator_3d import Simulator3DWindow
\ No newline at end of file
+import importlib
+
+_LAZY_EXPORTS = {
+    "ImGuiFileDialog": ".file_dialog",
+    "GaugeWindow": ".gauge",
+    "InteractiveFunscriptTimeline": ".interactive_timeline",
+    "MovementBarWindow": ".movement_bar",
+    # Backward compatibility alias
+    "LRDialWindow": ".movement_bar",
+    "MainMenu": ".menu",
+    "ProjectManager": ".project_manager",
+    "AppSettings": ".settings_manager",
+    "ShortcutManager": ".shortcut_manager",
+    "UndoRedoManager": ".undo_redo_manager",
+    "Simulator3DWindow": ".simulator_3d",
+}
+
+_ALIASES = {"LRDialWindow": "MovementBarWindow"}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), _ALIASES.get(name, name))
+    globals()[name] = value
+    return value
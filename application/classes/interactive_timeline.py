@@ -13,6 +13,7 @@ from .plugin_ui_manager import PluginUIManager, PluginUIState
 from .plugin_ui_renderer import PluginUIRenderer
 from .plugin_preview_renderer import PluginPreviewRenderer
 from application.utils import _format_time
+from funscript.dual_axis_funscript import DualAxisFunscript
 from config.element_group_colors import TimelineColors
 
 class TimelineTransformer:
@@ -121,6 +122,27 @@ class InteractiveFunscriptTimeline:
             return getattr(fs, f"{axis}_actions", [])
         return []
 
+    def _get_timestamps(self, actions: List[Dict]) -> List[int]:
+        """Sorted 'at' values for bisecting; the funscript's cached list when these are its actions."""
+        fs, axis = self._get_target_funscript_details()
+        if fs and axis and actions is getattr(fs, f"{axis}_actions", None):
+            return fs._get_timestamps_for_axis(axis)
+        return [a['at'] for a in actions]
+
+    def _record_range_undo(self, description: str, start_idx: int, end_idx: int, timeline_num: Optional[int] = None):
+        """One compact undo record covering only actions[start_idx:end_idx] for a whole gesture."""
+        timeline_num = timeline_num or self.timeline_num
+        undo_manager = self.app.funscript_processor._get_undo_manager(timeline_num)
+        if undo_manager is not None:
+            undo_manager.record_range_before_action(description, start_idx, end_idx)
+        else:
+            self.app.funscript_processor._record_timeline_action(timeline_num, description)
+
+    def _selection_runs(self) -> List[Tuple[int, int]]:
+        actions = self._get_actions()
+        return [(s, min(e, len(actions))) for s, e in
+                DualAxisFunscript.index_runs(self.multi_selected_action_indices) if s < len(actions)]
+
     def invalidate_cache(self):
         """Forces updates on next frame"""
         self._ultimate_preview_dirty = True
@@ -466,8 +488,9 @@ class InteractiveFunscriptTimeline:
         t_mouse = tf.x_to_time(mouse_pos[0])
         
         # Only search points near the mouse timestamp
-        start_idx = bisect_left([a['at'] for a in actions], t_mouse - tol_ms)
-        end_idx = bisect_right([a['at'] for a in actions], t_mouse + tol_ms)
+        timestamps = self._get_timestamps(actions)
+        start_idx = bisect_left(timestamps, t_mouse - tol_ms)
+        end_idx = bisect_right(timestamps, t_mouse + tol_ms)
         
         best_dist = float('inf')
         best_idx = -1
@@ -493,9 +516,9 @@ class InteractiveFunscriptTimeline:
         actions = self._get_actions()
         if self.dragging_action_idx < 0 or self.dragging_action_idx >= len(actions): return
         
-        # Record Undo State (Once per drag)
+        # Record Undo State (Once per drag, only the dragged point)
         if not self.drag_undo_recorded:
-            self.app.funscript_processor._record_timeline_action(self.timeline_num, "Drag Point")
+            self._record_range_undo("Drag Point", self.dragging_action_idx, self.dragging_action_idx + 1)
             self.drag_undo_recorded = True
 
         # Calculate New Values
@@ -508,17 +531,10 @@ class InteractiveFunscriptTimeline:
         if snap_t > 0: t_raw = round(t_raw / snap_t) * snap_t
         if snap_v > 0: v_raw = round(v_raw / snap_v) * snap_v
         
-        # Constraints: Cannot drag past neighbors
-        idx = self.dragging_action_idx
-        prev_limit = actions[idx - 1]['at'] + 1 if idx > 0 else 0
-        next_limit = actions[idx + 1]['at'] - 1 if idx < len(actions) - 1 else float('inf')
-        
-        new_t = int(max(prev_limit, min(next_limit, t_raw)))
-        new_v = int(max(0, min(100, v_raw)))
-        
-        # Apply
-        actions[idx]['at'] = new_t
-        actions[idx]['pos'] = new_v
+        # Apply (cannot drag past neighbors; keeps the timestamp cache valid)
+        fs, axis = self._get_target_funscript_details()
+        if not fs: return
+        fs.move_action(axis, self.dragging_action_idx, t_raw, v_raw)
         
         # Update state
         self.invalidate_cache()
@@ -549,16 +565,15 @@ class InteractiveFunscriptTimeline:
         t_start = tf.x_to_time(x1)
         t_end = tf.x_to_time(x2)
 
-        # Optimize: Binary search time bounds
-        s_idx = bisect_left([a['at'] for a in actions], t_start)
-        e_idx = bisect_right([a['at'] for a in actions], t_end)
-
-        new_selection = set()
-        for i in range(s_idx, e_idx):
-            act = actions[i]
-            py = tf.val_to_y(act['pos'])
-            if y1 <= py <= y2:
-                new_selection.add(i)
+        fs, axis = self._get_target_funscript_details()
+        if not fs: return
+        # Screen Y grows downwards: the bottom edge is the lowest position
+        if tf.height > 0:
+            pos_low = (1.0 - (y2 - tf.y_offset) / tf.height) * 100.0
+            pos_high = (1.0 - (y1 - tf.y_offset) / tf.height) * 100.0
+        else:
+            pos_low, pos_high = 0, 100
+        new_selection = set(fs.select_indices_in_rect(axis, t_start, t_end, pos_low, pos_high))
 
         if append:
             self.multi_selected_action_indices.update(new_selection)
@@ -568,8 +583,9 @@ class InteractiveFunscriptTimeline:
     def _finalize_range_select(self, actions, append: bool):
         t1, t2 = sorted([self.range_start_time, self.range_end_time])
         
-        s_idx = bisect_left([a['at'] for a in actions], t1)
-        e_idx = bisect_right([a['at'] for a in actions], t2)
+        timestamps = self._get_timestamps(actions)
+        s_idx = bisect_left(timestamps, t1)
+        e_idx = bisect_right(timestamps, t2)
         
         new_set = set(range(s_idx, e_idx))
         if append:
@@ -587,36 +603,30 @@ class InteractiveFunscriptTimeline:
 
     # --- Nudge Helpers ---
     def _nudge_selection_value(self, delta: int):
-        actions = self._get_actions()
-        if not actions: return
+        fs, axis = self._get_target_funscript_details()
+        runs = self._selection_runs()
+        if not fs or not runs: return
         
         snap = self.app.app_state_ui.snap_to_grid_pos
         actual_delta = delta * (snap if snap > 0 else 1)
         
-        self.app.funscript_processor._record_timeline_action(self.timeline_num, "Nudge Value")
-        for idx in self.multi_selected_action_indices:
-            if idx < len(actions):
-                actions[idx]['pos'] = max(0, min(100, actions[idx]['pos'] + actual_delta))
+        self._record_range_undo("Nudge Value", runs[0][0], runs[-1][1])
+        for start_idx, end_idx in runs:
+            fs.scale_range_pos(axis, start_idx, end_idx, offset=actual_delta)
         self.app.funscript_processor._finalize_action_and_update_ui(self.timeline_num, "Nudge Value")
         self.invalidate_cache()
 
     def _nudge_selection_time(self, delta_ms: int):
-        actions = self._get_actions()
-        if not actions: return
-
-        self.app.funscript_processor._record_timeline_action(self.timeline_num, "Nudge Time")
-
-        # Sort indices to avoid collision logic issues
-        indices = sorted(list(self.multi_selected_action_indices), reverse=(delta_ms > 0))
+        fs, axis = self._get_target_funscript_details()
+        runs = self._selection_runs()
+        if not fs or not runs: return
 
-        for idx in indices:
-            if idx < len(actions):
-                # Logic similar to drag constraint
-                prev_limit = actions[idx - 1]['at'] + 1 if idx > 0 else 0
-                next_limit = actions[idx + 1]['at'] - 1 if idx < len(actions) - 1 else float('inf')
+        self._record_range_undo("Nudge Time", runs[0][0], runs[-1][1])
 
-                new_at = actions[idx]['at'] + delta_ms
-                actions[idx]['at'] = int(max(prev_limit, min(next_limit, new_at)))
+        # Each contiguous run moves as a block, clamped between its unselected neighbours.
+        # Runs are processed in the direction of travel so earlier moves free up room.
+        for start_idx, end_idx in (reversed(runs) if delta_ms > 0 else runs):
+            fs.shift_range_time(axis, start_idx, end_idx, delta_ms)
 
         self.app.funscript_processor._finalize_action_and_update_ui(self.timeline_num, "Nudge Time")
         self.invalidate_cache()
@@ -635,11 +645,15 @@ class InteractiveFunscriptTimeline:
         # Convert frames to milliseconds
         delta_ms = int((frames / fps) * 1000.0)
 
-        self.app.funscript_processor._record_timeline_action(self.timeline_num, "Nudge All Points")
+        fs, axis = self._get_target_funscript_details()
+        if not fs: return
+
+        self._record_range_undo("Nudge All Points", 0, len(actions))
 
         # Nudge all points by the same amount
         for action in actions:
             action['at'] = max(0, action['at'] + delta_ms)
+        fs._invalidate_cache(axis)
 
         self.app.funscript_processor._finalize_action_and_update_ui(self.timeline_num, "Nudge All Points")
         self.invalidate_cache()
@@ -649,8 +663,7 @@ class InteractiveFunscriptTimeline:
         actions = self._get_actions()
         if not self.multi_selected_action_indices: return
         
-        indices = sorted(list(self.multi_selected_action_indices))
-        selection = [actions[i] for i in indices]
+        selection = [a for s_idx, e_idx in self._selection_runs() for a in actions[s_idx:e_idx]]
         
         if not selection: return
         
@@ -668,19 +681,9 @@ class InteractiveFunscriptTimeline:
         fs, axis = self._get_target_funscript_details()
         if not fs: return
         
-        self.app.funscript_processor._record_timeline_action(self.timeline_num, "Paste")
-        
-        new_actions = []
-        for item in clip:
-            t = int(paste_at_ms + item['relative_at'])
-            v = int(item['pos'])
-            new_actions.append({
-                'timestamp_ms': t,
-                'primary_pos': v if axis=='primary' else None,
-                'secondary_pos': v if axis=='secondary' else None
-            })
-            
-        fs.add_actions_batch(new_actions, is_from_live_tracker=False)
+        block = [{'at': int(paste_at_ms + item['relative_at']), 'pos': int(item['pos'])} for item in clip]
+        self._record_range_undo("Paste", *fs.get_paste_block_range(axis, block))
+        fs.paste_block(axis, block)
         self.app.funscript_processor._finalize_action_and_update_ui(self.timeline_num, "Paste")
         self.invalidate_cache()
 
@@ -697,20 +700,13 @@ class InteractiveFunscriptTimeline:
         
         if not fs_other: return
         
-        indices = sorted(list(self.multi_selected_action_indices))
-        points_to_copy = [actions[i] for i in indices]
-        
-        # Convert format
-        batch = []
-        for p in points_to_copy:
-            batch.append({
-                'timestamp_ms': p['at'],
-                'primary_pos': p['pos'] if axis_other == 'primary' else None,
-                'secondary_pos': p['pos'] if axis_other == 'secondary' else None
-            })
+        block = [{'at': a['at'], 'pos': a['pos']}
+                 for s_idx, e_idx in self._selection_runs() for a in actions[s_idx:e_idx]]
+        if not block: return
             
-        self.app.funscript_processor._record_timeline_action(other_num, f"Copy from T{self.timeline_num}")
-        fs_other.add_actions_batch(batch, is_from_live_tracker=False)
+        self._record_range_undo(f"Copy from T{self.timeline_num}",
+                                *fs_other.get_paste_block_range(axis_other, block), timeline_num=other_num)
+        fs_other.paste_block(axis_other, block)
         self.app.funscript_processor._finalize_action_and_update_ui(other_num, f"Copy from T{self.timeline_num}")
 
     # --- Selection Filters ---
@@ -805,7 +801,12 @@ class InteractiveFunscriptTimeline:
             curr_ms += step_ms
 
     def _draw_audio_waveform(self, dl, tf: TimelineTransformer):
-        if not self.app.app_state_ui.show_audio_waveform or self.app.audio_waveform_data is None: return
+        if not self.app.app_state_ui.show_audio_waveform: return
+        envelope = getattr(self.app, 'audio_waveform_envelope', None)
+        if envelope is not None:
+            self._draw_audio_envelope(dl, tf, envelope)
+            return
+        if self.app.audio_waveform_data is None: return
         
         data = self.app.audio_waveform_data
         total_frames = self.app.processor.total_frames
@@ -848,14 +849,41 @@ class InteractiveFunscriptTimeline:
             dl.add_polyline(pts_top, col, False, 1.0)
             dl.add_polyline(pts_bot, col, False, 1.0)
 
+    def _draw_audio_envelope(self, dl, tf: TimelineTransformer, envelope):
+        """Draws min/max bins from the multi-resolution envelope (works while still decoding)."""
+        times, bins = envelope.get_range(tf.visible_start_ms, tf.visible_end_ms, tf.zoom)
+        if times.size == 0 or envelope.peak <= 0: return
+
+        # Reduce to at most one column per pixel
+        n_cols = max(1, int(tf.width))
+        if times.size > n_cols:
+            edges = np.arange(0, times.size, int(math.ceil(times.size / n_cols)))
+            times = times[edges]
+            mins = np.minimum.reduceat(bins[:, 0], edges)
+            maxs = np.maximum.reduceat(bins[:, 1], edges)
+        else:
+            mins = bins[:, 0]
+            maxs = bins[:, 1]
+
+        xs = tf.vec_time_to_x(times)
+        center_y = tf.y_offset + tf.height / 2
+        scale = (tf.height / 2) / envelope.peak
+        ys_top = center_y - maxs * scale
+        ys_bot = center_y - mins * scale
+
+        col = imgui.get_color_u32_rgba(*TimelineColors.AUDIO_WAVEFORM)
+        for x, y0, y1 in zip(xs.tolist(), ys_top.tolist(), ys_bot.tolist()):
+            dl.add_line(x, y0, x, y1, col)
+
     def _draw_curve(self, dl, tf: TimelineTransformer, actions: List[Dict], 
                     is_preview=False, color_override=None, force_lines_only=False, alpha=1.0):
         if not actions or len(actions) < 2: return
 
         # 1. Culling: Identify visible slice
         margin_ms = tf.zoom * 100 
-        s_idx = bisect_left([a['at'] for a in actions], tf.visible_start_ms - margin_ms)
-        e_idx = bisect_right([a['at'] for a in actions], tf.visible_end_ms + margin_ms)
+        timestamps = self._get_timestamps(actions)
+        s_idx = bisect_left(timestamps, tf.visible_start_ms - margin_ms)
+        e_idx = bisect_right(timestamps, tf.visible_end_ms + margin_ms)
         
         s_idx = max(0, s_idx - 1)
         e_idx = min(len(actions), e_idx + 1)
@@ -1188,8 +1216,12 @@ class InteractiveFunscriptTimeline:
             self.logger.error(f"Could not get funscript details for timeline {self.timeline_num}")
             return
 
-        self.app.funscript_processor._record_timeline_action(self.timeline_num, "Delete Points")
-        fs.clear_points(axis=axis, selected_indices=list(self.multi_selected_action_indices))
+        runs = self._selection_runs()
+        if runs:
+            self._record_range_undo("Delete Points", runs[0][0], runs[-1][1])
+            # Back to front so earlier runs keep their indices
+            for start_idx, end_idx in reversed(runs):
+                fs.delete_index_range(axis, start_idx, end_idx)
         self.multi_selected_action_indices.clear()
         self.selected_action_idx = -1
         self.app.funscript_processor._finalize_action_and_update_ui(self.timeline_num, "Delete Points")
@@ -1209,11 +1241,9 @@ class InteractiveFunscriptTimeline:
             return
 
         # Record for undo
-        self.app.funscript_processor._record_timeline_action(self.timeline_num, "Clear All Points")
+        self._record_range_undo("Clear All Points", 0, num_points)
 
-        # Select all points then delete them
-        all_indices = list(range(num_points))
-        fs.clear_points(axis=axis, selected_indices=all_indices)
+        fs.delete_index_range(axis, 0, num_points)
 
         # Clear selection
         self.multi_selected_action_indices.clear()
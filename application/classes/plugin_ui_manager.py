@@ -256,35 +256,10 @@ class PluginUIManager:
                     return False
             
             else:
-                # Fallback to old preview method (creating a copy and transforming)
-                # Create a copy for preview
-                temp_funscript = copy.deepcopy(funscript_obj)
-                
-                # Store original actions for comparison
-                if axis == 'primary':
-                    original_actions = list(temp_funscript.primary_actions)
-                elif axis == 'secondary':
-                    original_actions = list(temp_funscript.secondary_actions)
-                else:  # both - preview primary
-                    original_actions = list(temp_funscript.primary_actions)
-                
-                # Apply transformation
-                result = context.plugin_instance.transform(temp_funscript, axis, **validated_params)
-                
-                # Check if transform modified in-place (result is None) or returned new funscript
-                final_funscript = result if result else temp_funscript
-                
-                # Extract the relevant actions after transformation
-                if axis == 'primary':
-                    transformed_actions = final_funscript.primary_actions
-                elif axis == 'secondary':
-                    transformed_actions = final_funscript.secondary_actions
-                else:  # both
-                    transformed_actions = final_funscript.primary_actions
-                
-                # Create preview data showing the changes
-                preview_data = self._create_fallback_preview_data(
-                    original_actions, transformed_actions, plugin_name, selected_indices
+                # Fallback to old preview method (transforming a copy). Results are cached by
+                # axis revision and computed on the selected window when the plugin allows it.
+                preview_data = self._compute_fallback_preview(
+                    context.plugin_instance, plugin_name, funscript_obj, axis, validated_params, selected_indices
                 )
                 
                 if preview_data:
@@ -307,6 +282,82 @@ class PluginUIManager:
             self.logger.error(f"Error generating preview for plugin '{plugin_name}': {e}")
             return False
     
+    def _compute_fallback_preview(self, plugin_instance, plugin_name: str, funscript_obj, axis: str,
+                                  validated_params: Dict[str, Any],
+                                  selected_indices: Optional[List[int]]) -> Optional[Dict[str, Any]]:
+        """Transform-and-diff preview, served from the versioned preview cache when possible."""
+        from funscript.plugins.preview_cache import (
+            preview_cache, actions_version_key, compute_preview_window, remap_selection
+        )
+        
+        key_params = {k: v for k, v in validated_params.items() if k != 'selected_indices'}
+        
+        if axis == 'both':
+            # Both axes are transformed; the primary axis is previewed
+            cache_key = preview_cache.make_key(actions_version_key(funscript_obj, 'both'), axis, plugin_name,
+                                               plugin_instance.version, key_params,
+                                               selection=selected_indices, kind='diff')
+            cached = preview_cache.get(cache_key)
+            if cached is not None:
+                return cached or None
+            
+            temp_funscript = copy.deepcopy(funscript_obj)
+            original_actions = list(temp_funscript.primary_actions)
+            result = plugin_instance.transform(temp_funscript, axis, **validated_params)
+            final_funscript = result if result else temp_funscript
+            preview_data = self._create_fallback_preview_data(
+                original_actions, final_funscript.primary_actions, plugin_name, selected_indices
+            )
+            preview_cache.put(cache_key, preview_data or {})
+            return preview_data
+        
+        actions = funscript_obj.primary_actions if axis == 'primary' else funscript_obj.secondary_actions
+        window = compute_preview_window(len(actions), selected_indices,
+                                        getattr(plugin_instance, 'preview_margin_points', None))
+        if window:
+            start, end = window
+            selection = remap_selection(selected_indices, window)
+        else:
+            start, end = 0, len(actions)
+            selection = selected_indices
+        
+        version_key = (actions_version_key(funscript_obj, axis), start, end)
+        cache_key = preview_cache.make_key(version_key, axis, plugin_name, plugin_instance.version,
+                                           key_params, selection=selection, kind='diff')
+        cached = preview_cache.get(cache_key)
+        if cached is not None:
+            return cached or None
+        
+        # Shallow copy with a private copy of just the actions the plugin will touch
+        temp_funscript = copy.copy(funscript_obj)
+        original_actions = actions[start:end]
+        window_actions = copy.deepcopy(original_actions)
+        if axis == 'primary':
+            temp_funscript.primary_actions = window_actions
+            temp_funscript.secondary_actions = list(funscript_obj.secondary_actions)
+        else:
+            temp_funscript.primary_actions = list(funscript_obj.primary_actions)
+            temp_funscript.secondary_actions = window_actions
+        temp_funscript._invalidate_cache('both')
+        
+        params = dict(validated_params)
+        if selection:
+            params['selected_indices'] = selection
+        else:
+            params.pop('selected_indices', None)
+        
+        result = plugin_instance.transform(temp_funscript, axis, **params)
+        
+        # Check if transform modified in-place (result is None) or returned new funscript
+        final_funscript = result if result else temp_funscript
+        transformed_actions = final_funscript.primary_actions if axis == 'primary' else final_funscript.secondary_actions
+        
+        preview_data = self._create_fallback_preview_data(
+            original_actions, transformed_actions, plugin_name, selection
+        )
+        preview_cache.put(cache_key, preview_data or {})
+        return preview_data
+    
     def apply_plugin(self, plugin_name: str, funscript_obj, axis: str = 'primary', selected_indices: Optional[List[int]] = None) -> bool:
         """
         Apply the specified plugin to the funscript.
@@ -1,11 +1,13 @@
+import hashlib
 import orjson
 import os
 import time
 import numpy as np
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, Set
 
 from config.constants import AUTOSAVE_FILE, PROJECT_FILE_EXTENSION, APP_VERSION
 from application.utils import check_write_access
+from video.audio_waveform import AudioWaveformEnvelope, get_waveform_cache_path
 
 
 # Add a handler to convert NumPy types to standard Python types for JSON serialization
@@ -19,12 +21,45 @@ def numpy_default_handler(obj):
     raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
 
 
+# Project format 2: the project file is a small manifest; large sections live in
+# content-hashed chunk files in "<project file>.chunks" and are only rewritten when they change.
+PROJECT_FORMAT_VERSION = 2
+PROJECT_CHUNK_DIR_SUFFIX = ".chunks"
+CHUNKED_PROJECT_SECTIONS = (
+    "funscript_actions_timeline1",
+    "funscript_actions_timeline2",
+    "video_chapters",
+    "audio_waveform_data",
+)
+
+
+def get_project_chunk_dir(project_filepath: str) -> str:
+    return project_filepath + PROJECT_CHUNK_DIR_SUFFIX
+
+
+def _atomic_write_bytes(filepath: str, data: bytes):
+    """Writes to a temporary file in the same directory and renames it over the target."""
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
 class ProjectManager:
     def __init__(self, app_instance):
         self.app = app_instance
         self._project_file_path: Optional[str] = None
         self._project_dirty: bool = False
         self.last_autosave_time: float = time.time()
+        # Last written chunk per section: {section: (fingerprint, digest, filename)}
+        self._saved_sections: Dict[str, Tuple[Optional[tuple], str, str]] = {}
+        self._saved_sections_dir: Optional[str] = None
 
     @property
     def project_file_path(self) -> Optional[str]:
@@ -56,6 +91,8 @@ class ProjectManager:
         self.app.reset_project_state(for_new_project=True)
 
         # ProjectManager specific resets
+        self._saved_sections = {}
+        self._saved_sections_dir = None
         self.project_file_path = None
         self.project_dirty = False  # A new project starts clean
         self.last_autosave_time = time.time()
@@ -121,8 +158,7 @@ class ProjectManager:
         try:
             # Track disk I/O performance
             io_start = time.perf_counter()
-            with open(filepath, 'rb') as f:
-                project_data = orjson.loads(f.read())
+            project_data = self._read_project_file(filepath)
             io_time = (time.perf_counter() - io_start) * 1000
             if hasattr(self.app, 'gui_instance') and self.app.gui_instance:
                 self.app.gui_instance.track_disk_io_time("ProjectLoad", io_time)
@@ -204,16 +240,22 @@ class ProjectManager:
         else:
             self.save_project(self.project_file_path)
 
-    def save_project(self, filepath: str):
+    def save_project(self, filepath: str, trust_fingerprints: bool = False):
+        """
+        Saves the project manifest and every chunk whose content changed since the last save.
+        With 'trust_fingerprints' (autosave), sections whose change fingerprint is unchanged
+        are not even serialized; otherwise each section is hashed to detect changes.
+        """
         check_write_access(filepath)
+        fingerprints = self._get_section_fingerprints()
         project_data = self._get_project_state_as_dict()
         project_data["version"] = APP_VERSION
 
         try:
             # Track disk I/O performance
             io_start = time.perf_counter()
-            with open(filepath, 'wb') as f:
-                f.write(orjson.dumps(project_data, default=numpy_default_handler))
+            chunks_written = self._write_chunked_project(filepath, project_data, fingerprints, trust_fingerprints)
+            self.app.logger.debug(f"Project save rewrote {chunks_written} of {len(CHUNKED_PROJECT_SECTIONS)} chunk(s).")
             io_time = (time.perf_counter() - io_start) * 1000
             if hasattr(self.app, 'gui_instance') and self.app.gui_instance:
                 self.app.gui_instance.track_disk_io_time("ProjectSave", io_time)
@@ -261,14 +303,117 @@ class ProjectManager:
         )
 
         # Use the existing save_project method, which handles state gathering,
-        # writing the file, and resetting the dirty flag.
-        self.save_project(project_filepath)
+        # writing the file, and resetting the dirty flag. Unchanged sections are skipped.
+        self.save_project(project_filepath, trust_fingerprints=True)
 
         # The save_project method resets the dirty flag, which is what we want.
         # It also logs its own success message.
         self.last_autosave_time = time.time()
 
 
+    # --- Chunked project files ---
+    def _read_project_file(self, filepath: str) -> Dict:
+        """Reads a project manifest and inlines its chunks (format 1 files have none)."""
+        with open(filepath, 'rb') as f:
+            project_data = orjson.loads(f.read())
+        chunks = project_data.pop("chunks", None) or {}
+        chunk_dir = get_project_chunk_dir(filepath)
+        saved_sections = {}
+        for section, filename in chunks.items():
+            chunk_path = os.path.join(chunk_dir, filename)
+            if not os.path.exists(chunk_path):
+                raise FileNotFoundError(f"Project chunk '{filename}' is missing from {chunk_dir}")
+            with open(chunk_path, 'rb') as f:
+                project_data[section] = orjson.loads(f.read())
+            digest = filename[len(section) + 1:-len(".json")]
+            saved_sections[section] = (None, digest, filename)
+        # Chunks on disk match what was just loaded: the next save only rewrites real changes
+        self._saved_sections = saved_sections
+        self._saved_sections_dir = chunk_dir if chunks else None
+        return project_data
+
+    def _write_chunked_project(self, filepath: str, project_data: Dict,
+                               fingerprints: Dict[str, Optional[tuple]], trust_fingerprints: bool) -> int:
+        """Writes changed chunks, then atomically replaces the manifest. Returns the number of chunks written."""
+        chunk_dir = get_project_chunk_dir(filepath)
+        if self._saved_sections_dir != chunk_dir:
+            self._saved_sections = {}
+            self._saved_sections_dir = chunk_dir
+        os.makedirs(chunk_dir, exist_ok=True)
+
+        manifest = {k: v for k, v in project_data.items() if k not in CHUNKED_PROJECT_SECTIONS}
+        chunks: Dict[str, str] = {}
+        chunks_written = 0
+        for section in CHUNKED_PROJECT_SECTIONS:
+            if section not in project_data:
+                continue
+            fingerprint = fingerprints.get(section)
+            saved = self._saved_sections.get(section)
+            if trust_fingerprints and fingerprint is not None and saved and saved[0] == fingerprint \
+                    and os.path.exists(os.path.join(chunk_dir, saved[2])):
+                chunks[section] = saved[2]
+                continue
+
+            payload = orjson.dumps(project_data[section], default=numpy_default_handler)
+            digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+            filename = f"{section}-{digest}.json"
+            chunk_path = os.path.join(chunk_dir, filename)
+            if not os.path.exists(chunk_path):
+                _atomic_write_bytes(chunk_path, payload)
+                chunks_written += 1
+            chunks[section] = filename
+            self._saved_sections[section] = (fingerprint, digest, filename)
+
+        manifest["project_format"] = PROJECT_FORMAT_VERSION
+        manifest["chunks"] = chunks
+        _atomic_write_bytes(filepath, orjson.dumps(manifest, default=numpy_default_handler))
+        self._remove_stale_chunks(chunk_dir, set(chunks.values()))
+        return chunks_written
+
+    @staticmethod
+    def _remove_stale_chunks(chunk_dir: str, referenced: Set[str]):
+        try:
+            filenames = os.listdir(chunk_dir)
+        except OSError:
+            return
+        for filename in filenames:
+            if filename in referenced or not filename.endswith(".json"):
+                continue
+            if any(filename.startswith(f"{section}-") for section in CHUNKED_PROJECT_SECTIONS):
+                try:
+                    os.remove(os.path.join(chunk_dir, filename))
+                except OSError:
+                    pass
+
+    def _get_section_fingerprints(self) -> Dict[str, Optional[tuple]]:
+        """
+        Cheap change fingerprints for the large sections (None = always hash the content).
+        Action lists combine the funscript's per-axis revision with the undo/redo stacks,
+        which move on every recorded edit, undo and redo.
+        """
+        fingerprints: Dict[str, Optional[tuple]] = {}
+        fs_proc = self.app.funscript_processor
+        # Same condition as _get_project_state_as_dict: without it the sections are saved empty
+        actions_saved = bool(self.app.processor and self.app.processor.tracker and self.app.processor.tracker.funscript)
+        for timeline_num in (1, 2):
+            fs, axis = fs_proc._get_target_funscript_object_and_axis(timeline_num)
+            fingerprint = None
+            if actions_saved and fs is not None and hasattr(fs, 'get_revision'):
+                actions = getattr(fs, f"{axis}_actions")
+                undo_manager = fs_proc._get_undo_manager(timeline_num)
+                undo_state = None
+                if undo_manager is not None:
+                    undo_state = (len(undo_manager.undo_stack),
+                                  id(undo_manager.undo_stack[-1]) if undo_manager.undo_stack else None,
+                                  len(undo_manager.redo_stack),
+                                  id(undo_manager.redo_stack[-1]) if undo_manager.redo_stack else None)
+                fingerprint = (id(fs), id(actions), len(actions), fs.get_revision(axis), undo_state)
+            fingerprints[f"funscript_actions_timeline{timeline_num}"] = fingerprint
+        waveform = self.app.audio_waveform_data
+        if waveform is not None:
+            fingerprints["audio_waveform_data"] = (id(waveform), getattr(waveform, 'shape', None))
+        return fingerprints
+
     def _get_project_state_as_dict(self) -> Dict:
         """Gathers all necessary data from app logic sub-modules for saving."""
         # Data from FunscriptProcessor
@@ -392,6 +537,11 @@ class ProjectManager:
                 f"Loaded audio waveform data ({len(self.app.audio_waveform_data)} samples) from project.")
         else:
             self.app.audio_waveform_data = None
+        # Full-resolution envelope comes from the on-disk cache next to the video (if still valid)
+        self.app.audio_waveform_envelope = None
+        if self.app.audio_waveform_data is not None and fm.video_path and os.path.exists(fm.video_path):
+            self.app.audio_waveform_envelope = AudioWaveformEnvelope.load(
+                get_waveform_cache_path(fm.video_path), fm.video_path)
 
         # Data for StageProcessor
         stage_proc = self.app.stage_processor
@@ -93,6 +93,11 @@ class AppSettings:
             # Performance & System
             "num_producers_stage1": constants.DEFAULT_S1_NUM_PRODUCERS,
             "num_consumers_stage1": constants.DEFAULT_S1_NUM_CONSUMERS,
+            "stage1_consumer_batch_size": constants.DEFAULT_S1_CONSUMER_BATCH_SIZE,
+            "stage1_decode_threads": constants.DEFAULT_S1_DECODE_THREADS,
+            "stage1_pose_max_staleness_s": constants.DEFAULT_S1_POSE_MAX_STALENESS_S,
+            "stage1_static_skip_threshold": constants.DEFAULT_S1_STATIC_SKIP_THRESHOLD,
+            "stage1_profile_fingerprint": None,  # Hardware fingerprint of the applied autotuner profile
             "num_workers_stage2_of": constants.DEFAULT_S2_OF_WORKERS,
             "hardware_acceleration_method": "none",  # Default to CPU to avoid CUDA errors on non-NVIDIA systems
             "ffmpeg_path": "ffmpeg",
@@ -129,6 +134,7 @@ class AppSettings:
             "live_tracker_base_amplification": constants.DEFAULT_LIVE_TRACKER_BASE_AMPLIFICATION,
             "live_tracker_class_amp_multipliers": constants.DEFAULT_CLASS_AMP_MULTIPLIERS,
             "live_tracker_flow_smoothing_window": constants.DEFAULT_FLOW_HISTORY_SMOOTHING_WINDOW,
+            "live_tracker_async_detection": True,  # Run YOLO off the per-frame path (live only)
 
             # --- Settings for the 2D Oscillation Detector ---
             "oscillation_detector_grid_size": 20,
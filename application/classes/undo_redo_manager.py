@@ -3,6 +3,24 @@ import copy
 from typing import Optional, List, Tuple
 
 
+class RangeSnapshot:
+    """
+    Compact undo state for an edit confined to one index window: the actions that
+    occupied [start, start + len(actions)) and the list length at that time. The
+    window may grow or shrink; the length difference tells how far on restore.
+    """
+    __slots__ = ('start', 'actions', 'list_length')
+
+    def __init__(self, start: int, actions: list, list_length: int):
+        self.start = start
+        self.actions = actions
+        self.list_length = list_length
+
+    def __eq__(self, other):
+        return (isinstance(other, RangeSnapshot) and self.start == other.start
+                and self.list_length == other.list_length and self.actions == other.actions)
+
+
 class UndoRedoManager:
     def __init__(self, max_history: int = 50):
         self.max_history: int = max_history
@@ -13,11 +31,22 @@ class UndoRedoManager:
         self.redo_stack: collections.deque[Tuple[str, list]] = collections.deque(maxlen=max_history)
 
         self._actions_list_reference: Optional[list] = None
+        # Funscript and axis owning the list, so restores bump its revision like any other edit
+        self._funscript_owner = None
+        self._axis: Optional[str] = None
 
-    def set_actions_reference(self, actions_list_ref: list):
+    def set_actions_reference(self, actions_list_ref: list, funscript_obj=None, axis: Optional[str] = None):
         self._actions_list_reference = actions_list_ref
+        self._funscript_owner = funscript_obj
+        self._axis = axis
         self.clear_history()
 
+    def _notify_owner(self):
+        """Invalidates the owner's caches after a restore; revision-keyed caches would otherwise
+        serve the replaced state when the list length did not change."""
+        if self._funscript_owner is not None and hasattr(self._funscript_owner, '_invalidate_cache'):
+            self._funscript_owner._invalidate_cache(self._axis or 'both')
+
     def record_state_before_action(self, action_description: str):
         """
         Call this *BEFORE* the actions list is modified.
@@ -35,6 +64,36 @@ class UndoRedoManager:
         self.undo_stack.append((action_description, state_before_action))
         self.redo_stack.clear()  # A new action clears the redo stack
 
+    def record_range_before_action(self, action_description: str, start_idx: int, end_idx: int):
+        """
+        Like record_state_before_action, but only snapshots actions[start_idx:end_idx].
+        Use it for gestures whose changes (including inserts and deletes) stay inside that window.
+        """
+        if self._actions_list_reference is None:
+            return
+        actions = self._actions_list_reference
+        start_idx = max(0, min(start_idx, len(actions)))
+        end_idx = max(start_idx, min(end_idx, len(actions)))
+        snapshot = RangeSnapshot(start_idx, copy.deepcopy(actions[start_idx:end_idx]), len(actions))
+        self.undo_stack.append((action_description, snapshot))
+        self.redo_stack.clear()
+
+    def _swap_state(self, state):
+        """Restores 'state' into the live list and returns the state it replaced (same kind)."""
+        actions = self._actions_list_reference
+        if isinstance(state, RangeSnapshot):
+            current_len = len(actions)
+            end_idx = state.start + len(state.actions) + (current_len - state.list_length)
+            replaced = RangeSnapshot(state.start, copy.deepcopy(actions[state.start:end_idx]), current_len)
+            actions[state.start:end_idx] = copy.deepcopy(state.actions)
+            self._notify_owner()
+            return replaced
+        replaced = copy.deepcopy(actions)
+        actions.clear()
+        actions.extend(copy.deepcopy(state))
+        self._notify_owner()
+        return replaced
+
     def undo(self) -> Optional[str]:  # Returns description of the action that was undone
         """
         Performs an undo. The current state is pushed to redo.
@@ -48,13 +107,10 @@ class UndoRedoManager:
         action_description_that_was_done, previous_state_to_restore = self.undo_stack.pop()
 
         # The current live state is the result of 'action_description_that_was_done'
-        current_live_state_for_redo = copy.deepcopy(self._actions_list_reference)
+        current_live_state_for_redo = self._swap_state(previous_state_to_restore)
         # When redoing, we re-apply 'action_description_that_was_done' to get 'current_live_state_for_redo'
         self.redo_stack.append((action_description_that_was_done, current_live_state_for_redo))
 
-        self._actions_list_reference.clear()
-        self._actions_list_reference.extend(copy.deepcopy(previous_state_to_restore))
-
         return action_description_that_was_done  # This is the action that was just "undone"
 
     def redo(self) -> Optional[str]:  # Returns description of the action that was redone
@@ -70,14 +126,11 @@ class UndoRedoManager:
         action_to_reapply_desc, state_to_restore_via_redo = self.redo_stack.pop()
 
         # The current live state is the one *before* this redo operation.
-        current_live_state_for_undo = copy.deepcopy(self._actions_list_reference)
+        current_live_state_for_undo = self._swap_state(state_to_restore_via_redo)
         # If we undo this redo, we revert 'action_to_reapply_desc', going back to 'current_live_state_for_undo'.
         # So, on undo_stack, we store (action_to_reapply_desc, current_live_state_for_undo)
         self.undo_stack.append((action_to_reapply_desc, current_live_state_for_undo))
 
-        self._actions_list_reference.clear()
-        self._actions_list_reference.extend(copy.deepcopy(state_to_restore_via_redo))
-
         return action_to_reapply_desc  # This is the action that was just "redone"
 
     def can_undo(self) -> bool:
@@ -1,15 +1,36 @@
 """
 GUI Components package initialization.
+
+Exports are resolved lazily: headless helpers living in this package
+(e.g. dynamic_tracker_ui) must be importable without imgui/OpenGL.
 """
 
-from .autotuner_window import AutotunerWindow
-from .chapter_type_manager_ui import ChapterTypeManagerUI
-from .control_panel_ui import ControlPanelUI
-from .generated_file_manager_window import GeneratedFileManagerWindow
-from .info_graphs_ui import InfoGraphsUI
-from .keyboard_shortcuts_dialog import KeyboardShortcutsDialog
-from .toolbar_ui import ToolbarUI
-from .video_display_ui import VideoDisplayUI
-from .video_navigation_ui import VideoNavigationUI, ChapterListWindow
-from .app_gui import GUI
-from .splash_screen import SplashScreen, StandaloneSplashWindow, show_splash_during_init
\ No newline at end of file
+import importlib
+
+_LAZY_EXPORTS = {
+    "AutotunerWindow": ".autotuner_window",
+    "ChapterTypeManagerUI": ".chapter_type_manager_ui",
+    "ControlPanelUI": ".control_panel_ui",
+    "GeneratedFileManagerWindow": ".generated_file_manager_window",
+    "InfoGraphsUI": ".info_graphs_ui",
+    "KeyboardShortcutsDialog": ".keyboard_shortcuts_dialog",
+    "ToolbarUI": ".toolbar_ui",
+    "VideoDisplayUI": ".video_display_ui",
+    "VideoNavigationUI": ".video_navigation_ui",
+    "ChapterListWindow": ".video_navigation_ui",
+    "GUI": ".app_gui",
+    "SplashScreen": ".splash_screen",
+    "StandaloneSplashWindow": ".splash_screen",
+    "show_splash_during_init": ".splash_screen",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -21,8 +21,8 @@ class AutotunerWindow:
 
             # Only render the content if the window is visible/open
             if is_open:
-                imgui.text_wrapped("This tool will run Stage 1 analysis multiple times to find the best-performing combination of Producer and Consumer threads for your system.")
-                imgui.text_wrapped("A video must be loaded to run the test. The process may take a long time.")
+                imgui.text_wrapped("This tool benchmarks decoding, inference and queue costs on a short sample of the loaded video and predicts the best combination of Producers, Consumers, batch size and decode threads for your system.")
+                imgui.text_wrapped("A video must be loaded to run the test. The result is stored for this hardware and reused on identical machines.")
                 imgui.separator()
 
                 is_ready = self.app.processor and self.app.processor.is_video_open()
@@ -81,13 +81,13 @@ class AutotunerWindow:
                 imgui.separator()
 
                 # --- Results Table ---
-                imgui.text("Results (Frames Per Second):")
+                imgui.text("Results (Predicted Frames Per Second):")
                 table_flags = imgui.TABLE_BORDERS
                 if imgui.begin_table("AutotuneResults", 5, flags=table_flags):
                     imgui.table_setup_column("HW Accel")
                     imgui.table_setup_column("Producers")
                     imgui.table_setup_column("Consumers")
-                    imgui.table_setup_column("Peak FPS")
+                    imgui.table_setup_column("Predicted FPS")
                     imgui.table_setup_column("Notes")
                     imgui.table_headers_row()
 
@@ -124,18 +124,22 @@ class AutotunerWindow:
                 # --- Recommendation and Apply Button ---
                 if self.app.autotuner_best_combination:
                     p_best, c_best, accel_best = self.app.autotuner_best_combination
-                    fps_best = self.app.autotuner_results.get((p_best, c_best, accel_best), (0.0, ""))[0]
-                    imgui.text(f"Recommendation: {p_best}P/{c_best}C with HW Accel '{accel_best}' ({fps_best:.2f} FPS)")
+                    fps_best, note_best = self.app.autotuner_results.get((p_best, c_best, accel_best), (0.0, ""))
+                    imgui.text(f"Recommendation: {p_best}P/{c_best}C with HW Accel '{accel_best}' ({fps_best:.2f} FPS, {note_best})")
 
                     # Apply Recommended Settings button (PRIMARY - positive action)
                     with primary_button_style():
                         if imgui.button("Apply Recommended Settings"):
-                            self.app.stage_processor.num_producers_stage1 = p_best
-                            self.app.stage_processor.num_consumers_stage1 = c_best
-                            self.app.hardware_acceleration_method = accel_best
-                            self.app.app_settings.set("num_producers_stage1", p_best)
-                            self.app.app_settings.set("num_consumers_stage1", c_best)
-                            self.app.app_settings.set("hardware_acceleration_method", accel_best)
+                            profile = self.app.autotuner_best_profile
+                            if profile:
+                                self.app.apply_stage1_profile(profile)
+                            else:
+                                self.app.stage_processor.num_producers_stage1 = p_best
+                                self.app.stage_processor.num_consumers_stage1 = c_best
+                                self.app.hardware_acceleration_method = accel_best
+                                self.app.app_settings.set("num_producers_stage1", p_best)
+                                self.app.app_settings.set("num_consumers_stage1", c_best)
+                                self.app.app_settings.set("hardware_acceleration_method", accel_best)
                             self.app.logger.info(f"Autotuner settings applied: P={p_best}, C={c_best}, HW Accel={accel_best}", extra={'status_message': True})
         finally:
             imgui.end()
@@ -3,7 +3,7 @@ import logging
 import os
 import time
 from application.gui_components.engine_compiler.tensorrt_validation_panel import ValidationPanel
-from application.logic.tensorrt_compiler_logic import TensorRTCompilerLogic
+from backend.core_logic.tensorrt_compiler_logic import TensorRTCompilerLogic
 from application.utils import primary_button_style, destructive_button_style
 from config.constants import TENSORRT_OUTPUT_DISPLAY_HEIGHT
 from config.element_group_colors import CompilerToolColors
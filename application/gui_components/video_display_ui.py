@@ -834,7 +834,12 @@ class VideoDisplayUI:
             )
 
     def _render_stage2_overlay(self, stage_proc, app_state):
-        frame_overlay_data = stage_proc.stage2_overlay_data_map.get(self.app.processor.current_frame_index)
+        overlay_store = stage_proc.stage2_overlay_data_map
+        current_frame_index = self.app.processor.current_frame_index
+        if self.app.processor.is_processing and not self.app.processor.pause_event.is_set():
+            # Decode the frames ahead of the playhead in the background
+            overlay_store.prefetch(current_frame_index + 1)
+        frame_overlay_data = overlay_store.get(current_frame_index)
         if not frame_overlay_data: return
 
         current_chapter = self.app.funscript_processor.get_chapter_at_frame(self.app.processor.current_frame_index)
@@ -1,14 +1,32 @@
 """
 Logic package initialization.
+
+Exports are resolved lazily so that ``application.logic.cli_handler`` can be
+imported for argument parsing without constructing the full application.
 """
 
-from .app_calibration import AppCalibration
-from .app_energy_saver import AppEnergySaver
-from .app_event_handlers import AppEventHandlers
-from .app_file_manager import AppFileManager
-from .app_funscript_processor import AppFunscriptProcessor
-from .app_logic import ApplicationLogic
-from .app_stage_processor import AppStageProcessor
-from .app_state_ui import AppStateUI
-from .app_utility import AppUtility
-from .tensorrt_compiler_logic import TensorRTCompilerLogic
\ No newline at end of file
+import importlib
+
+_LAZY_EXPORTS = {
+    "AppCalibration": ".app_calibration",
+    "AppEnergySaver": ".app_energy_saver",
+    "AppEventHandlers": ".app_event_handlers",
+    "AppFileManager": "backend.core_logic.app_file_manager",
+    "AppFunscriptProcessor": "backend.core_logic.app_funscript_processor",
+    "ApplicationLogic": ".app_logic",
+    "AppStageProcessor": "backend.core_logic.app_stage_processor",
+    "AppStateUI": ".app_state_ui",
+    "AppUtility": ".app_utility",
+    "TensorRTCompilerLogic": "backend.core_logic.tensorrt_compiler_logic",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -8,21 +8,22 @@ import platform
 import threading
 from typing import Optional, Dict, Tuple, List, Any
 from datetime import datetime, timedelta
-from ultralytics import YOLO
 
+# NOTE: ultralytics is imported locally where a model is actually loaded, keeping headless startup light.
 from video import VideoProcessor
 from tracker.tracker_manager import create_tracker_manager
 
-from application.classes import AppSettings, ProjectManager, ShortcutManager, UndoRedoManager
-from application.utils import AppLogger, check_write_access, AutoUpdater, VideoSegment
-from config.constants import DEFAULT_MODELS_DIR, FUNSCRIPT_METADATA_VERSION, PROJECT_FILE_EXTENSION, MODEL_DOWNLOAD_URLS
+from application.classes import AppSettings, ProjectManager, UndoRedoManager
+from application.utils import AppLogger, check_write_access, VideoSegment
+from config.constants import DEFAULT_MODELS_DIR, FUNSCRIPT_METADATA_VERSION, PROJECT_FILE_EXTENSION, MODEL_DOWNLOAD_URLS, \
+    DEFAULT_S1_POSE_MAX_STALENESS_S
 from config.tracker_discovery import get_tracker_discovery
 from pathlib import Path
 
 from .app_state_ui import AppStateUI
-from .app_file_manager import AppFileManager
-from .app_stage_processor import AppStageProcessor
-from .app_funscript_processor import AppFunscriptProcessor
+from backend.core_logic.app_file_manager import AppFileManager
+from backend.core_logic.app_stage_processor import AppStageProcessor
+from backend.core_logic.app_funscript_processor import AppFunscriptProcessor
 from .app_event_handlers import AppEventHandlers
 from .app_calibration import AppCalibration
 from .app_energy_saver import AppEnergySaver
@@ -179,8 +180,11 @@ class ApplicationLogic:
         # Configure third-party logging to reduce startup noise
         self._configure_third_party_logging()
 
-        # --- Initialize Auto-Updater ---
-        self.updater = AutoUpdater(self)
+        # --- Initialize Auto-Updater (GUI only; the updater UI depends on imgui) ---
+        self.updater = None
+        if not self.is_cli_mode:
+            from application.utils import AutoUpdater
+            self.updater = AutoUpdater(self)
 
         # REFACTORED Defensive programming. Always make sure the type is a list of strings.
         discarded_tracking_classes = self.app_settings.get("discarded_tracking_classes", [])
@@ -206,6 +210,7 @@ class ApplicationLogic:
         self.autotuner_best_combination: Optional[Tuple[int, int, str]] = None
         self.autotuner_best_fps: float = 0.0
         self.autotuner_forced_hwaccel: Optional[str] = None
+        self.autotuner_best_profile: Optional[Dict] = None
 
         # --- Hardware Acceleration
         # Query ffmpeg for available hardware accelerations
@@ -276,6 +281,10 @@ class ApplicationLogic:
         # --- Modular Components Initialization ---
         self.file_manager = AppFileManager(self)
         self.stage_processor = AppStageProcessor(self)
+        try:
+            self._apply_stored_stage1_profile()
+        except Exception as e:
+            self.logger.warning(f"Could not apply stored Stage 1 profile: {e}")
         self.funscript_processor = AppFunscriptProcessor(self)
         self.event_handlers = AppEventHandlers(self)
         self.calibration = AppCalibration(self)
@@ -301,7 +310,10 @@ class ApplicationLogic:
 
         # --- Other Managers ---
         self.project_manager = ProjectManager(self)
-        self.shortcut_manager = ShortcutManager(self)
+        self.shortcut_manager = None
+        if not self.is_cli_mode:
+            from application.classes import ShortcutManager  # Depends on glfw/imgui
+            self.shortcut_manager = ShortcutManager(self)
         self._shortcut_mapping_cache = {}  # Cache parsed shortcut mappings to avoid string parsing every frame
 
         # Initialize chapter type manager for custom chapter types
@@ -350,6 +362,8 @@ class ApplicationLogic:
 
         # --- Audio waveform data ---
         self.audio_waveform_data = None
+        # Multi-resolution envelope (video.audio_waveform.AudioWaveformEnvelope), filled progressively
+        self.audio_waveform_envelope = None
 
         self.app_state_ui.show_timeline_selection_popup = False
         self.app_state_ui.show_timeline_comparison_results_popup = False
@@ -370,7 +384,7 @@ class ApplicationLogic:
         self.energy_saver.reset_activity_timer()
 
         # Check for updates on startup only if enabled
-        if self.app_settings.get("updater_check_on_startup", True):
+        if self.updater and self.app_settings.get("updater_check_on_startup", True):
             self.updater.check_for_updates_async()
 
         # --- Initialize tracker mode from persisted setting; default handled by AppStateUI ---
@@ -463,6 +477,7 @@ class ApplicationLogic:
                     self.first_run_status_message = "Converting detection model to CoreML format..."
                     self.logger.info(f"Running on macOS ARM. Converting {det_filename_pt} to .mlpackage")
                     try:
+                        from ultralytics import YOLO
                         model = YOLO(det_model_path_pt)
                         model.export(format="coreml")
                         final_det_model_path = det_model_path_pt.replace('.pt', '.mlpackage')
@@ -499,6 +514,7 @@ class ApplicationLogic:
                     self.first_run_status_message = "Converting pose model to CoreML format..."
                     self.logger.info(f"Running on macOS ARM. Converting {pose_filename_pt} to .mlpackage")
                     try:
+                        from ultralytics import YOLO
                         model = YOLO(pose_model_path_pt)
                         model.export(format="coreml")
                         final_pose_model_path = pose_model_path_pt.replace('.pt', '.mlpackage')
@@ -591,97 +607,42 @@ class ApplicationLogic:
         self.autotuner_thread.start()
 
     def _run_autotuner_thread(self):
-        """The actual logic for the autotuning process."""
-        self.logger.info("Starting Stage 1 performance autotuner thread.")
+        """
+        Micro-benchmarks decode, inference and queue costs on a short sampled window and
+        picks producers/consumers/batch size/decode threads from a throughput model.
+        The chosen profile is stored per hardware fingerprint (see stage_1_benchmark).
+        """
+        from detection.cd.stage_1_benchmark import run_stage1_microbenchmark
+
+        self.logger.info("Starting Stage 1 micro-benchmark autotuner thread.")
         self.autotuner_results = {}
         self.autotuner_best_combination = None
         self.autotuner_best_fps = 0.0
+        self.autotuner_best_profile = None
 
-        def run_single_test(p: int, c: int, accel: str) -> Optional[float]:
-            """Helper to run one analysis and return its FPS."""
-            self.autotuner_status_message = f"Running test: {p}P / {c}C (HW Accel: {accel})..."
-            self.logger.info(self.autotuner_status_message)
-
-            completion_event = threading.Event()
-            # Set the flag as an attribute on the stage processor instance
-            self.stage_processor.force_rerun_stage1 = True
-
-            original_hw_method = self.hardware_acceleration_method
-            try:
-                self.hardware_acceleration_method = accel
-
-                total_frames = self.processor.total_frames
-                start_frame = min(1000, total_frames // 4)
-                end_frame = min(start_frame + 1000, total_frames - 1)
-                autotune_frame_range = (start_frame, end_frame)
-
-                self.stage_processor.start_full_analysis(
-                    processing_mode="stage3_mixed",
-                    override_producers=p,
-                    override_consumers=c,
-                    completion_event=completion_event,
-                    frame_range_override=autotune_frame_range,
-                    is_autotune_run=True
-                )
-                completion_event.wait()
-
-            finally:
-                self.hardware_acceleration_method = original_hw_method
-
-            if self.stage_processor.stage1_final_fps_str and "FPS" in self.stage_processor.stage1_final_fps_str:
-                try:
-                    fps_str = self.stage_processor.stage1_final_fps_str.replace(" FPS", "").strip()
-                    fps = float(fps_str)
-                    self.logger.info(f"Test finished for {p}P / {c}C ({accel}). Result: {fps:.2f} FPS")
-                    return fps
-                except (ValueError, TypeError):
-                    self.logger.error(f"Could not parse FPS string: '{self.stage_processor.stage1_final_fps_str}'")
-                    return None
-            else:
-                self.logger.error(f"Test failed for {p}P / {c}C ({accel}). No final FPS reported.")
-                return None
-
-        def get_perf(p, c, accel):
-            if (p, c, accel) in self.autotuner_results:
-                return self.autotuner_results[(p, c, accel)][0]
-
-            fps = run_single_test(p, c, accel)
-            if fps is None:
-                self.autotuner_results[(p, c, accel)] = (0.0, "Failed")
-                return 0.0
-
-            self.autotuner_results[(p, c, accel)] = (fps, "")
-
-            if fps > self.autotuner_best_fps:
-                self.autotuner_best_fps = fps
-                self.autotuner_best_combination = (p, c, accel)
-            return fps
-
-        def find_best_consumer_for_producer(p, accel, max_cores):
-            self.logger.info(f"Starting search for best consumer count for P={p}, Accel={accel}...")
-            low = 2
-            high = max(2, max_cores - p)
-
-            while high - low >= 3:
-                if self.stop_batch_event.is_set(): return
-                m1 = low + (high - low) // 3
-                m2 = high - (high - low) // 3
-
-                perf_m1 = get_perf(p, m1, accel)
-                if self.stop_batch_event.is_set(): return
+        video_path = self.file_manager.video_path
+        src = self.processor
 
-                perf_m2 = get_perf(p, m2, accel)
-                if self.stop_batch_event.is_set(): return
-
-                if perf_m1 < perf_m2:
-                    low = m1
-                else:
-                    high = m2
+        class VPAppProxy:
+            pass
 
-            self.logger.info(f"Narrowed search for P={p}, Accel={accel} to range [{low}, {high}]. Finalizing...")
-            for c in range(low, high + 1):
-                if self.stop_batch_event.is_set(): return
-                get_perf(p, c, accel)
+        def make_producer_processor(accel: str, decode_threads: int) -> VideoProcessor:
+            # Mirrors the Stage 1 producer configuration
+            proxy = VPAppProxy()
+            proxy.hardware_acceleration_method = accel
+            proxy.available_ffmpeg_hwaccels = self.available_ffmpeg_hwaccels
+            proxy.app_settings = {'vr_unwarp_method': 'v360'}
+            vp = VideoProcessor(app_instance=proxy, tracker=None, yolo_input_size=self.yolo_input_size,
+                                video_type=src.video_type_setting, vr_input_format=src.vr_input_format,
+                                vr_fov=src.vr_fov, vr_pitch=src.vr_pitch,
+                                fallback_logger_config={'logger_instance': self.logger},
+                                ffmpeg_decode_threads=decode_threads)
+            if not vp.open_video(video_path):
+                raise RuntimeError(f"Could not open video '{video_path}' for benchmarking.")
+            return vp
+
+        def set_status(msg: str):
+            self.autotuner_status_message = msg
 
         try:
             accel_methods_to_test = []
@@ -703,22 +664,43 @@ class ApplicationLogic:
                 if best_hw_accel != 'none':
                     accel_methods_to_test.append(best_hw_accel)
 
-            max_cores = os.cpu_count() or 4
-            PRODUCER_RANGE = range(1, 3)
-
-            for accel in accel_methods_to_test:
-                for p in PRODUCER_RANGE:
-                    if self.stop_batch_event.is_set():
-                        raise InterruptedError("Autotuner aborted by user.")
-                    find_best_consumer_for_producer(p, accel, max_cores)
-
-            if self.autotuner_best_combination:
+            profile, per_combination = run_stage1_microbenchmark(
+                video_processor_factory=make_producer_processor,
+                total_frames=src.total_frames,
+                video_fps=src.fps or 30.0,
+                det_model_path=self.yolo_det_model_path,
+                pose_model_path=self.yolo_pose_model_path,
+                yolo_input_size=self.yolo_input_size,
+                confidence_threshold=self.tracker.confidence_threshold if self.tracker else 0.4,
+                accel_methods=accel_methods_to_test,
+                available_hwaccels=self.available_ffmpeg_hwaccels,
+                stop_event=self.stop_batch_event,
+                status_callback=set_status,
+                logger=self.logger,
+                pose_max_staleness_s=self.app_settings.get("stage1_pose_max_staleness_s",
+                                                           DEFAULT_S1_POSE_MAX_STALENESS_S))
+
+            if self.stop_batch_event.is_set():
+                raise InterruptedError("Autotuner aborted by user.")
+
+            for (p, c, accel), (fps, batch_size, threads) in per_combination.items():
+                self.autotuner_results[(p, c, accel)] = (fps, f"b={batch_size}, t={threads or 'auto'} (model)")
+
+            if profile:
+                self.autotuner_best_profile = profile
+                self.autotuner_best_combination = (profile["num_producers"], profile["num_consumers"],
+                                                   profile["hardware_acceleration_method"])
+                self.autotuner_best_fps = profile["predicted_fps"]
                 p_final, c_final, accel_final = self.autotuner_best_combination
-                self.autotuner_status_message = f"Finished! Best: {p_final}P/{c_final}C, Accel: {accel_final} at {self.autotuner_best_fps:.2f} FPS"
-                self.logger.info(f"Autotuner finished. Best combination: {self.autotuner_best_combination} with {self.autotuner_best_fps:.2f} FPS.")
+                self.autotuner_status_message = (
+                    f"Finished! Best: {p_final}P/{c_final}C, batch {profile['consumer_batch_size']}, "
+                    f"Accel: {accel_final} at ~{self.autotuner_best_fps:.2f} FPS (predicted)")
+                self.logger.info(f"Autotuner finished. Profile {profile['fingerprint']}: {self.autotuner_best_combination}, "
+                                 f"batch={profile['consumer_batch_size']}, decode_threads={profile['decode_threads']}, "
+                                 f"predicted {self.autotuner_best_fps:.2f} FPS.")
             else:
-                self.autotuner_status_message = "Finished, but no successful runs were completed."
-                self.logger.warning("Autotuner finished without any successful test runs.")
+                self.autotuner_status_message = "Finished, but no measurements could be taken."
+                self.logger.warning("Autotuner finished without a usable benchmark profile.")
 
         except InterruptedError as e:
             self.autotuner_status_message = "Aborted by user."
@@ -728,7 +710,33 @@ class ApplicationLogic:
             self.logger.error(f"Autotuner thread failed: {e}", exc_info=True)
         finally:
             self.is_autotuning_active = False
-            self.stage_processor.force_rerun_stage1 = False
+
+    def apply_stage1_profile(self, profile: dict):
+        """Applies a Stage 1 autotuner profile to the stage processor and persists it in settings."""
+        p, c = profile["num_producers"], profile["num_consumers"]
+        accel = profile["hardware_acceleration_method"]
+        self.stage_processor.num_producers_stage1 = p
+        self.stage_processor.num_consumers_stage1 = c
+        self.hardware_acceleration_method = accel
+        self.app_settings.set("num_producers_stage1", p)
+        self.app_settings.set("num_consumers_stage1", c)
+        self.app_settings.set("hardware_acceleration_method", accel)
+        self.app_settings.set("stage1_consumer_batch_size", profile["consumer_batch_size"])
+        self.app_settings.set("stage1_decode_threads", profile["decode_threads"])
+        self.app_settings.set("stage1_profile_fingerprint", profile["fingerprint"])
+
+    def _apply_stored_stage1_profile(self):
+        """On a machine whose settings were not tuned here, reuse a stored profile for identical hardware."""
+        from detection.cd.stage_1_benchmark import get_hardware_fingerprint, get_stored_stage1_profile
+
+        key, _ = get_hardware_fingerprint(self.available_ffmpeg_hwaccels, self.yolo_det_model_path, self.yolo_input_size)
+        if self.app_settings.get("stage1_profile_fingerprint") == key:
+            return
+        profile = get_stored_stage1_profile(key)
+        if profile and profile.get("hardware_acceleration_method") in self.available_ffmpeg_hwaccels:
+            self.apply_stage1_profile(profile)
+            self.logger.info(f"Applied stored Stage 1 profile for this hardware ({key}): "
+                             f"{profile['num_producers']}P/{profile['num_consumers']}C, batch {profile['consumer_batch_size']}.")
 
     def trigger_ultimate_autotune_with_defaults(self, timeline_num: int):
         """
@@ -811,9 +819,17 @@ class ApplicationLogic:
 
         def _generate_waveform_thread():
             self.logger.info("Generating audio waveform...", extra={'status_message': True})
-            waveform_data = self.processor.get_audio_waveform(num_samples=2000)
 
-            self.audio_waveform_data = waveform_data
+            def _on_progress(envelope):
+                # Publish the partially decoded envelope so the timeline fills in while decoding
+                if self.audio_waveform_envelope is not envelope:
+                    self.audio_waveform_envelope = envelope
+                    self.app_state_ui.show_audio_waveform = True
+
+            envelope = self.processor.get_audio_waveform_envelope(on_progress=_on_progress)
+
+            self.audio_waveform_envelope = envelope
+            self.audio_waveform_data = envelope.peak_envelope(2000) if envelope is not None else None
 
             if self.audio_waveform_data is not None:
                 self.logger.info("Audio waveform generated successfully.", extra={'status_message': True})
@@ -1119,6 +1135,7 @@ class ApplicationLogic:
         except Exception as e:
             self.logger.error(f"An error occurred during the batch process: {e}", exc_info=True)
         finally:
+            self.stage_processor.release_stage1_worker_pool()
             self.is_batch_processing_active = False
             self.current_batch_video_index = -1
             self.batch_video_paths = []
@@ -1497,6 +1514,7 @@ class ApplicationLogic:
         try:
             self.logger.info(f"Temporarily loading model to cache class names: {os.path.basename(model_path)}")
             # This is the potentially slow operation that can freeze the UI.
+            from ultralytics import YOLO
             temp_model = YOLO(model_path)
             model_names = temp_model.names
 
@@ -1781,6 +1799,7 @@ class ApplicationLogic:
 
         # Reset waveform data
         self.audio_waveform_data = None
+        self.audio_waveform_envelope = None
         self.app_state_ui.show_audio_waveform = False
 
         # Reset UI states to defaults (or app settings defaults)
@@ -2086,6 +2105,7 @@ class ApplicationLogic:
                     if is_mac_arm:
                         self.logger.info(f"Attempting to convert detection model to CoreML (is_mac_arm={is_mac_arm})...")
                         try:
+                            from ultralytics import YOLO
                             model = YOLO(det_model_path_pt)
                             self.logger.info(f"YOLO model loaded, starting export to CoreML format...")
                             model.export(format="coreml")
@@ -2141,6 +2161,7 @@ class ApplicationLogic:
                     if is_mac_arm:
                         self.logger.info(f"Attempting to convert pose model to CoreML (is_mac_arm={is_mac_arm})...")
                         try:
+                            from ultralytics import YOLO
                             model = YOLO(pose_model_path_pt)
                             self.logger.info(f"YOLO pose model loaded, starting export to CoreML format...")
                             model.export(format="coreml")
@@ -2192,154 +2213,5 @@ class ApplicationLogic:
         """
         Handles CLI funscript processing mode - applies filters to existing funscripts.
         """
-        self.logger.info("Running in funscript processing mode")
-        
-        # 1. Find funscript files
-        input_path = os.path.abspath(args.input_path)
-        if not os.path.exists(input_path):
-            self.logger.error(f"Input path does not exist: {input_path}")
-            return
-        
-        funscript_paths = []
-        if os.path.isfile(input_path):
-            if input_path.lower().endswith('.funscript'):
-                funscript_paths.append(input_path)
-            else:
-                self.logger.error(f"File is not a funscript: {input_path}")
-                return
-        elif os.path.isdir(input_path):
-            self.logger.info(f"Scanning folder for funscripts: {input_path} (Recursive: {args.recursive})")
-            if args.recursive:
-                for root, _, files in os.walk(input_path):
-                    for file in files:
-                        if file.lower().endswith('.funscript'):
-                            funscript_paths.append(os.path.join(root, file))
-            else:
-                for file in os.listdir(input_path):
-                    if file.lower().endswith('.funscript'):
-                        funscript_paths.append(os.path.join(input_path, file))
-        
-        if not funscript_paths:
-            self.logger.error("No funscript files found at the specified path.")
-            return
-        
-        self.logger.info(f"Found {len(funscript_paths)} funscript(s) to process with filter: {args.filter}")
-        
-        # 2. Load plugin system
-        try:
-            from funscript.plugins.base_plugin import plugin_registry
-            # Import all plugins to ensure they're registered
-            from funscript.plugins import (
-                ultimate_autotune_plugin, rdp_simplify_plugin, savgol_filter_plugin,
-                speed_limiter_plugin, anti_jerk_plugin, amplify_plugin, clamp_plugin,
-                invert_plugin, keyframe_plugin
-            )
-            
-            # Manually register plugins that don't auto-register
-            from funscript.plugins.rdp_simplify_plugin import RdpSimplifyPlugin
-            from funscript.plugins.amplify_plugin import AmplifyPlugin
-            from funscript.plugins.clamp_plugin import ValueClampPlugin
-            from funscript.plugins.invert_plugin import InvertPlugin
-            from funscript.plugins.savgol_filter_plugin import SavgolFilterPlugin
-            from funscript.plugins.speed_limiter_plugin import SpeedLimiterPlugin
-            from funscript.plugins.anti_jerk_plugin import AntiJerkPlugin
-            from funscript.plugins.keyframe_plugin import KeyframePlugin
-            
-            # Register plugins that aren't auto-registering
-            plugins_to_register = [
-                RdpSimplifyPlugin(), AmplifyPlugin(), ValueClampPlugin(), InvertPlugin(),
-                SavgolFilterPlugin(), SpeedLimiterPlugin(), AntiJerkPlugin(), KeyframePlugin()
-            ]
-            
-            for plugin in plugins_to_register:
-                try:
-                    plugin_registry.register(plugin)
-                except Exception:
-                    pass  # May already be registered
-                    
-        except ImportError as e:
-            self.logger.error(f"Failed to import plugin system: {e}")
-            return
-        
-        # 3. Get the specified plugin
-        plugin_map = {
-            'ultimate-autotune': 'Ultimate Autotune',
-            'rdp-simplify': 'Simplify (RDP)',
-            'savgol-filter': 'SavGol Filter',
-            'speed-limiter': 'Speed Limiter',
-            'anti-jerk': 'Anti-Jerk',
-            'amplify': 'Amplify',
-            'clamp': 'Clamp',
-            'invert': 'Invert',
-            'keyframe': 'Keyframe'
-        }
-        
-        plugin_name = plugin_map.get(args.filter)
-        if not plugin_name:
-            self.logger.error(f"Unknown filter: {args.filter}")
-            return
-        
-        plugin = plugin_registry.get_plugin(plugin_name)
-        if not plugin:
-            self.logger.error(f"Plugin not found: {plugin_name}")
-            return
-        
-        self.logger.info(f"Using plugin: {plugin_name}")
-        
-        # 4. Process each funscript
-        success_count = 0
-        for i, funscript_path in enumerate(funscript_paths):
-            try:
-                self.logger.info(f"Processing {i+1}/{len(funscript_paths)}: {os.path.basename(funscript_path)}")
-                
-                # Load the funscript using existing parsing logic
-                from funscript import DualAxisFunscript
-                actions, error_msg, _, _ = self.file_manager._parse_funscript_file(funscript_path)
-                
-                if error_msg:
-                    self.logger.error(f"Failed to parse funscript {funscript_path}: {error_msg}")
-                    continue
-                
-                if not actions:
-                    self.logger.warning(f"Skipping empty funscript: {funscript_path}")
-                    continue
-                
-                # Create funscript object and set actions
-                funscript = DualAxisFunscript()
-                funscript.primary_actions = actions
-                
-                # Get default parameters for the plugin
-                if hasattr(plugin, 'get_default_params'):
-                    params = plugin.get_default_params()
-                else:
-                    params = {}
-                
-                # Apply the filter
-                self.logger.info(f"Applying {plugin_name} filter...")
-                result = plugin.transform(funscript, 'primary', **params)
-                
-                # Some plugins return the funscript object, others modify in-place and return None
-                # We'll treat any non-exception result as success and use the original funscript
-                # which should now be modified by the plugin
-                output_path = self._generate_filtered_funscript_path(funscript_path, args.filter, args.overwrite)
-                
-                # Save the filtered funscript using existing file manager
-                # Use the modified funscript (plugins modify in-place)
-                self.file_manager._save_funscript_file(output_path, funscript.primary_actions)
-                self.logger.info(f"Saved filtered funscript: {output_path}")
-                success_count += 1
-                    
-            except Exception as e:
-                self.logger.error(f"Error processing {funscript_path}: {e}")
-                continue
-        
-        self.logger.info(f"Funscript processing complete. Successfully processed {success_count}/{len(funscript_paths)} files.")
-    
-    def _generate_filtered_funscript_path(self, original_path, filter_name, overwrite):
-        """Generate output path for filtered funscript."""
-        if overwrite:
-            return original_path
-        
-        # Insert filter name before .funscript extension
-        base, ext = os.path.splitext(original_path)
-        return f"{base}.{filter_name}{ext}"
+        from application.logic.cli_handler import run_funscript_filter_mode
+        run_funscript_filter_mode(args, self)
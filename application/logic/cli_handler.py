@@ -0,0 +1,259 @@
+"""
+Headless command-line interface.
+
+Argument parsing, ``--help`` and funscript-only operations run without the GUI
+stack (imgui/OpenGL/GLFW) and without the ML stack (ultralytics/torch). Video
+modes build the processing core on demand; heavy stage modules are imported
+lazily by the stage processor when a stage actually runs.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+from typing import List, Optional
+
+VIDEO_EXTENSIONS = {".mp4", ".mkv", ".mov", ".avi", ".webm"}
+
+# CLI filter name -> registered plugin name
+FUNSCRIPT_FILTERS = {
+    'ultimate-autotune': 'Ultimate Autotune',
+    'rdp-simplify': 'Simplify (RDP)',
+    'savgol-filter': 'SavGol Filter',
+    'speed-limiter': 'Speed Limiter',
+    'anti-jerk': 'Anti-Jerk',
+    'amplify': 'Amplify',
+    'clamp': 'Clamp',
+    'invert': 'Invert',
+    'keyframe': 'Keyframe'
+}
+
+DEFAULT_CLI_MODE = "3-stage"
+
+
+def setup_core_environment():
+    """Process-wide setup shared by GUI and CLI (multiprocessing start method, base logging)."""
+    multiprocessing.freeze_support()
+    try:
+        # Stage 1/3 workers rely on 'spawn' semantics on every platform
+        multiprocessing.set_start_method('spawn')
+    except RuntimeError:
+        pass  # Already set
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="FunGen - AI powered funscript generator. Run without arguments to start the GUI.")
+    parser.add_argument("input_path", nargs="?", default=None,
+                        help="Path to a video file or a folder of videos (or funscripts with --funscript-mode).")
+    parser.add_argument("--mode", default=DEFAULT_CLI_MODE,
+                        help=f"Processing mode (tracker name or CLI alias). Default: {DEFAULT_CLI_MODE}. "
+                             "Use --list-modes to show the available modes.")
+    parser.add_argument("--list-modes", action="store_true",
+                        help="List the batch-compatible processing modes and exit.")
+    parser.add_argument("--od-mode", choices=["current", "legacy"], default="current",
+                        help="Oscillation detector mode used in Stage 3.")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="Re-process and overwrite existing funscripts.")
+    parser.add_argument("--no-autotune", dest="autotune", action="store_false",
+                        help="Disable Ultimate Autotune after generation.")
+    parser.add_argument("--no-copy", dest="copy", action="store_false",
+                        help="Do not save a copy of the funscript next to the video.")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="Scan folders recursively.")
+    parser.add_argument("--generate-roll", action="store_true",
+                        help="Always generate the secondary (roll) funscript.")
+    parser.add_argument("--funscript-mode", action="store_true",
+                        help="Apply a filter to existing funscripts instead of processing videos.")
+    parser.add_argument("--filter", choices=sorted(FUNSCRIPT_FILTERS), default="ultimate-autotune",
+                        help="Filter applied in --funscript-mode.")
+    parser.add_argument("--telemetry-jsonl", metavar="PATH", default=None,
+                        help="Append timing spans of all stages and workers to this JSON Lines file.")
+    parser.add_argument("--telemetry-prom", metavar="PATH", default=None,
+                        help="Write counters and span duration histograms to this Prometheus text file.")
+    return parser
+
+
+def parse_and_validate_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parses CLI arguments. Only touches the standard library, so --help is instant."""
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    if args.list_modes:
+        # Tracker discovery is only imported when explicitly requested
+        from config.tracker_discovery import get_tracker_discovery
+        for mode in get_tracker_discovery().get_supported_cli_modes():
+            print(mode)
+        sys.exit(0)
+
+    if args.funscript_mode and not args.input_path:
+        parser.error("--funscript-mode requires an input path.")
+    if args.input_path and not os.path.exists(args.input_path):
+        parser.error(f"Input path does not exist: {args.input_path}")
+    return args
+
+
+def collect_input_files(input_path: str, extensions, recursive: bool) -> List[str]:
+    """Returns matching files for a file or folder input path."""
+    input_path = os.path.abspath(input_path)
+    if os.path.isfile(input_path):
+        return [input_path] if os.path.splitext(input_path)[1].lower() in extensions else []
+
+    paths = []
+    if recursive:
+        for root, _, files in os.walk(input_path):
+            for file in files:
+                if os.path.splitext(file)[1].lower() in extensions:
+                    paths.append(os.path.join(root, file))
+    else:
+        for file in os.listdir(input_path):
+            if os.path.splitext(file)[1].lower() in extensions:
+                paths.append(os.path.join(input_path, file))
+    return sorted(paths)
+
+
+class HeadlessFunscriptCore:
+    """
+    Minimal core for funscript-only CLI operations: settings, logger and the file
+    manager. No video processor, tracker or model is created.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        from application.classes.settings_manager import AppSettings
+        from backend.core_logic.app_file_manager import AppFileManager
+
+        self.is_cli_mode = True
+        self.logger = logger or logging.getLogger("FunGenCLI")
+        self.app_settings = AppSettings(logger=self.logger)
+        self.processor = None
+        self.tracker = None
+        self.file_manager = AppFileManager(self)
+
+
+def _get_filter_plugin(plugin_name: str, logger: logging.Logger):
+    from funscript.plugins.base_plugin import plugin_registry
+    from funscript.plugins.ultimate_autotune_plugin import UltimateAutotunePlugin
+    from funscript.plugins.rdp_simplify_plugin import RdpSimplifyPlugin
+    from funscript.plugins.amplify_plugin import AmplifyPlugin
+    from funscript.plugins.clamp_plugin import ValueClampPlugin
+    from funscript.plugins.invert_plugin import InvertPlugin
+    from funscript.plugins.savgol_filter_plugin import SavgolFilterPlugin
+    from funscript.plugins.speed_limiter_plugin import SpeedLimiterPlugin
+    from funscript.plugins.anti_jerk_plugin import AntiJerkPlugin
+    from funscript.plugins.keyframe_plugin import KeyframePlugin
+
+    # Register the built-in filters (registering one again just replaces it)
+    plugins_to_register = [
+        UltimateAutotunePlugin(), RdpSimplifyPlugin(), AmplifyPlugin(), ValueClampPlugin(), InvertPlugin(),
+        SavgolFilterPlugin(), SpeedLimiterPlugin(), AntiJerkPlugin(), KeyframePlugin()
+    ]
+    for plugin in plugins_to_register:
+        try:
+            plugin_registry.register(plugin)
+        except Exception:
+            pass  # May already be registered
+
+    plugin = plugin_registry.get_plugin(plugin_name)
+    if not plugin:
+        logger.error(f"Plugin not found: {plugin_name}")
+    return plugin
+
+
+def generate_filtered_funscript_path(original_path: str, filter_name: str, overwrite: bool) -> str:
+    """Output path for a filtered funscript: <name>.<filter>.funscript unless overwriting."""
+    if overwrite:
+        return original_path
+    base, ext = os.path.splitext(original_path)
+    return f"{base}.{filter_name}{ext}"
+
+
+def run_funscript_filter_mode(args, core) -> int:
+    """
+    Applies ``args.filter`` to every funscript under ``args.input_path``.
+    ``core`` needs ``logger`` and ``file_manager`` (HeadlessFunscriptCore or ApplicationLogic).
+    Returns the number of successfully processed files.
+    """
+    logger = core.logger
+    logger.info("Running in funscript processing mode")
+
+    funscript_paths = collect_input_files(args.input_path, {".funscript"}, args.recursive)
+    if not funscript_paths:
+        logger.error("No funscript files found at the specified path.")
+        return 0
+    logger.info(f"Found {len(funscript_paths)} funscript(s) to process with filter: {args.filter}")
+
+    plugin_name = FUNSCRIPT_FILTERS.get(args.filter)
+    if not plugin_name:
+        logger.error(f"Unknown filter: {args.filter}")
+        return 0
+    try:
+        plugin = _get_filter_plugin(plugin_name, logger)
+    except ImportError as e:
+        logger.error(f"Failed to import plugin system: {e}")
+        return 0
+    if not plugin:
+        return 0
+    logger.info(f"Using plugin: {plugin_name}")
+
+    from funscript import DualAxisFunscript
+
+    success_count = 0
+    for i, funscript_path in enumerate(funscript_paths):
+        try:
+            logger.info(f"Processing {i + 1}/{len(funscript_paths)}: {os.path.basename(funscript_path)}")
+            actions, error_msg, _, _ = core.file_manager._parse_funscript_file(funscript_path)
+            if error_msg:
+                logger.error(f"Failed to parse funscript {funscript_path}: {error_msg}")
+                continue
+            if not actions:
+                logger.warning(f"Skipping empty funscript: {funscript_path}")
+                continue
+
+            funscript = DualAxisFunscript()
+            funscript.primary_actions = actions
+            params = plugin.get_default_params() if hasattr(plugin, 'get_default_params') else {}
+
+            logger.info(f"Applying {plugin_name} filter...")
+            # Plugins modify the funscript in place
+            plugin.transform(funscript, 'primary', **params)
+
+            output_path = generate_filtered_funscript_path(funscript_path, args.filter, args.overwrite)
+            core.file_manager._save_funscript_file(output_path, funscript.primary_actions)
+            logger.info(f"Saved filtered funscript: {output_path}")
+            success_count += 1
+        except Exception as e:
+            logger.error(f"Error processing {funscript_path}: {e}")
+
+    logger.info(f"Funscript processing complete. Successfully processed {success_count}/{len(funscript_paths)} files.")
+    return success_count
+
+
+def run_cli(args):
+    """Runs a CLI task, building only what that task needs."""
+    logger = logging.getLogger("FunGenCLI")
+    logger.info("--- FunGen CLI Mode ---")
+
+    telemetry = None
+    if args.telemetry_jsonl or args.telemetry_prom:
+        # Set before any worker process starts so workers inherit it
+        from common.telemetry import configure_telemetry
+        telemetry = configure_telemetry(args.telemetry_jsonl, args.telemetry_prom)
+
+    try:
+        if args.funscript_mode:
+            run_funscript_filter_mode(args, HeadlessFunscriptCore(logger))
+        else:
+            # Video processing needs the stage processor, trackers and file manager. In CLI
+            # mode ApplicationLogic skips all GUI-only components (updater, shortcuts, GPU timeline).
+            from application.logic.app_logic import ApplicationLogic
+            core_app = ApplicationLogic(is_cli=True)
+            core_app.run_cli(args)
+    finally:
+        if telemetry is not None:
+            telemetry.close()
+
+    logger.info("--- CLI Task Finished ---")
@@ -1,17 +1,47 @@
 """
 Utils package initialization.
+
+Exports are resolved lazily so that headless callers (CLI, worker processes)
+can import a single helper without pulling in the GUI stack (imgui/OpenGL/GLFW).
 """
 
-from .generated_file_manager import GeneratedFileManager
-from .github_token_manager import GitHubTokenManager
-from .logger import AppLogger, StatusMessageHandler, ColoredFormatter
-from .logo_texture import LogoTextureManager, get_logo_texture_manager
-from .icon_texture import IconTextureManager, get_icon_texture_manager
-from .processing_thread_manager import ProcessingThreadManager, TaskType, TaskPriority
-from .time_format import _format_time, format_github_date
-from .network_utils import check_internet_connection
-from .updater import GitHubAPIClient, AutoUpdater
-from .video_segment import VideoSegment
-from .write_access import check_write_access
-from .button_styles import primary_button_style, destructive_button_style
-from .keyboard_layout_detector import KeyboardLayoutDetector, KeyboardLayout, get_layout_detector
+import importlib
+
+_LAZY_EXPORTS = {
+    "GeneratedFileManager": ".generated_file_manager",
+    "GitHubTokenManager": ".github_token_manager",
+    "AppLogger": ".logger",
+    "StatusMessageHandler": ".logger",
+    "ColoredFormatter": ".logger",
+    "LogoTextureManager": ".logo_texture",
+    "get_logo_texture_manager": ".logo_texture",
+    "IconTextureManager": ".icon_texture",
+    "get_icon_texture_manager": ".icon_texture",
+    "ProcessingThreadManager": ".processing_thread_manager",
+    "TaskType": ".processing_thread_manager",
+    "TaskPriority": ".processing_thread_manager",
+    "_format_time": ".time_format",
+    "format_github_date": ".time_format",
+    "check_internet_connection": ".network_utils",
+    "GitHubAPIClient": ".updater",
+    "AutoUpdater": ".updater",
+    "VideoSegment": ".video_segment",
+    "FunscriptPreviewRasterizer": ".funscript_preview_rasterizer",
+    "check_write_access": ".write_access",
+    "primary_button_style": ".button_styles",
+    "destructive_button_style": ".button_styles",
+    "KeyboardLayoutDetector": ".keyboard_layout_detector",
+    "KeyboardLayout": ".keyboard_layout_detector",
+    "get_layout_detector": ".keyboard_layout_detector",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,309 @@
+"""
+Vectorized rasterizer for the funscript overview bar and the speed heatmap.
+
+Every segment between two actions is expanded into the columns it covers and
+reduced per column with NumPy (``minimum.at``/``maximum.at``). The last image is
+cached per bar; when the actions change, only the columns between the first and
+last changed action are redrawn.
+
+The simplified envelope and the heatmap are pixel-identical to the former
+per-segment renderers. The detailed bar is not: each column is one solid span
+between the line's half-column crossings (at most a pixel or so thicker than a
+``cv2.line`` on steep segments), coloured by the fastest segment touching the
+column where overlapping lines used to show whichever was drawn last. On dense
+scripts (several actions per column) this changes most column colours towards
+the faster end of the colour map, so peaks in speed stay visible when zoomed out.
+"""
+
+import threading
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+PREVIEW_BACKGROUND = (38, 31, 31, 255)
+PREVIEW_CENTER_LINE = (77, 77, 77, 179)
+ENVELOPE_SPEED_PPS = 500
+ENVELOPE_ALPHA = 100
+# Above this share of dirty columns a full redraw is just as cheap
+_INCREMENTAL_MAX_DIRTY_FRACTION = 0.5
+
+
+def _actions_to_arrays(actions: Sequence[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(actions)
+    ats = np.fromiter((a['at'] for a in actions), dtype=np.float64, count=n)
+    poss = np.fromiter((a['pos'] for a in actions), dtype=np.float64, count=n)
+    return ats, poss
+
+
+def _changed_action_range(old_ats: np.ndarray, old_poss: np.ndarray,
+                          ats: np.ndarray, poss: np.ndarray) -> Optional[Tuple[int, int]]:
+    """
+    Returns (p, s): the length of the common prefix and of the common suffix of the
+    two action lists, or None if they are identical.
+    """
+    n_old, n = len(old_ats), len(ats)
+    m = min(n_old, n)
+    diff = (old_ats[:m] != ats[:m]) | (old_poss[:m] != poss[:m])
+    p = int(np.argmax(diff)) if diff.any() else m
+    if p == m and n_old == n:
+        return None
+    rest = m - p
+    if rest == 0:
+        return p, 0
+    diff = (old_ats[n_old - rest:][::-1] != ats[n - rest:][::-1]) | \
+           (old_poss[n_old - rest:][::-1] != poss[n - rest:][::-1])
+    s = int(np.argmax(diff)) if diff.any() else rest
+    return p, s
+
+
+def _expand_segment_columns(xa: np.ndarray, ya: np.ndarray, xb: np.ndarray, yb: np.ndarray,
+                            c0: int, c1: int, half_column_spans: bool):
+    """
+    Expands segments (xa, ya) -> (xb, yb) into one entry per covered column in [c0, c1].
+    Returns (segment_index, column, y_low, y_high). With ``half_column_spans`` each
+    column spans the line between its half-column boundaries, so steep segments stay
+    connected; otherwise the line is sampled once at the column centre.
+    """
+    swap = xa > xb
+    xa, xb = np.where(swap, xb, xa), np.where(swap, xa, xb)
+    ya, yb = np.where(swap, yb, ya), np.where(swap, ya, yb)
+    lo = np.maximum(xa, c0)
+    hi = np.minimum(xb, c1)
+    counts = np.maximum(hi - lo + 1, 0)
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, empty
+
+    seg = np.repeat(np.arange(len(xa)), counts)
+    starts = np.cumsum(counts) - counts
+    cols = np.repeat(lo, counts) + (np.arange(total) - np.repeat(starts, counts))
+
+    sxa, sya = xa[seg].astype(np.float64), ya[seg].astype(np.float64)
+    dx = (xb - xa)[seg].astype(np.float64)
+    dy = (yb - ya)[seg].astype(np.float64)
+    vertical = dx == 0
+    safe_dx = np.where(vertical, 1.0, dx)
+    if half_column_spans:
+        left = np.clip(cols - 0.5, sxa, sxa + dx)
+        right = np.clip(cols + 0.5, sxa, sxa + dx)
+        y_left = sya + dy * (left - sxa) / safe_dx
+        y_right = sya + dy * (right - sxa) / safe_dx
+        y_low = np.rint(np.minimum(y_left, y_right))
+        y_high = np.rint(np.maximum(y_left, y_right))
+    else:
+        y_low = y_high = np.rint(sya + dy * (cols - sxa) / safe_dx)
+    # Vertical segments cover both end rows in their single column
+    y_low = np.where(vertical, np.minimum(ya, yb)[seg], y_low).astype(np.int64)
+    y_high = np.where(vertical, np.maximum(ya, yb)[seg], y_high).astype(np.int64)
+    return seg, cols.astype(np.int64), y_low, y_high
+
+
+def _paint_spans(region: np.ndarray, y_min: np.ndarray, y_max: np.ndarray, colors: np.ndarray):
+    """Sets rows y_min..y_max of every column of ``region`` to that column's colour."""
+    rows = np.arange(region.shape[0])[:, np.newaxis]
+    mask = (rows >= y_min[np.newaxis, :]) & (rows <= y_max[np.newaxis, :])
+    region[mask] = np.broadcast_to(colors[np.newaxis, :, :], region.shape)[mask]
+
+
+class _RasterCache:
+    __slots__ = ('key', 'ats', 'poss', 'image')
+
+    def __init__(self):
+        self.key = None
+        self.ats = None
+        self.poss = None
+        self.image = None
+
+
+class FunscriptPreviewRasterizer:
+    """
+    Shared renderer for the funscript preview bar and heatmap images (uint8, 4 channels).
+
+    ``speed_colors_u8`` maps a speed array to uint8 RGBA rows and ``envelope_color``
+    returns the float RGBA colour of the simplified envelope; both normally come from
+    AppUtility. Safe to call from several preview worker threads.
+    """
+
+    def __init__(self, speed_colors_u8: Callable[[np.ndarray], np.ndarray],
+                 envelope_color: Callable[[float], Tuple[float, float, float, float]]):
+        self.speed_colors_u8 = speed_colors_u8
+        self.envelope_color = envelope_color
+        self._caches = {'timeline': _RasterCache(), 'heatmap': _RasterCache()}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Forces the next render of both bars to redraw every column (e.g. after a colour map change)."""
+        with self._lock:
+            for cache in self._caches.values():
+                cache.key = None
+
+    # --- Public renderers ---
+    def render_timeline(self, target_width: int, target_height: int, total_duration_s: float,
+                        actions: Sequence[Dict], simplified: bool = False) -> np.ndarray:
+        image = np.empty((target_height, target_width, 4), dtype=np.uint8)
+        self._fill_timeline_background(image)
+        if not actions or total_duration_s <= 0.001 or target_width <= 0 or target_height <= 0:
+            return image
+        key = ('timeline', target_width, target_height, total_duration_s, bool(simplified))
+        return self._render('timeline', key, actions, target_width, total_duration_s, simplified,
+                            self._draw_timeline_columns)
+
+    def render_heatmap(self, target_width: int, target_height: int, total_duration_s: float,
+                       actions: Sequence[Dict], background: Sequence[int]) -> np.ndarray:
+        if len(actions) <= 1 or total_duration_s <= 0.001 or target_width <= 0 or target_height <= 0:
+            return np.full((target_height, target_width, 4), background, dtype=np.uint8)
+        key = ('heatmap', target_width, target_height, total_duration_s, tuple(background))
+        return self._render('heatmap', key, actions, target_width, total_duration_s, False,
+                            self._draw_heatmap_columns)
+
+    # --- Cache handling ---
+    def _render(self, kind: str, key: tuple, actions: Sequence[Dict], width: int,
+                total_duration_s: float, simplified: bool, draw_columns) -> np.ndarray:
+        ats, poss = _actions_to_arrays(actions)
+        with self._lock:
+            cache = self._caches[kind]
+            c0, c1 = 0, width - 1
+            if cache.key == key:
+                changed = _changed_action_range(cache.ats, cache.poss, ats, poss)
+                if changed is None:
+                    return cache.image.copy()
+                c0, c1 = self._dirty_columns(kind, changed, ats, width, total_duration_s, simplified)
+                if (c1 - c0 + 1) > width * _INCREMENTAL_MAX_DIRTY_FRACTION:
+                    c0, c1 = 0, width - 1
+            if (c0, c1) == (0, width - 1) or cache.image is None:
+                c0, c1 = 0, width - 1
+                image = np.empty((key[2], width, 4), dtype=np.uint8)
+            else:
+                image = cache.image
+            draw_columns(image, c0, c1, ats, poss, total_duration_s, simplified)
+            cache.key, cache.ats, cache.poss, cache.image = key, ats, poss, image
+            return image.copy()
+
+    def _dirty_columns(self, kind: str, changed: Tuple[int, int], ats: np.ndarray, width: int,
+                       total_duration_s: float, simplified: bool) -> Tuple[int, int]:
+        p, s = changed
+        n = len(ats)
+        # Unchanged neighbours bound the edit; their columns are identical in both images
+        x = self._column_coords(ats[[max(p - 1, 0), min(n - s, n - 1)]], width, total_duration_s, simplified)
+        c0 = int(x[0]) if p > 0 else 0
+        # Heatmap columns past the last action reuse the colour of the last segment
+        tail_reused = kind == 'heatmap' and s <= 1
+        c1 = int(x[1]) if s > 0 and not tail_reused else width - 1
+        if simplified:
+            # Envelope polygon edges also cover the columns next to a changed span
+            c0, c1 = c0 - 1, c1 + 1
+        return max(0, min(c0, width - 1)), max(0, min(c1, width - 1))
+
+    # --- Coordinate mapping (matches the original per-mode rounding) ---
+    @staticmethod
+    def _column_coords(ats: np.ndarray, width: int, total_duration_s: float, simplified: bool) -> np.ndarray:
+        scaled = (ats / 1000.0 / total_duration_s) * (width - 1)
+        if simplified:
+            return np.round(scaled).astype(np.int64)
+        return np.clip(scaled.astype(np.int64), 0, width - 1)
+
+    @staticmethod
+    def _fill_timeline_background(image: np.ndarray):
+        image[:] = PREVIEW_BACKGROUND
+        if image.shape[0] > 0:
+            image[image.shape[0] // 2, :] = PREVIEW_CENTER_LINE
+
+    # --- Column renderers ---
+    def _draw_timeline_columns(self, image: np.ndarray, c0: int, c1: int, ats: np.ndarray, poss: np.ndarray,
+                               total_duration_s: float, simplified: bool):
+        region = image[:, c0:c1 + 1]
+        self._fill_timeline_background(region)
+        n = len(ats)
+        if n < 2:
+            return
+        height, width = image.shape[0], image.shape[1]
+        x = self._column_coords(ats, width, total_duration_s, simplified)
+
+        # The envelope polygon's edges reach one column into each neighbour, so its spans
+        # are computed one column past the redrawn range on both sides
+        lo, hi = (max(c0 - 1, 0), min(c1 + 1, width - 1)) if simplified else (c0, c1)
+
+        # Only segments that can touch [lo, hi] (actions are sorted by time)
+        if np.all(x[1:] >= x[:-1]):
+            i0 = max(int(np.searchsorted(x, lo, side='left')) - 1, 0)
+            i1 = min(int(np.searchsorted(x, hi, side='right')), n - 1)
+        else:
+            i0, i1 = 0, n - 1
+        if i1 <= i0:
+            return
+        x = x[i0:i1 + 1]
+        ncols = hi - lo + 1
+
+        if simplified:
+            y = np.round((1.0 - poss[i0:i1 + 1] / 100.0) * (height - 1)).astype(np.int64)
+            seg, cols, y_low, y_high = _expand_segment_columns(x[:-1], y[:-1], x[1:], y[1:], lo, hi, False)
+        else:
+            pos = (poss[i0:i1 + 1].astype(np.float32) / 100.0).astype(np.float32)
+            y = np.clip(((1.0 - pos) * height).astype(np.int64), 0, height - 1)
+            ats_s = ats[i0:i1 + 1] / 1000.0
+            dt = np.diff(ats_s)
+            dpos = np.abs(np.diff(pos * 100.0))
+            speeds = np.divide(dpos, dt, out=np.zeros_like(dpos), where=dt > 1e-6)
+            drawn = (x[:-1] != x[1:]) | (y[:-1] != y[1:])
+            keep = np.flatnonzero(drawn)
+            seg, cols, y_low, y_high = _expand_segment_columns(x[:-1][keep], y[:-1][keep], x[1:][keep],
+                                                               y[1:][keep], lo, hi, True)
+            seg = keep[seg]
+        if len(cols) == 0:
+            return
+
+        cols -= lo
+        y_min = np.full(ncols, height, dtype=np.int64)
+        y_max = np.full(ncols, -1, dtype=np.int64)
+        np.minimum.at(y_min, cols, y_low)
+        np.maximum.at(y_max, cols, y_high)
+        covered = np.flatnonzero(y_max >= 0)
+        if len(covered) == 0:
+            return
+
+        if simplified:
+            rgba = self.envelope_color(ENVELOPE_SPEED_PPS)
+            envelope = np.array([int(rgba[2] * 255), int(rgba[1] * 255), int(rgba[0] * 255), ENVELOPE_ALPHA],
+                                dtype=np.float32)
+            # Same polygon fill as the full-width envelope (min row forward, max row back), so
+            # the diagonal edges between columns are kept
+            polygon = np.concatenate((np.stack((covered, y_min[covered]), axis=1),
+                                      np.stack((covered, y_max[covered]), axis=1)[::-1])).astype(np.int32)
+            mask = np.zeros((height, ncols), dtype=np.uint8)
+            cv2.fillPoly(mask, [polygon], 1)
+            mask = mask[:, c0 - lo:c1 - lo + 1].astype(bool)
+            # 50% blend of the envelope over the background, as an overlay + addWeighted would
+            blended = np.rint(region.astype(np.float32) * 0.5 + envelope * 0.5).astype(np.uint8)
+            region[mask] = blended[mask]
+        else:
+            col_speed = np.full(ncols, -1.0, dtype=np.float32)
+            np.maximum.at(col_speed, cols, speeds[seg])
+            rgba = self.speed_colors_u8(col_speed[covered])
+            bgra = rgba[:, [2, 1, 0, 3]]
+            sub = region[:, covered]
+            _paint_spans(sub, y_min[covered], y_max[covered], bgra)
+            region[:, covered] = sub
+
+    def _draw_heatmap_columns(self, image: np.ndarray, c0: int, c1: int, ats: np.ndarray, poss: np.ndarray,
+                              total_duration_s: float, simplified: bool):
+        width = image.shape[1]
+        ats_s = ats / 1000.0
+        x_coords = np.clip(((ats_s / total_duration_s) * (width - 1)).astype(np.int32), 0, width - 1)
+        cols = np.arange(c0, c1 + 1, dtype=np.int32)
+        seg_idx_for_col = np.searchsorted(x_coords, cols, side='right') - 1
+        valid_mask = seg_idx_for_col >= 0
+        seg_idx_for_col = np.clip(seg_idx_for_col, 0, len(ats) - 2)
+
+        col_colors = np.zeros((len(cols), 4), dtype=np.uint8)
+        if np.any(valid_mask):
+            # Speeds and colours are only looked up for the segments these columns show
+            segs = seg_idx_for_col[valid_mask]
+            dt = ats_s[segs + 1] - ats_s[segs]
+            poss32 = poss.astype(np.float32)
+            dpos = np.abs(poss32[segs + 1] - poss32[segs])
+            speeds = np.divide(dpos, dt, out=np.zeros_like(dpos), where=dt > 1e-6)
+            col_colors[valid_mask] = self.speed_colors_u8(speeds)
+            col_colors[valid_mask, 3] = 255
+        image[:, c0:c1 + 1] = col_colors[np.newaxis, :, :]
@@ -21,6 +21,9 @@ class Stage2SignalEnhancer:
     - Add missing strokes (significant motion without Stage 2 signal change)
     - Reinforce weak signals during high motion periods
     - Smooth out temporal inconsistencies
+
+    Motion is measured on a grayscale, downscaled crop of the ROI that is written
+    into two alternating buffers, so no full-frame conversion or copy is made.
     """
     
     def __init__(self, 
@@ -29,6 +32,7 @@ class Stage2SignalEnhancer:
                  signal_change_threshold: int = 8,
                  history_window: int = 10,
                  enhancement_strength: float = 0.3,
+                 analysis_max_side: int = 160,
                  logger: Optional[logging.Logger] = None):
         """
         Initialize the Stage 2 signal enhancer.
@@ -39,12 +43,14 @@ class Stage2SignalEnhancer:
             signal_change_threshold: Minimum Stage 2 signal change to consider significant
             history_window: Number of frames to keep in motion history
             enhancement_strength: How much to adjust signals (0.0-1.0)
+            analysis_max_side: Longest side of the analysed ROI crop in pixels (0 = no downscaling)
             logger: Optional logger instance
         """
         self.motion_threshold_low = motion_threshold_low
         self.motion_threshold_high = motion_threshold_high  
         self.signal_change_threshold = signal_change_threshold
         self.enhancement_strength = enhancement_strength
+        self.analysis_max_side = analysis_max_side
         self.logger = logger or logging.getLogger(__name__)
         
         # Motion history tracking
@@ -52,9 +58,12 @@ class Stage2SignalEnhancer:
         self.signal_history: deque = deque(maxlen=history_window)
         self.enhanced_signal_history: deque = deque(maxlen=history_window)
         
-        # Frame storage for difference computation
-        self.prev_frame: Optional[np.ndarray] = None
+        # Frame storage for difference computation: the previous analysis crop lives in
+        # one of two buffers and the next crop is written into the other one
         self.prev_roi_frame: Optional[np.ndarray] = None
+        self._gray_buffer: Optional[np.ndarray] = None
+        self._analysis_buffers: List[Optional[np.ndarray]] = [None, None]
+        self._next_buffer = 0
         
         # Motion statistics for adaptive thresholding
         self.motion_stats = {
@@ -85,22 +94,11 @@ class Stage2SignalEnhancer:
         Returns:
             Enhanced Stage 2 signal (0-100 scale)
         """
-        # Convert to grayscale for motion analysis
-        current_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Use ROI if provided, otherwise use full frame
-        if roi:
-            x1, y1, x2, y2 = roi
-            current_roi = current_gray[y1:y2, x1:x2]
-            analysis_frame = current_roi
-        else:
-            analysis_frame = current_gray
-            current_roi = current_gray
+        analysis_frame = self._prepare_analysis_frame(frame, roi)
         
         # Initialize on first frame
-        if self.prev_frame is None:
-            self.prev_frame = current_gray.copy()
-            self.prev_roi_frame = current_roi.copy()
+        if self.prev_roi_frame is None:
+            self.prev_roi_frame = analysis_frame
             self.signal_history.append(stage2_signal)
             self.enhanced_signal_history.append(stage2_signal)
             self.last_enhanced_signal = stage2_signal
@@ -130,8 +128,7 @@ class Stage2SignalEnhancer:
         self.last_enhanced_signal = enhanced_signal
         
         # Update frame storage
-        self.prev_frame = current_gray.copy()
-        self.prev_roi_frame = current_roi.copy()
+        self.prev_roi_frame = analysis_frame
         
         # Log significant enhancements
         if abs(enhanced_signal - stage2_signal) > 3:
@@ -140,18 +137,45 @@ class Stage2SignalEnhancer:
         
         return enhanced_signal
     
+    def _prepare_analysis_frame(self, frame: np.ndarray, roi: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
+        """Grayscale crop of the ROI (or full frame), downscaled to analysis_max_side."""
+        crop = frame
+        if roi:
+            x1, y1, x2, y2 = roi
+            crop = frame[y1:y2, x1:x2]
+        if crop.size == 0:
+            crop = frame
+        
+        h, w = crop.shape[:2]
+        longest = max(h, w)
+        if self.analysis_max_side > 0 and longest > self.analysis_max_side:
+            scale = self.analysis_max_side / longest
+            size = (max(1, int(round(w * scale))), max(1, int(round(h * scale))))
+        else:
+            size = (w, h)
+        
+        out = self._analysis_buffers[self._next_buffer]
+        if out is None or out.shape != (size[1], size[0]):
+            out = np.empty((size[1], size[0]), dtype=np.uint8)
+            self._analysis_buffers[self._next_buffer] = out
+        self._next_buffer ^= 1
+        
+        if size == (w, h):
+            cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY, dst=out)
+            return out
+        if self._gray_buffer is None or self._gray_buffer.shape != (h, w):
+            self._gray_buffer = np.empty((h, w), dtype=np.uint8)
+        cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY, dst=self._gray_buffer)
+        cv2.resize(self._gray_buffer, size, dst=out, interpolation=cv2.INTER_AREA)
+        return out
+    
     def _calculate_motion_magnitude(self, current_frame: np.ndarray, prev_frame: np.ndarray) -> float:
         """Calculate motion magnitude using frame difference."""
-        if current_frame.shape != prev_frame.shape:
+        if current_frame.shape != prev_frame.shape or current_frame.size == 0:
             return 0.0
-            
-        # Frame difference
-        frame_diff = cv2.absdiff(current_frame, prev_frame)
-        
-        # Calculate magnitude as RMS of differences
-        motion_magnitude = np.sqrt(np.mean(frame_diff.astype(np.float32) ** 2))
         
-        return motion_magnitude
+        # Magnitude as RMS of the differences (L2 norm without a difference image)
+        return cv2.norm(current_frame, prev_frame, cv2.NORM_L2) / np.sqrt(current_frame.size)
     
     def _calculate_motion_vector(self, current_frame: np.ndarray, prev_frame: np.ndarray) -> Tuple[float, float]:
         """Calculate dominant motion vector using simple block matching."""
@@ -322,8 +346,8 @@ class Stage2SignalEnhancer:
         self.motion_history.clear()
         self.signal_history.clear()
         self.enhanced_signal_history.clear()
-        self.prev_frame = None
         self.prev_roi_frame = None
+        self._next_buffer = 0
         self.motion_stats = {'mean': 0.0, 'std': 1.0, 'max_recent': 0.0}
         self.last_enhanced_signal = None
         self.false_stroke_suppression_active = False
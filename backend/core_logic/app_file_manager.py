@@ -554,6 +554,7 @@ class AppFileManager:
 
         # Clear audio waveform data
         self.app.audio_waveform_data = None
+        self.app.audio_waveform_envelope = None
         self.app.app_state_ui.show_audio_waveform = False
 
         # If funscript was loaded from a file (not generated) and we are not clearing unconditionally, keep T1.
@@ -578,36 +579,28 @@ class AppFileManager:
         self.app.project_manager.project_dirty = True
 
     def load_stage2_overlay_data(self, filepath: str):
-        """Load Stage 2 overlay data (supports legacy list format and new dict with frames/segments/metadata)."""
+        """
+        Load Stage 2 overlay data (supports legacy list format and new dict with frames/segments/metadata).
+        Frames are not unpacked up front: the overlay is opened as an indexed, memory-mapped
+        Stage2OverlayStore that decodes frames on demand.
+        """
         self.clear_stage2_overlay_data()  # Clear previous before loading new
         stage_processor = self.app.stage_processor
         try:
-            with open(filepath, 'rb') as f:
-                packed_data = f.read()
-            loaded_data = msgpack.unpackb(packed_data, raw=False)
-
-            overlay_frames: list = []
-            overlay_segments: list = []
-
-            # New format: { "frames": [...], "segments": [...], "metadata": {...} }
-            if isinstance(loaded_data, dict) and ("frames" in loaded_data or "segments" in loaded_data):
-                overlay_frames = loaded_data.get("frames", []) or []
-                overlay_segments = loaded_data.get("segments", []) or []
-            # Legacy format: list of frame dicts
-            elif isinstance(loaded_data, list):
-                overlay_frames = loaded_data
-            else:
+            from detection.cd.stage_2_overlay_store import Stage2OverlayStore
+            try:
+                overlay_store = Stage2OverlayStore(filepath, logger=self.logger)
+            except ValueError as fmt_e:
                 stage_processor.stage2_status_text = "Error: Unsupported overlay format"
                 self.app.app_state_ui.show_stage2_overlay = False
-                self.logger.error("Stage 2 overlay data is not in expected dict/list format.")
+                self.logger.error(f"Stage 2 overlay data is not in expected dict/list format: {fmt_e}")
                 return
 
-            # Set overlay frames into processor structures
-            stage_processor.stage2_overlay_data = overlay_frames
-            stage_processor.stage2_overlay_data_map = {
-                frame_data.get("frame_id", -1): frame_data
-                for frame_data in overlay_frames if isinstance(frame_data, dict)
-            }
+            overlay_segments = overlay_store.read_section("segments", []) or []
+
+            # Set overlay frames into processor structures (the store serves both)
+            stage_processor.stage2_overlay_data = overlay_store
+            stage_processor.stage2_overlay_data_map = overlay_store
             self.stage2_output_msgpack_path = filepath
 
             # Load segments if present
@@ -617,10 +610,10 @@ class AppFileManager:
                 except Exception as seg_e:
                     self.logger.warning(f"Failed to parse overlay segments: {seg_e}")
 
-            if overlay_frames:
+            if overlay_store:
                 stage_processor.stage2_status_text = f"Overlay loaded: {os.path.basename(filepath)}"
                 self.logger.info(
-                    f"Loaded Stage 2 overlay: {os.path.basename(filepath)} ({len(overlay_frames)} frames)",
+                    f"Loaded Stage 2 overlay: {os.path.basename(filepath)} ({len(overlay_store)} frames)",
                     extra={'status_message': True})
                 self.app.app_state_ui.show_stage2_overlay = True
             else:
@@ -637,6 +630,9 @@ class AppFileManager:
 
     def clear_stage2_overlay_data(self):
         stage_processor = self.app.stage_processor
+        overlay_store = stage_processor.stage2_overlay_data_map
+        if overlay_store is not None and hasattr(overlay_store, 'close'):
+            overlay_store.close()
         stage_processor.stage2_overlay_data = None
         stage_processor.stage2_overlay_data_map = None
         self.stage2_output_msgpack_path = None  # Clear path if data is cleared
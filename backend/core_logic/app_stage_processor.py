@@ -18,10 +18,14 @@ from application.utils.checkpoint_manager import (
 from application.gui_components.dynamic_tracker_ui import get_dynamic_tracker_ui
 
 from detection.cd.data_structures.segments import Segment
-import detection.cd.stage_1_cd as stage1_module
-import detection.cd.stage_2_cd as stage2_module
-import detection.cd.stage_3_of_processor as stage3_module
-import detection.cd.stage_3_mixed_processor as stage3_mixed_module
+from common.lazy_import import lazy_import
+from common.telemetry import get_telemetry
+
+# Stage pipelines (OpenCV, SciPy, model runtimes) are loaded on first use, not at startup
+stage1_module = lazy_import("detection.cd.stage_1_cd")
+stage2_module = lazy_import("detection.cd.stage_2_cd")
+stage3_module = lazy_import("detection.cd.stage_3_of_processor")
+stage3_mixed_module = lazy_import("detection.cd.stage_3_mixed_processor")
 
 from config import constants
 from config.constants import ChapterSource, ChapterSegmentType
@@ -52,6 +56,8 @@ class AppStageProcessor:
         self.stage_thread: Optional[threading.Thread] = None
         self.stop_stage_event = multiprocessing.Event()
         self.gui_event_queue = Queue()
+        # Set while Stage 1 inference workers are kept alive for the next batch video
+        self.stage1_worker_pool_active: bool = False
 
         # --- Status and Progress Tracking ---
         self.reset_stage_status(stages=("stage1", "stage2", "stage3"))
@@ -63,11 +69,13 @@ class AppStageProcessor:
         self.force_rerun_stage2_segmentation: bool = False
 
         # --- Stage 2 Overlay Data ---
-        self.stage2_overlay_data: Optional[List[Dict]] = None
-        self.stage2_overlay_data_map: Optional[Dict[int, Dict]] = None
+        # Both hold the Stage2OverlayStore of the loaded overlay (frames decoded on demand)
+        self.stage2_overlay_data = None
+        self.stage2_overlay_data_map = None
 
         # --- Fallback Constants ---
-        self.S2_TOTAL_MAIN_STEPS_FALLBACK = getattr(stage2_module, 'ATR_PASS_COUNT', 6)
+        # Not read from stage2_module here: that would import the Stage 2 pipeline at startup
+        self.S2_TOTAL_MAIN_STEPS_FALLBACK = 6
 
         self.refinement_analysis_active: bool = False
         self.refinement_thread: Optional[threading.Thread] = None
@@ -630,6 +638,8 @@ class AppStageProcessor:
         # Handle both string (new dynamic system) and enum (legacy) modes
         mode_name = selected_mode if isinstance(selected_mode, str) else selected_mode.name
         self.logger.info(f"[Thread] Using processing mode: {mode_name}")
+        telemetry = get_telemetry()
+        analysis_span = telemetry.span("analysis", mode=mode_name, video=os.path.basename(fm.video_path or ""))
 
         try:
             # --- Stage 1 ---
@@ -681,13 +691,15 @@ class AppStageProcessor:
                         "message": f"Using cached preprocessed video: {os.path.basename(preprocessed_path_for_s3)}"
                     }, None))
             else:
-                stage1_results = self._execute_stage1_logic(
-                    frame_range=frame_range_for_s1,
-                    output_path=target_s1_path,
-                    num_producers_override=getattr(self, 'override_producers', None),
-                    num_consumers_override=getattr(self, 'override_consumers', None),
-                    is_autotune_run=is_autotune_context
-                )
+                with telemetry.span("stage1") as stage_span:
+                    stage1_results = self._execute_stage1_logic(
+                        frame_range=frame_range_for_s1,
+                        output_path=target_s1_path,
+                        num_producers_override=getattr(self, 'override_producers', None),
+                        num_consumers_override=getattr(self, 'override_consumers', None),
+                        is_autotune_run=is_autotune_context
+                    )
+                    stage_span.set(success=stage1_results.get("success", False))
                 stage1_success = stage1_results.get("success", False)
                 preprocessed_path_for_s3 = stage1_results.get("preprocessed_video_path")
 
@@ -759,11 +771,13 @@ class AppStageProcessor:
             is_s1_data_source_ranged = (frame_range_for_s1 is not None)
 
             s2_start_time = time.time()
-            stage2_run_results = self._execute_stage2_logic(
-                s2_overlay_output_path=s2_overlay_path,
-                generate_funscript_actions=generate_s2_funscript_actions,
-                is_ranged_data_source=is_s1_data_source_ranged
-            )
+            with telemetry.span("stage2") as stage_span:
+                stage2_run_results = self._execute_stage2_logic(
+                    s2_overlay_output_path=s2_overlay_path,
+                    generate_funscript_actions=generate_s2_funscript_actions,
+                    is_ranged_data_source=is_s1_data_source_ranged
+                )
+                stage_span.set(success=stage2_run_results.get("success", False))
             s2_end_time = time.time()
             stage2_success = stage2_run_results.get("success", False)
 
@@ -842,7 +856,9 @@ class AppStageProcessor:
 
                 self.logger.info(f"Starting Mixed Stage 3 with {preprocessed_path_for_s3}.")
 
-                s3_results_dict = self._execute_stage3_mixed_module(segments_for_s3, preprocessed_path_for_s3, s2_output_data)
+                with telemetry.span("stage3", variant="mixed") as stage_span:
+                    s3_results_dict = self._execute_stage3_mixed_module(segments_for_s3, preprocessed_path_for_s3, s2_output_data)
+                    stage_span.set(success=s3_results_dict is not None)
                 stage3_success = s3_results_dict is not None
 
                 if stage3_success:
@@ -899,10 +915,13 @@ class AppStageProcessor:
 
                 self.logger.info(f"Starting Stage 3 with {preprocessed_path_for_s3}.")
 
-                if self._is_mixed_stage3_tracker(selected_mode):
-                    s3_results_dict = self._execute_stage3_mixed_module(segments_for_s3, preprocessed_path_for_s3, s2_output_data)
-                else:
-                    s3_results_dict = self._execute_stage3_optical_flow_module(segments_for_s3, preprocessed_path_for_s3)
+                is_mixed_stage3 = self._is_mixed_stage3_tracker(selected_mode)
+                with telemetry.span("stage3", variant="mixed" if is_mixed_stage3 else "optical_flow") as stage_span:
+                    if is_mixed_stage3:
+                        s3_results_dict = self._execute_stage3_mixed_module(segments_for_s3, preprocessed_path_for_s3, s2_output_data)
+                    else:
+                        s3_results_dict = self._execute_stage3_optical_flow_module(segments_for_s3, preprocessed_path_for_s3)
+                    stage_span.set(success=s3_results_dict is not None)
                 stage3_success = s3_results_dict is not None
 
                 if stage3_success:
@@ -965,6 +984,7 @@ class AppStageProcessor:
                     self.gui_event_queue.put(("analysis_message", completion_payload, None))
 
         finally:
+            analysis_span.end(stage1=stage1_success, stage2=stage2_success, stage3=stage3_success)
             self.full_analysis_active = False
             self.current_analysis_stage = 0
             self.frame_range_override = None
@@ -1124,8 +1144,16 @@ class AppStageProcessor:
                 output_filename_override=output_path,
                 save_preprocessed_video_arg=self.save_preprocessed_video,
                 preprocessed_video_path_arg=preprocessed_video_path if self.save_preprocessed_video else None,
-                is_autotune_run_arg=is_autotune_run
+                is_autotune_run_arg=is_autotune_run,
+                consumer_batch_size_arg=self.app_settings.get("stage1_consumer_batch_size", 1),
+                decode_threads_arg=self.app_settings.get("stage1_decode_threads", 0),
+                keep_worker_pool_arg=self.app.is_batch_processing_active and not is_autotune_run,
+                pose_max_staleness_arg=self.app_settings.get("stage1_pose_max_staleness_s",
+                                                             constants.DEFAULT_S1_POSE_MAX_STALENESS_S),
+                static_skip_threshold_arg=self.app_settings.get("stage1_static_skip_threshold",
+                                                                constants.DEFAULT_S1_STATIC_SKIP_THRESHOLD)
             )
+            self.stage1_worker_pool_active = self.app.is_batch_processing_active and not is_autotune_run
             if self.stop_stage_event.is_set():
                 self.gui_event_queue.put(("stage1_status_update", "S1 Aborted by user.", "Aborted"))
                 self.gui_event_queue.put(
@@ -1593,6 +1621,11 @@ class AppStageProcessor:
 
             range_is_active, range_start_frame, range_end_frame = self.app.funscript_processor.get_effective_scripting_range()
 
+            # A displayed overlay keeps its file memory-mapped; release it before Stage 2 rewrites that file
+            if s2_overlay_output_path and fm.stage2_output_msgpack_path and \
+                    os.path.abspath(fm.stage2_output_msgpack_path) == os.path.abspath(s2_overlay_output_path):
+                fm.clear_stage2_overlay_data()
+
             self.logger.info("Using Stage 2 implementation")
             stage2_results = stage2_module.perform_contact_analysis(
                 video_path_arg=fm.video_path,
@@ -2242,6 +2275,12 @@ class AppStageProcessor:
             except Exception as e:
                 self.logger.error(f"Error processing GUI event in AppLogic's StageProcessor: {e}", exc_info=True)
 
+    def release_stage1_worker_pool(self):
+        """Stops the Stage 1 inference workers kept alive between batch videos."""
+        if self.stage1_worker_pool_active:
+            self.stage1_worker_pool_active = False
+            stage1_module.shutdown_stage1_inference_pool()
+
     def shutdown_app_threads(self):
         self.stop_stage_event.set()
         if self.stage_thread and self.stage_thread.is_alive():
@@ -2252,6 +2291,7 @@ class AppStageProcessor:
             else:
                 self.logger.info("App stage processing thread finished.", extra={'status_message': False})
         self.stage_thread = None
+        self.release_stage1_worker_pool()
 
     # REFACTORED replaces duplicate code in __init__ and deals with edge cases (ie 'None' values)
     def _is_stage3_tracker(self, tracker_name):
@@ -10,5 +10,6 @@ __all__ = [
     'HTTPClientManager',
     'TempManager',
     'Result',
-    'FunGenException'
+    'FunGenException',
+    'lazy_import'
 ]
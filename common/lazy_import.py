@@ -0,0 +1,36 @@
+"""
+Lazy module imports.
+
+Heavy modules (OpenCV, SciPy, the Stage 1-3 pipelines and their model
+dependencies) are only needed once a stage actually runs. ``lazy_import``
+returns a module object that executes on first attribute access, so callers
+can keep module-level names without paying the import cost at startup.
+"""
+
+import sys
+import importlib
+import importlib.util
+from types import ModuleType
+
+
+def lazy_import(module_name: str) -> ModuleType:
+    """
+    Return ``module_name`` as a lazily-executed module.
+
+    If the module is already imported, the real module is returned. Otherwise
+    the module is registered in ``sys.modules`` and executed on first attribute
+    access (``importlib.util.LazyLoader``). Truthiness checks do not trigger loading.
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"No module named {module_name!r}")
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,319 @@
+"""
+In-process telemetry: timed spans, counters and histograms.
+
+Spans are named after what they time ("stage2.pass_3_kalman_and_lock_state",
+"stage3.chunk") and nest per thread, so every record knows its parent span.
+Finished spans and events go to a bounded ring buffer that is appended to a
+JSON Lines file whenever enough records have accumulated and on flush().
+Counters and histograms (span durations are recorded as a histogram too) can be
+written as a Prometheus text exposition file, e.g. for node_exporter's textfile
+collector.
+
+Telemetry is disabled unless an export path is configured; a disabled span()
+returns a shared no-op object. Configuration is passed to worker processes
+through environment variables, so Stage 1-3 workers append their own records
+to the same JSON Lines file. Only the configuring process writes the
+Prometheus file.
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+TELEMETRY_JSONL_ENV = "FUNGEN_TELEMETRY_JSONL"
+TELEMETRY_PROMETHEUS_ENV = "FUNGEN_TELEMETRY_PROM"
+
+RING_BUFFER_SIZE = 8192
+FLUSH_THRESHOLD = 512
+METRIC_PREFIX = "fungen_"
+# Seconds; wide enough for per-chunk work and whole stages
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0)
+
+_METRIC_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class _NullSpan:
+    """Returned by a disabled Telemetry; accepts the Span API and records nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def end(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed section. Use as a context manager, or call end() once."""
+
+    __slots__ = ("_telemetry", "name", "attrs", "parent", "_start_wall", "_start", "_ended")
+
+    def __init__(self, telemetry: "Telemetry", name: str, attrs: Dict[str, Any]):
+        self._telemetry = telemetry
+        self.name = name
+        self.attrs = attrs
+        stack = telemetry._span_stack()
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self._start_wall = time.time()
+        self._start = time.perf_counter()
+        self._ended = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(error=exc_type.__name__ if exc_type is not None else None)
+        return False
+
+    def set(self, **attrs):
+        """Adds attributes to the span record."""
+        self.attrs.update(attrs)
+
+    def end(self, **attrs):
+        if self._ended:
+            return
+        self._ended = True
+        duration = time.perf_counter() - self._start
+        stack = self._telemetry._span_stack()
+        if self in stack:
+            stack.remove(self)
+        if attrs.get("error") is None:
+            attrs.pop("error", None)
+        self.attrs.update(attrs)
+        self._telemetry._finish_span(self, duration)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class Telemetry:
+    """Collects spans, counters and histograms of one process."""
+
+    def __init__(self, jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+                 capacity: int = RING_BUFFER_SIZE):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.enabled = bool(jsonl_path or prometheus_path)
+        # Unflushed records when a JSON Lines file is configured, else the most recent ones
+        self._records: deque = deque(maxlen=capacity)
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], _Histogram] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = os.getpid()
+
+    def _span_stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    # --- Recording ---
+
+    def span(self, name: str, **attrs):
+        """Starts a span; use ``with telemetry.span(...)`` or keep it and call ``end()``."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs)
+
+    def count(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = DURATION_BUCKETS, **labels):
+        """Adds a sample to a histogram."""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(tuple(buckets))
+            histogram.observe(value)
+
+    def event(self, name: str, **attrs):
+        """Records a point-in-time event."""
+        if not self.enabled:
+            return
+        record = {"type": "event", "name": name, "ts": time.time(), "pid": self._pid}
+        record.update(attrs)
+        self._append(record)
+
+    def _finish_span(self, span: Span, duration: float):
+        record = {"type": "span", "name": span.name, "parent": span.parent, "ts": span._start_wall,
+                  "duration_s": round(duration, 6), "pid": self._pid, "thread": threading.current_thread().name}
+        record.update(span.attrs)
+        self.observe("span_duration_seconds", duration, span=span.name)
+        self._append(record)
+
+    def _append(self, record: Dict[str, Any]):
+        with self._lock:
+            self._records.append(record)
+            flush_now = self.jsonl_path is not None and len(self._records) >= FLUSH_THRESHOLD
+        if flush_now:
+            self.flush()
+
+    # --- Export ---
+
+    def recent(self) -> List[Dict[str, Any]]:
+        """Records held in the ring buffer (those not flushed yet, if a file is configured)."""
+        with self._lock:
+            return list(self._records)
+
+    def flush(self):
+        """Appends buffered records to the JSON Lines file."""
+        if not self.jsonl_path:
+            return
+        with self._lock:
+            records = list(self._records)
+            self._records.clear()
+        if not records:
+            return
+        data = "".join(json.dumps(r, default=str) + "\n" for r in records).encode("utf-8")
+        try:
+            # A single unbuffered append per flush keeps lines of concurrent worker processes whole
+            with open(self.jsonl_path, "ab", buffering=0) as f:
+                f.write(data)
+        except OSError:
+            pass
+
+    def export_prometheus(self, path: Optional[str] = None):
+        """Writes counters and histograms in the Prometheus text format (atomically)."""
+        path = path or self.prometheus_path
+        if not path:
+            return
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(h.counts), h.total, h.count, h.bounds) for key, h in self._histograms.items()}
+
+        lines = []
+        for metric in sorted({name for name, _ in counters}):
+            metric_name = _metric_name(metric) + "_total"
+            lines.append(f"# TYPE {metric_name} counter")
+            for (name, labels), value in sorted(counters.items()):
+                if name == metric:
+                    lines.append(f"{metric_name}{_format_labels(labels)} {_format_value(value)}")
+        for metric in sorted({name for name, _ in histograms}):
+            metric_name = _metric_name(metric)
+            lines.append(f"# TYPE {metric_name} histogram")
+            for (name, labels), (counts, total, count, bounds) in sorted(histograms.items()):
+                if name != metric:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(bounds, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{metric_name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {cumulative}")
+                lines.append(f"{metric_name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{metric_name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{metric_name}_count{_format_labels(labels)} {count}")
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def close(self):
+        self.flush()
+        self.export_prometheus()
+
+
+def _metric_name(name: str) -> str:
+    return METRIC_PREFIX + _METRIC_NAME_RE.sub("_", name)
+
+
+def _format_labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{_METRIC_NAME_RE.sub("_", str(key))}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+_telemetry: Optional[Telemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def _is_main_process() -> bool:
+    import multiprocessing
+    return multiprocessing.parent_process() is None
+
+
+def get_telemetry() -> Telemetry:
+    """Returns the process-wide Telemetry, configured from the environment on first use."""
+    global _telemetry
+    if _telemetry is None:
+        with _telemetry_lock:
+            if _telemetry is None:
+                prometheus_path = os.environ.get(TELEMETRY_PROMETHEUS_ENV) if _is_main_process() else None
+                _telemetry = Telemetry(os.environ.get(TELEMETRY_JSONL_ENV) or None, prometheus_path or None)
+                if _telemetry.enabled:
+                    atexit.register(_telemetry.close)
+    return _telemetry
+
+
+def configure_telemetry(jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None) -> Telemetry:
+    """
+    Enables telemetry for this process and for worker processes started afterwards.
+    Replaces (and flushes) a previously configured instance.
+    """
+    global _telemetry
+    jsonl_path = os.path.abspath(jsonl_path) if jsonl_path else None
+    prometheus_path = os.path.abspath(prometheus_path) if prometheus_path else None
+    for env_name, value in ((TELEMETRY_JSONL_ENV, jsonl_path), (TELEMETRY_PROMETHEUS_ENV, prometheus_path)):
+        if value:
+            os.environ[env_name] = value
+        else:
+            os.environ.pop(env_name, None)
+
+    with _telemetry_lock:
+        previous, _telemetry = _telemetry, Telemetry(jsonl_path, prometheus_path)
+        if _telemetry.enabled:
+            atexit.register(_telemetry.close)
+    if previous is not None and previous.enabled:
+        previous.close()
+        atexit.unregister(previous.close)
+    return _telemetry
@@ -115,6 +115,18 @@ class TempManager:
         """
         return self.video_cache / f"{video_hash}.{extension}"
 
+    def get_app_cache_path(self, filename: str) -> Path:
+        """
+        Get path for an app-wide cache file (kept out of age-based cleanup).
+
+        Args:
+            filename: Cache file name
+
+        Returns:
+            Path to the cache file in the base directory
+        """
+        return self.base_dir / filename
+
     def cleanup_old_files(self, max_age_days: int = 7, dry_run: bool = False):
         """
         Clean up old temp files.
@@ -4,11 +4,6 @@ import enum
 from typing import Dict, List, Tuple, Any
 from enum import Enum, auto
 
-# Attempt to import torch for device detection, but fail gracefully if it's not available.
-try:
-    import torch
-except ImportError:
-    torch = None
 
 ####################################################################################################
 # META & VERSIONING
@@ -31,6 +26,7 @@ CONFIG_VERSION = 1
 ####################################################################################################
 SETTINGS_FILE = "settings.json"
 AUTOSAVE_FILE = "autosave.fgnstate"
+TRACKER_DISCOVERY_MANIFEST_FILE = "tracker_discovery_manifest.json"  # In the app cache directory (common.temp_manager)
 DEFAULT_AUTOSAVE_INTERVAL_SECONDS = 300
 
 # --- Logging Configuration ---
@@ -60,12 +56,18 @@ INTERNET_TEST_HOSTS = [
 ####################################################################################################
 # Determines the compute device for ML models (e.g., 'cuda', 'mps', 'cpu').
 # This is detected once and used by both Stage 1 and the live tracker.
-DEVICE = 'cpu'
-if torch:
+# Resolved lazily (see __getattr__ at the end of this module) so importing config does not import torch.
+def _detect_device() -> str:
+    # Attempt to import torch for device detection, but fail gracefully if it's not available.
+    try:
+        import torch
+    except ImportError:
+        return 'cpu'
     if platform.machine() == 'arm64' and platform.system() == 'Darwin':
-        DEVICE = 'mps'
-    elif torch.cuda.is_available():
-        DEVICE = 'cuda'
+        return 'mps'
+    if torch.cuda.is_available():
+        return 'cuda'
+    return 'cpu'
 
 # The side length of the square input image for the YOLO model.
 YOLO_INPUT_SIZE = 640
@@ -85,6 +87,12 @@ class ProcessingSpeedMode(Enum):
     SLOW_MOTION = "Slow-mo"
     MAX_SPEED = "Max Speed"
 
+# Live processing pipeline (decode-ahead -> tracking -> presentation)
+LIVE_DECODE_AHEAD_FRAMES = 8  # Decoded frames buffered ahead of the tracker
+LIVE_PRESENT_QUEUE_FRAMES = 2  # Tracked frames waiting for presentation
+LIVE_REALTIME_DROP_LATE_FRAMES = True  # Real Time mode: skip frames the tracker can no longer make in time
+LIVE_REALTIME_MAX_LAG_S = 0.5  # Real Time mode: re-sync the clock instead of catching up beyond this lag
+
 
 ####################################################################################################
 # UI COLORS (Toolbar button states)
@@ -409,6 +417,25 @@ MOTION_INVERSION_THRESHOLD = 1.2
 STAGE1_FRAME_QUEUE_MAXSIZE = 99
 DEFAULT_S1_NUM_PRODUCERS = 1
 DEFAULT_S1_NUM_CONSUMERS = max(os.cpu_count() // 2, 1) if os.cpu_count() else 2
+DEFAULT_S1_CONSUMER_BATCH_SIZE = 1
+DEFAULT_S1_DECODE_THREADS = 0  # 0 = let FFmpeg decide
+DEFAULT_S1_POSE_MAX_STALENESS_S = 2.0  # Pose is re-run at least this often (seconds of video)
+STAGE1_POSE_LAYOUT_MIN_IOU = 0.5  # A detection box overlapping its pose-time box less than this re-runs pose
+# Static-scene skipping (opt-in experiment): mean absolute difference (0-255) of frame thumbnails below
+# which a frame reuses the detections of the last inferred frame. No threshold has been validated
+# against full runs yet, so it stays off (0 = every frame is inferred) unless set in the settings.
+DEFAULT_S1_STATIC_SKIP_THRESHOLD = 0.0
+STAGE1_STATIC_SIGNATURE_SIZE = 32  # Thumbnail side in pixels
+STAGE1_STATIC_SKIP_MAX_CARRY_S = 1.0  # A frame is inferred at least this often (seconds of video)
+FFMPEG_CAPABILITIES_FILE = "ffmpeg_capabilities.json"
+
+# --- Stage 1 Autotuner (micro-benchmark) ---
+STAGE1_PROFILES_FILE = "stage1_profiles.json"
+AUTOTUNER_DECODE_SAMPLE_FRAMES = 120
+AUTOTUNER_INFERENCE_SAMPLE_FRAMES = 32
+AUTOTUNER_BATCH_SIZES = (1, 2, 4, 8)
+AUTOTUNER_DECODE_THREAD_OPTIONS = (0, 1, 2, 4)
+AUTOTUNER_MAX_PRODUCERS = 4
 
 
 ####################################################################################################
@@ -437,6 +464,10 @@ S2_PENIS_INTERPOLATION_MAX_GAP_FRAMES = 30
 S2_LOCKED_PENIS_EXTENDED_INTERPOLATION_MAX_FRAMES = 180
 S2_CONTACT_EXTENDED_INTERPOLATION_MAX_FRAMES = 5
 S2_CONTACT_OPTICAL_FLOW_MAX_GAP_FRAMES = 20
+# OF gap recovery: gaps whose anchors are this close are served by one forward decode instead of a new seek
+S2_OF_RECOVERY_BRIDGE_FRAMES = 90
+# Upper bound on the frames covered by one forward decode, so work still spreads across workers
+S2_OF_RECOVERY_MAX_SPAN_FRAMES = 1800
 S2_PENIS_LENGTH_SMOOTHING_WINDOW = 15
 S2_PENIS_ABSENCE_THRESHOLD_FOR_HEIGHT_RESET = 180
 S2_RTS_WINDOW_PADDING = 20
@@ -657,3 +688,12 @@ FILTER_BOXES_AREA_TO_LOCKED_CONST = {
 FILTER_BOXES_AREA_TO_LOCKED_MIN_CONST = {"foot": 1}
 CENTER_SCREEN_CONST = 320  # Assuming YOLO input size of 640 / 2. Should be dynamic.
 CENTER_SCREEN_FOCUS_AREA_CONST = 320  # Example, make dynamic or pass based on yolo_input_size
+
+
+def __getattr__(name):
+    # Lazy module attributes (PEP 562): DEVICE needs torch, which is expensive to import.
+    if name == 'DEVICE':
+        value = _detect_device()
+        globals()['DEVICE'] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,32 @@
 """
 Detection CD package initialization.
+
+Exports are resolved lazily: importing a data structure from this package
+must not import the Stage 1/2 pipelines (OpenCV, SciPy, model runtimes).
 """
 
-from .stage_1_cd import FFmpegEncoder, Stage1QueueMonitor
-from .stage_2_cd import BaseSegment, BoxRecord, PoseRecord
-from .data_structures import FrameObject, LockedPenisState, Segment
-from .stage_2_sqlite_storage import Stage2SQLiteStorage 
\ No newline at end of file
+import importlib
+
+_LAZY_EXPORTS = {
+    "FFmpegEncoder": ".stage_1_cd",
+    "Stage1QueueMonitor": ".stage_1_cd",
+    "BaseSegment": ".data_structures",
+    "BoxRecord": ".data_structures",
+    "PoseRecord": ".data_structures",
+    "FrameObject": ".data_structures",
+    "LockedPenisState": ".data_structures",
+    "Segment": ".data_structures",
+    "Stage2SQLiteStorage": ".stage_2_sqlite_storage",
+    "Stage2OverlayStore": ".stage_2_overlay_store",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -94,13 +94,15 @@ class FrameObject:
             
         raw_detections = raw_frame_data.get("detections", [])
         raw_poses = raw_frame_data.get("poses", [])
+        # Stage 1 copies detections into near-duplicate ("carried") frames without running the model
+        box_status = constants.STATUS_INTERPOLATED if raw_frame_data.get("carried") else constants.STATUS_DETECTED
         
         for det_data in raw_detections:
             if det_data.get('class_name') in self._effective_discard_classes:
                 continue
             self.boxes.append(
                 BoxRecord(self.frame_id, det_data.get('bbox'), det_data.get('confidence'), det_data.get('class'),
-                          det_data.get('class_name'), yolo_input_size=self.yolo_input_size))
+                          det_data.get('class_name'), status=box_status, yolo_input_size=self.yolo_input_size))
                           
         for pose_data in raw_poses:
             self.poses.append(PoseRecord(self.frame_id, pose_data.get('bbox'), pose_data.get('keypoints')))
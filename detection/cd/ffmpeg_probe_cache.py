@@ -0,0 +1,234 @@
+"""
+Cached FFmpeg probes shared by the Stage 1/2/3 pipelines.
+
+Two kinds of results are cached here:
+
+* Encoder capabilities of an ffmpeg binary (its HEVC encoders and which hardware
+  encoders actually initialise). They are stored in ``ffmpeg_capabilities.json``
+  together with the binary's version line, keyed by its resolved path, size and
+  mtime, so a probe only runs again after ffmpeg is replaced or upgraded.
+* One ffprobe record per preprocessed video, stored next to it as
+  ``<video>.probe.json`` and tied to the file's size and mtime. Every stage reads
+  the same record, so a preprocessed file is probed once after it is written.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from config import constants
+from common.temp_manager import get_temp_manager
+
+CAPABILITIES_FORMAT_VERSION = 1
+PROBE_RECORD_VERSION = 1
+PROBE_RECORD_SUFFIX = ".probe.json"
+
+# (codec, display name) of the hardware encoders tested with a real encode
+HW_ENCODER_PROBES = (
+    ("hevc_nvenc", "NVENC (NVIDIA)"),
+    ("hevc_amf", "AMF (AMD)"),
+    ("hevc_qsv", "QSV (Intel)"),
+    ("hevc_vaapi", "VAAPI (Linux)"),
+)
+
+_lock = threading.Lock()
+_capabilities_memo: Dict[str, Dict[str, Any]] = {}
+_probe_memo: Dict[str, Dict[str, Any]] = {}
+
+
+def _creation_flags() -> int:
+    # Windows fix: prevent terminal windows from spawning
+    return subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+
+
+def _atomic_write_json(path: str, data: Any):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _binary_identity(ffmpeg_path: str) -> Optional[Dict[str, Any]]:
+    resolved = shutil.which(ffmpeg_path) or ffmpeg_path
+    try:
+        st = os.stat(resolved)
+    except OSError:
+        return None
+    return {"path": os.path.abspath(resolved), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_version_line(ffmpeg_path: str) -> str:
+    try:
+        output = subprocess.check_output([ffmpeg_path, "-hide_banner", "-version"], stderr=subprocess.STDOUT,
+                                         text=True, timeout=5, creationflags=_creation_flags())
+    except Exception:
+        return ""
+    return output.splitlines()[0].strip() if output else ""
+
+
+def _probe_capabilities(ffmpeg_path: str, logger: logging.Logger) -> Dict[str, Any]:
+    try:
+        output = subprocess.check_output([ffmpeg_path, "-hide_banner", "-encoders"], stderr=subprocess.PIPE,
+                                         text=True, timeout=10, creationflags=_creation_flags())
+    except Exception as e:
+        logger.warning(f"Failed to query FFmpeg encoders: {e}")
+        return {"encoders": [], "devices": [], "complete": False}
+
+    encoders = sorted({token for line in output.splitlines() for token in line.split()
+                       if token.startswith("hevc_") or token == "libx265"})
+
+    devices = []
+    for encoder_codec, encoder_name in HW_ENCODER_PROBES:
+        if encoder_codec not in encoders:
+            continue
+        # A few frames are enough to know whether the device initialises
+        try:
+            subprocess.run([ffmpeg_path, "-hide_banner", "-f", "lavfi", "-i", "testsrc=size=256x256:rate=30",
+                            "-frames:v", "5", "-c:v", encoder_codec, "-f", "null", "-"],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, timeout=10,
+                           check=True, creationflags=_creation_flags())
+            devices.append({"codec": encoder_codec, "name": encoder_name, "ok": True})
+        except subprocess.CalledProcessError:
+            devices.append({"codec": encoder_codec, "name": encoder_name, "ok": False})
+        except Exception:
+            pass
+    return {"encoders": encoders, "devices": devices, "complete": True}
+
+
+def get_encoder_capabilities(ffmpeg_path: str = "ffmpeg", logger: Optional[logging.Logger] = None,
+                             cache_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Returns {"version", "encoders", "devices"} for the given ffmpeg binary, probing
+    it only when no cached entry matches its path, size and mtime. The cache file
+    defaults to FFMPEG_CAPABILITIES_FILE in the app cache directory.
+    """
+    logger = logger or logging.getLogger(__name__)
+    if cache_path is None:
+        cache_path = str(get_temp_manager().get_app_cache_path(constants.FFMPEG_CAPABILITIES_FILE))
+    identity = _binary_identity(ffmpeg_path)
+    if identity is None:
+        key = ffmpeg_path
+    else:
+        key = hashlib.sha1(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    with _lock:
+        cached = _capabilities_memo.get(key)
+        if cached is not None:
+            return cached
+
+        entries = {}
+        if identity is not None:
+            try:
+                with open(cache_path, "r") as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == CAPABILITIES_FORMAT_VERSION:
+                    entries = data.get("binaries", {})
+            except (OSError, ValueError):
+                pass
+            cached = entries.get(key)
+            if cached is not None:
+                _capabilities_memo[key] = cached
+                return cached
+
+        logger.info(f"Probing FFmpeg encoder capabilities: {ffmpeg_path}")
+        capabilities = _probe_capabilities(ffmpeg_path, logger)
+        complete = capabilities.pop("complete")
+        capabilities["version"] = _read_version_line(ffmpeg_path)
+        # Failed probes are not persisted so a transient error is retried next run
+        if identity is not None and complete:
+            entries[key] = dict(capabilities, binary=identity)
+            try:
+                _atomic_write_json(cache_path, {"version": CAPABILITIES_FORMAT_VERSION, "binaries": entries})
+            except OSError as e:
+                logger.warning(f"Could not save FFmpeg capabilities cache: {e}")
+        _capabilities_memo[key] = capabilities
+        return capabilities
+
+
+def get_probe_record_path(video_path: str) -> str:
+    return video_path + PROBE_RECORD_SUFFIX
+
+
+def _run_ffprobe(video_path: str) -> Optional[Dict[str, Any]]:
+    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+           '-show_entries', 'stream=nb_frames,duration,r_frame_rate',
+           '-show_entries', 'format=duration',
+           '-of', 'json', video_path]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10,
+                            creationflags=_creation_flags())
+    if result.returncode != 0:
+        return None
+    data = json.loads(result.stdout)
+    return {
+        "stream": (data.get('streams') or [{}])[0],
+        "format": data.get('format', {}),
+    }
+
+
+def get_video_probe_record(video_path: str, persist: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Returns the cached ffprobe result ({"stream": ..., "format": ...}) for a video,
+    running ffprobe only if the file changed since the record was written.
+    Returns None if the file is missing or ffprobe fails.
+    """
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None
+    key = os.path.abspath(video_path)
+    record_path = get_probe_record_path(video_path)
+
+    with _lock:
+        record = _probe_memo.get(key)
+    if record is None and persist:
+        try:
+            with open(record_path, "r") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            record = None
+    if (isinstance(record, dict) and record.get("version") == PROBE_RECORD_VERSION
+            and record.get("source_size") == st.st_size and record.get("source_mtime_ns") == st.st_mtime_ns):
+        with _lock:
+            _probe_memo[key] = record
+        return record
+
+    probe = _run_ffprobe(video_path)
+    if probe is None:
+        return None
+    record = dict(probe, version=PROBE_RECORD_VERSION, source_size=st.st_size, source_mtime_ns=st.st_mtime_ns)
+    if persist:
+        try:
+            _atomic_write_json(record_path, record)
+        except OSError:
+            pass  # Read-only location: the in-memory record is still usable
+    with _lock:
+        _probe_memo[key] = record
+    return record
+
+
+def get_probe_frame_count(record: Dict[str, Any], fps: float) -> int:
+    """Frame count from a probe record: nb_frames if known, else duration * fps."""
+    stream_info = record.get("stream", {})
+    nb_frames_str = stream_info.get('nb_frames')
+    if nb_frames_str and nb_frames_str != 'N/A':
+        return int(nb_frames_str)
+    dur_str = stream_info.get('duration', record.get("format", {}).get('duration', '0'))
+    duration = float(dur_str) if dur_str and dur_str != 'N/A' else 0.0
+    return round(duration * fps)
+
+
+def discard_video_probe_record(video_path: str):
+    """Forgets the probe record of a video that is being removed or rewritten."""
+    with _lock:
+        _probe_memo.pop(os.path.abspath(video_path), None)
+    try:
+        os.remove(get_probe_record_path(video_path))
+    except OSError:
+        pass
+
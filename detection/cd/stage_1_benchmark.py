@@ -0,0 +1,376 @@
+"""
+Stage 1 micro-benchmark autotuner.
+
+Instead of running full Stage 1 analyses for every producer/consumer combination,
+this module measures the individual costs on a short sampled window of the loaded
+video (decode throughput, per-frame inference latency per batch size and the
+inter-process queue hand-off) and fits a simple throughput model:
+
+    F(p, c, b, t) = min(p * D_t, c_eff * I_b, cores / (k_decode_t + k_infer_b + k_queue))
+
+where D_t is the decode rate of one producer with t FFmpeg threads, I_b the
+inference rate of one consumer at batch size b (detection on every frame, pose on
+the share of frames the pose scheduler selects) and k_* the CPU seconds spent per
+frame by each part. The best combination is stored per hardware fingerprint so
+identical machines reuse it without re-tuning.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import constants
+from common.temp_manager import get_temp_manager
+
+PROFILE_FORMAT_VERSION = 1
+
+# Consumers sharing one accelerator stop scaling after a couple of concurrent streams
+GPU_CONSUMER_SATURATION = 2.0
+# Combinations within this fraction of the best prediction are considered equivalent
+TIE_TOLERANCE = 0.02
+
+
+def get_hardware_fingerprint(available_hwaccels: Sequence[str], det_model_path: Optional[str],
+                             yolo_input_size: int) -> Tuple[str, dict]:
+    """
+    Returns (key, info) identifying this machine for the purpose of Stage 1 tuning.
+    Uses only cheap platform queries so it can be evaluated at startup.
+    """
+    info = {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count() or 1,
+        "hwaccels": sorted(h for h in available_hwaccels if h not in ("auto", "none")),
+        "det_model": os.path.basename(det_model_path) if det_model_path else "",
+        "yolo_input_size": int(yolo_input_size),
+    }
+    key = hashlib.sha1(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return key, info
+
+
+def _default_profiles_path() -> str:
+    return str(get_temp_manager().get_app_cache_path(constants.STAGE1_PROFILES_FILE))
+
+
+def load_stage1_profiles(profiles_path: Optional[str] = None) -> Dict[str, dict]:
+    profiles_path = profiles_path or _default_profiles_path()
+    if not os.path.exists(profiles_path):
+        return {}
+    try:
+        with open(profiles_path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != PROFILE_FORMAT_VERSION:
+        return {}
+    return data.get("profiles", {})
+
+
+def get_stored_stage1_profile(fingerprint_key: str,
+                              profiles_path: Optional[str] = None) -> Optional[dict]:
+    return load_stage1_profiles(profiles_path).get(fingerprint_key)
+
+
+def save_stage1_profile(profile: dict, profiles_path: Optional[str] = None):
+    profiles_path = profiles_path or _default_profiles_path()
+    profiles = load_stage1_profiles(profiles_path)
+    profiles[profile["fingerprint"]] = profile
+    tmp_path = profiles_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": PROFILE_FORMAT_VERSION, "profiles": profiles}, f, indent=2)
+    os.replace(tmp_path, profiles_path)
+
+
+def measure_decode_throughput(video_processor_factory: Callable[[str, int], object], hwaccel: str, decode_threads: int,
+                              start_frame: int, num_frames: int, stop_event: Optional[threading.Event] = None,
+                              keep_frames: int = 0) -> Tuple[float, float, List[np.ndarray]]:
+    """
+    Streams num_frames frames with one producer-equivalent VideoProcessor.
+    Returns (frames_per_second, cpu_seconds_per_frame, kept_frames). The CPU cost
+    includes the FFmpeg child process, which is reaped when the stream ends.
+    """
+    vp = video_processor_factory(hwaccel, decode_threads)
+    kept = []
+    count = 0
+    t_before = os.times()
+    wall_start = time.perf_counter()
+    for _, frame in vp.stream_frames_for_segment(start_frame, num_frames, stop_event=stop_event):
+        if len(kept) < keep_frames:
+            kept.append(frame.copy())
+        count += 1
+    wall = time.perf_counter() - wall_start
+    t_after = os.times()
+    if count == 0 or wall <= 0:
+        return 0.0, 0.0, kept
+    cpu = (t_after.user - t_before.user) + (t_after.system - t_before.system) \
+        + (t_after.children_user - t_before.children_user) + (t_after.children_system - t_before.children_system)
+    # If the child was not accounted for, assume one fully busy core
+    cpu_per_frame = cpu / count if cpu > 0 else wall / count
+    return count / wall, cpu_per_frame, kept
+
+
+def measure_inference(det_model_path: str, pose_model_path: Optional[str], frames: List[np.ndarray],
+                      batch_sizes: Sequence[int], yolo_input_size: int, confidence_threshold: float,
+                      video_fps: float, stop_event: Optional[threading.Event] = None,
+                      logger: Optional[logging.Logger] = None,
+                      pose_max_staleness_s: float = constants.DEFAULT_S1_POSE_MAX_STALENESS_S
+                      ) -> Tuple[str, Dict[int, Tuple[float, float]]]:
+    """
+    Measures one consumer's throughput for each batch size, including the
+    amortised cost of the on-demand pose pass.
+    Consumers run pose when the detection layout changes and at least once per
+    pose_max_staleness_s of video (see _PoseScheduler). The pose rate is the share
+    of layout changes in the sampled frames, but never below one run per staleness
+    window, which a sample shorter than the window cannot show.
+    Returns (device, {batch_size: (frames_per_second, cpu_seconds_per_frame)}).
+    """
+    from ultralytics import YOLO
+    from detection.cd.stage_1_cd import _PoseScheduler, _detections_from_result
+
+    device = constants.DEVICE
+    det_model = YOLO(det_model_path, task='detect')
+    pose_model = YOLO(pose_model_path, task='pose') if pose_model_path and os.path.exists(pose_model_path) else None
+
+    def run_det(batch):
+        return det_model(batch if len(batch) > 1 else batch[0], device=device, verbose=False,
+                         imgsz=yolo_input_size, conf=confidence_threshold)
+
+    # Warm-up (model fusing, kernel selection, allocator growth)
+    run_det(frames[:1])
+    pose_seconds = 0.0
+    if pose_model is not None:
+        pose_model(frames[0], device=device, verbose=False, imgsz=yolo_input_size, conf=confidence_threshold)
+        t0 = time.perf_counter()
+        pose_model(frames[0], device=device, verbose=False, imgsz=yolo_input_size, conf=confidence_threshold)
+        pose_seconds = time.perf_counter() - t0
+    # Same frame bound as Stage1InferencePool.open_job
+    pose_max_staleness = max(1, int(round(video_fps * pose_max_staleness_s)))
+
+    det_costs = {}
+    sample_results = []
+    for b in batch_sizes:
+        if stop_event and stop_event.is_set():
+            break
+        if b > len(frames):
+            continue
+        run_det(frames[:b])  # warm-up for this batch shape
+        num_batches = max(1, len(frames) // b)
+        collect = not sample_results
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for i in range(num_batches):
+            batch_results = run_det(frames[i * b:(i + 1) * b])
+            if collect:
+                sample_results.extend(batch_results)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        n = num_batches * b
+        det_costs[b] = (wall / n, cpu / n)
+
+    pose_fraction = 0.0
+    if pose_model is not None and sample_results:
+        scheduler = _PoseScheduler(pose_max_staleness)
+        # The first frame always starts a stretch; only the runs after it reflect layout changes
+        pose_runs = sum(scheduler.needs_pose(frame_id, _detections_from_result(r, det_model.names))
+                        for frame_id, r in enumerate(sample_results)) - 1
+        pose_fraction = max(pose_runs / max(1, len(sample_results) - 1), 1.0 / pose_max_staleness)
+        if logger:
+            logger.info(f"[S1 Benchmark] Pose runs on {pose_fraction * 100:.1f}% of frames "
+                        f"(staleness limit {pose_max_staleness} frames)")
+    pose_per_frame = pose_seconds * pose_fraction
+
+    results = {}
+    for b, (det_seconds, det_cpu) in det_costs.items():
+        seconds_per_frame = det_seconds + pose_per_frame
+        # CPU inference keeps the cores busy for the whole call; accelerators mostly wait
+        cpu_per_frame = det_cpu + (pose_per_frame if device == 'cpu' else 0.0)
+        results[b] = (1.0 / seconds_per_frame, cpu_per_frame)
+        if logger:
+            logger.info(f"[S1 Benchmark] Inference b={b} on '{device}': {results[b][0]:.1f} FPS/consumer")
+
+    del det_model, pose_model
+    return device, results
+
+
+def _queue_echo_worker(in_queue, out_queue):
+    while True:
+        item = in_queue.get()
+        if item is None:
+            break
+        out_queue.put(item[0])
+
+
+def measure_queue_handoff(frame: np.ndarray, num_frames: int = 64) -> float:
+    """Returns the seconds spent per frame passing (frame_id, frame) through a multiprocessing queue."""
+    ctx = multiprocessing.get_context('spawn')
+    in_queue, out_queue = ctx.Queue(maxsize=constants.STAGE1_FRAME_QUEUE_MAXSIZE), ctx.Queue()
+    worker = ctx.Process(target=_queue_echo_worker, args=(in_queue, out_queue), daemon=True)
+    worker.start()
+    try:
+        in_queue.put((-1, frame))
+        out_queue.get(timeout=30)  # worker is up and the pipe is warm
+        start = time.perf_counter()
+        for i in range(num_frames):
+            in_queue.put((i, frame))
+        for _ in range(num_frames):
+            out_queue.get(timeout=30)
+        return (time.perf_counter() - start) / num_frames
+    finally:
+        in_queue.put(None)
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
+
+
+def predict_stage1_fps(p: int, c: int, decode_fps: float, decode_cpu: float, infer_fps: float, infer_cpu: float,
+                       queue_cost: float, device: str, cpu_cores: int) -> float:
+    """Throughput model for p producers and c consumers (see module docstring)."""
+    if decode_fps <= 0 or infer_fps <= 0:
+        return 0.0
+    producer_rate = 1.0 / (1.0 / decode_fps + queue_cost)
+    consumer_rate = 1.0 / (1.0 / infer_fps + queue_cost)
+    c_eff = c if device == 'cpu' else min(float(c), GPU_CONSUMER_SATURATION)
+    cpu_per_frame = decode_cpu + infer_cpu + 2.0 * queue_cost
+    cpu_bound = cpu_cores / cpu_per_frame if cpu_per_frame > 0 else float('inf')
+    return min(p * producer_rate, c_eff * consumer_rate, cpu_bound)
+
+
+def select_stage1_profile(decode_measurements: Dict[Tuple[str, int], Tuple[float, float]],
+                          inference_measurements: Dict[int, Tuple[float, float]], queue_cost: float,
+                          device: str, cpu_cores: int) -> Tuple[Optional[dict], Dict[Tuple[int, int, str], Tuple[float, int, int]]]:
+    """
+    Enumerates producers, consumers, batch size and decode threads against the model.
+    Returns (best, per_combination) where per_combination maps (p, c, accel) to
+    (predicted_fps, batch_size, decode_threads) for the best b/t of that combination.
+    """
+    per_combination = {}
+    candidates = []
+    for (accel, threads), (decode_fps, decode_cpu) in decode_measurements.items():
+        for batch_size, (infer_fps, infer_cpu) in inference_measurements.items():
+            for p in range(1, constants.AUTOTUNER_MAX_PRODUCERS + 1):
+                for c in range(1, max(1, cpu_cores - p) + 1):
+                    fps = predict_stage1_fps(p, c, decode_fps, decode_cpu, infer_fps, infer_cpu,
+                                             queue_cost, device, cpu_cores)
+                    candidates.append((fps, p, c, batch_size, threads, accel))
+                    if fps > per_combination.get((p, c, accel), (-1.0,))[0]:
+                        per_combination[(p, c, accel)] = (fps, batch_size, threads)
+    if not candidates:
+        return None, per_combination
+
+    best_fps = max(cand[0] for cand in candidates)
+    # Prefer fewer processes, smaller batches and fewer threads among near-equal predictions
+    near_best = [cand for cand in candidates if cand[0] >= best_fps * (1.0 - TIE_TOLERANCE)]
+    fps, p, c, batch_size, threads, accel = min(near_best, key=lambda cand: (cand[1] + cand[2], cand[3], cand[4], -cand[0]))
+    best = {
+        "num_producers": p,
+        "num_consumers": c,
+        "consumer_batch_size": batch_size,
+        "decode_threads": threads,
+        "hardware_acceleration_method": accel,
+        "predicted_fps": round(fps, 2),
+    }
+    return best, per_combination
+
+
+def run_stage1_microbenchmark(video_processor_factory: Callable[[str, int], object], total_frames: int, video_fps: float,
+                              det_model_path: str, pose_model_path: Optional[str], yolo_input_size: int,
+                              confidence_threshold: float, accel_methods: Sequence[str],
+                              available_hwaccels: Sequence[str], stop_event: Optional[threading.Event] = None,
+                              status_callback: Optional[Callable[[str], None]] = None,
+                              logger: Optional[logging.Logger] = None,
+                              profiles_path: Optional[str] = None,
+                              pose_max_staleness_s: float = constants.DEFAULT_S1_POSE_MAX_STALENESS_S
+                              ) -> Tuple[Optional[dict], Dict]:
+    """
+    Runs the bounded benchmark and stores the chosen profile for this machine.
+    ``video_processor_factory(hwaccel, decode_threads)`` must return an opened
+    VideoProcessor configured like a Stage 1 producer.
+    Returns (profile, per_combination); profile is None if aborted or nothing could be measured.
+    """
+    logger = logger or logging.getLogger(__name__)
+    profiles_path = profiles_path or _default_profiles_path()
+
+    def status(msg: str):
+        logger.info(f"[S1 Benchmark] {msg}")
+        if status_callback:
+            status_callback(msg)
+
+    def aborted() -> bool:
+        return bool(stop_event and stop_event.is_set())
+
+    fingerprint, hardware_info = get_hardware_fingerprint(available_hwaccels, det_model_path, yolo_input_size)
+    cpu_cores = hardware_info["cpu_count"]
+
+    # Sample from the body of the video, away from intros
+    num_frames = min(constants.AUTOTUNER_DECODE_SAMPLE_FRAMES, max(1, total_frames))
+    start_frame = max(0, min(total_frames // 4, total_frames - num_frames))
+
+    decode_measurements = {}
+    sample_frames: List[np.ndarray] = []
+    for accel in accel_methods:
+        for threads in constants.AUTOTUNER_DECODE_THREAD_OPTIONS:
+            if aborted():
+                return None, {}
+            status(f"Measuring decode: HW Accel '{accel}', {threads or 'auto'} threads...")
+            keep = 0 if sample_frames else constants.AUTOTUNER_INFERENCE_SAMPLE_FRAMES
+            fps, cpu, kept = measure_decode_throughput(video_processor_factory, accel, threads, start_frame,
+                                                       num_frames, stop_event, keep_frames=keep)
+            if kept:
+                sample_frames = kept
+            if fps > 0:
+                decode_measurements[(accel, threads)] = (fps, cpu)
+                logger.info(f"[S1 Benchmark] Decode '{accel}' t={threads}: {fps:.1f} FPS, {cpu * 1000:.1f} ms CPU/frame")
+            else:
+                logger.warning(f"[S1 Benchmark] Decode '{accel}' t={threads} produced no frames.")
+
+    if not decode_measurements or not sample_frames:
+        status("No frames could be decoded.")
+        return None, {}
+
+    if aborted():
+        return None, {}
+    status("Measuring inference latency per batch size...")
+    device, inference_measurements = measure_inference(det_model_path, pose_model_path, sample_frames,
+                                                       constants.AUTOTUNER_BATCH_SIZES, yolo_input_size,
+                                                       confidence_threshold, video_fps, stop_event, logger,
+                                                       pose_max_staleness_s)
+    if not inference_measurements or aborted():
+        return None, {}
+
+    status("Measuring queue hand-off cost...")
+    queue_cost = measure_queue_handoff(sample_frames[0])
+
+    best, per_combination = select_stage1_profile(decode_measurements, inference_measurements, queue_cost,
+                                                  device, cpu_cores)
+    if best is None:
+        return None, per_combination
+
+    profile = dict(best)
+    profile.update({
+        "fingerprint": fingerprint,
+        "hardware": hardware_info,
+        "device": device,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "measurements": {
+            "decode": {f"{accel}/t{threads}": {"fps": round(fps, 2), "cpu_ms_per_frame": round(cpu * 1000, 3)}
+                       for (accel, threads), (fps, cpu) in decode_measurements.items()},
+            "inference": {str(b): {"fps": round(fps, 2), "cpu_ms_per_frame": round(cpu * 1000, 3)}
+                          for b, (fps, cpu) in inference_measurements.items()},
+            "queue_ms_per_frame": round(queue_cost * 1000, 3),
+        },
+    })
+    try:
+        save_stage1_profile(profile, profiles_path)
+    except OSError as e:
+        logger.error(f"[S1 Benchmark] Could not save profile to '{profiles_path}': {e}")
+    return profile, per_combination
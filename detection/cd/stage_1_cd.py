@@ -1,20 +1,23 @@
+import cv2
 import numpy as np
 import msgpack
 import time
 from multiprocessing import Process, Queue, Event, Value, freeze_support
 import platform
 import sys
-from threading import Thread as PyThread
+from threading import Thread as PyThread, Condition, Lock
+import itertools
 from queue import Empty, Full
-from ultralytics import YOLO
 import os
 import logging
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 import subprocess
 from queue import Queue as StdLibQueue
 
 from video import VideoProcessor
 from config import constants
+from common.telemetry import get_telemetry
+from detection.cd.ffmpeg_probe_cache import get_encoder_capabilities, get_video_probe_record, discard_video_probe_record
 
 log_vid = logging.getLogger(__name__)
 
@@ -116,22 +119,13 @@ def _validate_preprocessed_video_completeness(video_path: str, expected_frames:
             logger.warning(f"Preprocessed video is suspiciously small: {file_size} bytes")
             return False
 
-        # Use ffprobe to get video info
-        import subprocess
-        import json
-
-        cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
-               '-show_entries', 'stream=nb_frames,duration,r_frame_rate',
-               '-of', 'json', video_path]
-
-        creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10, creationflags=creation_flags)
-        if result.returncode != 0:
+        # ffprobe runs once per file version; all stages share the recorded result
+        record = get_video_probe_record(video_path)
+        if record is None:
             logger.warning(f"ffprobe failed for preprocessed video: {video_path}")
             return False
 
-        data = json.loads(result.stdout)
-        stream_info = data.get('streams', [{}])[0]
+        stream_info = record.get('stream', {})
 
         # Check frame count
         nb_frames_str = stream_info.get('nb_frames')
@@ -169,6 +163,7 @@ def _cleanup_incomplete_file(file_path: str, logger: logging.Logger) -> None:
         file_path: Path to the file to remove
         logger: Logger instance
     """
+    discard_video_probe_record(file_path)
     try:
         if os.path.exists(file_path):
             # Create a backup with timestamp before deletion
@@ -260,48 +255,17 @@ class FFmpegEncoder:
         self.encoder_process = None
         log_vid.info("Encoder process stopped.")
 
-    def _detect_encoding_devices(self) -> None:
-        """
-        Detects and logs all available hardware encoding devices with their device IDs.
-        This function tests each encoder type and reports availability.
-        """
+    def _log_encoding_devices(self, capabilities: dict) -> None:
+        """Logs the hardware encoding devices found by the (cached) capability probe."""
         log_vid.info("=== ENCODING DEVICE DETECTION ===")
-        
-        # Define encoder types to test
-        encoder_configs = [
-            ("hevc_nvenc", "NVENC (NVIDIA)"),
-            ("hevc_amf", "AMF (AMD)"),
-            ("hevc_qsv", "QSV (Intel)"),
-            ("hevc_vaapi", "VAAPI (Linux)")
-        ]
-        
-        all_devices = []
-        device_id = 0
-        
-        for encoder_codec, encoder_name in encoder_configs:
-            try:
-                subprocess.check_output([
-                    self.ffmpeg_path, "-hide_banner", "-f", "lavfi", "-i", "testsrc", 
-                    "-c:v", encoder_codec, "-f", "null", "-"
-                ], stderr=subprocess.PIPE, text=True, timeout=5)
-                # If we get here, encoder is available
-                all_devices.append(f"Device {device_id}: {encoder_name}")
-                device_id += 1
-            except subprocess.CalledProcessError as e:
-                if encoder_codec in e.stderr:
-                    # Encoder exists but failed - might be device-specific
-                    all_devices.append(f"Device {device_id}: {encoder_name} - failed")
-                    device_id += 1
-            except Exception:
-                pass
-
-        if all_devices:
-            log_vid.info("Detected encoding devices:")
-            for device in all_devices:
-                log_vid.info(f"  {device}")
+        devices = capabilities.get("devices", [])
+        if devices:
+            log_vid.info(f"Detected encoding devices ({capabilities.get('version') or 'unknown FFmpeg version'}):")
+            for device_id, device in enumerate(devices):
+                suffix = "" if device.get("ok") else " - failed"
+                log_vid.info(f"  Device {device_id}: {device.get('name')}{suffix}")
         else:
             log_vid.info("No hardware encoding devices detected")
-            
         log_vid.info("=== END ENCODING DEVICE DETECTION ===")
 
     def _get_encoder_args(self) -> List[str]:
@@ -311,36 +275,33 @@ class FFmpegEncoder:
         Respects the user's hardware acceleration setting.
         """
 
-        self._detect_encoding_devices()
+        capabilities = get_encoder_capabilities(self.ffmpeg_path, log_vid)
+        self._log_encoding_devices(capabilities)
 
         if self.hwaccel_method == "none":
             log_vid.info("Using software libx265 encoder (CPU-only mode).")
             return ["-c:v", "libx265", "-preset", "ultrafast", "-crf", "26", "-pix_fmt", "yuv420p"]
 
-        try:
-            output = subprocess.check_output([self.ffmpeg_path, "-hide_banner", "-encoders"], text=True)
-        except Exception as e:
-            log_vid.warning(f"Failed to query FFmpeg encoders: {e}")
-            output = ""
+        encoders = capabilities.get("encoders", [])
 
         # macOS is a special case and usually works well.
-        if "hevc_videotoolbox" in output:
+        if "hevc_videotoolbox" in encoders:
             log_vid.info("Using H.265 Apple VideoToolbox for hardware encoding.")
             return ["-c:v", "hevc_videotoolbox", "-q:v", "20", "-pix_fmt", "yuv420p", "-b:v", "0"]
 
-        if "hevc_nvenc" in output:
+        if "hevc_nvenc" in encoders:
             log_vid.info("Using H.265 NVENC for hardware encoding.")
             return ["-c:v", "hevc_nvenc", "-preset", "fast", "-qp", "26", "-pix_fmt", "yuv420p"]
 
-        elif "hevc_amf" in output:
+        elif "hevc_amf" in encoders:
             log_vid.info("Using H.265 AMD AMF for hardware encoding.")
             return ["-c:v", "hevc_amf", "-quality", "quality", "-qp_i", "26", "-qp_p", "26", "-pix_fmt", "yuv420p"]
 
-        elif "hevc_qsv" in output:
+        elif "hevc_qsv" in encoders:
             log_vid.info("Using H.265 Intel QSV for hardware encoding.")
             return ["-c:v", "hevc_qsv", "-preset", "fast", "-global_quality", "26", "-pix_fmt", "yuv420p"]
 
-        elif "hevc_vaapi" in output: # Primarily for Linux
+        elif "hevc_vaapi" in encoders: # Primarily for Linux
             log_vid.info("Using H.265 VAAPI for hardware encoding.")
             return ["-c:v", "hevc_vaapi", "-qp", "26", "-pix_fmt", "yuv420p"]
         
@@ -352,13 +313,16 @@ class Stage1QueueMonitor:
     def __init__(self):
         self.frame_queue_puts = Value('i', 0)
         self.frame_queue_gets = Value('i', 0)
+        # Frames the shared pool has answered for this run; pool workers never see this monitor
+        self.frames_answered = Value('i', 0)
         self.result_queue_puts = Value('i', 0)
         self.result_queue_gets = Value('i', 0)
 
     def frame_queue_put(self, queue, item, block=True, timeout=None):
         with self.frame_queue_puts.get_lock():
-            self.frame_queue_puts.value += 1
             queue.put(item, block=block, timeout=timeout)
+            # Counted only once queued: the count is the number of frames the pool must answer
+            self.frame_queue_puts.value += 1
 
     def frame_queue_get(self, queue, block=True, timeout=None):
         with self.frame_queue_gets.get_lock():
@@ -366,6 +330,10 @@ class Stage1QueueMonitor:
             self.frame_queue_gets.value += 1
             return item
 
+    def frame_answered(self):
+        with self.frames_answered.get_lock():
+            self.frames_answered.value += 1
+
     def result_queue_put(self, queue, item):
         with self.result_queue_puts.get_lock():
             self.result_queue_puts.value += 1
@@ -382,9 +350,9 @@ class Stage1QueueMonitor:
         try:
             return queue.qsize()
         except NotImplementedError:  # Some platforms might not implement qsize()
-            # Fallback to the original, less accurate method if qsize() is not available
-            with self.frame_queue_puts.get_lock(), self.frame_queue_gets.get_lock():
-                return self.frame_queue_puts.value - self.frame_queue_gets.value
+            # Fallback: frames queued by this run and not yet answered (includes frames in flight)
+            with self.frame_queue_puts.get_lock(), self.frames_answered.get_lock():
+                return max(0, self.frame_queue_puts.value - self.frames_answered.value)
 
 
     def get_result_queue_size(self):
@@ -403,15 +371,19 @@ def video_processor_producer_proc(
         start_frame_abs_num: int,
         num_frames_in_segment: int,
         frame_queue: Queue,
+        job_header: tuple,
         queue_monitor_local: Stage1QueueMonitor,
         stop_event_local: Event,
         hwaccel_method_producer: Optional[str],
         hwaccel_avail_list_producer: Optional[List[str]],
         logger_config_for_vp_in_producer: Optional[dict] = None,
         is_encoding_preprocessed_video: bool = False,
-        output_path_for_encoding: Optional[str] = None
+        output_path_for_encoding: Optional[str] = None,
+        decode_threads_producer: int = 0,
+        static_skip_threshold_producer: float = 0.0
 ):
     frames_put_to_queue_this_producer = 0
+    frames_carried_this_producer = 0
     vp_instance = None
     producer_logger = None
     encoder = None
@@ -436,7 +408,8 @@ def video_processor_producer_proc(
             vr_input_format=vr_input_format_setting_producer,
             vr_fov=vr_fov_setting_producer,
             vr_pitch=vr_pitch_setting_producer,
-            fallback_logger_config=logger_config_for_vp_in_producer
+            fallback_logger_config=logger_config_for_vp_in_producer,
+            ffmpeg_decode_threads=decode_threads_producer
         )
         producer_logger = vp_instance.logger
         if not producer_logger:
@@ -474,6 +447,10 @@ def video_processor_producer_proc(
         producer_logger.info(
             f"[S1 VP Producer-{producer_idx}] Streaming segment: Video='{os.path.basename(vp_instance.video_path)}', StartFrameAbs={start_frame_abs_num}, NumFrames={num_frames_in_segment}, YOLOSize={vp_instance.yolo_input_size}")
 
+        # Static-scene skipping: frames close to the last inferred frame reuse its detections
+        max_carry_frames = int(round(vp_instance.video_info.get('fps', 30.0) * constants.STAGE1_STATIC_SKIP_MAX_CARRY_S))
+        reference_frame_id, reference_signature = None, None
+
         for frame_id, frame in vp_instance.stream_frames_for_segment(start_frame_abs_num, num_frames_in_segment, stop_event=stop_event_local):
             if stop_event_local.is_set():
                 producer_logger.info(
@@ -483,9 +460,18 @@ def video_processor_producer_proc(
             if encoder:
                 encoder.encode_frame(frame.tobytes())
 
+            signature, carried_from = None, None
+            if static_skip_threshold_producer > 0:
+                signature = _static_frame_signature(frame)
+                if (reference_signature is not None and frame_id - reference_frame_id <= max_carry_frames
+                        and np.abs(signature - reference_signature).mean() < static_skip_threshold_producer):
+                    carried_from = reference_frame_id
+
             try:
                 # Attempt to put the frame on the queue with a 0.5 second timeout
-                queue_monitor_local.frame_queue_put(frame_queue, (frame_id, np.copy(frame)), block=True, timeout=0.5)
+                # Carried frames are queued without pixels so their answers stay in order with the rest
+                item = (job_header, frame_id, np.copy(frame) if carried_from is None else None, carried_from)
+                queue_monitor_local.frame_queue_put(frame_queue, item, block=True, timeout=0.5)
             except Full:
                 # If the queue is full, check the stop event and continue the loop to check again.
                 if stop_event_local.is_set():
@@ -498,13 +484,17 @@ def video_processor_producer_proc(
                     f"[S1 VP Producer-{producer_idx}] Stop event detected after attempting to queue frame {frame_id}. Loop terminating.")
                 break
             frames_put_to_queue_this_producer += 1
+            if carried_from is not None:
+                frames_carried_this_producer += 1
+            elif signature is not None:
+                reference_frame_id, reference_signature = frame_id, signature
 
         if not stop_event_local.is_set() and frames_put_to_queue_this_producer < num_frames_in_segment:
             producer_logger.warning(
                 f"[S1 VP Producer-{producer_idx}] Streamed {frames_put_to_queue_this_producer} frames, but expected {num_frames_in_segment}. Video might be shorter or stream ended early.")
 
         producer_logger.info(
-            f"[S1 VP Producer-{producer_idx}] Segment streaming loop ended. Put {frames_put_to_queue_this_producer} frames to queue (Target: {num_frames_in_segment}). Stop event: {stop_event_local.is_set()}")
+            f"[S1 VP Producer-{producer_idx}] Segment streaming loop ended. Put {frames_put_to_queue_this_producer} frames to queue (Target: {num_frames_in_segment}, carried: {frames_carried_this_producer}). Stop event: {stop_event_local.is_set()}")
 
     except Exception as e:
         # Use producer_logger if available, otherwise print as a last resort
@@ -557,9 +547,124 @@ def video_processor_producer_proc(
         effective_logger_final.info(
             f"[S1 VP Producer-{producer_idx}] Fully Exited. Final count of frames put to queue: {frames_count_final}. Stop event: {stop_event_local.is_set()}")
 
+def _static_frame_signature(frame: np.ndarray) -> np.ndarray:
+    """Small area-averaged thumbnail of a frame; its mean absolute difference measures scene change."""
+    size = constants.STAGE1_STATIC_SIGNATURE_SIZE
+    return cv2.resize(frame, (size, size), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def _resolve_carried_frames(results_dict: Dict[int, dict]) -> int:
+    """
+    Gives near-duplicate ("carried") frames the detections of the frame they were compared with,
+    in place, marked "carried": True. Carried frames whose source frame has no result are dropped,
+    i.e. treated as missing. Returns the number of carried frames kept.
+    """
+    carried_ids = [fid for fid, payload in results_dict.items() if "carried_from" in payload]
+    carried_count = 0
+    for frame_id in carried_ids:
+        source = results_dict.get(results_dict[frame_id]["carried_from"])
+        if source is None:
+            del results_dict[frame_id]
+            continue
+        results_dict[frame_id] = {"detections": source["detections"], "poses": [], "carried": True}
+        carried_count += 1
+    return carried_count
+
+
+def _detections_from_result(r, class_names) -> List[dict]:
+    detections = []
+    if r.boxes:
+        for i in range(len(r.boxes)):
+            box_data = r.boxes[i]
+            detections.append({
+                'bbox': box_data.xyxy[0].tolist(),
+                'confidence': float(box_data.conf[0]),
+                'class': int(box_data.cls[0]),
+                'class_name': class_names[int(box_data.cls[0])]
+            })
+    return detections
+
+
+def _poses_from_result(r) -> List[dict]:
+    poses = []
+    if r.keypoints and r.boxes:
+        for i in range(len(r.boxes)):
+            poses.append({
+                'bbox': r.boxes.xyxy[i].tolist(),
+                'keypoints': r.keypoints.data[i].tolist()
+            })
+    return poses
+
+
+def _layout_changed(ref_classes: np.ndarray, ref_boxes: np.ndarray, classes: np.ndarray, boxes: np.ndarray,
+                    min_iou: float) -> bool:
+    """True if the class set differs, or a box overlaps no reference box of its class by min_iou."""
+    if set(ref_classes.tolist()) != set(classes.tolist()):
+        return True
+    if len(boxes) == 0:
+        return False
+    x1 = np.maximum(boxes[:, None, 0], ref_boxes[None, :, 0])
+    y1 = np.maximum(boxes[:, None, 1], ref_boxes[None, :, 1])
+    x2 = np.minimum(boxes[:, None, 2], ref_boxes[None, :, 2])
+    y2 = np.minimum(boxes[:, None, 3], ref_boxes[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    ref_area = (ref_boxes[:, 2] - ref_boxes[:, 0]) * (ref_boxes[:, 3] - ref_boxes[:, 1])
+    union = area[:, None] + ref_area[None, :] - inter
+    iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    iou[classes[:, None] != ref_classes[None, :]] = 0.0
+    return bool((iou.max(axis=1) < min_iou).any())
+
+
+class _PoseScheduler:
+    """
+    Decides per frame whether a consumer runs the pose model for one video.
+
+    Pose runs when the detection layout changed materially since the last pose of the
+    same stretch of video (see _layout_changed), and at least every max_staleness frames.
+    Skipped frames get no poses; logger_proc carries the last poses forward.
+    A consumer sees an interleaved subset of frames (other consumers, several producer
+    segments), so state is kept per contiguous stretch of the frame ids it receives.
+    """
+    MAX_STREAMS = 8
+
+    def __init__(self, max_staleness: int, min_iou: float = constants.STAGE1_POSE_LAYOUT_MIN_IOU):
+        self.max_staleness = max(1, int(max_staleness))
+        self.min_iou = min_iou
+        # [last frame id, last pose frame id, classes and boxes at the last pose]
+        self._streams = []
+
+    def needs_pose(self, frame_id: int, detections: List[dict]) -> bool:
+        classes = np.array([d['class'] for d in detections], dtype=np.int64)
+        boxes = np.array([d['bbox'] for d in detections], dtype=np.float64).reshape(-1, 4)
+
+        stream = None
+        for s in self._streams:
+            if s[0] < frame_id <= s[0] + self.max_staleness and (stream is None or s[0] > stream[0]):
+                stream = s
+        if stream is None:
+            self._streams.append([frame_id, frame_id, classes, boxes])
+            if len(self._streams) > self.MAX_STREAMS:
+                self._streams.pop(0)
+            return True
+
+        stream[0] = frame_id
+        if frame_id - stream[1] < self.max_staleness and not _layout_changed(stream[2], stream[3], classes, boxes,
+                                                                             self.min_iou):
+            return False
+        stream[1:] = [frame_id, classes, boxes]
+        return True
+
+
 def consumer_proc(frame_queue, result_queue, consumer_idx, yolo_det_model_path, yolo_pose_model_path,
-                  confidence_threshold, yolo_input_size_consumer, queue_monitor_local, stop_event_local,
-                  logger_config_for_consumer: Optional[dict] = None, video_fps: float = 30.0):
+                  yolo_input_size_consumer, stop_event_local,
+                  logger_config_for_consumer: Optional[dict] = None, batch_size: int = 1):
+    """
+    Inference worker of a Stage1InferencePool. Frames arrive as (job_header, frame_id, frame, carried_from)
+    with job_header = (job_id, pose_max_staleness, confidence_threshold); every frame is answered
+    with (job_id, frame_id, payload), where payload is None if inference failed. Carried frames
+    (near-duplicates sent without pixels) are answered with {"carried_from": frame_id} right away.
+    """
     # --- Logger setup ---
     consumer_logger = logging.getLogger(f"S1_Consumer_{consumer_idx}_{os.getpid()}")
 
@@ -573,6 +678,9 @@ def consumer_proc(frame_queue, result_queue, consumer_idx, yolo_det_model_path,
         except Exception as e:
             consumer_logger.warning(f"[S1 Consumer-{consumer_idx}] Failed to pre-import torchvision: {e}")
 
+        # ultralytics (and torch) are only imported inside consumer processes that load models
+        from ultralytics import YOLO
+
         # Load BOTH models in the same worker
         consumer_logger.info(f"[S1 Consumer-{consumer_idx}] Loading models...")
         det_model = YOLO(yolo_det_model_path, task='detect')
@@ -583,54 +691,81 @@ def consumer_proc(frame_queue, result_queue, consumer_idx, yolo_det_model_path,
         consumer_logger.info(
             f"[S1 Consumer-{consumer_idx}] Models loaded. Detection on '{constants.DEVICE}', Pose on '{pose_device}'.")
 
-        while not stop_event_local.is_set():
+        batch_size = max(1, int(batch_size))
+        pose_schedulers: Dict[int, _PoseScheduler] = {}
+        carried_item = None
+        received_sentinel = False
+        while not stop_event_local.is_set() and not received_sentinel:
             try:
-                item = queue_monitor_local.frame_queue_get(frame_queue, block=True, timeout=0.5)
+                if carried_item is not None:
+                    item, carried_item = carried_item, None
+                else:
+                    item = frame_queue.get(block=True, timeout=0.5)
                 if item is None:
                     consumer_logger.info(f"[S1 Consumer-{consumer_idx}] Received sentinel. Exiting loop.")
                     break
-                frame_id, frame = item
+            except Empty:
+                continue
+            if item[3] is not None:
+                result_queue.put((item[0][0], item[1], {"carried_from": item[3]}))
+                continue
 
+            job_header = item[0]
+            batch = [item]
+            # Opportunistically fill a batch with frames of the same video that are already queued
+            while len(batch) < batch_size:
+                try:
+                    item = frame_queue.get(block=False)
+                except Empty:
+                    break
+                if item is None:
+                    consumer_logger.info(f"[S1 Consumer-{consumer_idx}] Received sentinel. Exiting after current batch.")
+                    received_sentinel = True
+                    break
+                if item[3] is not None:
+                    result_queue.put((item[0][0], item[1], {"carried_from": item[3]}))
+                    continue
+                if item[0] != job_header:
+                    carried_item = item  # First frame of another video starts the next batch
+                    break
+                batch.append(item)
+
+            job_id, pose_max_staleness, confidence_threshold = job_header
+            pose_scheduler = pose_schedulers.get(job_id)
+            if pose_scheduler is None:
+                pose_scheduler = pose_schedulers[job_id] = _PoseScheduler(pose_max_staleness)
+                if len(pose_schedulers) > 4:
+                    del pose_schedulers[min(pose_schedulers)]
+            frame_ids = [fid for _, fid, _, _ in batch]
+            frames = [frm for _, _, frm, _ in batch]
+            try:
                 # --- Step 1: Perform Detection (on every frame) ---
-                det_results = det_model(frame, device=constants.DEVICE, verbose=False, imgsz=yolo_input_size_consumer,
-                                        conf=confidence_threshold)
-                detections = []
-                for r in det_results:
-                    if r.boxes:
-                        for i in range(len(r.boxes)):
-                            box_data = r.boxes[i]
-                            detections.append({
-                                'bbox': box_data.xyxy[0].tolist(),
-                                'confidence': float(box_data.conf[0]),
-                                'class': int(box_data.cls[0]),
-                                'class_name': det_model.names[int(box_data.cls[0])]
-                            })
+                det_results = det_model(frames if len(frames) > 1 else frames[0], device=constants.DEVICE, verbose=False,
+                                        imgsz=yolo_input_size_consumer, conf=confidence_threshold)
+                detections_per_frame = [_detections_from_result(r, det_model.names) for r in det_results]
 
                 # --- Step 2: Conditionally perform Pose Estimation ---
-                # Run roughly once per second; safe for low FPS values
-                poses = []  # Default to empty
-                if frame_id % max(1, int(round(video_fps))) == 0:
-                    pose_results = pose_model(frame, device=pose_device, verbose=False, imgsz=yolo_input_size_consumer, conf=confidence_threshold)
-                    for r in pose_results:
-                        if r.keypoints and r.boxes:
-                            for i in range(len(r.boxes)):
-                                poses.append({
-                                    'bbox': r.boxes.xyxy[i].tolist(),
-                                    'keypoints': r.keypoints.data[i].tolist()
-                                })
+                # Only when the detection layout changed or the last pose is too old
+                poses_per_frame = [[] for _ in batch]
+                pose_indices = [i for i, (fid, detections) in enumerate(zip(frame_ids, detections_per_frame))
+                                if pose_scheduler.needs_pose(fid, detections)]
+                if pose_indices:
+                    pose_frames = [frames[i] for i in pose_indices]
+                    pose_results = pose_model(pose_frames if len(pose_frames) > 1 else pose_frames[0], device=pose_device,
+                                              verbose=False, imgsz=yolo_input_size_consumer, conf=confidence_threshold)
+                    for i, r in zip(pose_indices, pose_results):
+                        poses_per_frame[i] = _poses_from_result(r)
 
                 # --- Step 3: Package results ---
                 # The 'poses' list will either have data or be empty.
-                result_payload = {
-                    "detections": detections,
-                    "poses": poses
-                }
-                queue_monitor_local.result_queue_put(result_queue, (frame_id, result_payload))
-
-            except Empty:
-                continue
+                payloads = [{"detections": detections, "poses": poses}
+                            for detections, poses in zip(detections_per_frame, poses_per_frame)]
             except Exception as e:
                 consumer_logger.error(f"[S1 Consumer-{consumer_idx}] Error processing frame: {e}", exc_info=True)
+                payloads = [None] * len(batch)
+
+            for frame_id, payload in zip(frame_ids, payloads):
+                result_queue.put((job_id, frame_id, payload))
 
     except Exception as e:
         consumer_logger.critical(f"[S1 Consumer-{consumer_idx}] Critical setup error: {e}", exc_info=True)
@@ -640,6 +775,153 @@ def consumer_proc(frame_queue, result_queue, consumer_idx, yolo_det_model_path,
         consumer_logger.info(f"[S1 Consumer-{consumer_idx}] Exiting.")
 
 
+class Stage1Job:
+    """
+    One video's share of a Stage1InferencePool. Producers tag frames with ``header``;
+    results are routed to ``result_queue`` as (frame_id, payload).
+    """
+
+    def __init__(self, job_id: int, pose_max_staleness: int, confidence_threshold: float,
+                 queue_monitor: Stage1QueueMonitor):
+        self.job_id = job_id
+        self.header = (job_id, pose_max_staleness, confidence_threshold)
+        self.queue_monitor = queue_monitor
+        self.result_queue = StdLibQueue()
+        self.frames_answered = 0
+        self._cond = Condition()
+
+    def deliver(self, frame_id: int, payload: Optional[dict]):
+        if payload is not None:
+            self.queue_monitor.result_queue_put(self.result_queue, (frame_id, payload))
+        self.queue_monitor.frame_answered()
+        with self._cond:
+            self.frames_answered += 1
+            self._cond.notify_all()
+
+    def wait_for_frames(self, count: int, timeout: float) -> bool:
+        """True once ``count`` frames have been answered (with or without a result)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.frames_answered >= count, timeout=timeout)
+
+
+class Stage1InferencePool:
+    """
+    Detection/pose worker processes that outlive a single Stage 1 run.
+
+    Models are loaded once per worker and stay warm, so successive videos of a batch
+    only pay for decoding. Producers of every video feed the shared ``frame_queue``;
+    a router thread hands each result to the Stage1Job whose id it carries.
+    """
+
+    def __init__(self, yolo_det_model_path: str, yolo_pose_model_path: str, yolo_input_size: int,
+                 num_workers: int, batch_size: int = 1, logger_config: Optional[dict] = None):
+        self.config_key = self.make_config_key(yolo_det_model_path, yolo_pose_model_path, yolo_input_size,
+                                               num_workers, batch_size)
+        self.frame_queue = Queue(maxsize=constants.STAGE1_FRAME_QUEUE_MAXSIZE)
+        self._result_queue = Queue()
+        self._stop_event = Event()
+        self._jobs: Dict[int, Stage1Job] = {}
+        self._jobs_lock = Lock()
+        self._job_ids = itertools.count(1)
+
+        self._workers = []
+        for i in range(num_workers):
+            w_args = (self.frame_queue, self._result_queue, i, yolo_det_model_path, yolo_pose_model_path,
+                      yolo_input_size, self._stop_event, logger_config, batch_size)
+            self._workers.append(Process(target=consumer_proc, args=w_args, daemon=True))
+        for p in self._workers:
+            p.start()
+        self._router = PyThread(target=self._route_results, name="S1ResultRouter", daemon=True)
+        self._router.start()
+        # The pool outlives the video that started it, so its own events go to the module logger
+        log_vid.info(f"[S1 Pool] Started {num_workers} inference workers.")
+
+    @staticmethod
+    def make_config_key(yolo_det_model_path, yolo_pose_model_path, yolo_input_size, num_workers, batch_size) -> tuple:
+        return (os.path.abspath(yolo_det_model_path), os.path.abspath(yolo_pose_model_path), int(yolo_input_size),
+                int(num_workers), max(1, int(batch_size)))
+
+    def is_alive(self) -> bool:
+        return not self._stop_event.is_set() and all(p.is_alive() for p in self._workers)
+
+    def open_job(self, queue_monitor: Stage1QueueMonitor, video_fps: float, confidence_threshold: float,
+                 pose_max_staleness_s: float = constants.DEFAULT_S1_POSE_MAX_STALENESS_S) -> Stage1Job:
+        # Upper bound on the age of reused poses, in frames; safe for low FPS values
+        pose_max_staleness = max(1, int(round(video_fps * pose_max_staleness_s)))
+        with self._jobs_lock:
+            job = Stage1Job(next(self._job_ids), pose_max_staleness, confidence_threshold, queue_monitor)
+            self._jobs[job.job_id] = job
+        return job
+
+    def close_job(self, job: Stage1Job):
+        """Stops routing results to ``job``; late results for it are dropped."""
+        with self._jobs_lock:
+            self._jobs.pop(job.job_id, None)
+
+    def _route_results(self):
+        while True:
+            try:
+                item = self._result_queue.get(timeout=0.5)
+            except Empty:
+                if self._stop_event.is_set():
+                    return
+                continue
+            if item is None:
+                return
+            job_id, frame_id, payload = item
+            with self._jobs_lock:
+                job = self._jobs.get(job_id)
+            if job is not None:
+                job.deliver(frame_id, payload)
+
+    def shutdown(self, timeout: float = 2.0):
+        self._stop_event.set()
+        # The router keeps draining results meanwhile, so workers can flush their queues and exit
+        for p in self._workers:
+            p.join(timeout=timeout)
+            if p.is_alive():
+                log_vid.info(f"[S1 Pool] Terminating inference worker: {p.pid}")
+                p.terminate()
+                p.join(timeout=1.0)
+        self._result_queue.put(None)
+        self._router.join(timeout=1.0)
+        log_vid.info("[S1 Pool] Inference workers stopped.")
+
+
+_inference_pool: Optional[Stage1InferencePool] = None
+_inference_pool_lock = Lock()
+
+
+def get_stage1_inference_pool(yolo_det_model_path: str, yolo_pose_model_path: str, yolo_input_size: int,
+                              num_workers: int, batch_size: int = 1, logger_config: Optional[dict] = None,
+                              logger: Optional[logging.Logger] = None) -> Stage1InferencePool:
+    """Returns the running pool if it was started with the same models and sizes, else starts a new one."""
+    global _inference_pool
+    key = Stage1InferencePool.make_config_key(yolo_det_model_path, yolo_pose_model_path, yolo_input_size,
+                                              num_workers, batch_size)
+    with _inference_pool_lock:
+        pool = _inference_pool
+        if pool is not None and (pool.config_key != key or not pool.is_alive()):
+            pool.shutdown()
+            pool = _inference_pool = None
+        if pool is None:
+            pool = Stage1InferencePool(yolo_det_model_path, yolo_pose_model_path, yolo_input_size, num_workers,
+                                       batch_size, logger_config)
+            _inference_pool = pool
+        elif logger:
+            logger.info("[S1 Pool] Reusing running inference workers; models are already loaded.")
+        return pool
+
+
+def shutdown_stage1_inference_pool():
+    """Stops the shared inference workers, if any. Safe to call repeatedly."""
+    global _inference_pool
+    with _inference_pool_lock:
+        pool, _inference_pool = _inference_pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
 def logger_proc(frame_processing_queue, result_queue, output_file_local, expected_frames,
                 progress_callback_local, queue_monitor_local, stop_event_local,
                 s1_start_time_param, parent_logger: logging.Logger,
@@ -725,6 +1007,14 @@ def logger_proc(frame_processing_queue, result_queue, output_file_local, expecte
         parent_logger.warning(f"[S1 Logger] Abort signal received. Skipping save of partial file: {output_file_local}")
         return
 
+    carried_count = _resolve_carried_frames(results_dict)
+    if carried_count:
+        parent_logger.info(f"[S1 Logger] {carried_count} static frames reused the detections of a previous frame.")
+    telemetry = get_telemetry()
+    telemetry.count("stage1_frames", len(results_dict) - carried_count, kind="inferred")
+    telemetry.count("stage1_frames", carried_count, kind="carried")
+    telemetry.count("stage1_frames", max(0, expected_frames - len(results_dict)), kind="missing")
+
     # Save the results
     ordered_results = [results_dict.get(i, {"detections": [], "poses": []}) for i in range(expected_frames)]
 
@@ -787,8 +1077,25 @@ def perform_yolo_analysis(
         output_filename_override: Optional[str] = None,
         save_preprocessed_video_arg: bool = True,
         preprocessed_video_path_arg: Optional[str] = None,
-        is_autotune_run_arg: bool = False
+        is_autotune_run_arg: bool = False,
+        consumer_batch_size_arg: int = 1,
+        decode_threads_arg: int = 0,
+        keep_worker_pool_arg: bool = False,
+        pose_max_staleness_arg: float = constants.DEFAULT_S1_POSE_MAX_STALENESS_S,
+        static_skip_threshold_arg: float = constants.DEFAULT_S1_STATIC_SKIP_THRESHOLD
 ):
+    """
+    Runs Stage 1 detection/pose analysis on a video and writes the msgpack result.
+
+    Inference runs on the shared Stage1InferencePool. With keep_worker_pool_arg the
+    workers stay alive afterwards so the next video (e.g. in a batch) reuses the loaded
+    models; the caller then ends them with shutdown_stage1_inference_pool().
+    Pose estimation runs when the detection layout changes, and at least every
+    pose_max_staleness_arg seconds of video. With static_skip_threshold_arg > 0, frames
+    whose thumbnail differs from the last inferred frame by less than the threshold
+    (mean absolute difference, 0-255) skip inference and are saved with that frame's
+    detections and "carried": True. Skipping is an opt-in experiment and off by default.
+    """
     process_logger = None
     fallback_config_for_subprocesses = None
 
@@ -928,13 +1235,20 @@ def perform_yolo_analysis(
     if total_frames_to_process <= 0:
         return None, 0.0
 
-    frame_processing_queue = Queue(maxsize=constants.STAGE1_FRAME_QUEUE_MAXSIZE)
-    yolo_result_queue = Queue()
-    producers_list, consumers_list = [], []
+    producers_list = []
     logger_p_thread = None
+    job, inference_pool = None, None
+    run_completed = False
     max_fps_container = [0.0]
 
     try:
+        # --- INFERENCE POOL (reused across videos when kept alive) ---
+        inference_pool = get_stage1_inference_pool(yolo_model_path_arg, yolo_pose_model_path_arg, yolo_input_size_arg,
+                                                   num_consumers_arg, consumer_batch_size_arg,
+                                                   fallback_config_for_subprocesses, process_logger)
+        job = inference_pool.open_job(queue_monitor, video_fps, confidence_threshold, pose_max_staleness_arg)
+        frame_processing_queue = inference_pool.frame_queue
+
         # --- PROCESS CREATION ---
         frames_per_producer = total_frames_to_process // num_producers_effective
         extra_frames = total_frames_to_process % num_producers_effective
@@ -944,19 +1258,14 @@ def perform_yolo_analysis(
             if num_frames > 0:
                 encoding_path_arg = preprocessed_video_path_arg if is_encoding_preprocessed_video else None
                 p_args = (i, video_path_to_use, yolo_input_size_arg, video_type_to_use, vr_input_format_arg, vr_fov_arg,
-                          vr_pitch_arg, current_frame, num_frames, frame_processing_queue, queue_monitor,
+                          vr_pitch_arg, current_frame, num_frames, frame_processing_queue, job.header, queue_monitor,
                           stop_event_internal, hwaccel_method_arg, hwaccel_avail_list_arg,
-                          fallback_config_for_subprocesses, is_encoding_preprocessed_video, encoding_path_arg)
+                          fallback_config_for_subprocesses, is_encoding_preprocessed_video, encoding_path_arg,
+                          decode_threads_arg, static_skip_threshold_arg)
                 producers_list.append(Process(target=video_processor_producer_proc, args=p_args, daemon=True))
                 current_frame += num_frames
 
-        for i in range(num_consumers_arg):
-            c_args = (frame_processing_queue, yolo_result_queue, i, yolo_model_path_arg, yolo_pose_model_path_arg,
-                      confidence_threshold, yolo_input_size_arg, queue_monitor, stop_event_internal,
-                      fallback_config_for_subprocesses, video_fps)
-            consumers_list.append(Process(target=consumer_proc, args=c_args, daemon=True))
-
-        logger_thread_args = (frame_processing_queue, yolo_result_queue, result_file_local, total_frames_to_process,
+        logger_thread_args = (frame_processing_queue, job.result_queue, result_file_local, total_frames_to_process,
                               progress_callback, queue_monitor, stop_event_internal,
                               s1_start_time, process_logger, gui_event_queue_arg, max_fps_container)
 
@@ -965,17 +1274,14 @@ def perform_yolo_analysis(
         # --- PROCESS STARTUP ---
         for p in producers_list:
             p.start()
-        for p in consumers_list:
-            p.start()
         logger_p_thread.start()
 
         # --- PROCESS JOINING AND SENTINEL LOGIC ---
         producers_finished = False
-        all_procs = producers_list + consumers_list
         loop_start_time = time.time()
         ANALYSIS_TIMEOUT_SECONDS = 60  # 1 minute
 
-        while any(p.is_alive() for p in all_procs):
+        while True:
             # Conditionally check for timeout ONLY if it's an autotuner run
             if is_autotune_run_arg and (time.time() - loop_start_time > ANALYSIS_TIMEOUT_SECONDS):
                 process_logger.critical(
@@ -991,22 +1297,27 @@ def perform_yolo_analysis(
                 process_logger.warning("[S1 Lib] Abort detected in main monitoring loop.")
                 break
 
+            if not inference_pool.is_alive():
+                process_logger.critical("[S1 Lib] Inference workers stopped unexpectedly. Aborting analysis.")
+                stop_event_internal.set()
+                break
+
             # Check if all producers are finished.
             if not producers_finished and not any(p.is_alive() for p in producers_list):
-                process_logger.info("[S1 Lib] All producers finished. Sending sentinels to consumers.")
-                for _ in range(len(consumers_list)):
-                    queue_monitor.frame_queue_put(frame_processing_queue, None)
+                process_logger.info("[S1 Lib] All producers finished. Waiting for the remaining results.")
                 producers_finished = True
 
-            time.sleep(0.5)  # Wait between checks to avoid busy-waiting.
+            if producers_finished:
+                # The pool answers every queued frame, so the run is complete once all of them came back
+                if job.wait_for_frames(queue_monitor.frame_queue_puts.value, timeout=0.5):
+                    break
+            else:
+                time.sleep(0.5)  # Wait between checks to avoid busy-waiting.
 
         # After the main loop, check if it was a natural finish (not an abort).
         if not stop_event_internal.is_set():
-            process_logger.info("[S1 Lib] All consumers finished. Sending end-of-stream sentinel to logger.")
-            try:
-                yolo_result_queue.put((None, None), timeout=1.0)
-            except Full:
-                process_logger.warning("[S1 Lib] Timed out sending sentinel to logger queue.")
+            process_logger.info("[S1 Lib] All results received. Sending end-of-stream sentinel to logger.")
+            job.result_queue.put((None, None))
 
         # Final wait for the logger thread to finish writing the file.
         if logger_p_thread.is_alive():
@@ -1014,6 +1325,7 @@ def perform_yolo_analysis(
 
         if stop_event_external.is_set():
             return None, 0.0
+        run_completed = not stop_event_internal.is_set()
 
         final_max_fps = max_fps_container[0]
         process_logger.info(f"Stage 1 analysis completed. Final Max FPS: {final_max_fps:.2f}")
@@ -1048,13 +1360,18 @@ def perform_yolo_analysis(
     finally:
         # This 'finally' block ensures cleanup happens no matter what.
         process_logger.info("[S1 Lib] Entering cleanup block.")
-        all_processes = producers_list + consumers_list
-        for p in all_processes:
+        for p in producers_list:
             if p.is_alive():
                 process_logger.info(f"[S1 Lib] Terminating hanging process: {p.pid}")
                 p.terminate()  # Forcefully terminate
                 p.join(timeout=1.0)  # Wait for OS to clean up
 
+        if job is not None:
+            inference_pool.close_job(job)
+        # Aborted or failed runs may leave frames in flight, so the workers are not reused
+        if not (keep_worker_pool_arg and run_completed):
+            shutdown_stage1_inference_pool()
+
         # Also ensure the logger thread is joined.
         if logger_p_thread and logger_p_thread.is_alive():
             logger_p_thread.join(timeout=1.0)
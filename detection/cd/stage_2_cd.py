@@ -13,9 +13,12 @@ import multiprocessing
 import psutil
 import time
 import tempfile
+from array import array
+from collections import deque
 
 from video import VideoProcessor
 from config import constants
+from common.telemetry import get_telemetry
 from funscript.dual_axis_funscript import DualAxisFunscript
 from application.utils.rts_smoother import RTSSmoother
 from application.utils.stage2_signal_enhancer import Stage2SignalEnhancer
@@ -70,6 +73,85 @@ def _calculate_iou(box1: Tuple[float, ...], box2: Tuple[float, ...]) -> float:
     union_area = box1_area + box2_area - inter_area
     return inter_area / union_area if union_area > 0 else 0.0
 
+
+def _iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) xyxy boxes as an (N, M) matrix."""
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    inter = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def _iou_rows(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Row-wise IoU of two (N, 4) xyxy box arrays, same arithmetic as _calculate_iou."""
+    x1 = np.maximum(boxes_a[:, 0], boxes_b[:, 0])
+    y1 = np.maximum(boxes_a[:, 1], boxes_b[:, 1])
+    x2 = np.minimum(boxes_a[:, 2], boxes_b[:, 2])
+    y2 = np.minimum(boxes_a[:, 3], boxes_b[:, 3])
+    inter = np.maximum(0, x2 - x1) * np.maximum(0, y2 - y1)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a + area_b - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def _box_geometry(records: List[BoxRecord]) -> Dict[str, np.ndarray]:
+    """Stacks bbox, center and size of BoxRecords into float64 arrays."""
+    bboxes = np.array([r.bbox for r in records], dtype=np.float64).reshape(-1, 4)
+    width = bboxes[:, 2] - bboxes[:, 0]
+    height = bboxes[:, 3] - bboxes[:, 1]
+    return {
+        'bbox': bboxes,
+        'cx': bboxes[:, 0] + width / 2,
+        'cy': bboxes[:, 1] + height / 2,
+        'width': width,
+        'height': height,
+    }
+
+
+def _size_ratio_matrix(tracks: Dict[str, np.ndarray], dets: Dict[str, np.ndarray]) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.minimum(dets['width'][None, :] / tracks['width'][:, None],
+                          dets['height'][None, :] / tracks['height'][:, None])
+
+
+def _center_distance_matrix(tracks: Dict[str, np.ndarray], dets: Dict[str, np.ndarray]) -> np.ndarray:
+    return np.hypot(dets['cx'][None, :] - tracks['cx'][:, None], dets['cy'][None, :] - tracks['cy'][:, None])
+
+
+def _greedy_assignment(scores: np.ndarray, feasible: np.ndarray, maximize: bool = True) -> List[Tuple[int, int]]:
+    """
+    Global greedy assignment on a score matrix: feasible pairs are taken best-first,
+    each row and column at most once. Ties keep row-major (track, detection) order.
+    """
+    rows, cols = np.nonzero(feasible)
+    if rows.size == 0:
+        return []
+    values = scores[rows, cols]
+    order = np.argsort(-values if maximize else values, kind='stable')
+    used_rows, used_cols = set(), set()
+    pairs = []
+    for k in order.tolist():
+        r, c = int(rows[k]), int(cols[k])
+        if r in used_rows or c in used_cols:
+            continue
+        used_rows.add(r)
+        used_cols.add(c)
+        pairs.append((r, c))
+    return pairs
+
+
+def _group_indices_by_class(indices, class_of) -> Dict[str, List]:
+    groups: Dict[str, List] = {}
+    for i in indices:
+        groups.setdefault(class_of(i), []).append(i)
+    return groups
+
 def _get_aligned_fallback_boxes(
         potential_fallback_boxes: List[BoxRecord],
         dominant_pose: Optional[PoseRecord],
@@ -144,211 +226,188 @@ def _assign_frame_position(contacts: List[Dict], logger: Optional[logging.Logger
 
 
 
-def _aggregate_segments(frame_objects: List[FrameObject], fps: float, min_segment_duration_frames: int,
-                            logger: logging.Logger) -> List[Segment]:
-    """
-    Aggregates frame data into a final, stable list of segments using
-    a master iterative loop to ensure all merging rules are exhaustively applied.
-    """
-    if not frame_objects:
-        return []
+_ORAL_POSITIONS = frozenset(('Blowjob', 'Handjob'))
+_PENETRATION_POSITIONS = frozenset(('Cowgirl / Missionary', 'Rev. Cowgirl / Doggy'))
 
-    # --- Config for Stability ---
-    SHORT_FLICKER_DURATION = int(fps * 1.0)  # Anything less than 1s is a potential flicker to be merged.
+# Run layout used by the aggregation sweeps: [start_frame_id, end_frame_id, position, segment_id]
+_RUN_START, _RUN_END, _RUN_POS, _RUN_ID = 0, 1, 2, 3
 
-    # --- Pass 1: Create an initial, granular list of segments. ---
-    # We create a segment for every single change in position. This list will be messy
-    # but provides the raw material for our robust merging loop.
-    segments: List[Segment] = []
-    if frame_objects:
-        current_pos = frame_objects[0].assigned_position
-        start_frame = frame_objects[0].frame_id
-        
-        # DEBUG: Log first segment creation
-        if logger:
-            logger.debug(f"_aggregate_segments: First frame position = '{current_pos}' (type: {type(current_pos)})")
-        
-        for i in range(1, len(frame_objects)):
-            if frame_objects[i].assigned_position != current_pos:
-                # DEBUG: Log segment creation
-                if logger:
-                    logger.debug(f"_aggregate_segments: Creating segment {start_frame}-{frame_objects[i - 1].frame_id} with position '{current_pos}' (type: {type(current_pos)})")
-                segments.append(Segment(start_frame, frame_objects[i - 1].frame_id, current_pos))
-                current_pos = frame_objects[i].assigned_position
-                start_frame = frame_objects[i].frame_id
-                
-        # DEBUG: Log final segment creation
-        if logger:
-            logger.debug(f"_aggregate_segments: Creating final segment {start_frame}-{frame_objects[-1].frame_id} with position '{current_pos}' (type: {type(current_pos)})")
-        segments.append(Segment(start_frame, frame_objects[-1].frame_id, current_pos))
 
-    if logger:
-        logger.debug(f"Pass 1 (Initial Creation) generated {len(segments)} granular segments.")
+def _position_runs(frame_objects: List[FrameObject], first_id: int) -> List[list]:
+    """Run-length encodes the per-frame positions (one run per position change)."""
+    runs = []
+    current_pos = frame_objects[0].assigned_position
+    start_frame = frame_objects[0].frame_id
+    prev_frame = start_frame
+    for fo in frame_objects:
+        pos = fo.assigned_position
+        if pos != current_pos:
+            runs.append([start_frame, prev_frame, current_pos, first_id + len(runs)])
+            current_pos = pos
+            start_frame = fo.frame_id
+        prev_frame = fo.frame_id
+    runs.append([start_frame, prev_frame, current_pos, first_id + len(runs)])
+    return runs
 
-    # --- Pass 2: The Master Iterative Merging Loop ---
-    # This loop continues until a full pass over all rules results in zero merges.
-    # This guarantees that the list is fully stabilized.
-    while True:
-        merges_made_in_pass = 0
-
-        # --- Rule A: Merge short "Not Relevant" segments between identical neighbors ---
-        i = 0
-        while i < len(segments) - 2:
-            seg1, seg_gap, seg2 = segments[i], segments[i + 1], segments[i + 2]
-            is_short_gap = seg_gap.major_position == "Not Relevant" and seg_gap.duration < (fps * 10)
-            if seg1.major_position == seg2.major_position and seg1.major_position != "Not Relevant" and is_short_gap:
-                if logger:
-                    logger.debug(f"Rule A: Merging {seg1.major_position} across short NR gap.")
-                seg1.end_frame_id = seg2.end_frame_id
-                seg1.update_duration()
-                segments.pop(i + 2)
-                segments.pop(i + 1)
-                merges_made_in_pass += 1
-                i = 0  # Restart scan after a modification
-                continue
-            i += 1
-
-        # --- Rule A2: Merge short penetration misclassifications between identical oral neighbors ---
-        # Example: BJ | short CG | BJ -> merge into a single BJ segment (targeted; avoids collapsing real short BJs)
-        i = 0
-        while i < len(segments) - 2:
-            seg1, seg_mid, seg2 = segments[i], segments[i + 1], segments[i + 2]
-            is_short_mid = (seg_mid.major_position != "Not Relevant") and (seg_mid.duration < (fps * 5))
-            oral_positions = {'Blowjob', 'Handjob'}
-            penetration_positions = {'Cowgirl / Missionary', 'Rev. Cowgirl / Doggy'}
-            neighbors_oral_and_identical = (seg1.major_position == seg2.major_position) and (seg1.major_position in oral_positions)
-            mid_is_penetration = seg_mid.major_position in penetration_positions
-
-            if neighbors_oral_and_identical and mid_is_penetration and is_short_mid:
-                if logger:
-                    logger.debug(
-                        f"Rule A2: Merging short penetration '{seg_mid.major_position}' between oral segments '{seg1.major_position}'."
-                )
-                seg1.end_frame_id = seg2.end_frame_id
-                seg1.update_duration()
-                segments.pop(i + 2)
-                segments.pop(i + 1)
-                merges_made_in_pass += 1
-                i = 0
-                continue
-            i += 1
 
-        # --- Rule B: Merge adjacent "Handjob" and "Blowjob" segments into "Blowjob" ---
-        i = 0
-        while i < len(segments) - 1:
-            pos1, pos2 = segments[i].major_position, segments[i + 1].major_position
-            if {pos1, pos2} <= {'Handjob', 'Blowjob'}:  # Use set for commutative check
-                if logger:
-                    logger.debug(f"Rule B: Merging adjacent '{pos1}' and '{pos2}' into 'Blowjob'.")
-                segments[i].major_position = 'Blowjob'
-                segments[i].end_frame_id = segments[i + 1].end_frame_id
-                segments[i].update_duration()
-                segments.pop(i + 1)
-                merges_made_in_pass += 1
-                i = 0  # Restart scan
+def _sweep_bridge_runs(runs: List[list], fps: float) -> Tuple[List[list], int, int]:
+    """
+    Single stack sweep applying Rule A (short "Not Relevant" gap between identical
+    neighbors) and then Rule A2 (short penetration run between identical oral
+    neighbors). A bridged run keeps its position, so it can never become the middle
+    of a new triple; checking each triple once, when its last run arrives, reaches
+    the same fixpoint as rescanning from the start after every merge.
+    """
+    nr_gap_limit = fps * 10
+    penetration_limit = fps * 5
+
+    def sweep(items, is_bridge):
+        out = []
+        merges = 0
+        for run in items:
+            out.append(run)
+            if len(out) >= 3:
+                first, mid, last = out[-3], out[-2], out[-1]
+                if first[_RUN_POS] == last[_RUN_POS] and is_bridge(first[_RUN_POS], mid):
+                    first[_RUN_END] = last[_RUN_END]
+                    del out[-2:]
+                    merges += 1
+        return out, merges
+
+    runs, merges_a = sweep(runs, lambda pos, mid: (
+        pos != "Not Relevant" and mid[_RUN_POS] == "Not Relevant"
+        and (mid[_RUN_END] - mid[_RUN_START] + 1) < nr_gap_limit))
+    runs, merges_a2 = sweep(runs, lambda pos, mid: (
+        pos in _ORAL_POSITIONS and mid[_RUN_POS] in _PENETRATION_POSITIONS
+        and (mid[_RUN_END] - mid[_RUN_START] + 1) < penetration_limit))
+    return runs, merges_a, merges_a2
+
+
+def _sweep_adjacent_runs(runs: List[list], merge_identical: bool, merge_oral: bool) -> Tuple[List[list], int]:
+    """
+    Single stack sweep merging neighbors that are identical (``merge_identical``)
+    and/or both Handjob/Blowjob (``merge_oral``, relabelled as Blowjob).
+    """
+    out = []
+    merges = 0
+    for run in runs:
+        if out:
+            prev = out[-1]
+            pos1, pos2 = prev[_RUN_POS], run[_RUN_POS]
+            oral_pair = merge_oral and pos1 in _ORAL_POSITIONS and pos2 in _ORAL_POSITIONS
+            if oral_pair or (merge_identical and pos1 == pos2):
+                if oral_pair:
+                    prev[_RUN_POS] = 'Blowjob'
+                prev[_RUN_END] = run[_RUN_END]
+                merges += 1
                 continue
-            i += 1
+        out.append(run)
+    return out, merges
 
-        # --- Rule C: Merge any remaining identical adjacent segments ---
-        i = 0
-        while i < len(segments) - 1:
-            if segments[i].major_position == segments[i + 1].major_position:
-                if logger:
-                    logger.debug(f"Rule C: Merging adjacent identicals: {segments[i].major_position}")
-                segments[i].end_frame_id = segments[i + 1].end_frame_id
-                segments[i].update_duration()
-                segments.pop(i + 1)
-                merges_made_in_pass += 1
-                i = 0  # Restart scan
-                continue
-            i += 1
 
-        # If a full pass of all rules resulted in no changes, the list is stable.
-        if merges_made_in_pass == 0:
-            if logger:
-                logger.debug("Pass 2 (Iterative Merging) stabilized.")
-            break
+def _absorb_short_runs(runs: List[list], min_duration: int) -> Tuple[List[list], int]:
+    """
+    Merges every run shorter than ``min_duration`` into a neighbor, preferring a
+    Blowjob neighbor and otherwise the longer one. Runs to the left of the one being
+    examined are never short, so a single left-to-right pass matches rescanning from
+    the start after every merge.
+    """
+    if len(runs) < 2:
+        return runs, 0
+    out = []
+    merges = 0
+    n = len(runs)
+    for k in range(n):
+        run = runs[k]
+        if run[_RUN_END] - run[_RUN_START] + 1 >= min_duration:
+            out.append(run)
+            continue
+        prev = out[-1] if out else None
+        nxt = runs[k + 1] if k + 1 < n else None
+        if prev is None and nxt is None:  # Everything else was absorbed into this run
+            out.append(run)
+            continue
+        prev_dur = prev[_RUN_END] - prev[_RUN_START] + 1 if prev is not None else -1
+        next_dur = nxt[_RUN_END] - nxt[_RUN_START] + 1 if nxt is not None else -1
+        prev_is_bj = prev is not None and prev[_RUN_POS] == 'Blowjob'
+        next_is_bj = nxt is not None and nxt[_RUN_POS] == 'Blowjob'
+
+        if prev_is_bj and not next_is_bj:
+            into_prev = True
+        elif next_is_bj and not prev_is_bj:
+            into_prev = False
+        else:
+            into_prev = prev_dur >= next_dur
 
-    # --- Pass 3: Final Cleanup & Gap Filling ---
+        if into_prev:
+            prev[_RUN_END] = run[_RUN_END]
+        else:
+            nxt[_RUN_START] = run[_RUN_START]
+        merges += 1
+    return out, merges
 
-    # First, cleanup any remaining short segments (<10s) by merging them into their longest neighbor.
-    min_duration_10s = int(fps * 10)
-    i = 0
-    while i < len(segments):
-        if segments[i].duration < min_duration_10s:
-            prev_dur = segments[i - 1].duration if i > 0 else -1
-            next_dur = segments[i + 1].duration if i < len(segments) - 1 else -1
 
-            if prev_dur == -1 and next_dur == -1:  # It's the only segment
-                break
+def _aggregate_segments(frame_objects: List[FrameObject], fps: float, min_segment_duration_frames: int,
+                            logger: logging.Logger) -> List[Segment]:
+    """
+    Aggregates frame data into a final, stable list of segments.
 
-            # Prefer merging short segments into a Blowjob neighbor if present to reduce BJ -> CG mislabels
-            prev_is_bj = (i > 0 and segments[i - 1].major_position == 'Blowjob')
-            next_is_bj = (i < len(segments) - 1 and segments[i + 1].major_position == 'Blowjob')
+    Works on run-length encoded [start, end, position] runs: each merge rule is a
+    single linear stack sweep, and the rule set is repeated until a full pass makes
+    no merges (in practice two or three passes). Segment objects are only built for
+    the final runs, keeping the ids the per-change segments would have had.
+    """
+    if not frame_objects:
+        return []
 
-            if prev_is_bj and not next_is_bj:
-                target = 'prev'
-            elif next_is_bj and not prev_is_bj:
-                target = 'next'
-            else:
-                # Fall back to longest neighbor
-                target = 'prev' if prev_dur >= next_dur else 'next'
+    debug = logger is not None and logger.isEnabledFor(logging.DEBUG)
+    first_id = BaseSegment._id_counter
 
-            if target == 'prev':  # Merge into previous neighbor
-                if logger:
-                    logger.debug(f"Pass 3: Cleaning up short segment ({segments[i].major_position}) by merging into previous.")
-                segments[i - 1].end_frame_id = segments[i].end_frame_id
-                segments[i - 1].update_duration()
-                segments.pop(i)
-                i = 0  # Restart scan from the beginning after a merge
-                continue
-            else:  # Merge into next neighbor
-                if logger:
-                    logger.debug(f"Pass 3: Cleaning up short segment ({segments[i].major_position}) by merging into next.")
-                segments[i + 1].start_frame_id = segments[i].start_frame_id
-                segments[i + 1].update_duration()
-                segments.pop(i)
-                i = 0  # Restart scan
-                continue
-        i += 1
+    # --- Pass 1: One run per change in position. ---
+    runs = _position_runs(frame_objects, first_id)
+    next_id = first_id + len(runs)
+    if debug:
+        logger.debug(f"Pass 1 (Initial Creation) generated {len(runs)} granular segments.")
 
-    # Second, fill any remaining gaps with "Not Relevant" segments for a gapless timeline.
-    final_segments: List[Segment] = []
+    # --- Pass 2: Repeat the merging rules until a full pass makes no merges. ---
+    while True:
+        runs, merges_a, merges_a2 = _sweep_bridge_runs(runs, fps)
+        # Rule B: adjacent Handjob/Blowjob -> Blowjob
+        runs, merges_b = _sweep_adjacent_runs(runs, merge_identical=False, merge_oral=True)
+        # Rule C: remaining identical neighbors
+        runs, merges_c = _sweep_adjacent_runs(runs, merge_identical=True, merge_oral=False)
+        if debug:
+            logger.debug(f"Pass 2 merges: A={merges_a}, A2={merges_a2}, B={merges_b}, C={merges_c}")
+        if merges_a + merges_a2 + merges_b + merges_c == 0:
+            break
+
+    # --- Pass 3: Absorb short segments (<10s), then fill gaps with "Not Relevant". ---
+    runs, merges_short = _absorb_short_runs(runs, int(fps * 10))
+    if debug:
+        logger.debug(f"Pass 3: absorbed {merges_short} short segments.")
+
+    filled_runs = []
     last_end_frame = -1
-    for seg in segments:
-        if seg.start_frame_id > last_end_frame + 1:
-            final_segments.append(Segment(last_end_frame + 1, seg.start_frame_id - 1, "Not Relevant"))
-        final_segments.append(seg)
-        last_end_frame = seg.end_frame_id
+    for run in runs:
+        if run[_RUN_START] > last_end_frame + 1:
+            filled_runs.append([last_end_frame + 1, run[_RUN_START] - 1, "Not Relevant", next_id])
+            next_id += 1
+        filled_runs.append(run)
+        last_end_frame = run[_RUN_END]
 
     # --- Pass 4: Final merging of adjacent segments of same type or HJ/BJ ---
-    while True:
-        merges_made = 0
-        i = 0
-        while i < len(final_segments) - 1:
-            pos1, pos2 = final_segments[i].major_position, final_segments[i + 1].major_position
-
-            # Check if segments are same type or HJ/BJ combination
-            if pos1 == pos2 or {pos1, pos2} <= {'Handjob', 'Blowjob'}:
-                if logger:
-                    logger.debug(f"Pass 4: Merging adjacent '{pos1}' and '{pos2}' segments.")
-                # For HJ/BJ combination, use 'Blowjob' as the merged type
-                if {pos1, pos2} <= {'Handjob', 'Blowjob'}:
-                    final_segments[i].major_position = 'Blowjob'
-                final_segments[i].end_frame_id = final_segments[i + 1].end_frame_id
-                final_segments[i].update_duration()
-                final_segments.pop(i + 1)
-                merges_made += 1
-                i = 0  # Restart scan after modification
-                continue
-            i += 1
+    filled_runs, merges_final = _sweep_adjacent_runs(filled_runs, merge_identical=True, merge_oral=True)
+    if debug:
+        logger.debug(f"Pass 4: {merges_final} final merges.")
 
-        if merges_made == 0:
-            if logger:
-                logger.debug("Pass 4 (Final Merging) stabilized.")
-            break
+    final_segments: List[Segment] = []
+    for start, end, position, segment_id in filled_runs:
+        seg = Segment(start, end, position)
+        seg.id = segment_id
+        final_segments.append(seg)
+    BaseSegment._id_counter = next_id
 
-    if logger:
+    if debug:
         logger.debug(f"Final, clean segment count: {len(final_segments)}")
     return final_segments
 
@@ -523,57 +582,41 @@ def _apply_signal_enhancement(app, frame_objects: List[FrameObject], logger: Opt
     if logger:
         logger.debug(f"Applying signal enhancement to {n_frames} frames")
     
-    enhanced_count = 0
-    
-    # Cache property access and precompute where possible
-    frame_data = []
-    for frame_obj in frame_objects:
-        if frame_obj.locked_penis_state.active and frame_obj.locked_penis_state.box:
-            box = frame_obj.locked_penis_state.box
-            # Precompute center coordinates
-            cx = (box[0] + box[2]) / 2
-            cy = (box[1] + box[3]) / 2
-            frame_data.append((frame_obj.funscript_distance, cx, cy))
-        else:
-            frame_data.append((frame_obj.funscript_distance, None, None))
-    
-    # Process frames in pairs to reduce redundant calculations
-    for i in range(1, n_frames):
-        curr_distance, curr_cx, curr_cy = frame_data[i]
-        prev_distance, prev_cx, prev_cy = frame_data[i-1]
-        
-        # Check for motion
-        motion_detected = False
-        if curr_cx is not None and prev_cx is not None:
-            # Use squared distance to avoid sqrt calculation
-            dx = curr_cx - prev_cx
-            dy = curr_cy - prev_cy
-            squared_movement = dx*dx + dy*dy
-            # Compare squared distances (25 = 5^2)
-            motion_detected = squared_movement > 25.0
-        
-        # Apply enhancement logic
-        signal_change = abs(curr_distance - prev_distance)
-        enhanced_signal = curr_distance
-        
-        # False stroke suppression: large signal change but no motion
-        if signal_change > 8 and not motion_detected:
-            # Reduce signal change by 40%
-            change_direction = 1 if curr_distance > prev_distance else -1
-            reduced_change = int(signal_change * 0.6)
-            enhanced_signal = prev_distance + (change_direction * reduced_change)
-            enhanced_count += 1
-        
-        # Missing stroke detection: motion but small signal change
-        elif motion_detected and signal_change < 5:
-            # Add small boost based on motion
-            boost = 8  # Small boost
-            direction = 1 if i % 2 == 0 else -1  # Alternate direction for oscillation
-            enhanced_signal = curr_distance + (direction * boost)
-            enhanced_count += 1
-        
-        # Apply enhanced signal
-        frame_objects[i].funscript_distance = int(np.clip(enhanced_signal, 0, 100))
+    # Distance and locked-box columns; frames without an active lock have no centre
+    distances = np.array([fo.funscript_distance for fo in frame_objects])
+    has_center = np.array([bool(fo.locked_penis_state.active and fo.locked_penis_state.box)
+                           for fo in frame_objects], dtype=bool)
+    boxes = np.array([fo.locked_penis_state.box for fo, ok in zip(frame_objects, has_center) if ok]).reshape(-1, 4)
+    # Keep the boxes' precision so the motion test rounds like the per-frame version did
+    cx = np.full(n_frames, np.nan, dtype=np.result_type(boxes.dtype, np.float32))
+    cy = np.full(n_frames, np.nan, dtype=cx.dtype)
+    cx[has_center] = (boxes[:, 0] + boxes[:, 2]) / 2
+    cy[has_center] = (boxes[:, 1] + boxes[:, 3]) / 2
+
+    # Each frame is compared with the previous frame's original value, so all pairs
+    # are independent and evaluated at once
+    curr, prev = distances[1:], distances[:-1]
+    dx = cx[1:] - cx[:-1]
+    dy = cy[1:] - cy[:-1]
+    # Squared movement vs 25 = 5^2; NaN (missing centre) compares False
+    motion_detected = (dx * dx + dy * dy) > 25.0
+    signal_change = np.abs(curr - prev)
+
+    # False stroke suppression: large signal change but no motion -> reduce change by 40%
+    suppress = (signal_change > 8) & ~motion_detected
+    # Missing stroke detection: motion but small signal change -> small alternating boost
+    boost = ~suppress & motion_detected & (signal_change < 5)
+
+    change_direction = np.where(curr > prev, 1, -1)
+    reduced_change = np.trunc(signal_change * 0.6)
+    boost_direction = np.where(np.arange(1, n_frames) % 2 == 0, 1, -1)
+    enhanced_signal = np.where(suppress, prev + change_direction * reduced_change,
+                               np.where(boost, curr + boost_direction * 8, curr))
+    enhanced_count = int(np.count_nonzero(suppress | boost))
+
+    # Apply enhanced signal
+    for fo, value in zip(frame_objects[1:], np.trunc(np.clip(enhanced_signal, 0, 100)).astype(np.int64).tolist()):
+        fo.funscript_distance = value
     
     if logger:
         logger.debug(f"Enhanced {enhanced_count} frame signals out of {n_frames}")
@@ -630,16 +673,19 @@ def resilient_tracker_step0(app, frames: List, video_info: Dict, logger: Optiona
 
     # Recently-dead buffer
     RECENT_DEAD_FRAMES = int(fps * 0.5)  # 0.5 sec
-    recently_dead = []  # list of (frame_id, bbox, class_name)
+    recently_dead = deque()  # (frame_id, bbox, class_name), oldest first
 
     next_global_track_id = 1
     active_tracks = {}    # id -> {box_rec, frames_unseen, class_name, status}
     lost_tracks = {}
     tentative_tracks = {} # id -> same structure as active_tracks
 
+    # Association works on per-class cost matrices: gating is evaluated for all
+    # track/detection pairs at once and pairs are assigned globally, best score first.
     for frame_obj in sorted(frames, key=lambda f: f.frame_id):
         current_detections = [b for b in frame_obj.boxes if not b.is_excluded]
-        unmatched_detections = list(range(len(current_detections)))
+        unmatched = set(range(len(current_detections)))
+        det_class = lambda i: current_detections[i].class_name
 
         # --- 1. Age existing tracks ---
         to_lost = []
@@ -653,8 +699,9 @@ def resilient_tracker_step0(app, frames: List, video_info: Dict, logger: Optiona
             lost_tracks[tid]["status"] = "lost"
             recently_dead.append((frame_obj.frame_id, lost_tracks[tid]["box_rec"].bbox.copy(), lost_tracks[tid]["class_name"]))
 
-        # Prune recently_dead buffer
-        recently_dead = [(fid, bb, cn) for (fid, bb, cn) in recently_dead if frame_obj.frame_id - fid <= RECENT_DEAD_FRAMES]
+        # Prune recently_dead buffer (entries are appended in frame order)
+        while recently_dead and frame_obj.frame_id - recently_dead[0][0] > RECENT_DEAD_FRAMES:
+            recently_dead.popleft()
 
         # Delete old lost tracks
         to_delete = []
@@ -665,83 +712,85 @@ def resilient_tracker_step0(app, frames: List, video_info: Dict, logger: Optiona
         for tid in to_delete:
             del lost_tracks[tid]
 
-        # --- 2. Match Active Tracks ---
-        for track_id, td in list(active_tracks.items()):
-            best_idx, max_iou = -1, -1
-            class_name = td["class_name"]
-            thr = CLASS_SPECIFIC_IOU.get(class_name, IOU_THRESHOLD)
-
-            for i in unmatched_detections:
-                det = current_detections[i]
-                if det.class_name != class_name:
-                    continue
-                iou = _calculate_iou(td["box_rec"].bbox, det.bbox)
-
-                # Velocity gating
-                jump_dist = np.linalg.norm([det.cx - td["box_rec"].cx, det.cy - td["box_rec"].cy])
-                max_jump = max(td["box_rec"].width, td["box_rec"].height) * 1.5
-                if jump_dist > max_jump:
-                    continue
-
-                # Size consistency
-                size_ratio = min(det.width / td["box_rec"].width, det.height / td["box_rec"].height)
-                if not (0.7 <= size_ratio <= 1.3):
-                    continue
-
-                if iou > thr and iou > max_iou:
-                    max_iou = iou
-                    best_idx = i
-
-            if best_idx != -1:
-                det = current_detections[best_idx]
-                det.track_id = track_id
-                td["box_rec"] = det
-                td["frames_unseen"] = 0
-                unmatched_detections.remove(best_idx)
-
-        # --- 3. Re-Identify Lost Tracks ---
-        for i in list(unmatched_detections):
-            det = current_detections[i]
-            best_lost_id, min_score = -1, float('inf')
-            for tid, td in lost_tracks.items():
-                if td["class_name"] != det.class_name:
+        # --- 2. Match Active Tracks (IoU with velocity and size gating) ---
+        if active_tracks and unmatched:
+            dets_by_class = _group_indices_by_class(sorted(unmatched), det_class)
+            tracks_by_class = _group_indices_by_class(list(active_tracks), lambda t: active_tracks[t]["class_name"])
+            for class_name, track_ids in tracks_by_class.items():
+                det_indices = dets_by_class.get(class_name)
+                if not det_indices:
                     continue
-                dist = np.linalg.norm([det.cx - td["box_rec"].cx, det.cy - td["box_rec"].cy])
-                reid_thr = REID_DISTANCE_FACTOR * min(td["box_rec"].width, td["box_rec"].height)
-                if dist > reid_thr:
-                    continue
-                size_ratio = min(det.width / td["box_rec"].width, det.height / td["box_rec"].height)
-                if not (0.7 <= size_ratio <= 1.3):
+                tracks = _box_geometry([active_tracks[t]["box_rec"] for t in track_ids])
+                dets = _box_geometry([current_detections[i] for i in det_indices])
+
+                iou = _iou_matrix(tracks['bbox'], dets['bbox'])
+                max_jump = np.maximum(tracks['width'], tracks['height'])[:, None] * 1.5
+                size_ratio = _size_ratio_matrix(tracks, dets)
+                feasible = ((_center_distance_matrix(tracks, dets) <= max_jump)
+                            & (size_ratio >= 0.7) & (size_ratio <= 1.3)
+                            & (iou > CLASS_SPECIFIC_IOU.get(class_name, IOU_THRESHOLD)))
+
+                for r, c in _greedy_assignment(iou, feasible, maximize=True):
+                    track_id, det_idx = track_ids[r], det_indices[c]
+                    td = active_tracks[track_id]
+                    det = current_detections[det_idx]
+                    det.track_id = track_id
+                    td["box_rec"] = det
+                    td["frames_unseen"] = 0
+                    unmatched.discard(det_idx)
+
+        # --- 3. Re-Identify Lost Tracks (nearest center within a size-relative radius) ---
+        if lost_tracks and unmatched:
+            dets_by_class = _group_indices_by_class(sorted(unmatched), det_class)
+            tracks_by_class = _group_indices_by_class(list(lost_tracks), lambda t: lost_tracks[t]["class_name"])
+            for class_name, track_ids in tracks_by_class.items():
+                det_indices = dets_by_class.get(class_name)
+                if not det_indices:
                     continue
-                score = dist
-                if score < min_score:
-                    min_score = score
-                    best_lost_id = tid
-
-            if best_lost_id != -1:
-                det.track_id = best_lost_id
-                reactivated = lost_tracks.pop(best_lost_id)
-                reactivated["box_rec"] = det
-                reactivated["frames_unseen"] = 0
-                active_tracks[best_lost_id] = reactivated
-                unmatched_detections.remove(i)
+                tracks = _box_geometry([lost_tracks[t]["box_rec"] for t in track_ids])
+                dets = _box_geometry([current_detections[i] for i in det_indices])
+
+                dist = _center_distance_matrix(tracks, dets)
+                reid_thr = REID_DISTANCE_FACTOR * np.minimum(tracks['width'], tracks['height'])[:, None]
+                size_ratio = _size_ratio_matrix(tracks, dets)
+                feasible = (dist <= reid_thr) & (size_ratio >= 0.7) & (size_ratio <= 1.3)
+
+                for r, c in _greedy_assignment(dist, feasible, maximize=False):
+                    track_id, det_idx = track_ids[r], det_indices[c]
+                    det = current_detections[det_idx]
+                    det.track_id = track_id
+                    reactivated = lost_tracks.pop(track_id)
+                    reactivated["box_rec"] = det
+                    reactivated["frames_unseen"] = 0
+                    active_tracks[track_id] = reactivated
+                    unmatched.discard(det_idx)
 
         # --- 4. Update Tentative Tracks ---
-        for tid, td in list(tentative_tracks.items()):
-            matched = False
-            for i in unmatched_detections:
-                det = current_detections[i]
-                if det.class_name != td["class_name"]:
+        matched_tentative = set()
+        if tentative_tracks and unmatched:
+            dets_by_class = _group_indices_by_class(sorted(unmatched), det_class)
+            tracks_by_class = _group_indices_by_class(list(tentative_tracks), lambda t: tentative_tracks[t]["class_name"])
+            for class_name, track_ids in tracks_by_class.items():
+                det_indices = dets_by_class.get(class_name)
+                if not det_indices:
                     continue
-                iou = _calculate_iou(td["box_rec"].bbox, det.bbox)
-                if iou > CLASS_SPECIFIC_IOU.get(td["class_name"], IOU_THRESHOLD):
-                    det.track_id = tid
+                tracks = _box_geometry([tentative_tracks[t]["box_rec"] for t in track_ids])
+                dets = _box_geometry([current_detections[i] for i in det_indices])
+                iou = _iou_matrix(tracks['bbox'], dets['bbox'])
+                feasible = iou > CLASS_SPECIFIC_IOU.get(class_name, IOU_THRESHOLD)
+
+                for r, c in _greedy_assignment(iou, feasible, maximize=True):
+                    track_id, det_idx = track_ids[r], det_indices[c]
+                    td = tentative_tracks[track_id]
+                    det = current_detections[det_idx]
+                    det.track_id = track_id
                     td["box_rec"] = det
                     td["frames_seen"] += 1
-                    matched = True
-                    unmatched_detections.remove(i)
-                    break
-            if not matched:
+                    matched_tentative.add(track_id)
+                    unmatched.discard(det_idx)
+
+        for tid, td in list(tentative_tracks.items()):
+            if tid not in matched_tentative:
                 td["frames_unseen"] += 1
                 if td["frames_unseen"] > 2:
                     del tentative_tracks[tid]
@@ -750,16 +799,19 @@ def resilient_tracker_step0(app, frames: List, video_info: Dict, logger: Optiona
                 active_tracks[tid] = tentative_tracks.pop(tid)
 
         # --- 5. Create New Tentative Tracks ---
-        new_tracks = 0
-        for i in unmatched_detections:
-            det = current_detections[i]
-            if new_tracks >= MAX_NEW_TRACKS_PER_FRAME:
-                break
-            if det.confidence < 0.4:
-                continue
+        candidates = [i for i in sorted(unmatched) if current_detections[i].confidence >= 0.4]
+        if candidates and recently_dead:
             # Prevent recreation from recently_dead
-            if any(det.class_name == cn and _calculate_iou(det.bbox, bb) > 0.5 for (_, bb, cn) in recently_dead):
-                continue
+            dead_boxes = np.array([bb for (_, bb, _) in recently_dead], dtype=np.float64).reshape(-1, 4)
+            dead_classes = np.array([cn for (_, _, cn) in recently_dead])
+            cand_boxes = _box_geometry([current_detections[i] for i in candidates])['bbox']
+            cand_classes = np.array([current_detections[i].class_name for i in candidates])
+            overlaps_dead = ((_iou_matrix(cand_boxes, dead_boxes) > 0.5)
+                             & (cand_classes[:, None] == dead_classes[None, :])).any(axis=1)
+            candidates = [i for i, blocked in zip(candidates, overlaps_dead.tolist()) if not blocked]
+
+        for i in candidates[:MAX_NEW_TRACKS_PER_FRAME]:
+            det = current_detections[i]
             det.track_id = next_global_track_id
             tentative_tracks[next_global_track_id] = {
                 "box_rec": det,
@@ -769,7 +821,6 @@ def resilient_tracker_step0(app, frames: List, video_info: Dict, logger: Optiona
                 "status": "tentative"
             }
             next_global_track_id += 1
-            new_tracks += 1
 
         # --- 6. Enforce Exclusive Class Overlaps ---
         # Resolve conflicts by keeping highest-confidence track
@@ -1168,115 +1219,168 @@ def pass_2_preliminary_height_estimation(app, frames: List, video_info: Dict, vr
         logger.debug("Preliminary height estimation complete.")
 
 
+INTERACTION_CONTEXTS = ('unknown', 'other', 'penetration')
+
+
+def _height_kalman_predictions(measurements: np.ndarray, predict_mask: np.ndarray) -> np.ndarray:
+    """
+    Closed-form replay of the (height, velocity) filter pass 3 ran through
+    cv2.KalmanFilter(2, 1) with H = [1, 0], A = [[1, 1], [0, 1]], Q = 0.01 I, R = 0.1.
+
+    OpenCV semantics are kept: correct() starts from the prior of the last predict()
+    (all zeros before the first one) and predict() copies the prior into the posterior.
+    Values are rounded to float32 wherever OpenCV stores a matrix, but OpenCV evaluates
+    its matrix products in a different order, so predictions are equivalent within
+    float tolerance rather than identical (differences up to about 2e-4 px;
+    tests/test_stage2_height_kalman.py checks 1e-3 px). predict() only runs while the
+    lock is active and the lock activates on a frame that also calls correct(), so the
+    initial posterior and the posterior reset on activation are always overwritten
+    before use.
+
+    Args:
+        measurements: Heights passed to correct(), NaN on frames without a correction
+        predict_mask: Frames on which predict() runs (after that frame's correction)
+
+    Returns:
+        float32 predicted heights, NaN on frames without a prediction
+    """
+    scratch = array('f', [0.0])
+
+    def f32(value: float) -> float:
+        scratch[0] = value  # Rounds to nearest float32
+        return scratch[0]
+
+    q, r = f32(0.01), f32(0.1)
+    # Prior (statePre / errorCovPre) and posterior (statePost / errorCovPost)
+    pre_h = pre_v = 0.0
+    pre_p00 = pre_p01 = pre_p10 = pre_p11 = 0.0
+    h = v = 0.0
+    p00 = p01 = p10 = p11 = 0.0
+
+    predictions = np.full(len(measurements), np.nan, dtype=np.float32)
+    has_measurement = ~np.isnan(measurements)
+    for i in np.flatnonzero(has_measurement | predict_mask):
+        if has_measurement[i]:
+            s = f32(pre_p00 + r)
+            k0, k1 = f32(pre_p00 / s), f32(pre_p01 / s)
+            innovation = f32(float(measurements[i]) - pre_h)
+            h, v = f32(pre_h + k0 * innovation), f32(pre_v + k1 * innovation)
+            p00, p01 = f32(pre_p00 - k0 * pre_p00), f32(pre_p01 - k0 * pre_p01)
+            p10, p11 = f32(pre_p10 - k1 * pre_p00), f32(pre_p11 - k1 * pre_p01)
+        if predict_mask[i]:
+            pre_h, pre_v = f32(h + v), v
+            t00, t01 = f32(p00 + p10), f32(p01 + p11)
+            pre_p00, pre_p01 = f32(t00 + t01 + q), t01
+            pre_p10, pre_p11 = f32(p10 + p11), f32(p11 + q)
+            h, v = pre_h, pre_v
+            p00, p01, p10, p11 = pre_p00, pre_p01, pre_p10, pre_p11
+            predictions[i] = pre_h
+    return predictions
+
+
 def pass_3_kalman_and_lock_state(app, frames: List, video_info: Dict, yolo_input_size: int, vr_vertical_third_filter: bool, logger: Optional[logging.Logger]):
     """
     REFACTORED: This pass now only manages the lock state (active/inactive) and
     calculates the Kalman-filtered VISIBLE penis box. It no longer creates the
     full conceptual box, as the final max_height is not yet known.
+
+    All boxes are stacked into one detection table. The lock selection depends on
+    the previous frame, so it walks the frames once over table rows; contact
+    classification then runs over the whole table at once and the height filter
+    is replayed from the collected measurements. Per-frame results are gathered in arrays and written to the
+    FrameObjects in a final pass; the arrays are also returned.
     """
     if logger:
         logger.debug("Starting Stage 2 Pass 3: Kalman Filter and Lock State")
-    fps, yolo_size = video_info.get('fps', 30.0), yolo_input_size
+    fps = video_info.get('fps', 30.0)
+    video_type = video_info.get('actual_video_type', '2D')
+    is_vr = video_type == 'VR'
+    pelvis_zone_indices = [11, 12]  # Left and Right Hip
+    PENIS_PATIENCE = int(fps * 0.5)  # How many frames to hold onto a lock without seeing it
+
+    # --- Detection table: every box of every frame, in frame order ---
+    n_frames = len(frames)
+    all_boxes = [b for frame_obj in frames for b in frame_obj.boxes]
+    box_counts = np.fromiter((len(frame_obj.boxes) for frame_obj in frames), dtype=np.int64, count=n_frames)
+    box_frame = np.repeat(np.arange(n_frames), box_counts)
+    box_table = np.array([b.bbox for b in all_boxes], dtype=np.float32).reshape(-1, 4)
+    box_classes = [b.class_name for b in all_boxes]
+    is_candidate = np.array([name == constants.PENIS_CLASS_NAME and not b.is_excluded
+                             for name, b in zip(box_classes, all_boxes)], dtype=bool)
+    box_coords = list(map(tuple, box_table))  # float32 scalars, as _calculate_iou gets from BoxRecord.bbox
+    candidate_rows_by_frame = [[] for _ in range(n_frames)]
+    for row in np.flatnonzero(is_candidate).tolist():
+        candidate_rows_by_frame[box_frame[row]].append(row)
+    row_of_box = {id(b): row for row, b in enumerate(all_boxes)}
+
+    # --- Per-frame results ---
+    selected_row = np.full(n_frames, -1, dtype=np.int64)  # Table row of the selected penis
+    raw_box_row = np.full(n_frames, -1, dtype=np.int64)  # Table row of the last known penis
+    lock_active = np.zeros(n_frames, dtype=bool)
+    lock_deactivated = np.zeros(n_frames, dtype=bool)
+    measured_height = np.full(n_frames, np.nan, dtype=np.float32)
+
     # --- State variables for the loop ---
     current_lp_active = False
-    current_lp_last_raw_box_coords: Optional[Tuple[float, ...]] = None
     current_lp_consecutive_detections = 0
     current_lp_consecutive_non_detections = 0
-    last_known_interaction_type = 'unknown'  # Tracks context: 'penetration', 'other', or 'unknown'
-    last_known_penis_box: Optional[BoxRecord] = None
-
-    # --- Kalman Filter Setup ---
-    kf_height = cv2.KalmanFilter(2, 1)
-    kf_height.measurementMatrix = np.array([[1, 0]], np.float32)
-    kf_height.transitionMatrix = np.array([[1, 1], [0, 1]], np.float32)
-    kf_height.processNoiseCov = np.eye(2, dtype=np.float32) * 0.01
-    kf_height.measurementNoiseCov = np.eye(1, dtype=np.float32) * 0.1
-    kf_height.errorCovPost = np.eye(2, dtype=np.float32) * 1.0
-    kf_height.statePost = np.array([[yolo_size * 0.1], [0]], dtype=np.float32)
-
+    last_known_row = -1
+    locked_row = -1  # Stable penis lock (table row)
+    unseen_frames = 0
     last_frame_dominant_pose: Optional[PoseRecord] = None
-    is_vr = video_info.get('actual_video_type', '2D') == 'VR'
-    pelvis_zone_indices = [11, 12]  # Left and Right Hip
 
-    # --- Global state for locked penis ---
-    locked_penis_tracker = {'box_rec': None, 'unseen_frames': 0}
-    PENIS_PATIENCE = int(fps * 0.5)  # How many frames to hold onto a lock without seeing it
-
-    for frame_obj in frames:
+    for i, frame_obj in enumerate(frames):
         dominant_pose_this_frame = _get_dominant_pose(frame_obj, is_vr, yolo_input_size)
         if dominant_pose_this_frame:
             frame_obj.dominant_pose_id = dominant_pose_this_frame.id
 
-        penis_candidates = [b for b in frame_obj.boxes if
-                            b.class_name == constants.PENIS_CLASS_NAME and not b.is_excluded]
-        selected_penis_box_rec = None
+        candidate_rows = candidate_rows_by_frame[i]
+        sel_row = -1
 
         # --- Stable Penis Selection Logic ---
         # 1. Try to find the previously locked penis via IoU
-        if locked_penis_tracker['box_rec']:
+        if locked_row >= 0:
             best_iou = 0
-            best_candidate = None
-            for cand in penis_candidates:
-                iou = _calculate_iou(locked_penis_tracker['box_rec'].bbox, cand.bbox)
+            for row in candidate_rows:
+                iou = _calculate_iou(box_coords[locked_row], box_coords[row])
                 if iou > best_iou:
                     best_iou = iou
-                    best_candidate = cand
+                    sel_row = row
             if best_iou > 0.1:  # Generous IoU threshold to maintain lock
-                selected_penis_box_rec = best_candidate
-                locked_penis_tracker['box_rec'] = selected_penis_box_rec
-                locked_penis_tracker['unseen_frames'] = 0
+                locked_row = sel_row
+                unseen_frames = 0
             else:
-                locked_penis_tracker['unseen_frames'] += 1
+                sel_row = -1
+                unseen_frames += 1
 
         # 2. If no IoU match, get the preferred (new) penis
-        if not selected_penis_box_rec:
-            preferred_penis = frame_obj.get_preferred_penis_box(video_info.get('actual_video_type', '2D'),
-                                                                vr_vertical_third_filter)
-            if preferred_penis:
-                # Only switch if the old lock is lost or this new one is significantly better
-                if locked_penis_tracker['unseen_frames'] > PENIS_PATIENCE or not locked_penis_tracker['box_rec']:
-                    selected_penis_box_rec = preferred_penis
-                    locked_penis_tracker['box_rec'] = selected_penis_box_rec
-                    locked_penis_tracker['unseen_frames'] = 0
+        if sel_row < 0 and candidate_rows:
+            # Only switch if the old lock is lost or this new one is significantly better
+            if unseen_frames > PENIS_PATIENCE or locked_row < 0:
+                preferred_penis = frame_obj.get_preferred_penis_box(video_type, vr_vertical_third_filter)
+                if preferred_penis:
+                    sel_row = row_of_box[id(preferred_penis)]
+                    locked_row = sel_row
+                    unseen_frames = 0
 
         # Reset lock if patient has run out
-        if locked_penis_tracker['box_rec'] and locked_penis_tracker['unseen_frames'] > PENIS_PATIENCE:
-            locked_penis_tracker['box_rec'] = None
+        if locked_row >= 0 and unseen_frames > PENIS_PATIENCE:
+            locked_row = -1
 
-        # --- CONTEXT-AWARE LOCK AND INFERENCE LOGIC (uses the now stable selected_penis_box_rec) ---
-        if selected_penis_box_rec:
-            last_known_penis_box = selected_penis_box_rec
+        # --- LOCK STATE (uses the now stable selection) ---
+        if sel_row >= 0:
+            selected_row[i] = sel_row
+            last_known_row = sel_row
             current_lp_consecutive_detections += 1
             current_lp_consecutive_non_detections = 0
-            current_lp_last_raw_box_coords = tuple(selected_penis_box_rec.bbox)
-            current_raw_height = selected_penis_box_rec.height
-
-            # Update the interaction context based on current contact
-            has_penetration_contact = False
-            has_other_contact = False
-            penetration_classes = {'pussy', 'butt', 'anus'}
-            other_classes = {'hand', 'face', 'breast', 'foot'}
-            for box_rec in frame_obj.boxes:
-                if _calculate_iou(selected_penis_box_rec.bbox, box_rec.bbox) > 0.001:
-                    if box_rec.class_name in penetration_classes:
-                        has_penetration_contact = True
-                        break
-                    elif box_rec.class_name in other_classes:
-                        has_other_contact = True
-
-            if has_penetration_contact:
-                last_known_interaction_type = 'penetration'
-            elif has_other_contact:
-                last_known_interaction_type = 'other'
 
             # Activate lock if needed
             if not current_lp_active and current_lp_consecutive_detections >= fps / 5:
                 current_lp_active = True
-                kf_height.statePost = np.array([[current_raw_height], [0]], dtype=np.float32)
                 if logger:
                     logger.debug(f"Stage 2 LP Lock ACTIVATE at frame {frame_obj.frame_id}")
 
-            kf_height.correct(np.array([[current_raw_height]], dtype=np.float32))
+            measured_height[i] = all_boxes[sel_row].height
 
         else:  # NO penis detected in this frame
             current_lp_consecutive_detections = 0
@@ -1288,30 +1392,62 @@ def pass_3_kalman_and_lock_state(app, frames: List, video_info: Dict, yolo_input
                 if dissimilarity < constants.POSE_STABILITY_THRESHOLD:
                     pose_is_stable = True
 
-            # If no box was inferred, this is a true non-detection frame.
-            if not selected_penis_box_rec:
-                if not pose_is_stable:  # Only increment non-detections if pose is also unstable
-                    current_lp_consecutive_non_detections += 1
+            if not pose_is_stable:  # Only increment non-detections if pose is also unstable
+                current_lp_consecutive_non_detections += 1
 
             if current_lp_active and current_lp_consecutive_non_detections >= (fps * 2):
                 current_lp_active = False
-                last_known_interaction_type = 'unknown'  # Reset context on lock deactivation
+                lock_deactivated[i] = True
 
-        # --- Update the frame state ---
+        lock_active[i] = current_lp_active
+        raw_box_row[i] = last_known_row
+        last_frame_dominant_pose = dominant_pose_this_frame
+
+    # --- Contact context over the whole table ---
+    # Selected penis vs. every box of its frame; penetration contact wins over other contact.
+    # The context persists until the lock deactivates.
+    paired_row = selected_row[box_frame]
+    paired = np.flatnonzero(paired_row >= 0)
+    in_contact = np.zeros(len(all_boxes), dtype=bool)
+    in_contact[paired] = _iou_rows(box_table[paired_row[paired]], box_table[paired]) > 0.001
+    penetration_classes = {'pussy', 'butt', 'anus'}
+    other_classes = {'hand', 'face', 'breast', 'foot'}
+    is_penetration = np.array([name in penetration_classes for name in box_classes], dtype=bool)
+    is_other = np.array([name in other_classes for name in box_classes], dtype=bool)
+    penetration_contact = np.bincount(box_frame[in_contact & is_penetration], minlength=n_frames) > 0
+    other_contact = np.bincount(box_frame[in_contact & is_other], minlength=n_frames) > 0
+
+    context_update = np.full(n_frames, -1, dtype=np.int8)
+    context_update[(selected_row >= 0) & other_contact] = INTERACTION_CONTEXTS.index('other')
+    context_update[(selected_row >= 0) & penetration_contact] = INTERACTION_CONTEXTS.index('penetration')
+    context_update[lock_deactivated] = INTERACTION_CONTEXTS.index('unknown')
+    last_update = np.maximum.accumulate(np.where(context_update >= 0, np.arange(n_frames), -1))
+    interaction_context = np.where(last_update >= 0, context_update[np.maximum(last_update, 0)], 0).astype(np.int8)
+
+    # --- Kalman-filtered visible height (an active lock always has a last known box) ---
+    predicted_height = _height_kalman_predictions(measured_height, lock_active)
+
+    # --- Update the frame states ---
+    for i, frame_obj in enumerate(frames):
         lp_state = frame_obj.locked_penis_state
-        lp_state.active = current_lp_active
+        lp_state.active = bool(lock_active[i])
         # Use the box from the stable tracker for last raw coords
-        if last_known_penis_box:
-            lp_state.last_raw_coords = tuple(last_known_penis_box.bbox)
+        if raw_box_row[i] >= 0:
+            lp_state.last_raw_coords = tuple(all_boxes[raw_box_row[i]].bbox)
 
-        if current_lp_active and lp_state.last_raw_coords:
-            predicted_height_kalman = kf_height.predict()[0, 0]
+        if lock_active[i] and lp_state.last_raw_coords:
             x1, _, x2, y2_raw = lp_state.last_raw_coords
-            frame_obj.penis_box_kalman = (x1, y2_raw - predicted_height_kalman, x2, y2_raw)
+            frame_obj.penis_box_kalman = (x1, y2_raw - predicted_height[i], x2, y2_raw)
         else:
             frame_obj.penis_box_kalman = None
 
-        last_frame_dominant_pose = dominant_pose_this_frame
+    return {
+        "selected_row": selected_row,
+        "raw_box_row": raw_box_row,
+        "active": lock_active,
+        "predicted_height": predicted_height,
+        "interaction_context": interaction_context,
+    }
 
 
 def _update_frames_with_aggregated_positions(frames: List[FrameObject], aggregated_segments: List[Segment], logger: Optional[logging.Logger]):
@@ -1972,20 +2108,13 @@ def _pre_scan_for_interactor_ids(frames: List, video_info: Dict, vr_vertical_thi
     return interactor_ids
 
 
-def _recover_gap_worker(args: dict) -> Tuple[List[BoxRecord], int]:
-    """
-    A worker function designed to be run in a separate process to recover a single gap.
-    It now processes a precise range from start_frame to end_frame, as determined by
-    the parent process, which handles the interruption logic.
-    """
-    gap_info = args['gap_info']
-    preprocessed_video_path = args['preprocessed_video_path']
-    yolo_input_size = args['yolo_input_size']
+# Per-process state of the OF gap recovery pool (one decoder per worker, opened once)
+_OF_RECOVERY_WORKER_STATE: Dict[str, Any] = {}
 
-    recovered_boxes = []
-    frames_processed_in_worker = 0
 
-    # Each worker needs its own VideoProcessor instance
+def _init_gap_recovery_worker(preprocessed_video_path: str, yolo_input_size: int):
+    """Pool initializer: opens the preprocessed video once for the lifetime of the worker."""
+
     class DummyAppForVP:
         def __init__(self):
             # Create a logger unique to the worker process for easier debugging
@@ -1993,131 +2122,180 @@ def _recover_gap_worker(args: dict) -> Tuple[List[BoxRecord], int]:
             self.hardware_acceleration_method = 'none'
             self.available_ffmpeg_hwaccels = ['none']
 
-    # Create a logger for validation
-    worker_logger = logging.getLogger(f"S2_OF_Worker_{os.getpid()}")
-
-    # Validate preprocessed video before using it
-    try:
-        from detection.cd.stage_1_cd import _validate_preprocessed_video_completeness
-        # Use gap info to get frame count and estimated fps
-        expected_frames = gap_info["end_frame"] - gap_info["start_frame"] + 1
-        estimated_fps = args.get('fps', 30.0)  # Get fps from args or use default
-
-        if not _validate_preprocessed_video_completeness(preprocessed_video_path, expected_frames, estimated_fps, worker_logger):
-            worker_logger.warning(f"Preprocessed video validation failed in OF worker: {os.path.basename(preprocessed_video_path)}")
-            return [], 0
-    except Exception as e:
-        worker_logger.error(f"Error validating preprocessed video in OF worker: {e}")
-        return [], 0
-
     vp = VideoProcessor(app_instance=DummyAppForVP(), yolo_input_size=yolo_input_size)
     if not vp.open_video(preprocessed_video_path):
-        return [], 0
+        logging.getLogger(f"S2_OF_Worker_{os.getpid()}").error(
+            f"OF worker could not open preprocessed video: {os.path.basename(preprocessed_video_path)}")
+        vp = None
+    _OF_RECOVERY_WORKER_STATE['vp'] = vp
+    _OF_RECOVERY_WORKER_STATE['yolo_input_size'] = yolo_input_size
 
-    try:
-        # The start frame for OF is the last known good frame
-        initial_frame_img = vp._get_specific_frame(gap_info["start_frame"] - 1)
-        if initial_frame_img is None: return [], 0
-
-        prev_gray = cv2.cvtColor(initial_frame_img, cv2.COLOR_BGR2GRAY)
-        current_tracked_box = np.array(gap_info["last_known_box"].bbox, dtype=np.float32)
-        if current_tracked_box.shape[0] != 4 or not np.all(np.isfinite(current_tracked_box)):
-            # Invalid starting box; skip recovery for this gap
-            return [], 0
-        # Use cached DIS optical flow instance (ultrafast)
-        flow_dense = _get_dis_flow_ultrafast()
-
-        # PERFORMANCE FIX: Use streaming frame access instead of individual frame requests
-        # This eliminates the FFmpeg process creation/destruction overhead per frame
-        start_frame = gap_info["start_frame"]
-        end_frame = gap_info["end_frame"]
-        num_frames_in_gap = end_frame - start_frame + 1
-        
-        # Stream consecutive frames for the entire gap range
-        for actual_frame_id, current_frame_img in vp.stream_frames_for_segment(start_frame, num_frames_in_gap):
-            frames_processed_in_worker += 1
-            if current_frame_img is None: break
 
-            current_gray = cv2.cvtColor(current_frame_img, cv2.COLOR_BGR2GRAY)
+def _advance_box_with_flow(flow_dense, prev_gray: np.ndarray, current_gray: np.ndarray,
+                           current_tracked_box: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Moves a box by the median DIS flow inside it between two gray frames.
+    Returns None when the box can no longer be tracked.
+    """
+    # Compute flow on a padded ROI around the current tracked box to reduce cost
+    h, w = prev_gray.shape
+    if not np.all(np.isfinite(current_tracked_box)):
+        return None
+    x1f, y1f, x2f, y2f = map(float, current_tracked_box)
+    # Clamp current box to valid image bounds to avoid NaN/invalid ROIs
+    x1f = max(0.0, min(x1f, float(w - 1)))
+    x2f = max(0.0, min(x2f, float(w)))
+    y1f = max(0.0, min(y1f, float(h - 1)))
+    y2f = max(0.0, min(y2f, float(h)))
+    bw = max(1.0, x2f - x1f)
+    bh = max(1.0, y2f - y1f)
+    if not np.isfinite(bw) or not np.isfinite(bh):
+        return None
+    pad_x = int(0.25 * bw)
+    pad_y = int(0.25 * bh)
+    rx1 = max(0, int(x1f) - pad_x)
+    ry1 = max(0, int(y1f) - pad_y)
+    rx2 = min(w, int(x2f) + pad_x)
+    ry2 = min(h, int(y2f) + pad_y)
+
+    if rx2 <= rx1 or ry2 <= ry1:
+        return None
 
-            # Compute flow on a padded ROI around the current tracked box to reduce cost
-            h, w = prev_gray.shape
-            if not np.all(np.isfinite(current_tracked_box)):
-                break
-            x1f, y1f, x2f, y2f = map(float, current_tracked_box)
-            # Clamp current box to valid image bounds to avoid NaN/invalid ROIs
-            x1f = max(0.0, min(x1f, float(w - 1)))
-            x2f = max(0.0, min(x2f, float(w)))
-            y1f = max(0.0, min(y1f, float(h - 1)))
-            y2f = max(0.0, min(y2f, float(h)))
-            bw = max(1.0, x2f - x1f)
-            bh = max(1.0, y2f - y1f)
-            if not np.isfinite(bw) or not np.isfinite(bh):
-                break
-            pad_x = int(0.25 * bw)
-            pad_y = int(0.25 * bh)
-            rx1 = max(0, int(x1f) - pad_x)
-            ry1 = max(0, int(y1f) - pad_y)
-            rx2 = min(w, int(x2f) + pad_x)
-            ry2 = min(h, int(y2f) + pad_y)
-
-            if rx2 <= rx1 or ry2 <= ry1:
-                break
+    prev_roi = prev_gray[ry1:ry2, rx1:rx2]
+    curr_roi = current_gray[ry1:ry2, rx1:rx2]
+    # Ensure memory is contiguous for DIS optical flow
+    prev_roi_c = np.ascontiguousarray(prev_roi)
+    curr_roi_c = np.ascontiguousarray(curr_roi)
+    try:
+        flow = flow_dense.calc(prev_roi_c, curr_roi_c, None)
+    except cv2.error:
+        # If DIS requires contiguous memory or encounters a failure, stop recovery for this gap
+        return None
+    if flow is None:
+        return None
 
-            prev_roi = prev_gray[ry1:ry2, rx1:rx2]
-            curr_roi = current_gray[ry1:ry2, rx1:rx2]
-            # Ensure memory is contiguous for DIS optical flow
-            prev_roi_c = np.ascontiguousarray(prev_roi)
-            curr_roi_c = np.ascontiguousarray(curr_roi)
-            try:
-                flow = flow_dense.calc(prev_roi_c, curr_roi_c, None)
-            except cv2.error:
-                # If DIS requires contiguous memory or encounters a failure, stop recovery for this gap
-                break
-            if flow is None:
-                break
+    # Median flow within the original (unpadded) box area mapped into ROI coords
+    bx1 = max(0, int(int(x1f) - rx1))
+    by1 = max(0, int(int(y1f) - ry1))
+    bx2 = min(flow.shape[1], int(int(x2f) - rx1))
+    by2 = min(flow.shape[0], int(int(y2f) - ry1))
+    if bx2 <= bx1 or by2 <= by1:
+        return None
 
-            # Median flow within the original (unpadded) box area mapped into ROI coords
-            bx1 = max(0, int(int(x1f) - rx1))
-            by1 = max(0, int(int(y1f) - ry1))
-            bx2 = min(flow.shape[1], int(int(x2f) - rx1))
-            by2 = min(flow.shape[0], int(int(y2f) - ry1))
-            if bx2 <= bx1 or by2 <= by1:
-                break
+    dx = float(np.median(flow[by1:by2, bx1:bx2, 0]))
+    dy = float(np.median(flow[by1:by2, bx1:bx2, 1]))
+    if not np.isfinite(dx) or not np.isfinite(dy):
+        return None
+    # Apply a small damping factor to reduce overshoot
+    damping = 0.85
+    dx *= damping
+    dy *= damping
+    # Update and clamp within image bounds
+    current_tracked_box = current_tracked_box.copy()
+    current_tracked_box += [dx, dy, dx, dy]
+    x1f, y1f, x2f, y2f = map(float, current_tracked_box)
+    x1f = max(0.0, min(x1f, float(w - 1)))
+    x2f = max(x1f + 1.0, min(x2f, float(w)))
+    y1f = max(0.0, min(y1f, float(h - 1)))
+    y2f = max(y1f + 1.0, min(y2f, float(h)))
+    return np.array([x1f, y1f, x2f, y2f], dtype=np.float32)
+
+
+def _recover_gap_cluster_worker(gaps: List[dict]) -> Tuple[List[BoxRecord], int]:
+    """
+    Recovers a cluster of gaps (sorted by start frame) from a single forward decode
+    that begins at the earliest anchor frame (the last known good frame before a gap).
+    Every decoded frame is converted to gray once and shared by all gaps that cover it;
+    each gap only carries its own tracked box from frame to frame.
+    """
+    vp = _OF_RECOVERY_WORKER_STATE.get('vp')
+    yolo_input_size = _OF_RECOVERY_WORKER_STATE.get('yolo_input_size')
+    if vp is None or not gaps:
+        return [], 0
 
-            dx = float(np.median(flow[by1:by2, bx1:bx2, 0]))
-            dy = float(np.median(flow[by1:by2, bx1:bx2, 1]))
-            if not np.isfinite(dx) or not np.isfinite(dy):
-                break
-            # Apply a small damping factor to reduce overshoot
-            damping = 0.85
-            dx *= damping
-            dy *= damping
-            # Update and clamp within image bounds
-            current_tracked_box += [dx, dy, dx, dy]
-            x1f, y1f, x2f, y2f = map(float, current_tracked_box)
-            x1f = max(0.0, min(x1f, float(w - 1)))
-            x2f = max(x1f + 1.0, min(x2f, float(w)))
-            y1f = max(0.0, min(y1f, float(h - 1)))
-            y2f = max(y1f + 1.0, min(y2f, float(h)))
-            current_tracked_box = np.array([x1f, y1f, x2f, y2f], dtype=np.float32)
-
-            new_box = BoxRecord(
-                frame_id=actual_frame_id, bbox=current_tracked_box,
-                confidence=gap_info["last_known_box"].confidence * 0.75,
-                class_id=gap_info["last_known_box"].class_id, class_name=gap_info["last_known_box"].class_name,
-                status=constants.STATUS_OF_RECOVERED, yolo_input_size=yolo_input_size,
-                track_id=gap_info["track_id"]
-            )
-            recovered_boxes.append(new_box)
-            prev_gray = current_gray
-    finally:
-        vp.stop_processing(join_thread=False)
-        del vp
+    recovered_boxes = []
+    frames_processed_in_worker = 0
+    # Use cached DIS optical flow instance (ultrafast)
+    flow_dense = _get_dis_flow_ultrafast()
+
+    decode_start = gaps[0]["start_frame"] - 1
+    decode_end = max(g["end_frame"] for g in gaps)
+    next_gap_idx = 0
+    # Gaps currently being tracked: [gap_info, current_tracked_box]
+    active = []
+    prev_gray = None
+
+    for actual_frame_id, current_frame_img in vp.stream_frames_for_segment(decode_start, decode_end - decode_start + 1):
+        if current_frame_img is None:
+            break
+        current_gray = cv2.cvtColor(current_frame_img, cv2.COLOR_BGR2GRAY)
+
+        if active:
+            still_active = []
+            for state in active:
+                gap_info = state[0]
+                frames_processed_in_worker += 1
+                new_box = _advance_box_with_flow(flow_dense, prev_gray, current_gray, state[1])
+                if new_box is None:
+                    continue
+                last_box = gap_info["last_known_box"]
+                recovered_boxes.append(BoxRecord(
+                    frame_id=actual_frame_id, bbox=new_box,
+                    confidence=last_box.confidence * 0.75,
+                    class_id=last_box.class_id, class_name=last_box.class_name,
+                    status=constants.STATUS_OF_RECOVERED, yolo_input_size=yolo_input_size,
+                    track_id=gap_info["track_id"]
+                ))
+                state[1] = new_box
+                if actual_frame_id < gap_info["end_frame"]:
+                    still_active.append(state)
+            active = still_active
+
+        # Gaps anchored on this frame start tracking from the next one
+        while next_gap_idx < len(gaps) and gaps[next_gap_idx]["start_frame"] - 1 <= actual_frame_id:
+            gap_info = gaps[next_gap_idx]
+            next_gap_idx += 1
+            if gap_info["start_frame"] - 1 < actual_frame_id:
+                continue  # Anchor frame was not decoded
+            start_box = np.array(gap_info["last_known_box"].bbox, dtype=np.float32)
+            if start_box.shape[0] != 4 or not np.all(np.isfinite(start_box)):
+                # Invalid starting box; skip recovery for this gap
+                continue
+            active.append([gap_info, start_box])
+
+        if not active and next_gap_idx >= len(gaps):
+            break
+        prev_gray = current_gray
 
     return recovered_boxes, frames_processed_in_worker
 
 
+def _cluster_recovery_gaps(gaps: List[dict]) -> List[List[dict]]:
+    """
+    Groups gaps sorted by start frame into clusters that can share one forward decode:
+    a gap joins the current cluster when its anchor frame is within
+    S2_OF_RECOVERY_BRIDGE_FRAMES of the cluster end and the cluster stays below
+    S2_OF_RECOVERY_MAX_SPAN_FRAMES.
+    """
+    clusters = []
+    current = []
+    cluster_start = cluster_end = 0
+    for gap in sorted(gaps, key=lambda g: (g["start_frame"], g["end_frame"])):
+        anchor = gap["start_frame"] - 1
+        if current and anchor <= cluster_end + constants.S2_OF_RECOVERY_BRIDGE_FRAMES \
+                and max(cluster_end, gap["end_frame"]) - cluster_start < constants.S2_OF_RECOVERY_MAX_SPAN_FRAMES:
+            current.append(gap)
+            cluster_end = max(cluster_end, gap["end_frame"])
+        else:
+            if current:
+                clusters.append(current)
+            current = [gap]
+            cluster_start, cluster_end = anchor, gap["end_frame"]
+    if current:
+        clusters.append(current)
+    return clusters
+
+
 def pass_1c_recover_lost_tracks_with_of(
         app, frames: List, video_info: Dict, yolo_input_size: int, vr_vertical_third_filter: bool,
         preprocessed_video_path_arg: str,
@@ -2224,23 +2402,21 @@ def pass_1c_recover_lost_tracks_with_of(
         return
 
     # --- Parallel Processing Setup ---
-    logger.info(f"Distributing {len(gaps_to_recover)} recovery gaps to {num_workers} worker processes.")
-
-    worker_args = [{
-        'gap_info': gap,
-        'preprocessed_video_path': preprocessed_video_path_arg,
-        'yolo_input_size': yolo_input_size,
-        'fps': fps
-    } for gap in gaps_to_recover]
+    # Gaps are sorted and clustered so nearby gaps share one forward decode; each worker
+    # keeps its decoder open across clusters. The video was validated once above.
+    gap_clusters = _cluster_recovery_gaps(gaps_to_recover)
+    logger.info(f"Distributing {len(gaps_to_recover)} recovery gaps in {len(gap_clusters)} decode clusters "
+                f"to {num_workers} worker processes.")
 
     total_frames_to_recover = sum(g['end_frame'] - g['start_frame'] + 1 for g in gaps_to_recover)
     frames_processed_count = 0
     total_boxes_added = 0
     start_time = time.time()
 
-    with multiprocessing.Pool(processes=num_workers) as pool:
+    with multiprocessing.Pool(processes=num_workers, initializer=_init_gap_recovery_worker,
+                              initargs=(preprocessed_video_path_arg, yolo_input_size)) as pool:
         # Use imap_unordered for better responsiveness as jobs finish
-        for result_boxes, frames_in_worker in pool.imap_unordered(_recover_gap_worker, worker_args):
+        for result_boxes, frames_in_worker in pool.imap_unordered(_recover_gap_cluster_worker, gap_clusters):
             frames_processed_count += frames_in_worker
             if result_boxes:
                 for box in result_boxes:
@@ -2485,6 +2661,7 @@ def perform_contact_analysis(
     #     main_steps_list.extend(main_steps_list_funscript_gen)
 
     num_main_steps = len(main_steps_list)
+    telemetry = get_telemetry()
 
     for i, (main_step_name, step_func) in enumerate(main_steps_list):
         logger.info(f"Starting {main_step_name} (Stage 2)")
@@ -2492,31 +2669,32 @@ def perform_contact_analysis(
 
         progress_wrapper(main_step_tuple_for_callback, (0, 1, "Initializing..."), True)
 
-        # --- Special handling for the OF recovery pass ---
-        if step_func == pass_1c_recover_lost_tracks_with_of:
-            step_func(app, frame_objects, video_info_dict, yolo_input_size_arg, vr_vertical_third_filter_arg, 
-                          preprocessed_video_path_arg, logger, progress_wrapper,
-                          main_step_tuple_for_callback, num_workers_stage2_of_arg)
-        elif step_func == resilient_tracker_step0:
-            step_func(app, frame_objects, video_info_dict, logger)
-        elif step_func == pass_1_interpolate_boxes:
-            step_func(app, frame_objects, video_info_dict, logger)
-        elif step_func == pass_1b_smooth_all_tracks:
-            step_func(app, frame_objects, video_info_dict, logger)
-        elif step_func == pass_2_preliminary_height_estimation:
-            step_func(app, frame_objects, video_info_dict, vr_vertical_third_filter_arg, logger)
-        elif step_func == pass_3_kalman_and_lock_state:
-            step_func(app, frame_objects, video_info_dict, yolo_input_size_arg, vr_vertical_third_filter_arg, logger)
-        elif step_func == pass_4_assign_positions_and_segments:
-            step_func(app, frame_objects, segments, video_info_dict, yolo_input_size_arg, logger)
-        elif step_func == pass_5_recalculate_heights_post_aggregation:
-            step_func(app, frame_objects, segments, video_info_dict, yolo_input_size_arg, vr_vertical_third_filter_arg, logger)
-        elif step_func == pass_6_determine_distance:
-            step_func(app, frame_objects, segments, video_info_dict, yolo_input_size_arg, logger)
-        elif step_func == pass_7_smooth_and_normalize_distances:
-            step_func(app, frame_objects, funscript_frames, funscript_distances, logger)
-        elif step_func == pass_8_simplify_signal:
-            step_func(app, frame_objects, funscript_frames, funscript_distances, funscript_distances_lr, video_info_dict, logger)
+        with telemetry.span(f"stage2.{step_func.__name__}", step=main_step_name, frames=len(frame_objects)):
+            # --- Special handling for the OF recovery pass ---
+            if step_func == pass_1c_recover_lost_tracks_with_of:
+                step_func(app, frame_objects, video_info_dict, yolo_input_size_arg, vr_vertical_third_filter_arg, 
+                              preprocessed_video_path_arg, logger, progress_wrapper,
+                              main_step_tuple_for_callback, num_workers_stage2_of_arg)
+            elif step_func == resilient_tracker_step0:
+                step_func(app, frame_objects, video_info_dict, logger)
+            elif step_func == pass_1_interpolate_boxes:
+                step_func(app, frame_objects, video_info_dict, logger)
+            elif step_func == pass_1b_smooth_all_tracks:
+                step_func(app, frame_objects, video_info_dict, logger)
+            elif step_func == pass_2_preliminary_height_estimation:
+                step_func(app, frame_objects, video_info_dict, vr_vertical_third_filter_arg, logger)
+            elif step_func == pass_3_kalman_and_lock_state:
+                step_func(app, frame_objects, video_info_dict, yolo_input_size_arg, vr_vertical_third_filter_arg, logger)
+            elif step_func == pass_4_assign_positions_and_segments:
+                step_func(app, frame_objects, segments, video_info_dict, yolo_input_size_arg, logger)
+            elif step_func == pass_5_recalculate_heights_post_aggregation:
+                step_func(app, frame_objects, segments, video_info_dict, yolo_input_size_arg, vr_vertical_third_filter_arg, logger)
+            elif step_func == pass_6_determine_distance:
+                step_func(app, frame_objects, segments, video_info_dict, yolo_input_size_arg, logger)
+            elif step_func == pass_7_smooth_and_normalize_distances:
+                step_func(app, frame_objects, funscript_frames, funscript_distances, logger)
+            elif step_func == pass_8_simplify_signal:
+                step_func(app, frame_objects, funscript_frames, funscript_distances, funscript_distances_lr, video_info_dict, logger)
 
         if stop_event.is_set():
             logger.info(f"Stage 2 stopped during {main_step_name}.")
@@ -2682,8 +2860,9 @@ def perform_contact_analysis(
                 raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable for msgpack")
 
             to_write = overlay_data_with_segments if overlay_data_with_segments is not None else all_frames_overlay_data
-            with open(output_overlay_msgpack_path, 'wb') as f:
-                f.write(msgpack.packb(to_write, use_bin_type=True, default=numpy_default_handler))
+            # Same bytes as msgpack.packb, plus a per-frame offset index for lazy loading in the GUI
+            from detection.cd.stage_2_overlay_store import write_overlay_msgpack
+            write_overlay_msgpack(output_overlay_msgpack_path, to_write, default=numpy_default_handler)
             if overlay_data_with_segments:
                 logger.info(f"Successfully saved Stage 2 overlay package with {len(overlay_data_with_segments.get('frames', []))} frames and {len(overlay_data_with_segments.get('segments', []))} segments to {output_overlay_msgpack_path}.")
             else:
@@ -0,0 +1,271 @@
+"""
+Indexed, memory-mapped access to Stage 2 overlay msgpack files.
+
+The overlay file itself keeps its msgpack layout (a dict with "frames",
+"segments" and "metadata", or the legacy list of frame dicts), so other readers
+can still unpack it in one go. Next to it, ``<overlay>.idx`` stores the byte
+offset and length of every frame, which lets the GUI decode single frames on
+demand instead of holding one dict per frame for the whole video.
+"""
+
+import logging
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import msgpack
+import numpy as np
+
+OVERLAY_INDEX_SUFFIX = ".idx"
+OVERLAY_INDEX_VERSION = 1
+DEFAULT_OVERLAY_CACHE_FRAMES = 512
+DEFAULT_OVERLAY_PREFETCH_FRAMES = 120
+
+
+def _index_path(overlay_path: str) -> str:
+    return overlay_path + OVERLAY_INDEX_SUFFIX
+
+
+def _write_index(overlay_path: str, fmt: str, frame_ids, offsets, lengths, sections: Dict[str, list]) -> Dict[str, Any]:
+    order = np.argsort(np.asarray(frame_ids, dtype=np.int64), kind='stable')
+    st = os.stat(overlay_path)
+    index = {
+        "version": OVERLAY_INDEX_VERSION,
+        "format": fmt,
+        "source_size": st.st_size,
+        "source_mtime_ns": st.st_mtime_ns,
+        "frame_ids": np.asarray(frame_ids, dtype=np.int64)[order].tobytes(),
+        "offsets": np.asarray(offsets, dtype=np.int64)[order].tobytes(),
+        "lengths": np.asarray(lengths, dtype=np.int64)[order].tobytes(),
+        "sections": sections,
+    }
+    try:
+        with open(_index_path(overlay_path), 'wb') as f:
+            f.write(msgpack.packb(index, use_bin_type=True))
+    except OSError:
+        pass  # Read-only location: the in-memory index is still usable
+    return index
+
+
+def write_overlay_msgpack(path: str, data: Any, default: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Writes overlay data (dict with "frames" or legacy list of frames) exactly as
+    ``msgpack.packb(data, use_bin_type=True)`` would, recording each frame's offset,
+    and writes the ``.idx`` sidecar. Returns the index.
+    """
+    packer = msgpack.Packer(use_bin_type=True, default=default)
+    frame_ids, offsets, lengths = [], [], []
+    sections: Dict[str, list] = {}
+
+    def write_frames(f, frames):
+        f.write(packer.pack_array_header(len(frames)))
+        for frame in frames:
+            offset = f.tell()
+            packed = packer.pack(frame)
+            f.write(packed)
+            if isinstance(frame, dict):
+                frame_ids.append(frame.get("frame_id", -1))
+                offsets.append(offset)
+                lengths.append(len(packed))
+
+    with open(path, 'wb') as f:
+        if isinstance(data, dict):
+            fmt = "dict"
+            f.write(packer.pack_map_header(len(data)))
+            for key, value in data.items():
+                f.write(packer.pack(key))
+                if key == "frames" and isinstance(value, list):
+                    write_frames(f, value)
+                else:
+                    offset = f.tell()
+                    packed = packer.pack(value)
+                    f.write(packed)
+                    sections[key] = [offset, len(packed)]
+        else:
+            fmt = "list"
+            write_frames(f, list(data))
+    return _write_index(path, fmt, frame_ids, offsets, lengths, sections)
+
+
+def build_overlay_index(path: str) -> Dict[str, Any]:
+    """Indexes an existing overlay file with one streaming pass (memory stays flat)."""
+    frame_ids, offsets, lengths = [], [], []
+    sections: Dict[str, list] = {}
+
+    with open(path, 'rb') as f:
+        first = f.read(1)
+        if not first:
+            raise ValueError("Overlay file is empty")
+        f.seek(0)
+        unpacker = msgpack.Unpacker(f, raw=False)
+        lead = first[0]
+
+        def read_frames():
+            for _ in range(unpacker.read_array_header()):
+                offset = unpacker.tell()
+                frame = unpacker.unpack()
+                if isinstance(frame, dict):
+                    frame_ids.append(frame.get("frame_id", -1))
+                    offsets.append(offset)
+                    lengths.append(unpacker.tell() - offset)
+
+        if 0x80 <= lead <= 0x8f or lead in (0xde, 0xdf):  # map
+            fmt = "dict"
+            keys = []
+            for _ in range(unpacker.read_map_header()):
+                key = unpacker.unpack()
+                keys.append(key)
+                if key == "frames":
+                    read_frames()
+                else:
+                    offset = unpacker.tell()
+                    unpacker.skip()
+                    sections[key] = [offset, unpacker.tell() - offset]
+            if "frames" not in keys and "segments" not in keys:
+                raise ValueError("Unsupported overlay format")
+        elif 0x90 <= lead <= 0x9f or lead in (0xdc, 0xdd):  # array
+            fmt = "list"
+            read_frames()
+        else:
+            raise ValueError("Unsupported overlay format")
+    return _write_index(path, fmt, frame_ids, offsets, lengths, sections)
+
+
+def load_overlay_index(path: str) -> Optional[Dict[str, Any]]:
+    """Returns the sidecar index if it exists and matches the overlay file, else None."""
+    try:
+        with open(_index_path(path), 'rb') as f:
+            index = msgpack.unpackb(f.read(), raw=False)
+        st = os.stat(path)
+    except (OSError, ValueError, msgpack.exceptions.ExtraData):
+        return None
+    if not isinstance(index, dict) or index.get("version") != OVERLAY_INDEX_VERSION:
+        return None
+    if index.get("source_size") != st.st_size or index.get("source_mtime_ns") != st.st_mtime_ns:
+        return None
+    return index
+
+
+class Stage2OverlayStore:
+    """
+    Read-only view of a Stage 2 overlay file: frames are decoded from a memory map on
+    request and kept in a small LRU cache. Supports the dict-style access the GUI uses
+    (``get``, ``in``, ``len``, truthiness), so it can stand in for the old frame map.
+    """
+
+    def __init__(self, path: str, cache_frames: int = DEFAULT_OVERLAY_CACHE_FRAMES,
+                 prefetch_frames: int = DEFAULT_OVERLAY_PREFETCH_FRAMES,
+                 logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self.cache_frames = max(1, cache_frames)
+        self.prefetch_frames = max(0, min(prefetch_frames, self.cache_frames // 2))
+
+        index = load_overlay_index(path)
+        if index is None:
+            self.logger.info(f"Indexing Stage 2 overlay: {os.path.basename(path)}")
+            index = build_overlay_index(path)
+        self.format = index["format"]
+        self._frame_ids = np.frombuffer(index["frame_ids"], dtype=np.int64)
+        self._offsets = np.frombuffer(index["offsets"], dtype=np.int64)
+        self._lengths = np.frombuffer(index["lengths"], dtype=np.int64)
+        self._sections = index.get("sections") or {}
+
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._cache: "OrderedDict[int, Optional[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._prefetch_target = None
+        self._prefetch_event = threading.Event()
+        self._prefetch_thread: Optional[threading.Thread] = None
+
+    # --- Mapping-style access ---
+    def __len__(self) -> int:
+        return len(self._frame_ids)
+
+    def __bool__(self) -> bool:
+        return len(self._frame_ids) > 0
+
+    def __contains__(self, frame_id) -> bool:
+        return self._locate(frame_id) is not None
+
+    def _locate(self, frame_id) -> Optional[int]:
+        try:
+            frame_id = int(frame_id)
+        except (TypeError, ValueError):
+            return None
+        # Last occurrence wins for duplicate ids, as with the old dict map
+        pos = int(np.searchsorted(self._frame_ids, frame_id, side='right')) - 1
+        if pos < 0 or self._frame_ids[pos] != frame_id:
+            return None
+        return pos
+
+    def get(self, frame_id, default=None) -> Optional[Dict]:
+        with self._lock:
+            if frame_id in self._cache:
+                self._cache.move_to_end(frame_id)
+                frame = self._cache[frame_id]
+                return default if frame is None else frame
+        pos = self._locate(frame_id)
+        frame = None
+        if pos is not None:
+            start = int(self._offsets[pos])
+            try:
+                frame = msgpack.unpackb(self._mm[start:start + int(self._lengths[pos])], raw=False)
+            except ValueError:
+                return default  # Store closed concurrently
+        with self._lock:
+            self._cache[frame_id] = frame
+            self._cache.move_to_end(frame_id)
+            while len(self._cache) > self.cache_frames:
+                self._cache.popitem(last=False)
+        return default if frame is None else frame
+
+    def read_section(self, key: str, default=None):
+        """Decodes a top-level entry other than "frames" (e.g. "segments", "metadata")."""
+        span = self._sections.get(key)
+        if not span:
+            return default
+        return msgpack.unpackb(self._mm[span[0]:span[0] + span[1]], raw=False)
+
+    # --- Background prefetch around the playhead ---
+    def prefetch(self, frame_id: int):
+        """Decodes the frames following ``frame_id`` in a background thread."""
+        if self._closed or self.prefetch_frames <= 0:
+            return
+        self._prefetch_target = int(frame_id)
+        if self._prefetch_thread is None:
+            self._prefetch_thread = threading.Thread(target=self._prefetch_loop, daemon=True,
+                                                     name="S2OverlayPrefetch")
+            self._prefetch_thread.start()
+        self._prefetch_event.set()
+
+    def _prefetch_loop(self):
+        while not self._closed:
+            self._prefetch_event.wait()
+            self._prefetch_event.clear()
+            target = self._prefetch_target
+            if target is None:
+                continue
+            for frame_id in range(target, target + self.prefetch_frames):
+                if self._closed or self._prefetch_target != target:
+                    break
+                with self._lock:
+                    cached = frame_id in self._cache
+                if not cached:
+                    self.get(frame_id)
+
+    def close(self):
+        self._closed = True
+        self._prefetch_event.set()
+        with self._lock:
+            self._cache.clear()
+        try:
+            self._mm.close()
+            self._file.close()
+        except (ValueError, OSError):
+            pass
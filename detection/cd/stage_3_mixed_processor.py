@@ -357,6 +357,9 @@ class MixedStageProcessor:
                     raise RuntimeError(f"Failed to initialize tracker: {selected_tracker}")
                 
                 self.roi_tracker = self.tracker_manager._current_tracker
+                # Offline runs must be deterministic: detect synchronously on every scheduled frame
+                if hasattr(self.roi_tracker, 'async_detection'):
+                    self.roi_tracker.async_detection = False
             finally:
                 # Restore original logging level
                 roi_logger.setLevel(original_level)
@@ -519,6 +522,8 @@ class MixedStageProcessor:
             raise RuntimeError(f"Failed to initialize tracker: {selected_tracker}")
         
         self.roi_tracker = self.tracker_manager._current_tracker
+        if hasattr(self.roi_tracker, 'async_detection'):
+            self.roi_tracker.async_detection = False
 
     def track_frame_with_stage2_data(self, frame_id: int, video_frame: np.ndarray) -> float:
         """
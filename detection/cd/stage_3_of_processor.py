@@ -11,6 +11,7 @@ from funscript import DualAxisFunscript
 from video import VideoProcessor
 from detection.cd.data_structures import Segment, FrameObject
 from config import constants
+from common.telemetry import get_telemetry
 
 
 
@@ -43,6 +44,7 @@ def stage3_worker_proc(
         worker_logger.addHandler(handler)
 
     worker_logger.info(f"Worker {worker_id} started.")
+    telemetry = get_telemetry()
 
     class MockFileManager:
         def __init__(self, path: Optional[str]):
@@ -73,47 +75,11 @@ def stage3_worker_proc(
     video_path_to_use = video_path  # Default to original
     video_type_for_vp = common_app_config.get('video_type', 'auto')
 
+    # The orchestrator only passes a preprocessed path that passed validation
     if preprocessed_video_path and os.path.exists(preprocessed_video_path):
-        # Validate preprocessed video before using it
-        try:
-            from detection.cd.stage_1_cd import _validate_preprocessed_video_completeness
-
-            # Get frame count from original video for validation
-            fps = common_app_config.get('video_fps', 30.0)
-
-            # Try to get accurate frame count from original video
-            try:
-                import subprocess
-                import json
-                cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
-                       '-show_entries', 'stream=nb_frames,duration',
-                       '-show_entries', 'format=duration',
-                       '-of', 'json', video_path]
-                result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=5)
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    stream_info = data.get('streams', [{}])[0]
-                    format_info = data.get('format', {})
-                    nb_frames_str = stream_info.get('nb_frames')
-                    dur_str = stream_info.get('duration', format_info.get('duration', '0'))
-                    duration = float(dur_str) if dur_str and dur_str != 'N/A' else 0.0
-                    expected_frames = int(nb_frames_str) if nb_frames_str and nb_frames_str != 'N/A' else round(duration * fps)
-                else:
-                    expected_frames = 10000  # Fallback
-            except Exception:
-                expected_frames = 10000  # Fallback if ffprobe fails
-
-            # Use a reasonable tolerance for Stage 3 (typically works with chunks)
-            tolerance = max(100, expected_frames // 100)  # 1% tolerance, minimum 100 frames
-
-            if _validate_preprocessed_video_completeness(preprocessed_video_path, expected_frames, fps, worker_logger, tolerance_frames=tolerance):
-                video_path_to_use = preprocessed_video_path
-                video_type_for_vp = 'flat'
-                worker_logger.info(f"Worker {worker_id} using validated preprocessed video: {os.path.basename(video_path_to_use)} ({expected_frames} frames)")
-            else:
-                worker_logger.warning(f"Worker {worker_id} preprocessed video validation failed, using original: {os.path.basename(video_path)}")
-        except Exception as e:
-            worker_logger.error(f"Worker {worker_id} error validating preprocessed video: {e}")
+        video_path_to_use = preprocessed_video_path
+        video_type_for_vp = 'flat'
+        worker_logger.info(f"Worker {worker_id} using validated preprocessed video: {os.path.basename(video_path_to_use)}")
     else:
         worker_logger.info(f"Worker {worker_id} will use original video source: {os.path.basename(video_path_to_use)} with type '{video_type_for_vp}'")
 
@@ -233,27 +199,29 @@ def stage3_worker_proc(
             roi_tracker_instance.start_tracking()
             roi_tracker_instance.main_interaction_class = getattr(segment_obj, 'position_short_name', None) or getattr(segment_obj, 'major_position', None) or getattr(segment_obj, 'position_long_name', 'Unknown')
 
-            frame_stream = video_processor.stream_frames_for_segment(
-                start_frame_abs_idx=chunk_start,
-                num_frames_to_read=(chunk_end - chunk_start + 1),
-                stop_event=stop_event
-            )
+            with telemetry.span("stage3.chunk", worker=worker_id, chunk_start=chunk_start, chunk_end=chunk_end,
+                                frames=chunk_end - chunk_start + 1):
+                frame_stream = video_processor.stream_frames_for_segment(
+                    start_frame_abs_idx=chunk_start,
+                    num_frames_to_read=(chunk_end - chunk_start + 1),
+                    stop_event=stop_event
+                )
 
-            for frame_id, frame_image in frame_stream:
-                if stop_event.is_set(): break
-                if frame_image is None: continue
+                for frame_id, frame_image in frame_stream:
+                    if stop_event.is_set(): break
+                    if frame_image is None: continue
 
-                frame_time_ms = int(round((frame_id / common_app_config.get('video_fps', 30.0)) * 1000.0))
+                    frame_time_ms = int(round((frame_id / common_app_config.get('video_fps', 30.0)) * 1000.0))
 
-                # Process frame using oscillation detector (full-frame processing)
-                processed_frame, action_log = roi_tracker_instance.process_frame_for_oscillation(frame_image, frame_time_ms, frame_id)
+                    # Process frame using oscillation detector (full-frame processing)
+                    processed_frame, action_log = roi_tracker_instance.process_frame_for_oscillation(frame_image, frame_time_ms, frame_id)
                 
-                # Only count frames in the output range for processing counter
-                if output_start <= frame_id <= output_end:
-                    with total_frames_processed_counter.get_lock():
-                        total_frames_processed_counter.value += 1
+                    # Only count frames in the output range for processing counter
+                    if output_start <= frame_id <= output_end:
+                        with total_frames_processed_counter.get_lock():
+                            total_frames_processed_counter.value += 1
 
-                roi_tracker_instance.internal_frame_counter += 1
+                    roi_tracker_instance.internal_frame_counter += 1
             
             # Extract actions from the oscillation detector's funscript, filtering to output range
             chunk_funscript = roi_tracker_instance.funscript
@@ -308,9 +276,40 @@ def stage3_worker_proc(
     except Exception as cleanup_error:
         worker_logger.warning(f"Worker {worker_id}: Error during cleanup: {cleanup_error}")
     
+    telemetry.flush()
     worker_logger.info(f"Worker {worker_id} finished with resource cleanup.")
 
 
+def _resolve_preprocessed_video_source(video_path: str, preprocessed_video_path: Optional[str], fps: float,
+                                       logger: logging.Logger) -> Optional[str]:
+    """
+    Validates the preprocessed video once for all Stage 3 workers.
+    Returns the path if it can be used, None to fall back to the original video.
+    """
+    if not preprocessed_video_path or not os.path.exists(preprocessed_video_path):
+        return None
+    try:
+        from detection.cd.stage_1_cd import _validate_preprocessed_video_completeness
+        from detection.cd.ffmpeg_probe_cache import get_video_probe_record, get_probe_frame_count
+
+        # Frame count of the original video; its probe is not persisted next to the user's file
+        record = get_video_probe_record(video_path, persist=False)
+        expected_frames = get_probe_frame_count(record, fps) if record else 0
+        if expected_frames <= 0:
+            expected_frames = 10000  # Fallback if ffprobe fails
+
+        # Use a reasonable tolerance for Stage 3 (typically works with chunks)
+        tolerance = max(100, expected_frames // 100)  # 1% tolerance, minimum 100 frames
+
+        if _validate_preprocessed_video_completeness(preprocessed_video_path, expected_frames, fps, logger, tolerance_frames=tolerance):
+            logger.info(f"Stage 3 workers will use validated preprocessed video: {os.path.basename(preprocessed_video_path)} ({expected_frames} frames)")
+            return preprocessed_video_path
+        logger.warning(f"Preprocessed video validation failed, Stage 3 workers will use original: {os.path.basename(video_path)}")
+    except Exception as e:
+        logger.error(f"Error validating preprocessed video for Stage 3: {e}")
+    return None
+
+
 def perform_stage3_analysis(
         video_path: str,
         preprocessed_video_path_arg: Optional[str],
@@ -458,11 +457,14 @@ def perform_stage3_analysis(
     for _ in range(num_workers):
         task_queue.put(None)
 
+    worker_video_source = _resolve_preprocessed_video_source(
+        video_path, preprocessed_video_path_arg, common_app_config.get('video_fps', 30.0), logger)
+
     processes: List[Process] = []
     for i in range(num_workers):
         p = Process(target=stage3_worker_proc,
                     args=(i, task_queue, result_queue, stop_event, total_frames_processed_counter, video_path,
-                          preprocessed_video_path_arg, tracker_config, common_app_config,
+                          worker_video_source, tracker_config, common_app_config,
                           logger_config, use_sqlite))
         processes.append(p)
         p.start()
@@ -3,6 +3,7 @@ from typing import Optional, Callable, List, Tuple, Dict, Any
 import logging
 import bisect
 import copy
+import itertools
 
 # Attempt to import optional libraries for processing
 try:
@@ -18,6 +19,9 @@ try:
 except ImportError:
     RDP_AVAILABLE = False
 
+# Revisions are drawn from one process-wide sequence, so (object, revision) pairs are never reused
+_revision_sequence = itertools.count(1)
+
 
 class DualAxisFunscript:
     def __init__(self, logger: Optional[logging.Logger] = None):
@@ -34,6 +38,10 @@ class DualAxisFunscript:
         self._cache_dirty_primary: bool = True
         self._cache_dirty_secondary: bool = True
 
+        # Change counters per axis, bumped on every edit (lets savers skip unchanged axes)
+        self._revision_primary: int = next(_revision_sequence)
+        self._revision_secondary: int = next(_revision_sequence)
+
         # Point simplification settings
         self.enable_point_simplification: bool = True  # Enable by default
 
@@ -56,6 +64,18 @@ class DualAxisFunscript:
             self._cache_dirty_primary = True
         if axis == 'secondary' or axis == 'both':
             self._cache_dirty_secondary = True
+        self._bump_revision(axis)
+
+    def _bump_revision(self, axis: str = 'both'):
+        """Records a change to an axis. Position-only edits call this directly (the timestamp cache stays valid)."""
+        if axis == 'primary' or axis == 'both':
+            self._revision_primary = next(_revision_sequence)
+        if axis == 'secondary' or axis == 'both':
+            self._revision_secondary = next(_revision_sequence)
+
+    def get_revision(self, axis: str) -> int:
+        """Revision of an axis; changes whenever its actions were edited through this class (or a plugin)."""
+        return self._revision_primary if axis == 'primary' else self._revision_secondary
 
     def _maybe_log_simplification_stats(self):
         """
@@ -225,6 +245,7 @@ class DualAxisFunscript:
             if actions_target_list[idx]["pos"] != clamped_pos:
                 actions_target_list[idx]["pos"] = clamped_pos
                 # No timestamp change, so cache is still valid
+                self._bump_revision(axis_name)
         else:
             can_insert = True
             if idx > 0 and len(actions_target_list) > 0:
@@ -590,6 +611,7 @@ class DualAxisFunscript:
             final_smoothed_positions = savgol_filter(positions, best_window_length, final_polyorder)
             for i, original_list_idx in enumerate(indices_to_filter):
                 actions_list_ref[original_list_idx]['pos'] = int(round(np.clip(final_smoothed_positions[i], 0, 100)))
+            self._bump_revision(axis)
 
             result = {
                 'window_length': best_window_length,
@@ -773,6 +795,7 @@ class DualAxisFunscript:
         # 4. Update the original list with the new values
         for i, original_list_idx in enumerate(indices_to_process):
             actions_list_ref[original_list_idx]['pos'] = new_positions[i]
+        self._bump_revision(axis)
 
         self.logger.info(f"Applied vectorized operation to {len(indices_to_process)} points on {axis} axis.")
 
@@ -952,6 +975,172 @@ class DualAxisFunscript:
         else:
             actions_list[:] = unique_actions
 
+    # --- Bulk range editing (contiguous index slices, found by binary search) ---
+
+    @staticmethod
+    def index_runs(indices) -> List[Tuple[int, int]]:
+        """Splits a collection of indices into sorted, contiguous [start, end) runs."""
+        if indices is None or len(indices) == 0:
+            return []
+        idx = np.unique(np.fromiter(indices, dtype=np.int64, count=len(indices)))
+        breaks = np.flatnonzero(np.diff(idx) != 1) + 1
+        starts = np.concatenate(([0], breaks))
+        ends = np.concatenate((breaks, [len(idx)]))
+        return [(int(idx[s]), int(idx[e - 1]) + 1) for s, e in zip(starts, ends)]
+
+    def get_index_range_for_time(self, axis: str, start_time_ms: float, end_time_ms: float) -> Tuple[int, int]:
+        """Returns the [start, end) index slice of actions with start_time_ms <= at <= end_time_ms."""
+        timestamps = self._get_timestamps_for_axis(axis)
+        return bisect.bisect_left(timestamps, start_time_ms), bisect.bisect_right(timestamps, end_time_ms)
+
+    def select_indices_in_rect(self, axis: str, start_time_ms: float, end_time_ms: float,
+                               min_pos: float = 0, max_pos: float = 100) -> List[int]:
+        """Indices of actions inside a time/position rectangle (time bounds by bisect, positions vectorized)."""
+        actions_list = self.primary_actions if axis == 'primary' else self.secondary_actions
+        s_idx, e_idx = self.get_index_range_for_time(axis, start_time_ms, end_time_ms)
+        if s_idx >= e_idx:
+            return []
+        if min_pos <= 0 and max_pos >= 100:
+            return list(range(s_idx, e_idx))
+        positions = np.fromiter((actions_list[i]['pos'] for i in range(s_idx, e_idx)),
+                                dtype=np.float64, count=e_idx - s_idx)
+        hits = np.flatnonzero((positions >= min_pos) & (positions <= max_pos))
+        return (hits + s_idx).tolist()
+
+    def move_action(self, axis: str, index: int, at_ms: int, pos: int) -> bool:
+        """
+        Moves one action, clamped between its neighbours so the order never changes.
+        Keeps the timestamp cache valid, which makes it cheap to call on every drag frame.
+        """
+        actions_list = self.primary_actions if axis == 'primary' else self.secondary_actions
+        if not 0 <= index < len(actions_list):
+            return False
+        prev_limit = actions_list[index - 1]['at'] + 1 if index > 0 else 0
+        next_limit = actions_list[index + 1]['at'] - 1 if index < len(actions_list) - 1 else float('inf')
+        new_at = int(max(prev_limit, min(next_limit, at_ms)))
+        actions_list[index]['at'] = new_at
+        actions_list[index]['pos'] = int(max(0, min(100, pos)))
+        self._bump_revision(axis)
+
+        cache_dirty = self._cache_dirty_primary if axis == 'primary' else self._cache_dirty_secondary
+        if not cache_dirty:
+            cache = self._primary_timestamps_cache if axis == 'primary' else self._secondary_timestamps_cache
+            cache[index] = new_at
+        if index == len(actions_list) - 1:
+            if axis == 'primary':
+                self.last_timestamp_primary = new_at
+            else:
+                self.last_timestamp_secondary = new_at
+        return True
+
+    def shift_range_time(self, axis: str, start_idx: int, end_idx: int, time_delta_ms: int) -> int:
+        """
+        Shifts actions[start_idx:end_idx] in time as one block. The delta is clamped so the
+        block stays between its neighbours and above 0 ms, so no re-sort is needed.
+        Returns the delta actually applied.
+        """
+        actions_list = self.primary_actions if axis == 'primary' else self.secondary_actions
+        start_idx, end_idx = max(0, start_idx), min(len(actions_list), end_idx)
+        if start_idx >= end_idx or time_delta_ms == 0:
+            return 0
+
+        lower = (actions_list[start_idx - 1]['at'] + 1) if start_idx > 0 else 0
+        delta = max(int(time_delta_ms), lower - actions_list[start_idx]['at'])
+        if end_idx < len(actions_list):
+            delta = min(delta, actions_list[end_idx]['at'] - 1 - actions_list[end_idx - 1]['at'])
+        if delta == 0:
+            return 0
+
+        for i in range(start_idx, end_idx):
+            actions_list[i]['at'] += delta
+        self._invalidate_cache(axis)
+        if end_idx == len(actions_list):
+            if axis == 'primary':
+                self.last_timestamp_primary = actions_list[-1]['at']
+            else:
+                self.last_timestamp_secondary = actions_list[-1]['at']
+        return delta
+
+    def scale_range_pos(self, axis: str, start_idx: int, end_idx: int,
+                        factor: float = 1.0, center: float = 50.0, offset: float = 0.0):
+        """Sets pos = center + (pos - center) * factor + offset on actions[start_idx:end_idx], clipped to 0-100."""
+        actions_list = self.primary_actions if axis == 'primary' else self.secondary_actions
+        start_idx, end_idx = max(0, start_idx), min(len(actions_list), end_idx)
+        if start_idx >= end_idx:
+            return
+        segment = actions_list[start_idx:end_idx]
+        positions = np.fromiter((a['pos'] for a in segment), dtype=np.float64, count=len(segment))
+        new_positions = np.clip(np.round(center + (positions - center) * factor + offset), 0, 100).astype(int)
+        for action, new_pos in zip(segment, new_positions.tolist()):
+            action['pos'] = new_pos
+        self._bump_revision(axis)
+
+    def delete_index_range(self, axis: str, start_idx: int, end_idx: int) -> int:
+        """Deletes actions[start_idx:end_idx]. Returns the number of removed actions."""
+        actions_list = self.primary_actions if axis == 'primary' else self.secondary_actions
+        start_idx, end_idx = max(0, start_idx), min(len(actions_list), end_idx)
+        if start_idx >= end_idx:
+            return 0
+        del actions_list[start_idx:end_idx]
+        self._invalidate_cache(axis)
+        last_ts = actions_list[-1]['at'] if actions_list else 0
+        if axis == 'primary':
+            self.last_timestamp_primary = last_ts
+        else:
+            self.last_timestamp_secondary = last_ts
+        return end_idx - start_idx
+
+    def get_paste_block_range(self, axis: str, block: List[Dict]) -> Tuple[int, int]:
+        """The [start, end) slice of existing actions that paste_block(axis, block) may replace."""
+        if not block:
+            return 0, 0
+        first_at = min(a['at'] for a in block)
+        last_at = max(a['at'] for a in block)
+        margin = max(self.min_interval_ms, 0)
+        return self.get_index_range_for_time(axis, first_at - margin, last_at + margin)
+
+    def paste_block(self, axis: str, block: List[Dict]) -> Tuple[int, int]:
+        """
+        Merges a block of {'at', 'pos'} actions into the axis like add_actions_batch does
+        (same-timestamp points are replaced, min_interval_ms is enforced), but only the
+        window of existing actions around the block is rebuilt.
+        Returns the [start, end) index range the merged window now occupies.
+        """
+        actions_list = self.primary_actions if axis == 'primary' else self.secondary_actions
+        if not block:
+            return 0, 0
+        s_idx, e_idx = self.get_paste_block_range(axis, block)
+        merged = actions_list[s_idx:e_idx] + [{'at': int(a['at']), 'pos': int(a['pos'])} for a in block]
+        merged.sort(key=lambda x: x['at'])
+
+        unique_actions = []
+        for action in merged:
+            # Keep only the last point at a given timestamp to remove duplicates
+            if unique_actions and action['at'] == unique_actions[-1]['at']:
+                unique_actions[-1] = action
+            else:
+                unique_actions.append(action)
+
+        if self.min_interval_ms > 0 and unique_actions:
+            # The action before the window anchors the interval filter, as in a full-list pass
+            last_kept_at = actions_list[s_idx - 1]['at'] if s_idx > 0 else None
+            window = []
+            for action in unique_actions:
+                if last_kept_at is None or action['at'] - last_kept_at >= self.min_interval_ms:
+                    window.append(action)
+                    last_kept_at = action['at']
+        else:
+            window = unique_actions
+
+        actions_list[s_idx:e_idx] = window
+        self._invalidate_cache(axis)
+        last_ts = actions_list[-1]['at'] if actions_list else 0
+        if axis == 'primary':
+            self.last_timestamp_primary = last_ts
+        else:
+            self.last_timestamp_secondary = last_ts
+        return s_idx, s_idx + len(window)
+
     def scale_points_to_range(self, axis: str, output_min: int, output_max: int,
                               start_time_ms: Optional[int] = None, end_time_ms: Optional[int] = None,
                               selected_indices: Optional[List[int]] = None):
@@ -993,6 +1182,7 @@ class DualAxisFunscript:
             new_pos = int(round(output_min + target_range / 2.0))
             for idx in indices_to_process:
                 actions_list_ref[idx]['pos'] = new_pos
+            self._bump_revision(axis)
             self.logger.info(f"Scaled {len(indices_to_process)} flat points on {axis} axis to {new_pos}.")
             return
 
@@ -1006,6 +1196,7 @@ class DualAxisFunscript:
             # Scale to the new target range
             new_pos = int(round(output_min + clipped_normalized_pos * target_range))
             actions_list_ref[idx]['pos'] = np.clip(new_pos, 0, 100)  # Final safety clip
+        self._bump_revision(axis)
 
         self.logger.info(
             f"Scaled {len(indices_to_process)} points on {axis} axis to new range [{output_min}-{output_max}].")
@@ -1270,8 +1461,40 @@ class DualAxisFunscript:
             return {"error": f"Plugin '{plugin_name}' not found"}
         
         try:
-            # Get plugin preview
-            return plugin.get_preview(self, axis=axis, **parameters)
+            from funscript.plugins.preview_cache import (
+                preview_cache, actions_version_key, compute_preview_window, remap_selection
+            )
+
+            # Previews are cached by the axis revision, so re-requesting an unchanged script/parameter
+            # combination (e.g. moving a slider back) does not rerun the plugin. With a selection and a
+            # plugin that declares its margin, only the selected window plus that margin is previewed;
+            # axis-wide figures in the summary (e.g. total_points) then count that window.
+            window = None
+            if axis != 'both':
+                actions = self.primary_actions if axis == 'primary' else self.secondary_actions
+                window = compute_preview_window(len(actions), parameters.get('selected_indices'),
+                                                plugin.preview_margin_points)
+            preview_target = self
+            if window:
+                start, end = window
+                # get_preview only reads, so the window can share the action dicts
+                preview_target = copy.copy(self)
+                setattr(preview_target, f"{axis}_actions", actions[start:end])
+                preview_target._invalidate_cache('both')
+                parameters = dict(parameters, selected_indices=remap_selection(parameters['selected_indices'], window))
+                version_key = (actions_version_key(self, axis), start, end)
+            else:
+                version_key = actions_version_key(self, axis)
+            cache_key = preview_cache.make_key(version_key, axis, plugin.name, plugin.version, parameters,
+                                               kind='summary')
+            cached = preview_cache.get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+            preview = plugin.get_preview(preview_target, axis=axis, **parameters)
+            if isinstance(preview, dict) and not preview.get('error'):
+                preview_cache.put(cache_key, copy.deepcopy(preview))
+            return preview
             
         except Exception as e:
             return {"error": f"Error generating preview for '{plugin_name}': {e}"}
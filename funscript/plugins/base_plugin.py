@@ -81,6 +81,17 @@ class FunscriptTransformationPlugin(ABC):
         """Return True if this plugin modifies the funscript in-place, False if it returns a copy."""
         return True
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        """
+        Return how many neighbouring actions on each side of a selection transform() reads.
+        
+        Previews of a selection are computed on the selected window plus this margin.
+        0 means only the selected actions are read; None (default) means the result
+        depends on the whole axis.
+        """
+        return None
+    
     @property
     def ui_preference(self) -> str:
         """
@@ -35,6 +35,10 @@ class ThresholdClampPlugin(FunscriptTransformationPlugin):
     def version(self) -> str:
         return "1.0.0"
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        return 0
+    
     @property
     def parameters_schema(self) -> Dict[str, Any]:
         return {
@@ -276,6 +280,10 @@ class ValueClampPlugin(FunscriptTransformationPlugin):
     def version(self) -> str:
         return "1.0.0"
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        return 0
+    
     @property
     def parameters_schema(self) -> Dict[str, Any]:
         return {
@@ -34,6 +34,10 @@ class InvertPlugin(FunscriptTransformationPlugin):
     def version(self) -> str:
         return "1.0.0"
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        return 0
+    
     @property
     def ui_preference(self) -> str:
         """Invert is a simple one-click operation."""
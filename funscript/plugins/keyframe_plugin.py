@@ -5,6 +5,7 @@ This plugin simplifies funscripts by identifying and preserving only the most
 significant peaks and valleys (keyframes) while removing less important points.
 """
 
+import heapq
 import numpy as np
 from typing import Dict, Any, List, Optional
 
@@ -34,6 +35,10 @@ class KeyframePlugin(FunscriptTransformationPlugin):
     def version(self) -> str:
         return "1.0.0"
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        return 0
+    
     @property
     def parameters_schema(self) -> Dict[str, Any]:
         return {
@@ -214,41 +219,66 @@ class KeyframePlugin(FunscriptTransformationPlugin):
         ext_positions = np.array([ext['pos'] for ext in extrema])
         ext_timestamps = np.array([ext['at'] for ext in extrema])
         
-        # Calculate significance for all internal points at once
-        while len(extrema) > 2:
-            if len(ext_positions) <= 2:
+        # Initial significance of every internal extremum, vectorized
+        significance_scores = self._projection_significance(
+            ext_positions[:-2], ext_positions[1:-1], ext_positions[2:],
+            ext_timestamps[:-2], ext_timestamps[1:-1], ext_timestamps[2:]
+        )
+        
+        # Repeatedly drop the weakest internal point until all remaining ones are significant.
+        # A removal only changes the significance of its two neighbours, so a heap with a
+        # doubly linked list replaces the full recomputation per removal. Ties resolve to
+        # the earliest point, as np.argmin did.
+        count = len(extrema)
+        prev_link = list(range(-1, count - 1))
+        next_link = list(range(1, count + 1))
+        removed = [False] * count
+        current_score = [0.0] + significance_scores.tolist() + [0.0]
+        heap = [(score, i) for i, score in enumerate(current_score) if 0 < i < count - 1]
+        heapq.heapify(heap)
+        positions = ext_positions.tolist()
+        times = ext_timestamps.tolist()
+        remaining = count
+        
+        while remaining > 2 and heap:
+            score, i = heapq.heappop(heap)
+            if removed[i] or score != current_score[i]:
+                continue  # Stale entry
+            if score >= position_tolerance:
                 break
-                
-            # Vectorized significance calculation for internal points
-            prev_pos = ext_positions[:-2]
-            curr_pos = ext_positions[1:-1] 
-            next_pos = ext_positions[2:]
-            prev_time = ext_timestamps[:-2]
-            curr_time = ext_timestamps[1:-1]
-            next_time = ext_timestamps[2:]
             
-            # Calculate projection-based significance
-            durations = next_time.astype(np.float64) - prev_time.astype(np.float64)
-            time_deltas = curr_time.astype(np.float64) - prev_time.astype(np.float64)
-            progress = np.divide(time_deltas, durations, 
-                               out=np.zeros_like(time_deltas), where=durations!=0)
-            projected_pos = prev_pos + progress * (next_pos - prev_pos)
-            significance_scores = np.abs(curr_pos - projected_pos)
+            removed[i] = True
+            remaining -= 1
+            p, n = prev_link[i], next_link[i]
+            next_link[p] = n
+            prev_link[n] = p
             
-            # Find weakest point
-            min_idx = np.argmin(significance_scores)
-            min_significance = significance_scores[min_idx]
-            
-            if min_significance < position_tolerance:
-                # Remove the weakest point (add 1 because we're looking at internal points)
-                remove_idx = min_idx + 1
-                extrema.pop(remove_idx)
-                ext_positions = np.delete(ext_positions, remove_idx)
-                ext_timestamps = np.delete(ext_timestamps, remove_idx)
-            else:
-                break
-                
-        return extrema
+            for j in (p, n):
+                if 0 < j < count - 1:
+                    current_score[j] = self._point_significance(
+                        positions, times, prev_link[j], j, next_link[j]
+                    )
+                    heapq.heappush(heap, (current_score[j], j))
+        
+        return [ext for ext, is_removed in zip(extrema, removed) if not is_removed]
+    
+    @staticmethod
+    def _projection_significance(prev_pos, curr_pos, next_pos, prev_time, curr_time, next_time):
+        """Distance of each point from the straight line between its neighbours."""
+        durations = next_time.astype(np.float64) - prev_time.astype(np.float64)
+        time_deltas = curr_time.astype(np.float64) - prev_time.astype(np.float64)
+        progress = np.divide(time_deltas, durations, 
+                           out=np.zeros_like(time_deltas), where=durations!=0)
+        projected_pos = prev_pos + progress * (next_pos - prev_pos)
+        return np.abs(curr_pos - projected_pos)
+    
+    @staticmethod
+    def _point_significance(positions, times, p, i, n) -> float:
+        """Scalar form of _projection_significance for a single point."""
+        duration = float(times[n]) - float(times[p])
+        progress = (float(times[i]) - float(times[p])) / duration if duration != 0 else 0.0
+        projected_pos = positions[p] + progress * (positions[n] - positions[p])
+        return abs(positions[i] - projected_pos)
     
     def _find_keyframes_ultra_fast(self, segment: List[Dict], params: Dict[str, Any]) -> List[Dict]:
         """Ultra-fast approximate keyframe detection for massive datasets."""
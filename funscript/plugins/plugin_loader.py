@@ -66,7 +66,7 @@ class PluginLoader:
         for plugin_file in directory_path.glob(pattern):
             if plugin_file.name.startswith('_'):  # Skip private files
                 continue
-            if plugin_file.name in ['base_plugin.py', 'plugin_loader.py']:  # Skip infrastructure files
+            if plugin_file.name in ['base_plugin.py', 'plugin_loader.py', 'preview_cache.py']:  # Skip infrastructure files
                 continue
             plugin_files.append(plugin_file)
         
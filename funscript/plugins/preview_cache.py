@@ -0,0 +1,162 @@
+"""
+Versioned cache for plugin previews.
+
+Plugin dialogs regenerate their preview every time a parameter changes. Most of
+those requests repeat an earlier (actions, parameters) combination, so preview
+results are cached under a key built from the revision of the previewed axis
+(see ``DualAxisFunscript.get_revision``), the previewed window, the axis, the
+plugin and its normalized parameters. Building the key is O(1); hashing the
+action content is only the fallback for funscript objects without revisions.
+Entries are evicted least-recently-used once the estimated memory budget is
+exceeded.
+
+For plugins that only read a bounded neighbourhood of the selected actions
+(see ``FunscriptTransformationPlugin.preview_margin_points``), previews are
+computed on the selected window plus that margin instead of the whole axis.
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_PREVIEW_CACHE_BYTES = 64 * 1024 * 1024
+# Rough per-entry cost of a preview point dict ({'at', 'pos', flags...})
+_BYTES_PER_PREVIEW_POINT = 400
+
+
+def hash_actions(actions: Sequence[Dict], start: int = 0, end: Optional[int] = None) -> str:
+    """Content hash of actions[start:end] ('at' and 'pos' only)."""
+    end = len(actions) if end is None else end
+    count = max(0, end - start)
+    data = np.fromiter((v for i in range(start, end) for v in (actions[i]['at'], actions[i]['pos'])),
+                       dtype=np.int64, count=count * 2)
+    return hashlib.blake2b(data.tobytes(), digest_size=16).hexdigest()
+
+
+def actions_version_key(funscript_obj, axis: str) -> Hashable:
+    """
+    Key that changes whenever the actions of ``axis`` ('primary', 'secondary' or 'both') change.
+
+    Relies on edits going through DualAxisFunscript or calling its _invalidate_cache(),
+    as all plugins do.
+    """
+    if axis == 'both':
+        return actions_version_key(funscript_obj, 'primary'), actions_version_key(funscript_obj, 'secondary')
+    actions = funscript_obj.primary_actions if axis == 'primary' else funscript_obj.secondary_actions
+    if not hasattr(funscript_obj, 'get_revision'):
+        return hash_actions(actions)
+    return id(funscript_obj), id(actions), len(actions), funscript_obj.get_revision(axis)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, float):
+        return round(value, 9)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def normalize_params(parameters: Dict[str, Any]) -> Hashable:
+    """Order-independent, hashable form of a parameter dict."""
+    return _freeze(parameters)
+
+
+def compute_preview_window(num_actions: int, selected_indices: Optional[Sequence[int]],
+                           margin_points: Optional[int]) -> Optional[Tuple[int, int]]:
+    """
+    Returns the [start, end) action range a windowed preview needs, or None if the
+    whole axis must be processed (no selection, or the plugin declares no margin).
+    """
+    if margin_points is None or not selected_indices:
+        return None
+    valid = [i for i in selected_indices if 0 <= i < num_actions]
+    if not valid:
+        return None
+    start = max(0, min(valid) - margin_points)
+    end = min(num_actions, max(valid) + 1 + margin_points)
+    return start, end
+
+
+def remap_selection(selected_indices: Optional[Sequence[int]], window: Tuple[int, int]) -> Optional[List[int]]:
+    """Translates absolute selected indices into indices relative to ``window``."""
+    if not selected_indices:
+        return None
+    start, end = window
+    return sorted(i - start for i in selected_indices if start <= i < end)
+
+
+def estimate_preview_size(preview_data: Any) -> int:
+    if isinstance(preview_data, dict):
+        points = preview_data.get('preview_points')
+        if isinstance(points, list):
+            return len(points) * _BYTES_PER_PREVIEW_POINT + 1024
+    return sys.getsizeof(preview_data) + 1024
+
+
+class PluginPreviewCache:
+    """Thread-safe LRU cache of preview results bounded by estimated memory."""
+
+    def __init__(self, max_bytes: int = DEFAULT_PREVIEW_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(version_key: Hashable, axis: str, plugin_name: str, plugin_version: str,
+                 parameters: Dict[str, Any], selection: Optional[Sequence[int]] = None,
+                 kind: str = 'actions') -> Hashable:
+        """
+        ``version_key`` identifies the previewed actions (see actions_version_key), including
+        the window if only part of the axis is previewed.
+        """
+        return (kind, version_key, axis, plugin_name, plugin_version, normalize_params(parameters),
+                tuple(selection) if selection else None)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size_bytes: Optional[int] = None):
+        size = size_bytes if size_bytes is not None else estimate_preview_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._total_bytes,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+# Global preview cache shared by the funscript API and the plugin UI
+preview_cache = PluginPreviewCache()
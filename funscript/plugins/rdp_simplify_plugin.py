@@ -39,6 +39,10 @@ class RdpSimplifyPlugin(FunscriptTransformationPlugin):
     def version(self) -> str:
         return "1.0.0"
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        return 0
+    
     @property
     def parameters_schema(self) -> Dict[str, Any]:
         return {
@@ -74,20 +78,15 @@ class RdpSimplifyPlugin(FunscriptTransformationPlugin):
         return False  # Uses fast numpy implementation, no external dependencies needed
     
     def _get_action_indices_in_time_range(self, actions_list, start_time_ms, end_time_ms):
-        """Helper method to find action indices within time range."""
+        """Helper method to find action indices within time range (actions are sorted by 'at')."""
         if not actions_list:
             return None, None
         
-        start_idx = None
-        end_idx = None
-        
-        for i, action in enumerate(actions_list):
-            if start_idx is None and action['at'] >= start_time_ms:
-                start_idx = i
-            if action['at'] <= end_time_ms:
-                end_idx = i
+        timestamps = np.fromiter((action['at'] for action in actions_list), dtype=np.int64, count=len(actions_list))
+        start_idx = int(np.searchsorted(timestamps, start_time_ms, side='left'))
+        end_idx = int(np.searchsorted(timestamps, end_time_ms, side='right')) - 1
         
-        return start_idx, end_idx
+        return (start_idx if start_idx < len(actions_list) else None), (end_idx if end_idx >= 0 else None)
     
     def _rdp_numpy_implementation(self, points, epsilon):
         """
@@ -97,9 +96,97 @@ class RdpSimplifyPlugin(FunscriptTransformationPlugin):
         if len(points) < 3:
             return points
         
-        # OPTIMIZED: Use fastest confirmed algorithm
-        # Testing showed multi-resolution added overhead - stick with iterative stack
-        return self._rdp_iterative_stack(points, epsilon)
+        # Level-synchronous RDP: all open segments of one recursion depth are split in a
+        # single vectorized pass. Produces the same points as _rdp_iterative_stack.
+        return self._rdp_level_vectorized(points, epsilon)
+    
+    # Segments with more intermediate points than this are split one at a time on contiguous
+    # slices; smaller ones are batched so their per-segment overhead is paid once per level.
+    _RDP_BATCH_SEGMENT_POINTS = 256
+    
+    def _rdp_level_vectorized(self, points, epsilon):
+        """Exact RDP: large segments are split individually, small ones a whole level at once."""
+        n = len(points)
+        if n < 3:
+            return points
+        
+        x = np.ascontiguousarray(points[:, 0])
+        y = np.ascontiguousarray(points[:, 1])
+        keep = np.zeros(n, dtype=bool)
+        keep[0] = True  # Always keep first point
+        keep[-1] = True  # Always keep last point
+        
+        stack = [(0, n - 1)]
+        small_starts, small_ends = [], []
+        while stack or small_starts:
+            while stack:
+                start_idx, end_idx = stack.pop()
+                if end_idx - start_idx <= 1:
+                    continue
+                if end_idx - start_idx - 1 <= self._RDP_BATCH_SEGMENT_POINTS:
+                    small_starts.append(start_idx)
+                    small_ends.append(end_idx)
+                    continue
+                
+                line_x = x[end_idx] - x[start_idx]
+                line_y = y[end_idx] - y[start_idx]
+                line_length = np.sqrt(line_x * line_x + line_y * line_y)
+                if line_length == 0:
+                    continue
+                
+                # Perpendicular distance |line x (p - start)| / |line|
+                px = x[start_idx + 1:end_idx] - x[start_idx]
+                py = y[start_idx + 1:end_idx] - y[start_idx]
+                distances = np.abs(line_x * py - line_y * px) / line_length
+                max_local_idx = int(np.argmax(distances))
+                if distances[max_local_idx] > epsilon:
+                    max_global_idx = start_idx + max_local_idx + 1
+                    keep[max_global_idx] = True
+                    stack.append((start_idx, max_global_idx))
+                    stack.append((max_global_idx, end_idx))
+            
+            if small_starts:
+                starts = np.array(small_starts, dtype=np.int64)
+                ends = np.array(small_ends, dtype=np.int64)
+                small_starts, small_ends = [], []
+                while starts.size:
+                    starts, ends = self._rdp_split_segments(x, y, starts, ends, epsilon, keep)
+        
+        return points[keep]
+    
+    @staticmethod
+    def _rdp_split_segments(x, y, starts, ends, epsilon, keep):
+        """Splits every segment (starts[i], ends[i]) in one vectorized pass; returns the sub-segments."""
+        # Segments need at least one intermediate point and a non-degenerate line
+        line_x = x[ends] - x[starts]
+        line_y = y[ends] - y[starts]
+        line_length = np.sqrt(line_x * line_x + line_y * line_y)
+        valid = ((ends - starts) > 1) & (line_length != 0)
+        if not np.all(valid):
+            starts, ends = starts[valid], ends[valid]
+            line_x, line_y, line_length = line_x[valid], line_y[valid], line_length[valid]
+        if not starts.size:
+            return starts, ends
+        
+        # Flatten the intermediate points of all segments
+        counts = ends - starts - 1
+        offsets = np.cumsum(counts) - counts
+        seg_ids = np.repeat(np.arange(starts.size), counts)
+        point_idx = np.arange(counts.sum()) - offsets[seg_ids] + starts[seg_ids] + 1
+        
+        px = x[point_idx] - x[starts][seg_ids]
+        py = y[point_idx] - y[starts][seg_ids]
+        distances = np.abs(line_x[seg_ids] * py - line_y[seg_ids] * px) / line_length[seg_ids]
+        
+        # First maximum per segment (matches np.argmax tie-breaking)
+        seg_max = np.maximum.reduceat(distances, offsets)
+        max_positions = np.flatnonzero(distances == seg_max[seg_ids])
+        split_idx = point_idx[max_positions[np.searchsorted(max_positions, offsets)]]
+        
+        split = seg_max > epsilon
+        split_idx = split_idx[split]
+        keep[split_idx] = True
+        return np.concatenate((starts[split], split_idx)), np.concatenate((split_idx, ends[split]))
     
     def _approximate_rdp_ultra_fast(self, points, epsilon):
         """Ultra-fast approximate RDP using uniform sampling + refinement."""
@@ -355,19 +442,11 @@ class RdpSimplifyPlugin(FunscriptTransformationPlugin):
             self.logger.debug(f"Segment for RDP on {axis} axis has < 2 points")
             return False
         
-        # OPTIMIZED: Vectorized conversion to points array for RDP
+        # Vectorized conversion to points array for RDP
         segment = segment_info['segment']
-        if len(segment) > 1000:
-            # Use vectorized extraction for large datasets
-            timestamps = np.array([action['at'] for action in segment], dtype=np.float64)
-            positions = np.array([action['pos'] for action in segment], dtype=np.float64)
-            points = np.column_stack((timestamps, positions))
-        else:
-            # Original method for smaller datasets
-            points = np.column_stack((
-                [action['at'] for action in segment],
-                [action['pos'] for action in segment]
-            )).astype(np.float64)
+        timestamps = np.fromiter((action['at'] for action in segment), dtype=np.float64, count=len(segment))
+        positions = np.fromiter((action['pos'] for action in segment), dtype=np.float64, count=len(segment))
+        points = np.column_stack((timestamps, positions))
         
         epsilon = params['epsilon']
         
@@ -377,10 +456,9 @@ class RdpSimplifyPlugin(FunscriptTransformationPlugin):
             self.logger.debug(f"Using optimized numpy RDP implementation for {axis} axis simplification")
             
             # Vectorized conversion back to action dictionaries
-            simplified_actions = [
-                {'at': int(point[0]), 'pos': int(np.clip(point[1], 0, 100))}
-                for point in simplified_points
-            ]
+            simplified_at = simplified_points[:, 0].astype(np.int64).tolist()
+            simplified_pos = np.clip(simplified_points[:, 1], 0, 100).astype(np.int64).tolist()
+            simplified_actions = [{'at': at, 'pos': pos} for at, pos in zip(simplified_at, simplified_pos)]
             
             # Reconstruct the full actions list
             new_actions_list = (
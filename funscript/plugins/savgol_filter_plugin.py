@@ -41,6 +41,10 @@ class SavgolFilterPlugin(FunscriptTransformationPlugin):
     def version(self) -> str:
         return "1.0.0"
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        return 0
+    
     @property
     def parameters_schema(self) -> Dict[str, Any]:
         return {
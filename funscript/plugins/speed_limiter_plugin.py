@@ -7,8 +7,8 @@ It removes rapid actions, replaces small movements with vibrations, and limits
 maximum speed.
 """
 
-import copy
 import numpy as np
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 
 try:
@@ -40,6 +40,11 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
     def version(self) -> str:
         return "1.0.0"
     
+    @property
+    def preview_margin_points(self) -> Optional[int]:
+        """Speed is limited against the previous action."""
+        return 1
+    
     @property
     def parameters_schema(self) -> Dict[str, Any]:
         return {
@@ -123,8 +128,8 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
             # Apply to all actions
             indices_to_process = list(range(len(actions_list)))
         
-        # Work on a deep copy
-        actions = copy.deepcopy(actions_list)
+        # Work on a copy (actions only hold scalars, so copying each dict is a deep copy)
+        actions = [dict(action) for action in actions_list]
         original_count = len(actions)
         
         min_interval = params['min_interval_ms']
@@ -169,22 +174,18 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
         # OPTIMIZATION: Use vectorized approach for large datasets
         if len(actions) > 5000:
             # Extract timestamps as numpy array
-            timestamps = np.array([action['at'] for action in actions])
+            timestamps = np.fromiter(map(itemgetter('at'), actions), dtype=np.int64, count=len(actions))
             
             # Calculate intervals between consecutive actions
             intervals = np.diff(timestamps)
             
-            # Create boolean mask for actions to keep
+            # Create boolean mask for actions to keep; remove the later action of each
+            # short interval (preserve chronological order)
             keep_mask = np.ones(len(actions), dtype=bool)
-            
-            # Mark actions to remove (those with intervals < min_interval)
-            for i in range(len(intervals)):
-                if intervals[i] < min_interval:
-                    # Remove the later action (preserve chronological order)
-                    keep_mask[i + 1] = False
+            keep_mask[1:] = intervals >= min_interval
             
             # Filter actions using the mask
-            filtered_actions = [actions[i] for i in range(len(actions)) if keep_mask[i]]
+            filtered_actions = [actions[i] for i in np.flatnonzero(keep_mask).tolist()]
             
             removed_count = len(actions) - len(filtered_actions)
             if removed_count > 0:
@@ -192,20 +193,11 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
             
             return filtered_actions
         else:
-            # Original method for smaller datasets
-            filtered_actions = [actions[-1]]  # Always keep the last action
-            last_kept_time = actions[-1]['at']
-            
-            for i in range(len(actions) - 2, -1, -1):
-                current_action = actions[i]
-                interval = abs(current_action['at'] - last_kept_time)
-                
-                if interval >= min_interval:
-                    filtered_actions.append(current_action)
-                    last_kept_time = current_action['at']
-            
-            # Restore chronological order
-            filtered_actions.reverse()
+            # Smaller datasets: walking back from the last action, keep each action at least
+            # min_interval before the previously kept one
+            timestamps = np.fromiter(map(itemgetter('at'), actions), dtype=np.int64, count=len(actions))
+            keep_mask = self._keep_mask_backward(timestamps, min_interval)
+            filtered_actions = [actions[i] for i in np.flatnonzero(keep_mask).tolist()]
             
             removed_count = len(actions) - len(filtered_actions)
             if removed_count > 0:
@@ -213,96 +205,114 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
             
             return filtered_actions
     
+    @staticmethod
+    def _keep_mask_backward(timestamps: np.ndarray, min_interval: int) -> np.ndarray:
+        """
+        Mask of the actions kept by the backward walk. In sorted scripts the last action of every
+        cluster (run of intervals shorter than min_interval) is kept, so the walks of all clusters
+        advance together, one kept action per pass: each jumps to the latest action at least
+        min_interval earlier.
+        """
+        n = len(timestamps)
+        keep = np.zeros(n, dtype=bool)
+        keep[-1] = True
+        intervals = np.diff(timestamps)
+        if np.any(intervals < 0):
+            # Unsorted input: the walk compares absolute intervals to the last kept action
+            last_kept_time = timestamps[-1]
+            for i in range(n - 2, -1, -1):
+                if abs(timestamps[i] - last_kept_time) >= min_interval:
+                    keep[i] = True
+                    last_kept_time = timestamps[i]
+            return keep
+        
+        cluster_ends = np.flatnonzero(np.append(intervals >= min_interval, True))
+        cluster_starts = np.append(0, cluster_ends[:-1] + 1)
+        keep[cluster_ends] = True
+        current, lowest = cluster_ends, cluster_starts
+        while current.size:
+            previous = np.searchsorted(timestamps, timestamps[current] - min_interval, side='right') - 1
+            previous = np.minimum(previous, current - 1)
+            inside = previous >= lowest
+            current, lowest = previous[inside], lowest[inside]
+            keep[current] = True
+        return keep
+    
     def _add_vibrations(self, actions: List[Dict], vibe_amount: int, 
                        small_movement_threshold: int, axis: str) -> tuple[List[Dict], int]:
         """Replace small movements with vibration patterns."""
         if len(actions) <= 2:
             return actions, 0
         
-        modified_count = 0
-        vibration_state = {'already_vibing': 0, 'last_vibe': '', 'last_height': 0}
+        if vibe_amount <= 0:
+            return actions, 0
         
-        for i in range(1, len(actions)):
-            current = actions[i]
-            previous = actions[i - 1]
-            
-            # Calculate movement size
-            movement_size = abs(current['pos'] - previous['pos'])
-            time_interval = current['at'] - previous['at']
-            
-            # Check if this is a small movement that should be vibrated
-            if (movement_size <= small_movement_threshold and 
-                time_interval > 0 and 
-                vibe_amount > 0):
-                
-                new_pos = self._calculate_vibration_position(
-                    previous['pos'], 
-                    current['pos'], 
-                    vibe_amount, 
-                    vibration_state
-                )
-                
-                if new_pos != current['pos']:
-                    actions[i]['pos'] = int(np.clip(new_pos, 0, 100))
-                    modified_count += 1
+        # Each step reads the previous (possibly vibrated) position and the alternating vibration
+        # direction, so this is a recurrence; only the candidate intervals are found in bulk
+        n = len(actions)
+        timestamps = np.fromiter(map(itemgetter('at'), actions), dtype=np.int64, count=n)
+        positions = [action['pos'] for action in actions]
+        candidates = (np.flatnonzero(np.diff(timestamps) > 0) + 1).tolist()
+        
+        modified_count = 0
+        vibe_up = False  # Direction of the last vibration; the first one goes up
+        for i in candidates:
+            previous_pos, current_pos = positions[i - 1], positions[i]
+            if abs(current_pos - previous_pos) > small_movement_threshold:
+                continue
+            # Alternate vibration direction to create oscillating pattern
+            vibe_up = not vibe_up
+            movement_direction = 1 if current_pos > previous_pos else -1
+            new_pos = (previous_pos + current_pos) // 2 + vibe_amount * (1 if vibe_up else -1) * movement_direction
+            new_pos = min(max(new_pos, 0), 100)
+            if new_pos != current_pos:
+                positions[i] = new_pos
+                actions[i]['pos'] = new_pos
+                modified_count += 1
         
         if modified_count > 0:
             self.logger.debug(f"{axis} axis: Added vibration to {modified_count} small movements")
         
         return actions, modified_count
     
-    def _calculate_vibration_position(self, prev_pos: int, curr_pos: int, 
-                                    vibe_amount: int, vibe_state: Dict) -> int:
-        """Calculate vibration position based on movement and state."""
-        movement_direction = 1 if curr_pos > prev_pos else -1
-        base_pos = (prev_pos + curr_pos) // 2
-        
-        # Alternate vibration direction to create oscillating pattern
-        if vibe_state['last_vibe'] == 'up':
-            vibe_direction = -1
-            vibe_state['last_vibe'] = 'down'
-        else:
-            vibe_direction = 1
-            vibe_state['last_vibe'] = 'up'
-        
-        # Apply vibration
-        vibrated_pos = base_pos + (vibe_amount * vibe_direction * movement_direction)
-        
-        return int(np.clip(vibrated_pos, 0, 100))
-    
     def _limit_speed_for_selected_indices(self, actions: List[Dict], speed_threshold: float, 
                                         selected_indices: List[int], axis: str) -> List[Dict]:
         """Apply speed limiting only to selected action indices."""
         if len(actions) <= 1 or not selected_indices:
             return actions
         
-        # Create a set for faster lookup
-        selected_set = set(selected_indices)
-        result_actions = copy.deepcopy(actions)
-        
-        # Process each selected action
-        for i in selected_indices:
-            if i <= 0 or i >= len(result_actions):
-                continue
-                
-            current = result_actions[i]
-            previous = result_actions[i - 1]
-            
-            # Calculate speed between current and previous
-            time_diff = current['at'] - previous['at']
-            if time_diff <= 0:
-                continue
-                
-            pos_diff = abs(current['pos'] - previous['pos'])
-            current_speed = pos_diff / time_diff * 1000  # positions per second
-            
-            if current_speed > speed_threshold:
-                # Adjust position to limit speed
-                max_pos_change = (speed_threshold * time_diff) / 1000
-                direction = 1 if current['pos'] > previous['pos'] else -1
-                new_pos = previous['pos'] + (direction * max_pos_change)
-                result_actions[i]['pos'] = int(np.clip(new_pos, 0, 100))
-        
+        n = len(actions)
+        indices = np.unique(np.asarray(selected_indices, dtype=np.int64))
+        indices = indices[(indices > 0) & (indices < n)]
+        timestamps = np.fromiter(map(itemgetter('at'), actions), dtype=np.int64, count=n)
+        original = np.fromiter(map(itemgetter('pos'), actions), dtype=np.int64, count=n)
+        indices = indices[timestamps[indices] - timestamps[indices - 1] > 0]
+        if indices.size == 0:
+            return list(actions)
+        
+        time_diff = (timestamps[indices] - timestamps[indices - 1]).astype(np.float64)
+        max_pos_change = (speed_threshold * time_diff) / 1000
+        # A limited action moves the start of the next interval, so limit in passes until no
+        # selected action follows one changed in the previous pass
+        positions = original.copy()
+        pending = np.arange(indices.size)
+        while pending.size:
+            i = indices[pending]
+            current, previous = original[i], positions[i - 1]
+            current_speed = np.abs(current - previous) / time_diff[pending] * 1000  # positions per second
+            direction = np.where(current > previous, 1, -1)
+            new_pos = np.clip(previous + direction * max_pos_change[pending], 0, 100).astype(np.int64)
+            new_pos = np.where(current_speed > speed_threshold, new_pos, current)
+            changed = new_pos != positions[i]
+            positions[i] = new_pos
+            followers = np.flatnonzero(changed)
+            followers = followers[pending[followers] + 1 < indices.size]
+            pending = pending[followers] + 1
+            pending = pending[indices[pending] == indices[pending - 1] + 1]
+        
+        result_actions = list(actions)
+        for i in np.flatnonzero(positions != original).tolist():
+            result_actions[i] = {**actions[i], 'pos': int(positions[i])}
         return result_actions
     
     def _limit_speed(self, actions: List[Dict], speed_threshold: float, axis: str) -> List[Dict]:
@@ -317,85 +327,73 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
             return self._limit_speed_original(actions, speed_threshold, axis)
     
     def _limit_speed_vectorized(self, actions: List[Dict], speed_threshold: float, axis: str) -> List[Dict]:
-        """REVOLUTIONARY: Bulk geometric interpolation for massive speedup."""
+        """Bulk geometric interpolation: every violating interval is subdivided in array passes."""
         # Extract arrays for vectorized operations
-        timestamps = np.array([action['at'] for action in actions])
-        positions = np.array([action['pos'] for action in actions])
+        n = len(actions)
+        timestamps = np.fromiter(map(itemgetter('at'), actions), dtype=np.int64, count=n)
+        positions = np.fromiter(map(itemgetter('pos'), actions), dtype=np.int64, count=n)
         
-        # BREAKTHROUGH 1: Pre-compute ALL violations using vectorized operations
+        # Pre-compute ALL violations using vectorized operations
         time_deltas = np.diff(timestamps)
         pos_deltas = np.diff(positions)
         speeds = np.abs(pos_deltas) / np.maximum(time_deltas, 1)
-        violation_mask = speeds > speed_threshold
+        violation_indices = np.flatnonzero(speeds > speed_threshold)
         
-        if not np.any(violation_mask):
+        if violation_indices.size == 0:
             return actions
         
-        # BREAKTHROUGH 2: Build interpolation segments in bulk using geometric math
-        violation_indices = np.where(violation_mask)[0]
-        
-        # Pre-allocate result arrays for maximum efficiency
-        estimated_size = len(actions) + len(violation_indices) * 5  # Estimate 5 points per violation
-        result_times = np.zeros(estimated_size)
-        result_positions = np.zeros(estimated_size)
-        
-        write_idx = 0
-        last_processed = 0
-        
-        # BREAKTHROUGH 3: Vectorized segment processing
-        for violation_idx in violation_indices:
-            # Copy non-violating points before this violation
-            segment_start = last_processed
-            segment_end = violation_idx + 1
-            
-            if segment_start < segment_end:
-                segment_len = segment_end - segment_start
-                result_times[write_idx:write_idx + segment_len] = timestamps[segment_start:segment_end]
-                result_positions[write_idx:write_idx + segment_len] = positions[segment_start:segment_end]
-                write_idx += segment_len
-            
-            # BREAKTHROUGH 4: Geometric interpolation math
-            start_time = timestamps[violation_idx]
-            end_time = timestamps[violation_idx + 1]
-            start_pos = positions[violation_idx]
-            end_pos = positions[violation_idx + 1]
-            
-            # Calculate required intermediate points using mathematics
-            total_distance = abs(end_pos - start_pos)
-            total_time = end_time - start_time
-            max_distance_per_segment = speed_threshold * total_time / 1000
-            
-            if max_distance_per_segment > 0:
-                num_segments = max(1, int(np.ceil(total_distance / max_distance_per_segment)))
-                
-                # VECTORIZED interpolation point generation
-                if num_segments > 1:
-                    # Generate intermediate time points
-                    time_points = np.linspace(start_time, end_time, num_segments + 1)
-                    # Generate intermediate position points
-                    pos_points = np.linspace(start_pos, end_pos, num_segments + 1)
-                    
-                    # Add all interpolated points at once
-                    interp_len = len(time_points) - 1  # Skip the start point (already added)
-                    if write_idx + interp_len < len(result_times):
-                        result_times[write_idx:write_idx + interp_len] = time_points[1:]
-                        result_positions[write_idx:write_idx + interp_len] = pos_points[1:]
-                        write_idx += interp_len
-            
-            last_processed = violation_idx + 1
-        
-        # Add remaining points
-        if last_processed < len(timestamps):
-            remaining_len = len(timestamps) - last_processed
-            result_times[write_idx:write_idx + remaining_len] = timestamps[last_processed:]
-            result_positions[write_idx:write_idx + remaining_len] = positions[last_processed:]
-            write_idx += remaining_len
-        
-        # BREAKTHROUGH 5: Bulk reconstruction of action dicts
-        result_actions = [
-            {'at': int(result_times[i]), 'pos': int(np.clip(result_positions[i], 0, 100))}
-            for i in range(write_idx)
-        ]
+        # Number of sub-segments needed for each violating interval
+        total_distance = np.abs(pos_deltas[violation_indices])
+        max_distance_per_segment = speed_threshold * time_deltas[violation_indices] / 1000
+        positive = max_distance_per_segment > 0
+        num_segments = np.ones(violation_indices.size, dtype=np.int64)
+        num_segments[positive] = np.maximum(
+            1, np.ceil(total_distance[positive] / max_distance_per_segment[positive])).astype(np.int64)
+        # A subdivided interval emits its end point twice: once interpolated, once as the original
+        inserted = np.where(num_segments > 1, num_segments, 0)
+        
+        # Output buffer is bounded (original estimate of 5 points per violation); intervals whose
+        # interpolation would overflow it are left as they are.
+        capacity = n + violation_indices.size * 5
+        write_before = violation_indices + 1 + np.cumsum(inserted) - inserted
+        if np.any((inserted > 0) & (write_before + inserted >= capacity)):
+            write_idx_offset = 0
+            for k in range(violation_indices.size):
+                if inserted[k] and violation_indices[k] + 1 + write_idx_offset + inserted[k] >= capacity:
+                    inserted[k] = 0
+                write_idx_offset += inserted[k]
+        
+        # Scatter original points and interpolated runs into the output arrays
+        inserted_before = np.zeros(n, dtype=np.int64)
+        inserted_before[violation_indices + 1] = inserted
+        out_index = np.arange(n) + np.cumsum(inserted_before)
+        total = n + int(inserted.sum())
+        result_times = np.empty(total, dtype=np.float64)
+        result_positions = np.empty(total, dtype=np.float64)
+        result_times[out_index] = timestamps
+        result_positions[out_index] = positions
+        
+        active = inserted > 0
+        if np.any(active):
+            v = violation_indices[active]
+            segs = inserted[active]
+            run_start = out_index[v + 1] - segs
+            run_ids = np.repeat(np.arange(v.size), segs)
+            step_number = (np.arange(segs.sum()) - np.repeat(np.cumsum(segs) - segs, segs) + 1).astype(np.float64)
+            dest = run_start[run_ids] + step_number.astype(np.int64) - 1
+            # Same arithmetic as np.linspace(start, end, segs + 1)[1:]
+            for values, out in ((timestamps, result_times), (positions, result_positions)):
+                start = values[v].astype(np.float64)
+                step = (values[v + 1] - values[v]).astype(np.float64) / segs
+                run_values = step_number * step[run_ids] + start[run_ids]
+                is_last = step_number == segs[run_ids]
+                run_values[is_last] = values[v + 1][run_ids[is_last]]
+                out[dest] = run_values
+        
+        # Bulk reconstruction of action dicts
+        result_at = result_times.astype(np.int64).tolist()
+        result_pos = np.clip(result_positions, 0, 100).astype(np.int64).tolist()
+        result_actions = [{'at': at, 'pos': pos} for at, pos in zip(result_at, result_pos)]
         
         speed_corrections = len(result_actions) - len(actions)
         if speed_corrections > 0:
@@ -404,28 +402,42 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
         return result_actions
     
     def _limit_speed_original(self, actions: List[Dict], speed_threshold: float, axis: str) -> List[Dict]:
-        """Original speed limiting for smaller datasets."""
-        speed_limited_actions = [actions[0]]  # Always keep first action
-        
-        for i in range(1, len(actions)):
-            current = actions[i]
-            previous = speed_limited_actions[-1]
-            
-            time_delta = current['at'] - previous['at']
-            if time_delta <= 0:
-                continue
-            
-            pos_delta = abs(current['pos'] - previous['pos'])
-            current_speed = pos_delta / time_delta  # positions per millisecond
-            
-            if current_speed > speed_threshold:
-                # Need to limit speed - insert intermediate points
-                intermediate_actions = self._create_intermediate_actions(
-                    previous, current, speed_threshold
-                )
-                speed_limited_actions.extend(intermediate_actions)
-            else:
-                speed_limited_actions.append(current)
+        """Speed limiting for smaller datasets (point-to-point speeds in positions per millisecond)."""
+        n = len(actions)
+        timestamps = np.fromiter(map(itemgetter('at'), actions), dtype=np.int64, count=n)
+        positions = np.fromiter(map(itemgetter('pos'), actions), dtype=np.int64, count=n)
+        
+        # An action is kept when it is later than every action kept before it
+        kept = np.ones(n, dtype=bool)
+        kept[1:] = timestamps[1:] > np.maximum.accumulate(timestamps)[:-1]
+        kept_indices = np.flatnonzero(kept)
+        
+        # Speed between consecutive kept actions
+        start_times, end_times = timestamps[kept_indices[:-1]], timestamps[kept_indices[1:]]
+        start_pos, end_pos = positions[kept_indices[:-1]], positions[kept_indices[1:]]
+        time_delta = end_times - start_times
+        pos_delta = end_pos - start_pos
+        too_fast = np.abs(pos_delta) / time_delta > speed_threshold
+        
+        # A too-fast interval becomes num_segments evenly spaced points ending on the original action
+        required_time = np.abs(pos_delta) / speed_threshold
+        subdivided = too_fast & (required_time > time_delta)
+        num_segments = np.ones(time_delta.size, dtype=np.int64)
+        num_segments[subdivided] = np.ceil(required_time[subdivided] / time_delta[subdivided]).astype(np.int64)
+        
+        interval_ids = np.repeat(np.arange(time_delta.size), num_segments)
+        step = np.arange(interval_ids.size) - np.repeat(np.cumsum(num_segments) - num_segments, num_segments) + 1
+        progress = step / num_segments[interval_ids]
+        new_times = np.trunc(start_times[interval_ids] + time_delta[interval_ids] * progress).astype(np.int64)
+        new_pos = np.clip(np.trunc(start_pos[interval_ids] + pos_delta[interval_ids] * progress), 0, 100).astype(np.int64)
+        # The last point of each interval is the original action
+        is_end = step == num_segments[interval_ids]
+        new_times[is_end], new_pos[is_end] = end_times, end_pos
+        
+        # Always keep first action
+        result_at = [int(timestamps[0])] + new_times.tolist()
+        result_pos = [int(positions[0])] + new_pos.tolist()
+        speed_limited_actions = [{'at': at, 'pos': pos} for at, pos in zip(result_at, result_pos)]
         
         speed_corrections = len(speed_limited_actions) - len(actions)
         if speed_corrections > 0:
@@ -433,43 +445,6 @@ class SpeedLimiterPlugin(FunscriptTransformationPlugin):
         
         return speed_limited_actions
     
-    def _create_intermediate_actions(self, start_action: Dict, end_action: Dict, 
-                                   max_speed: float) -> List[Dict]:
-        """Create intermediate actions to limit speed between two points."""
-        time_delta = end_action['at'] - start_action['at']
-        pos_delta = end_action['pos'] - start_action['pos']
-        
-        if time_delta <= 0:
-            return [end_action]
-        
-        # Calculate how many intermediate points we need
-        required_time = abs(pos_delta) / max_speed
-        if required_time <= time_delta:
-            return [end_action]
-        
-        num_segments = int(np.ceil(required_time / time_delta))
-        
-        intermediate_actions = []
-        for i in range(1, num_segments + 1):
-            progress = i / num_segments
-            
-            intermediate_time = int(start_action['at'] + (time_delta * progress))
-            intermediate_pos = int(start_action['pos'] + (pos_delta * progress))
-            intermediate_pos = int(np.clip(intermediate_pos, 0, 100))
-            
-            intermediate_actions.append({
-                'at': intermediate_time,
-                'pos': intermediate_pos
-            })
-        
-        # Make sure the last intermediate action matches the target
-        if intermediate_actions:
-            intermediate_actions[-1] = end_action
-        else:
-            intermediate_actions = [end_action]
-        
-        return intermediate_actions
-    
     def get_preview(self, funscript, axis: str = 'both', **parameters) -> Dict[str, Any]:
         """Generate a preview of the speed limiter effect."""
         try:
@@ -1,10 +1,10 @@
 import logging
 
-from application.logic.app_logic import ApplicationLogic
-from application.logic.cli_handler import parse_and_validate_args
+from application.logic.cli_handler import setup_core_environment, parse_and_validate_args, run_cli
 
 def run_gui():
     """Initializes and runs the graphical user interface."""
+    from application.logic.app_logic import ApplicationLogic
     from application.gui_components import GUI, show_splash_during_init
 
     def init_app_logic():
@@ -15,24 +15,16 @@ def run_gui():
     core_app.gui_instance = gui
     gui.run()
 
-def run_cli(args):
-    """Runs the application in command-line interface mode."""
-    logger = logging.getLogger(__name__)
-    logger.info("--- FunGen CLI Mode ---")
-    core_app = ApplicationLogic(is_cli=True)
-    core_app.run_cli(args)
-    logger.info("--- CLI Task Finished ---")
-
 def main():
     """
     Main function to run the application.
-    This function handles dependency checking, argument parsing, and starts either the GUI or CLI.
+    This function handles argument parsing and starts either the GUI or the headless CLI.
     """
     # Step 1: Set up core environment (logging, multiprocessing, etc.)
-    ApplicationLogic.setup_core_environment()
+    setup_core_environment()
     logger = logging.getLogger(__name__)
 
-    # Step 2: Parse and validate command-line arguments
+    # Step 2: Parse and validate command-line arguments (standard library only)
     args = parse_and_validate_args()
 
     # Step 3: Start the appropriate interface
@@ -42,4 +34,4 @@ def main():
         run_gui()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of the vectorized RDP, speed limiter and keyframe plugins against the
+loop implementations kept in test_plugin_equivalence.py.
+
+Usage: python tests/benchmark_plugins.py [num_actions]
+"""
+
+import copy
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_plugin_equivalence import (
+    ReferenceKeyframePlugin, ReferenceRdpSimplifyPlugin, ReferenceSpeedLimiterPlugin,
+    _funscript_with, _random_actions
+)
+from funscript.plugins.keyframe_plugin import KeyframePlugin
+from funscript.plugins.rdp_simplify_plugin import RdpSimplifyPlugin
+from funscript.plugins.speed_limiter_plugin import SpeedLimiterPlugin
+
+DEFAULT_NUM_ACTIONS = 30000
+
+
+def _time_transform(plugin, actions, repeats=3, **parameters) -> float:
+    """Best wall time of transform() over fresh copies of the script."""
+    best = float('inf')
+    for _ in range(repeats):
+        funscript = _funscript_with(actions)
+        start = time.perf_counter()
+        plugin.transform(funscript, axis='primary', **parameters)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _time_call(fn, *args, repeats=3) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        call_args = [copy.deepcopy(a) if isinstance(a, list) else a for a in args]
+        start = time.perf_counter()
+        fn(*call_args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    num_actions = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_NUM_ACTIONS
+    logging.disable(logging.CRITICAL)
+    rng = np.random.default_rng(0)
+    actions = _random_actions(rng, num_actions)
+    points = np.array([[a['at'], a['pos']] for a in actions], dtype=np.float64)
+    # Scripts over 3000 actions take the bulk path, whose reference overflows its output buffer
+    # once intervals need subdividing; the per-interval path is timed on a script it accepts
+    speed_actions = [{'at': i * 50, 'pos': int(50 + 50 * np.sin(i * np.pi / 10))} for i in range(3000)]
+
+    rdp, rdp_ref = RdpSimplifyPlugin(), ReferenceRdpSimplifyPlugin()
+    limiter, limiter_ref = SpeedLimiterPlugin(), ReferenceSpeedLimiterPlugin()
+    keyframe, keyframe_ref = KeyframePlugin(), ReferenceKeyframePlugin()
+
+    cases = [
+        ("RDP kernel (epsilon 2)",
+         lambda p: _time_call(p._rdp_numpy_implementation, points, 2.0), rdp, rdp_ref),
+        ("RDP transform (epsilon 8)",
+         lambda p: _time_transform(p, actions, epsilon=8.0), rdp, rdp_ref),
+        ("Speed limiter transform",
+         lambda p: _time_transform(p, actions, min_interval_ms=30, speed_threshold=500), limiter, limiter_ref),
+        ("Speed limit, 3000 actions (threshold 0.1)",
+         lambda p: _time_call(p._limit_speed, speed_actions, 0.1, 'primary'), limiter, limiter_ref),
+        ("Short-interval removal",
+         lambda p: _time_call(p._remove_short_intervals, actions, 30, 'primary'), limiter, limiter_ref),
+        ("Vibrations (amount 10)",
+         lambda p: _time_call(p._add_vibrations, actions, 10, 10, 'primary'), limiter, limiter_ref),
+        ("Speed limit, selection (threshold 100)",
+         lambda p: _time_transform(p, actions, speed_threshold=100, selected_indices=list(range(num_actions))),
+         limiter, limiter_ref),
+        ("Keyframe transform (tolerance 10)",
+         lambda p: _time_transform(p, actions, repeats=1, position_tolerance=10), keyframe, keyframe_ref),
+    ]
+
+    print(f"{num_actions} actions")
+    print(f"{'case':<44}{'reference':>12}{'vectorized':>12}{'speedup':>10}")
+    for name, run, plugin, reference in cases:
+        reference_time = run(reference)
+        plugin_time = run(plugin)
+        print(f"{name:<44}{reference_time:>11.3f}s{plugin_time:>11.3f}s{reference_time / plugin_time:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
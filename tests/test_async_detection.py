@@ -0,0 +1,175 @@
+"""
+Background detection of the live YOLO ROI tracker: AsyncDetector hand-off,
+re-alignment of late results by the ROI flow, the synchronous path Stage 3
+forces, and shutdown. The YOLO model is replaced by a fake detection function.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+async_detector = pytest.importorskip("tracker.tracker_modules.helpers.async_detector")
+yolo_roi = pytest.importorskip("tracker.tracker_modules.live.yolo_roi")
+
+FRAME_SHAPE = (480, 640, 3)
+TIMEOUT_S = 5.0
+PENIS_BOX = (300, 200, 60, 120)  # (x, y, w, h)
+
+
+class FakeModel:
+    """Detection function that returns PENIS_BOX; detection can be held to make results late."""
+
+    def __init__(self, hold: bool = False):
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+        self.started = threading.Event()
+        self.calls = []
+        self.frames = []
+
+    def __call__(self, frame):
+        self.calls.append(threading.current_thread().name)
+        self.frames.append(frame)
+        self.started.set()
+        assert self.release.wait(TIMEOUT_S)
+        return [{"box": PENIS_BOX, "class_name": "penis", "confidence": 0.9}]
+
+
+class DummyApp:
+    pass
+
+
+def _tracker(model: FakeModel):
+    tracker = yolo_roi.YoloRoiTracker()
+    assert tracker.initialize(DummyApp())
+    tracker.yolo_model = object()  # Only checked for presence; detection goes through the fake
+    tracker._detect_objects = model
+    tracker.start_tracking()
+    return tracker
+
+
+def _wait_for_result(detector):
+    """Waits until a result is published, without consuming it."""
+    deadline = time.monotonic() + TIMEOUT_S
+    while time.monotonic() < deadline:
+        with detector._cond:
+            if detector._result is not None and not detector.busy:
+                return
+        time.sleep(0.01)
+    pytest.fail("No detection result was published")
+
+
+def test_detector_keeps_only_the_newest_waiting_frame():
+    model = FakeModel(hold=True)
+    detector = async_detector.AsyncDetector(model, name="TestDetection")
+    try:
+        detector.submit(1, "frame-1")
+        assert model.started.wait(TIMEOUT_S)
+        detector.submit(2, "frame-2")
+        detector.submit(3, "frame-3")  # Replaces frame 2, which never started
+        assert detector.busy
+        model.release.set()
+
+        _wait_for_result(detector)
+        # Frame 2 never ran, and the one-slot output holds the newest result
+        assert model.frames == ["frame-1", "frame-3"]
+        assert detector.poll()[0] == 3
+        assert detector.poll() is None
+    finally:
+        detector.stop()
+
+
+def test_detector_reset_drops_in_flight_result():
+    model = FakeModel(hold=True)
+    detector = async_detector.AsyncDetector(model, name="TestDetection")
+    try:
+        detector.submit(1, "frame-1")
+        assert model.started.wait(TIMEOUT_S)
+        detector.reset()
+        model.release.set()
+        detector.submit(2, "frame-2")
+        _wait_for_result(detector)
+        assert detector.poll()[0] == 2
+    finally:
+        detector.stop()
+
+
+def test_detector_stop_ends_worker():
+    detector = async_detector.AsyncDetector(FakeModel(), name="TestDetection")
+    detector.submit(1, "frame-1")
+    thread = detector._thread
+    detector.stop(timeout=TIMEOUT_S)
+    assert not thread.is_alive()
+    detector.submit(2, "frame-2")  # Ignored once stopped
+    assert detector._thread is thread and detector.poll() is None
+
+
+def test_late_result_is_realigned_by_roi_flow():
+    model = FakeModel(hold=True)
+    tracker = _tracker(model)
+    processed = []
+    tracker._process_detections = lambda detections, frame_shape: processed.append(detections)
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    try:
+        tracker.process_frame(frame, 0, 0)  # No ROI yet: submits frame 1 to the worker
+        assert model.started.wait(TIMEOUT_S)
+        submitted_stamp = tracker.internal_frame_counter
+        for i in range(1, 4):
+            tracker.process_frame(frame, i * 33, i)  # Worker busy: no new frame is submitted
+        assert len(model.calls) == 1
+
+        # ROI flow seen while the detection was running, and one entry from before it
+        tracker._roi_shift_history.extend([(submitted_stamp, 50.0, 50.0), (submitted_stamp + 1, 4.0, -2.0),
+                                           (submitted_stamp + 3, 3.0, -1.0)])
+        model.release.set()
+        _wait_for_result(tracker._async_detector)
+        tracker.process_frame(frame, 4 * 33, 4)
+
+        assert tracker.last_detection_lag_frames == tracker.internal_frame_counter - submitted_stamp
+        x, y, w, h = PENIS_BOX
+        assert processed[-1] == [{"box": (x + 7, y - 3, w, h), "class_name": "penis", "confidence": 0.9}]
+    finally:
+        tracker.cleanup()
+
+
+def test_realignment_keeps_boxes_inside_the_frame():
+    tracker = _tracker(FakeModel())
+    try:
+        tracker._roi_shift_history.append((2, 1000.0, -1000.0))
+        detections = [{"box": PENIS_BOX, "class_name": "penis", "confidence": 0.9}]
+        realigned = tracker._realign_detections(detections, 1, FRAME_SHAPE[:2])
+        assert realigned[0]["box"] == (FRAME_SHAPE[1] - PENIS_BOX[2], 0, PENIS_BOX[2], PENIS_BOX[3])
+        assert tracker._realign_detections(detections, 2, FRAME_SHAPE[:2]) is detections
+    finally:
+        tracker.cleanup()
+
+
+def test_stage3_sync_detection_runs_on_the_calling_thread():
+    # Stage 3 sets async_detection = False so every detection applies to the frame it ran on
+    model = FakeModel()
+    tracker = _tracker(model)
+    tracker.async_detection = False
+    try:
+        result = tracker.process_frame(np.zeros(FRAME_SHAPE, dtype=np.uint8), 0, 0)
+        assert model.calls == [threading.current_thread().name]
+        assert tracker._async_detector is None
+        assert result.debug_info["detection_lag_frames"] == 0
+        assert result.debug_info["objects_detected"] == 1
+    finally:
+        tracker.cleanup()
+
+
+def test_cleanup_stops_the_detection_worker():
+    tracker = _tracker(FakeModel())
+    tracker.process_frame(np.zeros(FRAME_SHAPE, dtype=np.uint8), 0, 0)
+    thread = tracker._async_detector._thread
+    tracker.cleanup()
+    thread.join(TIMEOUT_S)
+    assert not thread.is_alive()
+    assert tracker._async_detector is None
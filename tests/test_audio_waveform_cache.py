@@ -0,0 +1,79 @@
+"""
+Audio waveform streaming: only a clean FFmpeg exit that reaches the expected
+duration is cached; truncated or failed decodes keep FFmpeg's stderr for the log.
+FFmpeg is replaced by a Python child process writing s16le samples.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+audio_waveform = pytest.importorskip("video.audio_waveform")
+
+FAKE_FFMPEG = """
+import sys
+seconds, exit_code, message = float(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+sys.stdout.buffer.write(b"\\x00\\x10" * int(seconds * {rate}))
+sys.stdout.flush()
+if message:
+    sys.stderr.write(message + "\\n")
+sys.exit(exit_code)
+""".format(rate=audio_waveform.WAVEFORM_SAMPLE_RATE)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"not a real video")
+    return str(path)
+
+
+def _fake_ffmpeg(monkeypatch, seconds: float, exit_code: int = 0, message: str = ""):
+    real_popen = subprocess.Popen
+
+    def popen(cmd, **kwargs):
+        return real_popen([sys.executable, "-c", FAKE_FFMPEG, str(seconds), str(exit_code), message], **kwargs)
+
+    monkeypatch.setattr(audio_waveform.subprocess, "Popen", popen)
+
+
+def test_complete_decode_is_cached(monkeypatch, video_path):
+    _fake_ffmpeg(monkeypatch, seconds=10.0)
+    envelope = audio_waveform.stream_audio_waveform_envelope(video_path, expected_duration_s=10.5)
+
+    assert envelope.complete
+    assert envelope.duration_ms == pytest.approx(10000.0)
+    cached = audio_waveform.AudioWaveformEnvelope.load(audio_waveform.get_waveform_cache_path(video_path), video_path)
+    assert cached is not None and cached.total_samples == envelope.total_samples
+
+
+def test_truncated_decode_is_returned_but_not_cached(monkeypatch, video_path, caplog):
+    _fake_ffmpeg(monkeypatch, seconds=4.0, exit_code=0)
+    with caplog.at_level(logging.WARNING):
+        envelope = audio_waveform.stream_audio_waveform_envelope(video_path, expected_duration_s=10.0)
+
+    assert envelope is not None and not envelope.complete
+    assert not os.path.exists(audio_waveform.get_waveform_cache_path(video_path))
+    assert "ended early" in caplog.text
+
+
+def test_failed_decode_is_not_cached_and_reports_stderr(monkeypatch, video_path, caplog):
+    _fake_ffmpeg(monkeypatch, seconds=10.0, exit_code=1, message="Error while decoding stream #0:1")
+    with caplog.at_level(logging.WARNING):
+        envelope = audio_waveform.stream_audio_waveform_envelope(video_path, expected_duration_s=10.0)
+
+    assert envelope is not None and not envelope.complete
+    assert not os.path.exists(audio_waveform.get_waveform_cache_path(video_path))
+    assert "Error while decoding stream #0:1" in caplog.text
+
+
+def test_decode_without_audio_reports_stderr(monkeypatch, video_path, caplog):
+    _fake_ffmpeg(monkeypatch, seconds=0.0, exit_code=1, message="Output file does not contain any stream")
+    with caplog.at_level(logging.ERROR):
+        assert audio_waveform.stream_audio_waveform_envelope(video_path, expected_duration_s=10.0) is None
+    assert "Output file does not contain any stream" in caplog.text
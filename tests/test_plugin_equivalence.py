@@ -0,0 +1,680 @@
+"""
+Equivalence tests for the vectorized RDP, speed limiter and keyframe plugins.
+
+The reference plugins below keep the loop implementations the vectorized code
+replaced (verbatim apart from unused locals), and both are run on the same
+randomized scripts. Outputs
+must be identical action for action.
+"""
+
+import copy
+import os
+import sys
+
+import numpy as np
+import pytest
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from funscript.dual_axis_funscript import DualAxisFunscript
+from funscript.plugins.keyframe_plugin import KeyframePlugin
+from funscript.plugins.rdp_simplify_plugin import RdpSimplifyPlugin
+from funscript.plugins.speed_limiter_plugin import SpeedLimiterPlugin
+
+NUM_RANDOM_SCRIPTS = 100
+
+# The reference RDP calls np.cross on 2D vectors, deprecated since NumPy 2.0
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+
+class ReferenceRdpSimplifyPlugin(RdpSimplifyPlugin):
+    """RDP with the linear time-range scan and the one-segment-at-a-time stack."""
+
+    def _get_action_indices_in_time_range(self, actions_list, start_time_ms, end_time_ms):
+        """Helper method to find action indices within time range."""
+        if not actions_list:
+            return None, None
+
+        start_idx = None
+        end_idx = None
+
+        for i, action in enumerate(actions_list):
+            if start_idx is None and action['at'] >= start_time_ms:
+                start_idx = i
+            if action['at'] <= end_time_ms:
+                end_idx = i
+
+        return start_idx, end_idx
+
+    def _rdp_numpy_implementation(self, points, epsilon):
+        return self._rdp_iterative_stack(points, epsilon)
+
+    def _rdp_iterative_stack(self, points, epsilon):
+        """Original optimized iterative stack implementation."""
+        if len(points) < 3:
+            return points
+
+        # Iterative stack-based approach
+        stack = [(0, len(points) - 1)]
+        keep = np.zeros(len(points), dtype=bool)
+        keep[0] = True  # Always keep first point
+        keep[-1] = True  # Always keep last point
+
+        while stack:
+            start_idx, end_idx = stack.pop()
+
+            if end_idx - start_idx <= 1:
+                continue
+
+            # Vectorized distance calculation for all points in segment
+            segment_points = points[start_idx:end_idx + 1]
+            if len(segment_points) < 3:
+                continue
+
+            line_vec = segment_points[-1] - segment_points[0]
+            line_length = np.linalg.norm(line_vec)
+
+            if line_length == 0:
+                continue
+
+            # Vectorized perpendicular distance calculation
+            intermediate_points = segment_points[1:-1]
+            point_vecs = intermediate_points - segment_points[0]
+            cross_products = np.cross(line_vec, point_vecs)
+            distances = np.abs(cross_products) / line_length
+
+            if len(distances) == 0:
+                continue
+
+            # Find max distance point
+            max_local_idx = np.argmax(distances)
+            max_distance = distances[max_local_idx]
+            max_global_idx = start_idx + max_local_idx + 1
+
+            if max_distance > epsilon:
+                # Keep this point and add sub-segments to stack
+                keep[max_global_idx] = True
+                stack.append((start_idx, max_global_idx))
+                stack.append((max_global_idx, end_idx))
+
+        # Return only the points we're keeping
+        return points[keep]
+
+
+class ReferenceSpeedLimiterPlugin(SpeedLimiterPlugin):
+    """Speed limiter with the per-interval loops."""
+
+    def _apply_speed_limiter_to_axis(self, funscript, axis: str, params: Dict[str, Any]):
+        """Apply speed limiting to a single axis."""
+        actions_list = funscript.primary_actions if axis == 'primary' else funscript.secondary_actions
+
+        if not actions_list or len(actions_list) < 2:
+            self.logger.info(f"Not enough points on {axis} axis for speed limiter")
+            return
+
+        # Check for selected indices
+        selected_indices = params.get('selected_indices')
+        if selected_indices is not None and len(selected_indices) > 0:
+            # Apply speed limiting only to selected actions
+            indices_to_process = sorted([
+                i for i in selected_indices
+                if 0 <= i < len(actions_list)
+            ])
+            if len(indices_to_process) < 2:
+                self.logger.info(f"Not enough selected points ({len(indices_to_process)}) on {axis} axis for speed limiter")
+                return
+        else:
+            # Apply to all actions
+            indices_to_process = list(range(len(actions_list)))
+
+        # Work on a deep copy
+        actions = copy.deepcopy(actions_list)
+        original_count = len(actions)
+
+        min_interval = params['min_interval_ms']
+        vibe_amount = params['vibe_amount']
+        speed_threshold = params['speed_threshold']
+        small_movement_threshold = params.get('small_movement_threshold', 10)
+
+        if selected_indices is not None and len(selected_indices) > 0:
+            # For selected indices, apply only speed limiting (no removal/addition of points)
+            # This preserves the index mapping
+            actions = self._limit_speed_for_selected_indices(actions, speed_threshold, indices_to_process, axis)
+            self.logger.info(f"Speed limiter applied to {len(indices_to_process)} selected points on {axis} axis")
+        else:
+            # Apply full speed limiting to all actions
+            # Step 1: Remove actions with short intervals
+            actions = self._remove_short_intervals(actions, min_interval, axis)
+            removed_count = original_count - len(actions)
+
+            # Step 2: Replace small movements with vibrations
+            if vibe_amount > 0:
+                actions, modified_count = self._add_vibrations(actions, vibe_amount, small_movement_threshold, axis)
+            else:
+                modified_count = 0
+
+            # Step 3: Apply speed limiting
+            actions = self._limit_speed(actions, speed_threshold, axis)
+
+            self.logger.info(f"Speed limiter applied to {axis} axis: {original_count} -> {len(actions)} points ({removed_count} removed, {modified_count if vibe_amount > 0 else 0} modified for vibration)")
+
+        # Update the funscript IN-PLACE to preserve list identity for undo manager
+        actions_target_list = funscript.primary_actions if axis == 'primary' else funscript.secondary_actions
+        actions_target_list[:] = actions
+
+        # Invalidate cache
+        funscript._invalidate_cache(axis)
+
+    def _remove_short_intervals(self, actions: List[Dict], min_interval: int, axis: str) -> List[Dict]:
+        """OPTIMIZED: Remove actions that are too close together in time using vectorized operations."""
+        if len(actions) <= 1:
+            return actions
+
+        # OPTIMIZATION: Use vectorized approach for large datasets
+        if len(actions) > 5000:
+            # Extract timestamps as numpy array
+            timestamps = np.array([action['at'] for action in actions])
+
+            # Calculate intervals between consecutive actions
+            intervals = np.diff(timestamps)
+
+            # Create boolean mask for actions to keep
+            keep_mask = np.ones(len(actions), dtype=bool)
+
+            # Mark actions to remove (those with intervals < min_interval)
+            for i in range(len(intervals)):
+                if intervals[i] < min_interval:
+                    # Remove the later action (preserve chronological order)
+                    keep_mask[i + 1] = False
+
+            # Filter actions using the mask
+            filtered_actions = [actions[i] for i in range(len(actions)) if keep_mask[i]]
+
+            removed_count = len(actions) - len(filtered_actions)
+            if removed_count > 0:
+                self.logger.debug(f"{axis} axis: Removed {removed_count} actions due to min interval (vectorized)")
+
+            return filtered_actions
+        else:
+            # Original method for smaller datasets
+            filtered_actions = [actions[-1]]  # Always keep the last action
+            last_kept_time = actions[-1]['at']
+
+            for i in range(len(actions) - 2, -1, -1):
+                current_action = actions[i]
+                interval = abs(current_action['at'] - last_kept_time)
+
+                if interval >= min_interval:
+                    filtered_actions.append(current_action)
+                    last_kept_time = current_action['at']
+
+            # Restore chronological order
+            filtered_actions.reverse()
+
+            removed_count = len(actions) - len(filtered_actions)
+            if removed_count > 0:
+                self.logger.debug(f"{axis} axis: Removed {removed_count} actions due to min interval")
+
+            return filtered_actions
+
+    def _limit_speed_vectorized(self, actions: List[Dict], speed_threshold: float, axis: str) -> List[Dict]:
+        """REVOLUTIONARY: Bulk geometric interpolation for massive speedup."""
+        # Extract arrays for vectorized operations
+        timestamps = np.array([action['at'] for action in actions])
+        positions = np.array([action['pos'] for action in actions])
+
+        # BREAKTHROUGH 1: Pre-compute ALL violations using vectorized operations
+        time_deltas = np.diff(timestamps)
+        pos_deltas = np.diff(positions)
+        speeds = np.abs(pos_deltas) / np.maximum(time_deltas, 1)
+        violation_mask = speeds > speed_threshold
+
+        if not np.any(violation_mask):
+            return actions
+
+        # BREAKTHROUGH 2: Build interpolation segments in bulk using geometric math
+        violation_indices = np.where(violation_mask)[0]
+
+        # Pre-allocate result arrays for maximum efficiency
+        estimated_size = len(actions) + len(violation_indices) * 5  # Estimate 5 points per violation
+        result_times = np.zeros(estimated_size)
+        result_positions = np.zeros(estimated_size)
+
+        write_idx = 0
+        last_processed = 0
+
+        # BREAKTHROUGH 3: Vectorized segment processing
+        for violation_idx in violation_indices:
+            # Copy non-violating points before this violation
+            segment_start = last_processed
+            segment_end = violation_idx + 1
+
+            if segment_start < segment_end:
+                segment_len = segment_end - segment_start
+                result_times[write_idx:write_idx + segment_len] = timestamps[segment_start:segment_end]
+                result_positions[write_idx:write_idx + segment_len] = positions[segment_start:segment_end]
+                write_idx += segment_len
+
+            # BREAKTHROUGH 4: Geometric interpolation math
+            start_time = timestamps[violation_idx]
+            end_time = timestamps[violation_idx + 1]
+            start_pos = positions[violation_idx]
+            end_pos = positions[violation_idx + 1]
+
+            # Calculate required intermediate points using mathematics
+            total_distance = abs(end_pos - start_pos)
+            total_time = end_time - start_time
+            max_distance_per_segment = speed_threshold * total_time / 1000
+
+            if max_distance_per_segment > 0:
+                num_segments = max(1, int(np.ceil(total_distance / max_distance_per_segment)))
+
+                # VECTORIZED interpolation point generation
+                if num_segments > 1:
+                    # Generate intermediate time points
+                    time_points = np.linspace(start_time, end_time, num_segments + 1)
+                    # Generate intermediate position points
+                    pos_points = np.linspace(start_pos, end_pos, num_segments + 1)
+
+                    # Add all interpolated points at once
+                    interp_len = len(time_points) - 1  # Skip the start point (already added)
+                    if write_idx + interp_len < len(result_times):
+                        result_times[write_idx:write_idx + interp_len] = time_points[1:]
+                        result_positions[write_idx:write_idx + interp_len] = pos_points[1:]
+                        write_idx += interp_len
+
+            last_processed = violation_idx + 1
+
+        # Add remaining points
+        if last_processed < len(timestamps):
+            remaining_len = len(timestamps) - last_processed
+            result_times[write_idx:write_idx + remaining_len] = timestamps[last_processed:]
+            result_positions[write_idx:write_idx + remaining_len] = positions[last_processed:]
+            write_idx += remaining_len
+
+        # BREAKTHROUGH 5: Bulk reconstruction of action dicts
+        result_actions = [
+            {'at': int(result_times[i]), 'pos': int(np.clip(result_positions[i], 0, 100))}
+            for i in range(write_idx)
+        ]
+
+        speed_corrections = len(result_actions) - len(actions)
+        if speed_corrections > 0:
+            self.logger.debug(f"{axis} axis: Added {speed_corrections} points (geometric interpolation)")
+
+        return result_actions
+
+    def _limit_speed_original(self, actions: List[Dict], speed_threshold: float, axis: str) -> List[Dict]:
+        """Original speed limiting for smaller datasets."""
+        speed_limited_actions = [actions[0]]  # Always keep first action
+
+        for i in range(1, len(actions)):
+            current = actions[i]
+            previous = speed_limited_actions[-1]
+
+            time_delta = current['at'] - previous['at']
+            if time_delta <= 0:
+                continue
+
+            pos_delta = abs(current['pos'] - previous['pos'])
+            current_speed = pos_delta / time_delta  # positions per millisecond
+
+            if current_speed > speed_threshold:
+                # Need to limit speed - insert intermediate points
+                intermediate_actions = self._create_intermediate_actions(
+                    previous, current, speed_threshold
+                )
+                speed_limited_actions.extend(intermediate_actions)
+            else:
+                speed_limited_actions.append(current)
+
+        speed_corrections = len(speed_limited_actions) - len(actions)
+        if speed_corrections > 0:
+            self.logger.debug(f"{axis} axis: Added {speed_corrections} intermediate points for speed limiting")
+
+        return speed_limited_actions
+
+    def _add_vibrations(self, actions: List[Dict], vibe_amount: int,
+                       small_movement_threshold: int, axis: str) -> tuple[List[Dict], int]:
+        """Replace small movements with vibration patterns."""
+        if len(actions) <= 2:
+            return actions, 0
+
+        modified_count = 0
+        vibration_state = {'already_vibing': 0, 'last_vibe': '', 'last_height': 0}
+
+        for i in range(1, len(actions)):
+            current = actions[i]
+            previous = actions[i - 1]
+
+            # Calculate movement size
+            movement_size = abs(current['pos'] - previous['pos'])
+            time_interval = current['at'] - previous['at']
+
+            # Check if this is a small movement that should be vibrated
+            if (movement_size <= small_movement_threshold and
+                time_interval > 0 and
+                vibe_amount > 0):
+
+                new_pos = self._calculate_vibration_position(
+                    previous['pos'],
+                    current['pos'],
+                    vibe_amount,
+                    vibration_state
+                )
+
+                if new_pos != current['pos']:
+                    actions[i]['pos'] = int(np.clip(new_pos, 0, 100))
+                    modified_count += 1
+
+        if modified_count > 0:
+            self.logger.debug(f"{axis} axis: Added vibration to {modified_count} small movements")
+
+        return actions, modified_count
+
+    def _calculate_vibration_position(self, prev_pos: int, curr_pos: int,
+                                    vibe_amount: int, vibe_state: Dict) -> int:
+        """Calculate vibration position based on movement and state."""
+        movement_direction = 1 if curr_pos > prev_pos else -1
+        base_pos = (prev_pos + curr_pos) // 2
+
+        # Alternate vibration direction to create oscillating pattern
+        if vibe_state['last_vibe'] == 'up':
+            vibe_direction = -1
+            vibe_state['last_vibe'] = 'down'
+        else:
+            vibe_direction = 1
+            vibe_state['last_vibe'] = 'up'
+
+        # Apply vibration
+        vibrated_pos = base_pos + (vibe_amount * vibe_direction * movement_direction)
+
+        return int(np.clip(vibrated_pos, 0, 100))
+
+    def _limit_speed_for_selected_indices(self, actions: List[Dict], speed_threshold: float,
+                                        selected_indices: List[int], axis: str) -> List[Dict]:
+        """Apply speed limiting only to selected action indices."""
+        if len(actions) <= 1 or not selected_indices:
+            return actions
+
+        result_actions = copy.deepcopy(actions)
+
+        # Process each selected action
+        for i in selected_indices:
+            if i <= 0 or i >= len(result_actions):
+                continue
+
+            current = result_actions[i]
+            previous = result_actions[i - 1]
+
+            # Calculate speed between current and previous
+            time_diff = current['at'] - previous['at']
+            if time_diff <= 0:
+                continue
+
+            pos_diff = abs(current['pos'] - previous['pos'])
+            current_speed = pos_diff / time_diff * 1000  # positions per second
+
+            if current_speed > speed_threshold:
+                # Adjust position to limit speed
+                max_pos_change = (speed_threshold * time_diff) / 1000
+                direction = 1 if current['pos'] > previous['pos'] else -1
+                new_pos = previous['pos'] + (direction * max_pos_change)
+                result_actions[i]['pos'] = int(np.clip(new_pos, 0, 100))
+
+        return result_actions
+
+    def _create_intermediate_actions(self, start_action: Dict, end_action: Dict,
+                                   max_speed: float) -> List[Dict]:
+        """Create intermediate actions to limit speed between two points."""
+        time_delta = end_action['at'] - start_action['at']
+        pos_delta = end_action['pos'] - start_action['pos']
+
+        if time_delta <= 0:
+            return [end_action]
+
+        # Calculate how many intermediate points we need
+        required_time = abs(pos_delta) / max_speed
+        if required_time <= time_delta:
+            return [end_action]
+
+        num_segments = int(np.ceil(required_time / time_delta))
+
+        intermediate_actions = []
+        for i in range(1, num_segments + 1):
+            progress = i / num_segments
+
+            intermediate_time = int(start_action['at'] + (time_delta * progress))
+            intermediate_pos = int(start_action['pos'] + (pos_delta * progress))
+            intermediate_pos = int(np.clip(intermediate_pos, 0, 100))
+
+            intermediate_actions.append({
+                'at': intermediate_time,
+                'pos': intermediate_pos
+            })
+
+        # Make sure the last intermediate action matches the target
+        if intermediate_actions:
+            intermediate_actions[-1] = end_action
+        else:
+            intermediate_actions = [end_action]
+
+        return intermediate_actions
+
+
+class ReferenceKeyframePlugin(KeyframePlugin):
+    """Keyframe detection that recomputes every significance after each removal."""
+
+    def _find_keyframes_vectorized(self, segment: List[Dict], params: Dict[str, Any]) -> List[Dict]:
+        """Vectorized keyframe detection for large datasets."""
+        position_tolerance = params['position_tolerance']
+
+        # Extract positions and timestamps as numpy arrays
+        positions = np.array([action['pos'] for action in segment])
+
+        # VECTORIZED: Find local extrema using numpy operations
+        # Create shifted arrays for comparison
+        pos_prev = positions[:-2]  # positions[i-1]
+        pos_curr = positions[1:-1]  # positions[i]
+        pos_next = positions[2:]    # positions[i+1]
+
+        # Detect peaks: curr > prev AND curr >= next
+        # Detect valleys: curr < prev AND curr <= next
+        is_peak = (pos_curr > pos_prev) & (pos_curr >= pos_next)
+        is_valley = (pos_curr < pos_prev) & (pos_curr <= pos_next)
+        is_extremum = is_peak | is_valley
+
+        # Build extrema list (always include first and last)
+        extrema_indices = [0]
+        extrema_indices.extend(np.where(is_extremum)[0] + 1)  # +1 because we compared shifted arrays
+        extrema_indices.append(len(segment) - 1)
+
+        # Remove duplicates and sort
+        extrema_indices = sorted(set(extrema_indices))
+        extrema = [segment[i] for i in extrema_indices]
+
+        # VECTORIZED significance calculation and filtering
+        if len(extrema) <= 2:
+            return extrema
+
+        # Convert to numpy arrays for vectorized processing
+        ext_positions = np.array([ext['pos'] for ext in extrema])
+        ext_timestamps = np.array([ext['at'] for ext in extrema])
+
+        # Calculate significance for all internal points at once
+        while len(extrema) > 2:
+            if len(ext_positions) <= 2:
+                break
+
+            # Vectorized significance calculation for internal points
+            prev_pos = ext_positions[:-2]
+            curr_pos = ext_positions[1:-1]
+            next_pos = ext_positions[2:]
+            prev_time = ext_timestamps[:-2]
+            curr_time = ext_timestamps[1:-1]
+            next_time = ext_timestamps[2:]
+
+            # Calculate projection-based significance
+            durations = next_time.astype(np.float64) - prev_time.astype(np.float64)
+            time_deltas = curr_time.astype(np.float64) - prev_time.astype(np.float64)
+            progress = np.divide(time_deltas, durations,
+                               out=np.zeros_like(time_deltas), where=durations!=0)
+            projected_pos = prev_pos + progress * (next_pos - prev_pos)
+            significance_scores = np.abs(curr_pos - projected_pos)
+
+            # Find weakest point
+            min_idx = np.argmin(significance_scores)
+            min_significance = significance_scores[min_idx]
+
+            if min_significance < position_tolerance:
+                # Remove the weakest point (add 1 because we're looking at internal points)
+                remove_idx = min_idx + 1
+                extrema.pop(remove_idx)
+                ext_positions = np.delete(ext_positions, remove_idx)
+                ext_timestamps = np.delete(ext_timestamps, remove_idx)
+            else:
+                break
+
+        return extrema
+
+
+def _random_actions(rng: np.random.Generator, count: int) -> List[Dict]:
+    """Sorted script with occasional duplicate timestamps, tight clusters and flat runs."""
+    gaps = rng.choice([0, 1, 5, 15, 40, 80, 200, 600], size=count, p=[0.03, 0.05, 0.1, 0.2, 0.27, 0.2, 0.1, 0.05])
+    timestamps = np.cumsum(gaps) + int(rng.integers(0, 1000))
+    positions = np.clip(50 + 45 * np.sin(np.arange(count) / rng.uniform(1.5, 12)) + rng.normal(0, 12, count), 0, 100)
+    flat = rng.random(count) < 0.1
+    positions[flat] = np.round(positions[flat], -1)
+    return [{'at': int(t), 'pos': int(p)} for t, p in zip(timestamps, positions)]
+
+
+def _random_selection(rng: np.random.Generator, count: int):
+    if rng.random() < 0.5:
+        return None
+    start = int(rng.integers(0, max(1, count - 2)))
+    end = int(rng.integers(start + 1, count + 1))
+    return list(range(start, end))
+
+
+def _funscript_with(actions: List[Dict]) -> DualAxisFunscript:
+    funscript = DualAxisFunscript()
+    funscript.primary_actions = copy.deepcopy(actions)
+    funscript.secondary_actions = copy.deepcopy(actions[::2])
+    funscript._invalidate_cache('both')
+    return funscript
+
+
+def _assert_same_transform(plugin, reference, actions: List[Dict], **parameters):
+    funscript = _funscript_with(actions)
+    expected = _funscript_with(actions)
+    plugin.transform(funscript, axis='both', **parameters)
+    reference.transform(expected, axis='both', **parameters)
+    assert funscript.primary_actions == expected.primary_actions
+    assert funscript.secondary_actions == expected.secondary_actions
+
+
+def _script_sizes(rng: np.random.Generator):
+    # Covers both sides of the plugins' size thresholds (3000 and 5000 actions)
+    return [int(rng.integers(2, 300)) if rng.random() < 0.9 else int(rng.integers(3000, 8000))
+            for _ in range(NUM_RANDOM_SCRIPTS)]
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_rdp_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    plugin, reference = RdpSimplifyPlugin(), ReferenceRdpSimplifyPlugin()
+    for count in _script_sizes(rng):
+        actions = _random_actions(rng, count)
+        parameters = {'epsilon': float(rng.uniform(0.1, 20.0))}
+        if rng.random() < 0.3:
+            first, last = actions[0]['at'], actions[-1]['at']
+            parameters['start_time_ms'] = int(rng.integers(first - 500, last + 1))
+            parameters['end_time_ms'] = int(rng.integers(parameters['start_time_ms'], last + 500))
+        else:
+            parameters['selected_indices'] = _random_selection(rng, count)
+        _assert_same_transform(plugin, reference, actions, **parameters)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_rdp_kernel_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    plugin, reference = RdpSimplifyPlugin(), ReferenceRdpSimplifyPlugin()
+    for count in _script_sizes(rng):
+        actions = _random_actions(rng, count)
+        points = np.array([[a['at'], a['pos']] for a in actions], dtype=np.float64)
+        epsilon = float(rng.uniform(0.1, 20.0))
+        np.testing.assert_array_equal(plugin._rdp_numpy_implementation(points, epsilon),
+                                      reference._rdp_numpy_implementation(points, epsilon))
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_speed_limiter_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    plugin, reference = SpeedLimiterPlugin(), ReferenceSpeedLimiterPlugin()
+    for count in _script_sizes(rng):
+        actions = _random_actions(rng, count)
+        parameters = {
+            'min_interval_ms': int(rng.integers(10, 200)),
+            'vibe_amount': int(rng.choice([0, 0, 10])),
+            'speed_threshold': float(rng.choice([50, 500, 1000])),
+            'selected_indices': _random_selection(rng, count),
+        }
+        _assert_same_transform(plugin, reference, actions, **parameters)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_speed_limit_kernels_match_reference(seed):
+    # The plugin's thresholds are rarely exceeded by realistic scripts; low ones exercise the interpolation
+    rng = np.random.default_rng(seed)
+    plugin, reference = SpeedLimiterPlugin(), ReferenceSpeedLimiterPlugin()
+    compared = 0
+    for count in _script_sizes(rng):
+        actions = _random_actions(rng, count)
+        speed_threshold = float(rng.uniform(0.02, 3.0))
+        min_interval = int(rng.integers(10, 200))
+        assert (plugin._remove_short_intervals(copy.deepcopy(actions), min_interval, 'primary') ==
+                reference._remove_short_intervals(copy.deepcopy(actions), min_interval, 'primary'))
+        try:
+            expected = reference._limit_speed(copy.deepcopy(actions), speed_threshold, 'primary')
+        except ValueError:
+            # The reference overflows its fixed-size buffer while copying the trailing points
+            continue
+        assert plugin._limit_speed(copy.deepcopy(actions), speed_threshold, 'primary') == expected
+        compared += 1
+    assert compared >= NUM_RANDOM_SCRIPTS // 2
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_speed_limiter_steps_match_reference(seed):
+    # Low thresholds chain limited actions; shuffled timestamps take the unsorted interval walk
+    rng = np.random.default_rng(seed)
+    plugin, reference = SpeedLimiterPlugin(), ReferenceSpeedLimiterPlugin()
+    for count in _script_sizes(rng):
+        actions = _random_actions(rng, count)
+        speed_threshold = float(rng.uniform(10, 2000))
+        selected = _random_selection(rng, count) or list(range(count))
+        assert (plugin._limit_speed_for_selected_indices(copy.deepcopy(actions), speed_threshold, selected, 'primary') ==
+                reference._limit_speed_for_selected_indices(copy.deepcopy(actions), speed_threshold, selected, 'primary'))
+        vibe_amount, small_movement = int(rng.integers(1, 51)), int(rng.integers(1, 51))
+        assert (plugin._add_vibrations(copy.deepcopy(actions), vibe_amount, small_movement, 'primary') ==
+                reference._add_vibrations(copy.deepcopy(actions), vibe_amount, small_movement, 'primary'))
+        shuffled = [actions[i] for i in rng.permutation(count)]
+        min_interval = int(rng.integers(10, 200))
+        if count <= 5000:
+            assert (plugin._remove_short_intervals(copy.deepcopy(shuffled), min_interval, 'primary') ==
+                    reference._remove_short_intervals(copy.deepcopy(shuffled), min_interval, 'primary'))
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_keyframe_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    plugin, reference = KeyframePlugin(), ReferenceKeyframePlugin()
+    for count in _script_sizes(rng):
+        actions = _random_actions(rng, min(count, 4000))
+        parameters = {
+            'position_tolerance': int(rng.integers(1, 51)),
+            'time_tolerance_ms': int(rng.integers(10, 1001)),
+            'selected_indices': _random_selection(rng, len(actions)),
+        }
+        _assert_same_transform(plugin, reference, actions, **parameters)
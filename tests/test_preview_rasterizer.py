@@ -0,0 +1,110 @@
+"""
+Funscript preview rasterizer: the simplified envelope matches the former
+fillPoly renderer pixel for pixel, and incremental redraws after an edit match a
+full render of the edited actions.
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+cv2 = pytest.importorskip("cv2")
+rasterizer_module = pytest.importorskip("application.utils.funscript_preview_rasterizer")
+
+
+def _envelope_color(speed):
+    return 0.2, 0.6, 0.9, 1.0
+
+
+def _speed_colors_u8(speeds):
+    v = np.clip(np.asarray(speeds, dtype=np.float32) / 500.0 * 255.0, 0, 255).astype(np.uint8)
+    return np.stack([v, 255 - v, np.full_like(v, 80), np.full_like(v, 255)], axis=1)
+
+
+def _reference_simplified_preview(width, height, total_duration_s, actions):
+    """The former simplified preview: per-column min/max rows filled as one polygon and blended at 50%."""
+    image = np.full((height, width, 4), (38, 31, 31, 255), dtype=np.uint8)
+    cv2.line(image, (0, height // 2), (width - 1, height // 2), (77, 77, 77, 179), 1)
+    min_vals = np.full(width, height, dtype=np.int32)
+    max_vals = np.full(width, -1, dtype=np.int32)
+    times_s = np.array([a['at'] for a in actions]) / 1000.0
+    positions = np.array([a['pos'] for a in actions])
+    x_coords = np.round((times_s / total_duration_s) * (width - 1)).astype(np.int32)
+    y_coords = np.round((1.0 - positions / 100.0) * (height - 1)).astype(np.int32)
+    for i in range(len(actions) - 1):
+        x1, x2, y1, y2 = x_coords[i], x_coords[i + 1], y_coords[i], y_coords[i + 1]
+        if x1 == x2:
+            min_vals[x1] = min(min_vals[x1], y1, y2)
+            max_vals[x1] = max(max_vals[x1], y1, y2)
+            continue
+        for x in range(x1, x2 + 1):
+            y_int = int(round(y1 + (y2 - y1) * (x - x1) / (x2 - x1)))
+            min_vals[x] = min(min_vals[x], y_int)
+            max_vals[x] = max(max_vals[x], y_int)
+    xs = np.flatnonzero(max_vals != -1)
+    polygon = np.concatenate((np.stack((xs, min_vals[xs]), axis=1),
+                              np.stack((xs, max_vals[xs]), axis=1)[::-1])).astype(np.int32)
+    overlay = image.copy()
+    rgba = _envelope_color(500)
+    cv2.fillPoly(overlay, [polygon], (int(rgba[2] * 255), int(rgba[1] * 255), int(rgba[0] * 255), 100))
+    cv2.addWeighted(overlay, 0.5, image, 0.5, 0, image)
+    return image
+
+
+def _random_actions(rng):
+    actions, at = [], 0
+    for _ in range(rng.choice((5, 50, 300, 3000))):
+        at += rng.randint(30, 800)
+        actions.append({'at': at, 'pos': rng.randint(0, 100)})
+    return actions
+
+
+def _edit(rng, actions):
+    edited = [dict(a) for a in actions]
+    for _ in range(rng.randint(1, 3)):
+        k = rng.randrange(len(edited))
+        op = rng.random()
+        if op < 0.5:
+            edited[k]['pos'] = rng.randint(0, 100)
+        elif op < 0.75 and len(edited) > 2:
+            edited.pop(k)
+        else:
+            prev_at = edited[k - 1]['at'] if k > 0 else 0
+            if edited[k]['at'] - prev_at > 2:
+                edited.insert(k, {'at': rng.randint(prev_at + 1, edited[k]['at'] - 1), 'pos': rng.randint(0, 100)})
+    return edited
+
+
+def _rasterizer():
+    return rasterizer_module.FunscriptPreviewRasterizer(_speed_colors_u8, _envelope_color)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_simplified_preview_matches_reference(seed):
+    rng = random.Random(seed)
+    actions = _random_actions(rng)
+    width, height = rng.choice(((800, 40), (1500, 60), (400, 30)))
+    duration_s = actions[-1]['at'] / 1000.0 * rng.choice((1.0, 1.1))
+    image = _rasterizer().render_timeline(width, height, duration_s, actions, simplified=True)
+    np.testing.assert_array_equal(image, _reference_simplified_preview(width, height, duration_s, actions))
+
+
+@pytest.mark.parametrize("simplified", [True, False])
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_render_matches_full_render(seed, simplified):
+    rng = random.Random(seed)
+    actions = _random_actions(rng)
+    width, height = rng.choice(((800, 40), (400, 30)))
+    duration_s = actions[-1]['at'] / 1000.0 * 1.05
+    rasterizer = _rasterizer()
+    rasterizer.render_timeline(width, height, duration_s, actions, simplified)
+    edited = _edit(rng, actions)
+
+    incremental = rasterizer.render_timeline(width, height, duration_s, edited, simplified)
+    full = _rasterizer().render_timeline(width, height, duration_s, edited, simplified)
+    np.testing.assert_array_equal(incremental, full)
@@ -0,0 +1,75 @@
+"""
+Stage 1 static-frame skipping: frames queued as near-duplicates ("carried") are
+answered with the detections of the frame they were compared with, and Stage 2
+reads their boxes as interpolated, not detected.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+stage_1_cd = pytest.importorskip("detection.cd.stage_1_cd")
+frame_objects = pytest.importorskip("detection.cd.data_structures.frame_objects")
+
+import config.constants as constants
+
+YOLO_INPUT_SIZE = 640
+
+
+def _detection(bbox, class_name="penis", class_id=0, confidence=0.9):
+    return {"bbox": list(bbox), "confidence": confidence, "class": class_id, "class_name": class_name}
+
+
+def _worker_results():
+    """Results as logger_proc collects them: frames 0 and 3 inferred, 1, 2 and 4 carried."""
+    inferred_0 = {"detections": [_detection((100, 120, 180, 300)), _detection((50, 60, 90, 110), "hand", 2)],
+                  "poses": [{"bbox": [0, 0, 640, 640], "keypoints": [[1.0, 2.0, 0.9]] * 17}]}
+    inferred_3 = {"detections": [_detection((110, 130, 190, 310))], "poses": []}
+    return {
+        0: inferred_0,
+        1: {"carried_from": 0},
+        2: {"carried_from": 0},
+        3: inferred_3,
+        4: {"carried_from": 3},
+    }
+
+
+def test_carried_frames_copy_source_detections():
+    results = _worker_results()
+    carried_count = stage_1_cd._resolve_carried_frames(results)
+
+    assert carried_count == 3
+    for frame_id, source_id in ((1, 0), (2, 0), (4, 3)):
+        assert results[frame_id]["carried"] is True
+        assert results[frame_id]["detections"] == results[source_id]["detections"]
+        # Poses are not copied; logger_proc forward-fills them like any frame without poses
+        assert results[frame_id]["poses"] == []
+    assert "carried" not in results[0] and "carried" not in results[3]
+
+
+def test_carried_frame_without_source_result_is_dropped():
+    # Frame 0 failed inference (no result), so frames carried from it count as missing
+    results = _worker_results()
+    del results[0]
+    carried_count = stage_1_cd._resolve_carried_frames(results)
+
+    assert carried_count == 1
+    assert sorted(results) == [3, 4]
+
+
+def test_carried_frames_become_interpolated_boxes():
+    results = _worker_results()
+    stage_1_cd._resolve_carried_frames(results)
+
+    for frame_id, payload in results.items():
+        frame = frame_objects.FrameObject(frame_id, YOLO_INPUT_SIZE, raw_frame_data=payload)
+        expected_status = constants.STATUS_INTERPOLATED if frame_id in (1, 2, 4) else constants.STATUS_DETECTED
+        assert len(frame.boxes) == len(payload["detections"])
+        assert all(box.status == expected_status for box in frame.boxes)
+        for box, detection in zip(frame.boxes, payload["detections"]):
+            np.testing.assert_allclose(box.bbox, detection["bbox"])
+            assert box.class_name == detection["class_name"]
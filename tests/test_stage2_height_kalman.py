@@ -0,0 +1,71 @@
+"""
+Checks the closed-form Stage 2 height filter (_height_kalman_predictions)
+against the cv2.KalmanFilter it replaced, driven with the same predict/correct
+schedule pass 3 used. Float32 rounding differs in the order OpenCV evaluates its
+matrix products, so the predictions agree within a tolerance, not bit for bit.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+cv2 = pytest.importorskip("cv2")
+stage_2_cd = pytest.importorskip("detection.cd.stage_2_cd")
+
+NUM_RANDOM_RUNS = 200
+NUM_FRAMES = 1500
+# Pixels; accumulated float32 rounding differences observed so far stay below 2e-4
+HEIGHT_TOLERANCE_PX = 1e-3
+
+
+def _random_schedule(rng: np.random.Generator):
+    """Heights measured on detection frames, and the frames on which the lock is active."""
+    detected = rng.random(NUM_FRAMES) < rng.uniform(0.5, 0.95)
+    heights = np.clip(np.cumsum(rng.normal(0, 3, NUM_FRAMES)) + rng.uniform(40, 300), 5, 640)
+    heights = np.round(heights, 1)
+    active = np.zeros(NUM_FRAMES, dtype=bool)
+    activations = np.zeros(NUM_FRAMES, dtype=bool)
+    is_active = False
+    for i in range(NUM_FRAMES):
+        if not is_active and detected[i] and rng.random() < 0.05:
+            is_active = activations[i] = True
+        elif is_active and not detected[i] and rng.random() < 0.05:
+            is_active = False
+        active[i] = is_active
+    return np.where(detected, heights, np.nan).astype(np.float32), active, activations
+
+
+def _cv2_predictions(measurements, predict_mask, activations, yolo_size=640):
+    """pass_3_kalman_and_lock_state's filter before it was replaced."""
+    kf_height = cv2.KalmanFilter(2, 1)
+    kf_height.measurementMatrix = np.array([[1, 0]], np.float32)
+    kf_height.transitionMatrix = np.array([[1, 1], [0, 1]], np.float32)
+    kf_height.processNoiseCov = np.eye(2, dtype=np.float32) * 0.01
+    kf_height.measurementNoiseCov = np.eye(1, dtype=np.float32) * 0.1
+    kf_height.errorCovPost = np.eye(2, dtype=np.float32) * 1.0
+    kf_height.statePost = np.array([[yolo_size * 0.1], [0]], dtype=np.float32)
+
+    predictions = np.full(len(measurements), np.nan, dtype=np.float32)
+    for i, height in enumerate(measurements):
+        if not np.isnan(height):
+            if activations[i]:
+                kf_height.statePost = np.array([[height], [0]], dtype=np.float32)
+            kf_height.correct(np.array([[height]], dtype=np.float32))
+        if predict_mask[i]:
+            predictions[i] = kf_height.predict()[0, 0]
+    return predictions
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_height_filter_matches_cv2_kalman(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(NUM_RANDOM_RUNS // 4):
+        measurements, predict_mask, activations = _random_schedule(rng)
+        expected = _cv2_predictions(measurements, predict_mask, activations)
+        actual = stage_2_cd._height_kalman_predictions(measurements, predict_mask)
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected))
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=HEIGHT_TOLERANCE_PX)
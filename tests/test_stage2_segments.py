@@ -0,0 +1,221 @@
+"""
+Stage 2 segment aggregation: the run-based _aggregate_segments must produce the
+same segments (bounds, position, duration and id) as the per-segment merge loop
+it replaced, which is kept below as the reference.
+"""
+
+import os
+import random
+import sys
+from typing import List
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+stage_2_cd = pytest.importorskip("detection.cd.stage_2_cd")
+
+from detection.cd.data_structures import BaseSegment, FrameObject, Segment
+
+YOLO_INPUT_SIZE = 640
+POSITIONS = ['Not Relevant', 'Blowjob', 'Handjob', 'Cowgirl / Missionary', 'Rev. Cowgirl / Doggy']
+
+
+def _reference_aggregate_segments(frame_objects, fps) -> List[Segment]:
+    """The previous _aggregate_segments, without its debug logging."""
+    if not frame_objects:
+        return []
+
+    # --- Pass 1: Create an initial, granular list of segments. ---
+    segments: List[Segment] = []
+    current_pos = frame_objects[0].assigned_position
+    start_frame = frame_objects[0].frame_id
+    for i in range(1, len(frame_objects)):
+        if frame_objects[i].assigned_position != current_pos:
+            segments.append(Segment(start_frame, frame_objects[i - 1].frame_id, current_pos))
+            current_pos = frame_objects[i].assigned_position
+            start_frame = frame_objects[i].frame_id
+    segments.append(Segment(start_frame, frame_objects[-1].frame_id, current_pos))
+
+    # --- Pass 2: The Master Iterative Merging Loop ---
+    while True:
+        merges_made_in_pass = 0
+
+        # --- Rule A: Merge short "Not Relevant" segments between identical neighbors ---
+        i = 0
+        while i < len(segments) - 2:
+            seg1, seg_gap, seg2 = segments[i], segments[i + 1], segments[i + 2]
+            is_short_gap = seg_gap.major_position == "Not Relevant" and seg_gap.duration < (fps * 10)
+            if seg1.major_position == seg2.major_position and seg1.major_position != "Not Relevant" and is_short_gap:
+                seg1.end_frame_id = seg2.end_frame_id
+                seg1.update_duration()
+                segments.pop(i + 2)
+                segments.pop(i + 1)
+                merges_made_in_pass += 1
+                i = 0
+                continue
+            i += 1
+
+        # --- Rule A2: Merge short penetration misclassifications between identical oral neighbors ---
+        i = 0
+        while i < len(segments) - 2:
+            seg1, seg_mid, seg2 = segments[i], segments[i + 1], segments[i + 2]
+            is_short_mid = (seg_mid.major_position != "Not Relevant") and (seg_mid.duration < (fps * 5))
+            oral_positions = {'Blowjob', 'Handjob'}
+            penetration_positions = {'Cowgirl / Missionary', 'Rev. Cowgirl / Doggy'}
+            neighbors_oral_and_identical = (seg1.major_position == seg2.major_position) and (seg1.major_position in oral_positions)
+            mid_is_penetration = seg_mid.major_position in penetration_positions
+            if neighbors_oral_and_identical and mid_is_penetration and is_short_mid:
+                seg1.end_frame_id = seg2.end_frame_id
+                seg1.update_duration()
+                segments.pop(i + 2)
+                segments.pop(i + 1)
+                merges_made_in_pass += 1
+                i = 0
+                continue
+            i += 1
+
+        # --- Rule B: Merge adjacent "Handjob" and "Blowjob" segments into "Blowjob" ---
+        i = 0
+        while i < len(segments) - 1:
+            pos1, pos2 = segments[i].major_position, segments[i + 1].major_position
+            if {pos1, pos2} <= {'Handjob', 'Blowjob'}:
+                segments[i].major_position = 'Blowjob'
+                segments[i].end_frame_id = segments[i + 1].end_frame_id
+                segments[i].update_duration()
+                segments.pop(i + 1)
+                merges_made_in_pass += 1
+                i = 0
+                continue
+            i += 1
+
+        # --- Rule C: Merge any remaining identical adjacent segments ---
+        i = 0
+        while i < len(segments) - 1:
+            if segments[i].major_position == segments[i + 1].major_position:
+                segments[i].end_frame_id = segments[i + 1].end_frame_id
+                segments[i].update_duration()
+                segments.pop(i + 1)
+                merges_made_in_pass += 1
+                i = 0
+                continue
+            i += 1
+
+        if merges_made_in_pass == 0:
+            break
+
+    # --- Pass 3: Final Cleanup & Gap Filling ---
+    min_duration_10s = int(fps * 10)
+    i = 0
+    while i < len(segments):
+        if segments[i].duration < min_duration_10s:
+            prev_dur = segments[i - 1].duration if i > 0 else -1
+            next_dur = segments[i + 1].duration if i < len(segments) - 1 else -1
+
+            if prev_dur == -1 and next_dur == -1:
+                break
+
+            prev_is_bj = (i > 0 and segments[i - 1].major_position == 'Blowjob')
+            next_is_bj = (i < len(segments) - 1 and segments[i + 1].major_position == 'Blowjob')
+
+            if prev_is_bj and not next_is_bj:
+                target = 'prev'
+            elif next_is_bj and not prev_is_bj:
+                target = 'next'
+            else:
+                target = 'prev' if prev_dur >= next_dur else 'next'
+
+            if target == 'prev':
+                segments[i - 1].end_frame_id = segments[i].end_frame_id
+                segments[i - 1].update_duration()
+                segments.pop(i)
+                i = 0
+                continue
+            else:
+                segments[i + 1].start_frame_id = segments[i].start_frame_id
+                segments[i + 1].update_duration()
+                segments.pop(i)
+                i = 0
+                continue
+        i += 1
+
+    final_segments: List[Segment] = []
+    last_end_frame = -1
+    for seg in segments:
+        if seg.start_frame_id > last_end_frame + 1:
+            final_segments.append(Segment(last_end_frame + 1, seg.start_frame_id - 1, "Not Relevant"))
+        final_segments.append(seg)
+        last_end_frame = seg.end_frame_id
+
+    # --- Pass 4: Final merging of adjacent segments of same type or HJ/BJ ---
+    while True:
+        merges_made = 0
+        i = 0
+        while i < len(final_segments) - 1:
+            pos1, pos2 = final_segments[i].major_position, final_segments[i + 1].major_position
+            if pos1 == pos2 or {pos1, pos2} <= {'Handjob', 'Blowjob'}:
+                if {pos1, pos2} <= {'Handjob', 'Blowjob'}:
+                    final_segments[i].major_position = 'Blowjob'
+                final_segments[i].end_frame_id = final_segments[i + 1].end_frame_id
+                final_segments[i].update_duration()
+                final_segments.pop(i + 1)
+                merges_made += 1
+                i = 0
+                continue
+            i += 1
+        if merges_made == 0:
+            break
+
+    return final_segments
+
+
+def _random_frames(rng: random.Random, fps: float) -> List[FrameObject]:
+    """Runs of random positions and lengths around the 1/5/10 s rule thresholds, with occasional frame gaps."""
+    frames = []
+    frame_id = rng.randint(0, 30)
+    for _ in range(rng.randint(1, 40)):
+        position = rng.choice(POSITIONS)
+        run_length = max(1, int(fps * rng.choice((0.2, 1, 3, 4.9, 5, 8, 9.9, 10, 12, 30)) + rng.randint(-2, 2)))
+        for _ in range(run_length):
+            frame = FrameObject(frame_id, YOLO_INPUT_SIZE)
+            frame.assigned_position = position
+            frames.append(frame)
+            frame_id += 1
+        if rng.random() < 0.15:
+            frame_id += rng.randint(1, int(fps * 12))
+    return frames
+
+
+def _summary(segments: List[Segment]):
+    return [(seg.id, seg.start_frame_id, seg.end_frame_id, seg.major_position, seg.duration) for seg in segments]
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_aggregate_segments_matches_reference(seed):
+    rng = random.Random(seed)
+    fps = rng.choice((24.0, 25.0, 29.97, 30.0, 59.94, 60.0))
+    frames = _random_frames(rng, fps)
+
+    BaseSegment._id_counter = 0
+    expected = _summary(_reference_aggregate_segments(frames, fps))
+    expected_counter = BaseSegment._id_counter
+
+    BaseSegment._id_counter = 0
+    actual = _summary(stage_2_cd._aggregate_segments(frames, fps, 0, None))
+
+    assert actual == expected
+    assert BaseSegment._id_counter == expected_counter
+
+
+def test_aggregate_segments_empty_and_single_run():
+    assert stage_2_cd._aggregate_segments([], 30.0, 0, None) == []
+
+    frames = []
+    for frame_id in range(5, 20):
+        frame = FrameObject(frame_id, YOLO_INPUT_SIZE)
+        frame.assigned_position = 'Blowjob'
+        frames.append(frame)
+    BaseSegment._id_counter = 0
+    expected = _summary(_reference_aggregate_segments(frames, 30.0))
+    BaseSegment._id_counter = 0
+    assert _summary(stage_2_cd._aggregate_segments(frames, 30.0, 0, None)) == expected
@@ -0,0 +1,61 @@
+"""
+Undo/redo restores go through UndoRedoManager._swap_state, not DualAxisFunscript,
+so the manager must bump the owning axis revision itself; preview caches keyed on
+the revision would otherwise serve the replaced state.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+dual_axis_funscript = pytest.importorskip("funscript.dual_axis_funscript")
+preview_cache = pytest.importorskip("funscript.plugins.preview_cache")
+
+from application.classes.undo_redo_manager import UndoRedoManager
+
+
+def _linked_manager(axis="primary"):
+    funscript = dual_axis_funscript.DualAxisFunscript()
+    actions = funscript.primary_actions if axis == "primary" else funscript.secondary_actions
+    actions.extend({"at": t, "pos": p} for t, p in ((0, 10), (100, 90), (200, 10), (300, 90)))
+    manager = UndoRedoManager()
+    manager.set_actions_reference(actions, funscript, axis)
+    return funscript, actions, manager
+
+
+@pytest.mark.parametrize("use_range", [False, True])
+def test_same_length_undo_and_redo_change_the_preview_key(use_range):
+    funscript, actions, manager = _linked_manager()
+    if use_range:
+        manager.record_range_before_action("Move Point", 1, 3)
+    else:
+        manager.record_state_before_action("Move Point")
+    actions[1]["pos"] = 50
+    actions[2]["pos"] = 60
+    funscript._bump_revision("primary")
+
+    edited_key = preview_cache.actions_version_key(funscript, "primary")
+    secondary_key = preview_cache.actions_version_key(funscript, "secondary")
+    assert manager.undo() == "Move Point"
+    undone_key = preview_cache.actions_version_key(funscript, "primary")
+    assert [a["pos"] for a in actions] == [10, 90, 10, 90]
+    assert undone_key != edited_key
+
+    assert manager.redo() == "Move Point"
+    assert [a["pos"] for a in actions] == [10, 50, 60, 90]
+    assert preview_cache.actions_version_key(funscript, "primary") not in (edited_key, undone_key)
+    # Only the linked axis is invalidated
+    assert preview_cache.actions_version_key(funscript, "secondary") == secondary_key
+
+
+def test_unlinked_manager_still_restores():
+    actions = [{"at": 0, "pos": 10}, {"at": 100, "pos": 90}]
+    manager = UndoRedoManager()
+    manager.set_actions_reference(actions)
+    manager.record_state_before_action("Move Point")
+    actions[0]["pos"] = 40
+    assert manager.undo() == "Move Point"
+    assert actions == [{"at": 0, "pos": 10}, {"at": 100, "pos": 90}]
@@ -667,7 +667,10 @@ class TrackerManager:
                 processor = getattr(self.app, 'processor', None)
 
                 if fs_proc and processor:
-                    current_frame = processor.current_frame_index
+                    # The live pipeline tracks frames ahead of the presented one (current_frame_index)
+                    current_frame = getattr(processor, 'tracking_frame_index', None)
+                    if current_frame is None:
+                        current_frame = processor.current_frame_index
                     chapter_at_frame = fs_proc.get_chapter_at_frame(current_frame)
 
                     # Determine category based on position_short_name (reliable for old and new chapters)
@@ -4,6 +4,10 @@ Modular tracker system with auto-discovery.
 This module automatically discovers and registers all tracker implementations,
 making them available for use in the application without requiring manual
 configuration or hardcoded lists.
+
+Discovery results are cached in a manifest (see core.discovery_manifest), so
+unchanged tracker files are listed from their cached metadata and a tracker
+module is only imported when its class is first requested.
 """
 
 import os
@@ -11,14 +15,21 @@ import sys
 import importlib.util
 import inspect
 import logging
-from typing import Dict, List, Type, Optional
+from typing import Dict, List, Type, Optional, Tuple
+
+from config import constants
+from common.temp_manager import get_temp_manager
 
 try:
     from .core.base_tracker import BaseTracker, TrackerMetadata, TrackerResult, TrackerError
     from .core.base_offline_tracker import BaseOfflineTracker
     from .core.security import (
         TrackerSecurityError, TrackerValidationError, TrackerSandboxError, 
-        TrackerAPIViolationError, load_tracker_safely
+        TrackerAPIViolationError, load_tracker_safely, validate_tracker_file
+    )
+    from .core.discovery_manifest import (
+        TrackerDiscoveryManifest, metadata_from_dict, metadata_to_dict,
+        VERDICT_TRACKER, VERDICT_NO_TRACKER, VERDICT_REJECTED
     )
 except ImportError:
     # Fallback for direct execution
@@ -26,7 +37,11 @@ except ImportError:
     from core.base_offline_tracker import BaseOfflineTracker
     from core.security import (
         TrackerSecurityError, TrackerValidationError, TrackerSandboxError,
-        TrackerAPIViolationError, load_tracker_safely
+        TrackerAPIViolationError, load_tracker_safely, validate_tracker_file
+    )
+    from core.discovery_manifest import (
+        TrackerDiscoveryManifest, metadata_from_dict, metadata_to_dict,
+        VERDICT_TRACKER, VERDICT_NO_TRACKER, VERDICT_REJECTED
     )
 
 
@@ -36,22 +51,28 @@ class TrackerRegistry:
     
     The registry scans the tracker_modules directory and community subdirectory
     for Python files containing BaseTracker subclasses, validates them, and
-    makes them available for instantiation.
+    makes them available for instantiation. Trackers restored from the discovery
+    manifest are imported lazily by get_tracker().
     """
     
-    def __init__(self):
+    def __init__(self, manifest_path: Optional[str] = None):
         self.logger = logging.getLogger("TrackerRegistry")
-        self._trackers: Dict[str, Type] = {}
+        self._trackers: Dict[str, Type] = {}  # Imported tracker classes
         self._metadata_cache: Dict[str, TrackerMetadata] = {}
         self._folder_map: Dict[str, str] = {}  # tracker_name -> folder_name
+        self._sources: Dict[str, Tuple[str, str, str]] = {}  # tracker_name -> (file_path, filename, class_name)
         self._discovery_errors: List[str] = []
+        self._scanned_files: List[str] = []
+        if manifest_path is None:
+            manifest_path = str(get_temp_manager().get_app_cache_path(constants.TRACKER_DISCOVERY_MANIFEST_FILE))
+        self._manifest = TrackerDiscoveryManifest(manifest_path, logger=self.logger)
         
         # Perform initial discovery
         self._discover_trackers()
         
-        if self._trackers:
+        if self._metadata_cache:
             # Single concise summary - debug level to reduce startup noise
-            self.logger.debug(f"Discovered {len(self._trackers)} trackers")
+            self.logger.debug(f"Discovered {len(self._metadata_cache)} trackers")
         else:
             self.logger.warning("No trackers discovered!")
             
@@ -61,6 +82,8 @@ class TrackerRegistry:
     def _discover_trackers(self):
         """Auto-discover tracker modules in the tracker_modules subdirectories."""
         tracker_dir = os.path.dirname(__file__)
+        self._manifest.load()
+        self._scanned_files = []
         
         # Scan live trackers subdirectory
         live_dir = os.path.join(tracker_dir, 'live')
@@ -82,7 +105,9 @@ class TrackerRegistry:
         if os.path.exists(community_dir):
             self._scan_directory(community_dir, folder_name='community', is_community=True)
         
-        self.logger.debug(f"Discovery complete. Found {len(self._trackers)} trackers.")
+        self._manifest.retain(self._scanned_files)
+        self._manifest.save()
+        self.logger.debug(f"Discovery complete. Found {len(self._metadata_cache)} trackers.")
     
     def _scan_directory(self, directory: str, folder_name: str, is_community: bool = False):
         """Scan a directory for tracker modules."""
@@ -90,6 +115,7 @@ class TrackerRegistry:
             for filename in os.listdir(directory):
                 if filename.endswith('.py') and filename not in ['__init__.py']:
                     file_path = os.path.join(directory, filename)
+                    self._scanned_files.append(file_path)
                     self._load_tracker_module(file_path, filename, folder_name, is_community)
         except OSError as e:
             error_msg = f"Failed to scan directory {directory}: {e}"
@@ -98,12 +124,27 @@ class TrackerRegistry:
     
     def _load_tracker_module(self, file_path: str, filename: str, folder_name: str, is_community: bool):
         """Load and validate a single tracker module with security checks."""
+        entry = self._manifest.lookup(file_path)
+        if entry is not None:
+            self._register_from_manifest(entry, file_path, filename, folder_name, is_community)
+            return
+
         try:
-            # Use secure loading with validation and sandboxing
-            tracker_class = load_tracker_safely(file_path, filename)
+            try:
+                validate_tracker_file(file_path)
+            except TrackerSecurityError as e:
+                self._manifest.record(file_path, VERDICT_REJECTED, message=str(e))
+                raise
+
+            # Use secure loading with sandboxing (static validation done above)
+            tracker_class = load_tracker_safely(file_path, filename, validated=True)
             if tracker_class:
-                self._register_tracker(tracker_class, folder_name, is_community, file_path)
+                metadata = self._register_tracker(tracker_class, folder_name, is_community, file_path)
+                if metadata is not None:
+                    self._manifest.record(file_path, VERDICT_TRACKER, class_name=tracker_class.__name__,
+                                          metadata=metadata_to_dict(metadata))
             else:
+                self._manifest.record(file_path, VERDICT_NO_TRACKER)
                 self.logger.debug(f"No valid tracker classes found in {filename}")
                 
         except TrackerSecurityError as e:
@@ -117,9 +158,54 @@ class TrackerRegistry:
             self._discovery_errors.append(error_msg)
             self.logger.warning(error_msg)
     
+    def _register_from_manifest(self, entry: Dict, file_path: str, filename: str, folder_name: str,
+                                is_community: bool):
+        """Register a tracker from its cached manifest entry without importing it."""
+        verdict = entry.get("verdict")
+        if verdict == VERDICT_REJECTED:
+            error_msg = f"SECURITY VIOLATION in {filename}: {entry.get('message', '')}"
+            self._discovery_errors.append(error_msg)
+            self.logger.error(error_msg)
+        elif verdict == VERDICT_TRACKER:
+            try:
+                metadata = metadata_from_dict(entry["metadata"])
+            except Exception as e:
+                error_msg = f"Invalid manifest entry for {filename}: {e}"
+                self._discovery_errors.append(error_msg)
+                self.logger.warning(error_msg)
+                return
+            self._add_tracker(metadata, folder_name, is_community, (file_path, filename, entry["class_name"]))
+        else:
+            self.logger.debug(f"No valid tracker classes found in {filename}")
     
-    def _register_tracker(self, tracker_class: Type, folder_name: str, is_community: bool, file_path: str):
-        """Register a validated tracker class with resource management."""
+    def _add_tracker(self, metadata: TrackerMetadata, folder_name: str, is_community: bool,
+                     source: Tuple[str, str, str], tracker_class: Optional[Type] = None):
+        # Check for name conflicts
+        if metadata.name in self._metadata_cache:
+            existing_metadata = self._metadata_cache[metadata.name]
+            self.logger.warning(
+                f"Tracker name conflict: '{metadata.name}' "
+                f"(existing: {existing_metadata.display_name}, "
+                f"new: {metadata.display_name}). Skipping new tracker."
+            )
+            return
+        
+        # Register the tracker
+        if tracker_class is not None:
+            self._trackers[metadata.name] = tracker_class
+        self._metadata_cache[metadata.name] = metadata
+        self._folder_map[metadata.name] = folder_name
+        self._sources[metadata.name] = source
+        
+        # Log at debug level to reduce verbosity
+        category_prefix = "[Community] " if is_community else ""
+        self.logger.debug(
+            f"Registered: {category_prefix}{metadata.display_name} ({metadata.name})"
+        )
+    
+    def _register_tracker(self, tracker_class: Type, folder_name: str, is_community: bool,
+                          file_path: str) -> Optional[TrackerMetadata]:
+        """Register a validated tracker class with resource management. Returns its metadata."""
         temp_instance = None
         try:
             # Validate by attempting to access metadata
@@ -134,26 +220,9 @@ class TrackerRegistry:
             if not metadata.name:
                 raise TrackerValidationError(f"Tracker name cannot be empty")
             
-            # Check for name conflicts
-            if metadata.name in self._trackers:
-                existing_metadata = self._metadata_cache[metadata.name]
-                self.logger.warning(
-                    f"Tracker name conflict: '{metadata.name}' "
-                    f"(existing: {existing_metadata.display_name}, "
-                    f"new: {metadata.display_name}). Skipping new tracker."
-                )
-                return
-            
-            # Register the tracker
-            self._trackers[metadata.name] = tracker_class
-            self._metadata_cache[metadata.name] = metadata
-            self._folder_map[metadata.name] = folder_name
-            
-            # Log at debug level to reduce verbosity
-            category_prefix = "[Community] " if is_community else ""
-            self.logger.debug(
-                f"Registered: {category_prefix}{metadata.display_name} ({metadata.name})"
-            )
+            source = (file_path, os.path.basename(file_path), tracker_class.__name__)
+            self._add_tracker(metadata, folder_name, is_community, source, tracker_class)
+            return metadata
             
         except TrackerSecurityError as e:
             error_msg = f"SECURITY VIOLATION during registration of {tracker_class.__name__}: {e}"
@@ -173,10 +242,11 @@ class TrackerRegistry:
                     temp_instance = None
                 except Exception as cleanup_error:
                     self.logger.warning(f"Failed to cleanup temp instance: {cleanup_error}")
+        return None
     
     def get_tracker(self, name: str) -> Optional[Type]:
         """
-        Get tracker class by name.
+        Get tracker class by name, importing its module on first use.
         
         Args:
             name: Internal tracker name (from metadata.name)
@@ -184,7 +254,24 @@ class TrackerRegistry:
         Returns:
             Type: Tracker class, or None if not found
         """
-        return self._trackers.get(name)
+        tracker_class = self._trackers.get(name)
+        if tracker_class is not None or name not in self._sources:
+            return tracker_class
+        
+        file_path, filename, class_name = self._sources[name]
+        try:
+            tracker_class = load_tracker_safely(file_path, filename)
+        except Exception as e:
+            error_msg = f"Failed to load tracker module {filename}: {e}"
+            self._discovery_errors.append(error_msg)
+            self.logger.error(error_msg)
+            return None
+        
+        if tracker_class is None or tracker_class.__name__ != class_name:
+            self.logger.error(f"Tracker '{name}' is no longer defined in {filename}; reload trackers")
+            return None
+        self._trackers[name] = tracker_class
+        return tracker_class
     
     def create_tracker(self, name: str) -> Optional:
         """
@@ -239,7 +326,7 @@ class TrackerRegistry:
     
     def get_available_names(self) -> List[str]:
         """Get list of all available tracker names."""
-        return list(self._trackers.keys())
+        return list(self._metadata_cache.keys())
     
     def get_discovery_errors(self) -> List[str]:
         """Get list of errors encountered during discovery."""
@@ -255,6 +342,7 @@ class TrackerRegistry:
         self._trackers.clear()
         self._metadata_cache.clear()
         self._folder_map.clear()
+        self._sources.clear()
         self._discovery_errors.clear()
         self._discover_trackers()
 
@@ -0,0 +1,138 @@
+"""
+Tracker discovery manifest.
+
+Caches the outcome of validating and inspecting each tracker file so startup can
+list trackers without parsing or importing them. Entries are keyed by the file's
+absolute path and tied to its size, mtime and SHA-1; when size or mtime changed
+but the content hash still matches (e.g. after a checkout), the entry is reused.
+
+Only verdicts that depend on the file content alone are stored: the tracker's
+class name and metadata, "no tracker class", or a static security rejection.
+Import or instantiation failures (missing dependencies, GPU state) are retried
+on every discovery.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from .base_tracker import StageDefinition, TrackerMetadata
+from .security import TrackerSecurityValidator
+
+MANIFEST_FORMAT_VERSION = 1
+
+VERDICT_TRACKER = "tracker"
+VERDICT_NO_TRACKER = "no_tracker"
+VERDICT_REJECTED = "rejected"
+
+_METADATA_FIELDS = ("name", "display_name", "description", "category", "version", "author",
+                    "tags", "requires_roi", "supports_dual_axis", "properties")
+_STAGE_FIELDS = ("stage_number", "name", "description", "produces_funscript", "requires_previous", "output_type")
+
+
+def _validator_fingerprint() -> str:
+    # Cached rejections and approvals are void once the security rules change
+    rules = {
+        "imports": sorted(TrackerSecurityValidator.BLACKLISTED_IMPORTS),
+        "builtins": sorted(TrackerSecurityValidator.BLACKLISTED_BUILTINS),
+    }
+    return hashlib.sha1(json.dumps(rules).encode("utf-8")).hexdigest()[:16]
+
+
+def _file_sha1(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def metadata_to_dict(metadata: TrackerMetadata) -> Dict[str, Any]:
+    data = {field: getattr(metadata, field) for field in _METADATA_FIELDS}
+    data["stages"] = [{field: getattr(stage, field) for field in _STAGE_FIELDS} for stage in metadata.stages]
+    return data
+
+
+def metadata_from_dict(data: Dict[str, Any]) -> TrackerMetadata:
+    kwargs = {field: data.get(field) for field in _METADATA_FIELDS}
+    kwargs["stages"] = [StageDefinition(**stage) for stage in data.get("stages", [])]
+    return TrackerMetadata(**kwargs)
+
+
+class TrackerDiscoveryManifest:
+    """On-disk cache of tracker file verdicts and metadata."""
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger("TrackerDiscoveryManifest")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._fingerprint = _validator_fingerprint()
+        self._dirty = False
+
+    def load(self):
+        self._entries = {}
+        self._dirty = False
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (isinstance(data, dict) and data.get("version") == MANIFEST_FORMAT_VERSION
+                and data.get("validator") == self._fingerprint):
+            self._entries = data.get("files", {})
+
+    def lookup(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached entry for an unchanged file, else None."""
+        key = os.path.abspath(file_path)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(file_path)
+            if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                return entry
+            if entry.get("size") != st.st_size or entry.get("sha1") != _file_sha1(file_path):
+                return None
+        except OSError:
+            return None
+        # Same content, new mtime: keep the verdict
+        entry["mtime_ns"] = st.st_mtime_ns
+        self._dirty = True
+        return entry
+
+    def record(self, file_path: str, verdict: str, **fields):
+        try:
+            st = os.stat(file_path)
+            sha1 = _file_sha1(file_path)
+        except OSError:
+            return
+        entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": sha1, "verdict": verdict}
+        entry.update(fields)
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError):
+            self.logger.debug(f"Tracker metadata of {file_path} is not JSON-serializable, not cached")
+            return
+        self._entries[os.path.abspath(file_path)] = entry
+        self._dirty = True
+
+    def retain(self, file_paths):
+        """Drops entries for tracker files that no longer exist."""
+        keep = {os.path.abspath(p) for p in file_paths}
+        stale = [key for key in self._entries if key not in keep]
+        for key in stale:
+            del self._entries[key]
+        if stale:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {"version": MANIFEST_FORMAT_VERSION, "validator": self._fingerprint, "files": self._entries}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            self.logger.debug(f"Could not save tracker discovery manifest: {e}")
@@ -307,13 +307,14 @@ class SecureTrackerLoader:
         self.validator = TrackerSecurityValidator()
         self.sandbox = TrackerSandbox()
         
-    def load_tracker_securely(self, file_path: str, filename: str) -> Optional[type]:
+    def load_tracker_securely(self, file_path: str, filename: str, validated: bool = False) -> Optional[type]:
         """
         Load tracker module with security validation.
         
         Args:
             file_path: Full path to tracker file
             filename: Filename for logging
+            validated: Skip static validation (caller just validated this file)
             
         Returns:
             Tracker class if validation passes, None otherwise
@@ -323,8 +324,9 @@ class SecureTrackerLoader:
         """
         try:
             # Step 1: Static security validation
-            self.logger.debug(f"Starting security validation for {filename}")
-            self.validator.validate_tracker_file(file_path)
+            if not validated:
+                self.logger.debug(f"Starting security validation for {filename}")
+                self.validator.validate_tracker_file(file_path)
             
             # Step 2: Skip sandbox validation for now - too complex for legitimate trackers
             # TODO: Implement lighter-weight sandbox in future
@@ -388,7 +390,7 @@ def validate_tracker_file(file_path: str) -> bool:
     return validator.validate_tracker_file(file_path)
 
 
-def load_tracker_safely(file_path: str, filename: str) -> Optional[type]:
+def load_tracker_safely(file_path: str, filename: str, validated: bool = False) -> Optional[type]:
     """Load a tracker with full security validation."""
     loader = SecureTrackerLoader()
-    return loader.load_tracker_securely(file_path, filename)
\ No newline at end of file
+    return loader.load_tracker_securely(file_path, filename, validated=validated)
\ No newline at end of file
@@ -107,6 +107,9 @@ class MultiScaleTracker:
     def __init__(self, scales: List[float] = None):
         self.scales = scales or [1.0, 0.75, 0.5]  # Full, 3/4, half resolution
         self.dis_flows = {}
+        # Pyramid of the last current frame, reused as the previous frame's pyramid
+        self._pyramid_source = None
+        self._pyramid = None
         
         # Initialize DIS flow for each scale
         for scale in self.scales:
@@ -116,32 +119,38 @@ class MultiScaleTracker:
             dis.setPatchStride(max(2, int(4 * scale)))
             self.dis_flows[scale] = dis
     
-    def compute_multi_scale_flow(self, prev_gray: np.ndarray, gray: np.ndarray) -> List[Tuple[np.ndarray, float]]:
-        """Compute optical flow at multiple scales."""
-        flows = []
+    def build_pyramid(self, gray: np.ndarray) -> Dict[float, np.ndarray]:
+        """Downscaled copies of a frame for every tracker scale (INTER_AREA from full resolution)."""
         h, w = gray.shape[:2]
-        
+        pyramid = {}
         for scale in self.scales:
             if scale == 1.0:
-                scaled_prev = prev_gray
-                scaled_curr = gray
+                # Critical performance optimization: ensure contiguous arrays for OpenCV
+                pyramid[scale] = np.ascontiguousarray(gray)
             else:
-                new_h, new_w = int(h * scale), int(w * scale)
-                scaled_prev = cv2.resize(prev_gray, (new_w, new_h), interpolation=cv2.INTER_AREA)
-                scaled_curr = cv2.resize(gray, (new_w, new_h), interpolation=cv2.INTER_AREA)
-            
-            # Critical performance optimization: ensure contiguous arrays for OpenCV
-            scaled_prev_cont = np.ascontiguousarray(scaled_prev)
-            scaled_curr_cont = np.ascontiguousarray(scaled_curr)
-            flow = self.dis_flows[scale].calc(scaled_prev_cont, scaled_curr_cont, None)
-            
-            # Scale flow back to original resolution
-            if scale != 1.0:
-                flow = cv2.resize(flow, (w, h), interpolation=cv2.INTER_LINEAR)
-                flow *= (1.0 / scale)  # Scale the flow vectors
-            
+                pyramid[scale] = cv2.resize(gray, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        return pyramid
+    
+    def compute_multi_scale_flow(self, prev_gray: np.ndarray, gray: np.ndarray) -> List[Tuple[np.ndarray, float]]:
+        """
+        Compute optical flow at multiple scales.
+        
+        Each flow is returned at its native scale (in scaled-pixel units). The pyramid of
+        ``gray`` is kept, so the next call, where it is ``prev_gray``, reuses it.
+        """
+        if self._pyramid is not None and self._pyramid_source is prev_gray:
+            prev_pyramid = self._pyramid
+        else:
+            prev_pyramid = self.build_pyramid(prev_gray)
+        curr_pyramid = self.build_pyramid(gray)
+        
+        flows = []
+        for scale in self.scales:
+            flow = self.dis_flows[scale].calc(prev_pyramid[scale], curr_pyramid[scale], None)
             flows.append((flow, scale))
         
+        self._pyramid_source = gray
+        self._pyramid = curr_pyramid
         return flows
 
 
@@ -442,7 +451,7 @@ class AxisProjectionEnhancedTracker(BaseTracker):
             
             # Initialize on first frame
             if self.prev_gray is None:
-                self.prev_gray = gray.copy()
+                self.prev_gray = gray
                 return self._create_initialization_result(frame_small, frame_time_ms)
             
             # Adaptive threshold based on noise
@@ -546,8 +555,9 @@ class AxisProjectionEnhancedTracker(BaseTracker):
             status_msg = f"Enhanced Axis | Pos: {self.current_position} | " \
                         f"Conf: {self.current_confidence:.2f} | Q: {self.tracking_quality:.2f}"
             
-            # Update prev frame
-            self.prev_gray = gray.copy()
+            # Update prev frame (gray is a fresh array every frame, so no copy is needed and
+            # the multi-scale tracker can recognize it as the frame whose pyramid it cached)
+            self.prev_gray = gray
             
             return TrackerResult(
                 processed_frame=vis_frame,
@@ -692,36 +702,43 @@ class AxisProjectionEnhancedTracker(BaseTracker):
         return candidates
     
     def _extract_flow_candidates(self, flow: np.ndarray, scale: float, timestamp: float) -> List[TrackingCandidate]:
-        """Extract candidates from optical flow analysis."""
+        """
+        Extract candidates from optical flow analysis.
+        
+        ``flow`` is at its native scale; positions, areas and vectors are rescaled to
+        processing-frame units instead of upsampling the flow field.
+        """
         candidates = []
+        inv_scale = 1.0 / scale
         
-        # Calculate flow magnitude and create motion mask
+        # Calculate flow magnitude and create motion mask (0.5 px/frame at full resolution)
         mag = np.sqrt(flow[..., 0]**2 + flow[..., 1]**2)
-        motion_thresh = 0.5 / scale  # Adapt threshold to scale
-        motion_mask = (mag > motion_thresh).astype(np.uint8) * 255
+        motion_mask = (mag > 0.5).astype(np.uint8) * 255
         
         # Find motion regions
         num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(motion_mask, connectivity=8)
         
+        min_area = 30 * scale * scale  # Skip small regions (30 full-resolution pixels)
+        win = max(1, int(round(5 * scale)))  # 11x11 full-resolution consistency window
         for i in range(1, num_labels):
             area = stats[i, cv2.CC_STAT_AREA]
-            if area < 30:  # Skip small regions
+            if area < min_area:
                 continue
             
-            cx, cy = centroids[i]
+            ncx, ncy = centroids[i]
             
             # Get flow vector at centroid
-            flow_u = flow[int(cy), int(cx), 0] if 0 <= cy < flow.shape[0] and 0 <= cx < flow.shape[1] else 0.0
-            flow_v = flow[int(cy), int(cx), 1] if 0 <= cy < flow.shape[0] and 0 <= cx < flow.shape[1] else 0.0
+            inside = 0 <= ncy < flow.shape[0] and 0 <= ncx < flow.shape[1]
+            flow_u = float(flow[int(ncy), int(ncx), 0]) * inv_scale if inside else 0.0
+            flow_v = float(flow[int(ncy), int(ncx), 1]) * inv_scale if inside else 0.0
             
             # Calculate confidence based on flow magnitude and consistency
             local_mag = np.sqrt(flow_u**2 + flow_v**2)
             
             # Local flow consistency check
-            y1, y2 = max(0, int(cy-5)), min(flow.shape[0], int(cy+6))
-            x1, x2 = max(0, int(cx-5)), min(flow.shape[1], int(cx+6))
-            local_flow = flow[y1:y2, x1:x2]
-            local_std = np.std(np.sqrt(local_flow[..., 0]**2 + local_flow[..., 1]**2))
+            y1, y2 = max(0, int(ncy) - win), min(flow.shape[0], int(ncy) + win + 1)
+            x1, x2 = max(0, int(ncx) - win), min(flow.shape[1], int(ncx) + win + 1)
+            local_std = np.std(mag[y1:y2, x1:x2]) * inv_scale
             
             consistency = np.exp(-local_std / 2.0)  # Higher consistency = lower std
             magnitude_score = min(1.0, local_mag / 3.0)
@@ -730,6 +747,7 @@ class AxisProjectionEnhancedTracker(BaseTracker):
             # Boost confidence for larger scales (more reliable)
             confidence *= (0.7 + 0.3 * scale)
             
+            cx, cy = ncx * inv_scale, ncy * inv_scale
             pos_1d = self._project_to_axis((cx, cy))
             
             candidate = TrackingCandidate(
@@ -737,7 +755,7 @@ class AxisProjectionEnhancedTracker(BaseTracker):
                 position_1d=pos_1d,
                 confidence=confidence,
                 source=f'flow_{scale}',
-                area=area,
+                area=area * inv_scale * inv_scale,
                 velocity=(flow_u, flow_v),
                 timestamp=timestamp
             )
@@ -22,7 +22,7 @@ import cv2
 from collections import deque
 from typing import Dict, Any, Optional, List, Tuple, Set
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 import traceback
 from dataclasses import dataclass
 
@@ -197,7 +197,9 @@ class HybridIntelligenceTracker(BaseTracker):
             self.show_oscillation_grid = kwargs.get('show_oscillation_grid', True)
             
             # Performance settings
-            self.processing_timeout = kwargs.get('processing_timeout', 0.5)  # 500ms default timeout
+            # How long a frame waits for this frame's YOLO/pose results before using the latest finished ones
+            self.model_wait_budget = kwargs.get('model_wait_budget', 0.02)
+            self.MEMORY_CLEANUP_INTERVAL = 300  # frames
             
             # === 1. ENHANCED FRAME DIFFERENTIATION PARAMETERS ===
             self.frame_diff_threshold = kwargs.get('frame_diff_threshold', 12)  # Much more sensitive
@@ -219,6 +221,12 @@ class HybridIntelligenceTracker(BaseTracker):
             
             # Thread pool for parallel processing  
             self.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="HI")
+            # In-flight model jobs ('yolo' / 'pose' -> Future); at most one per model
+            self._pending_futures = {}
+            # Frame copies handed to model jobs, reused once no in-flight job holds them
+            self._model_frame_buffers = []
+            self._pending_frame_buffers = {}
+            self._latest_pose_data = {}
             
             # Memory pool for ROI operations
             self.roi_pool = {}
@@ -250,6 +258,8 @@ class HybridIntelligenceTracker(BaseTracker):
             self.flow_update_method = kwargs.get('flow_update_method', 'selective')  # 'selective' or 'full'
             self.flow_grid_size = kwargs.get('flow_grid_size', 16)  # Subsampling for performance
             self.flow_window_size = kwargs.get('flow_window_size', 15)  # LK flow window
+            self.flow_roi_max_side = kwargs.get('flow_roi_max_side', 256)  # DROI flow working resolution
+            self.flow_roi_padding = kwargs.get('flow_roi_padding', 0.1)  # Context around the DROI for DIS
             
             # === 4. OSCILLATION DETECTION PARAMETERS ===
             self.oscillation_grid_size = kwargs.get('oscillation_grid_size', 10)
@@ -417,6 +427,10 @@ class HybridIntelligenceTracker(BaseTracker):
             self.use_gpu_flow = False
             self.flow_dense = cv2.DISOpticalFlow.create(cv2.DISOPTICAL_FLOW_PRESET_ULTRAFAST)
             self.gpu_flow = None
+            # Reused between frames: full-frame gray (double buffered) and the DROI crops fed to DIS
+            self._gray_buffers = [None, None]
+            self._gray_buffer_index = 0
+            self._flow_buffers = None
             
             self.logger.info("🚀 OPTIMIZED: Using CPU DIS ULTRAFAST (10-50x faster than GPU Farneback)")
             
@@ -647,6 +661,9 @@ class HybridIntelligenceTracker(BaseTracker):
             self.change_regions = []
             self.semantic_regions = []
             self.flow_analyses = []
+            self._pending_futures = {}
+            self._pending_frame_buffers = {}
+            self._latest_pose_data = {}
             
             # Reset signal history
             self.primary_signal_history.clear()
@@ -801,39 +818,20 @@ class HybridIntelligenceTracker(BaseTracker):
         
         try:
             self.frame_count += 1
-            if self.frame_count % 30 == 0:
+            if self.frame_count % self.MEMORY_CLEANUP_INTERVAL == 0:
                 self._perform_memory_cleanup()
             
-            self.current_frame_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            self.current_frame_gray = self._convert_to_gray(frame)
             
             # === STAGE 1: PARALLEL DETECTION & ANALYSIS ===
-            futures = []
-            pose_data = {}
-            
             if self.prev_frame_gray is not None:
-                # Launch all expensive tasks in parallel
-                if self._should_run_yolo():
-                    futures.append(self.executor.submit(self._detect_semantic_objects, frame))
-                futures.append(self.executor.submit(self._estimate_pose, frame))
-
-                # Collect results with progressive timeout handling
-                for future in futures:
-                    try:
-                        result = future.result(timeout=self.processing_timeout)
-                        if isinstance(result, list) and result and isinstance(result[0], SemanticRegion):
-                            self.semantic_regions = result
-                        elif isinstance(result, dict):
-                            pose_data = result
-                    except TimeoutError:
-                        self.logger.warning(f"Frame {self.frame_count}: Processing timeout, using previous results")
-                        # Cancel the future to free resources
-                        future.cancel()
-                        # Continue with previous frame's data
-                        continue
+                # Models run in the background; a slow model only delays its own signal
+                pose_data = self._schedule_model_jobs(frame)
             else:
                 # First frame case
                 self.semantic_regions = self._detect_semantic_objects(frame)
                 pose_data = self._estimate_pose(frame)
+                self._latest_pose_data = pose_data
 
             # === STAGE 2: DROI DEFINITION & MASKED ANALYSIS ===
             # Periodically update the DROI, otherwise keep it locked for stable analysis
@@ -846,14 +844,11 @@ class HybridIntelligenceTracker(BaseTracker):
                 self.position_last_update_frame = self.frame_count
 
             self._smoothly_update_droi()
-            droi_mask = self._create_droi_mask(self.current_frame_gray.shape)
             oscillation_signal = 0.0 # Initialize here
 
-            if droi_mask is not None and self.prev_frame_gray is not None:
-                masked_prev_gray = cv2.bitwise_and(self.prev_frame_gray, self.prev_frame_gray, mask=droi_mask)
-                masked_current_gray = cv2.bitwise_and(self.current_frame_gray, self.current_frame_gray, mask=droi_mask)
-                
-                self.flow_analyses = self._compute_selective_flow(masked_prev_gray, masked_current_gray)
+            if self.current_droi_box is not None and self.prev_frame_gray is not None:
+                self.flow_analyses = self._compute_selective_flow(self.prev_frame_gray, self.current_frame_gray,
+                                                                  self.current_droi_box)
                 oscillation_signal = self._analyze_oscillation_patterns() # This now uses flow, not change regions
             else:
                 self.flow_analyses = []
@@ -893,6 +888,67 @@ class HybridIntelligenceTracker(BaseTracker):
                 debug_info={"error": str(e)}, status_message=f"Error: {str(e)}"
             )
     
+    def _convert_to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """Converts to grayscale into one of two reused buffers (the other holds the previous frame)."""
+        self._gray_buffer_index ^= 1
+        buf = self._gray_buffers[self._gray_buffer_index]
+        if buf is None or buf.shape != frame.shape[:2]:
+            buf = np.empty(frame.shape[:2], dtype=np.uint8)
+            self._gray_buffers[self._gray_buffer_index] = buf
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=buf)
+        return buf
+
+    def _schedule_model_jobs(self, frame: np.ndarray) -> Dict[str, Any]:
+        """
+        Submits this frame's YOLO/pose jobs (at most one in flight per model), waits up to
+        ``model_wait_budget`` for them and applies whatever has finished. A model that is
+        still busy keeps its latest result; it never blocks the frame for longer.
+        """
+        run_yolo = self._should_run_yolo()
+        jobs = []
+        if run_yolo and 'yolo' not in self._pending_futures:
+            jobs.append(('yolo', self._detect_semantic_objects))
+        if 'pose' not in self._pending_futures:
+            jobs.append(('pose', self._estimate_pose))
+        if jobs:
+            # Jobs may outlive this call, so they get one copy of the frame between them
+            frame_copy = self._acquire_model_frame_buffer(frame)
+            for kind, fn in jobs:
+                self._pending_futures[kind] = self.executor.submit(fn, frame_copy)
+                self._pending_frame_buffers[kind] = frame_copy
+            wait_futures(list(self._pending_futures.values()), timeout=self.model_wait_budget)
+
+        for kind, future in list(self._pending_futures.items()):
+            if not future.done():
+                continue
+            del self._pending_futures[kind]
+            self._pending_frame_buffers.pop(kind, None)
+            try:
+                result = future.result()
+            except Exception as e:
+                self.logger.warning(f"Frame {self.frame_count}: {kind} job failed: {e}")
+                continue
+            if kind == 'yolo':
+                if result and isinstance(result[0], SemanticRegion):
+                    self.semantic_regions = result
+            elif isinstance(result, dict):
+                self._latest_pose_data = result
+        return self._latest_pose_data
+
+    def _acquire_model_frame_buffer(self, frame: np.ndarray) -> np.ndarray:
+        """Copies ``frame`` into a buffer no in-flight model job is reading; allocates only on first use."""
+        in_use = {id(buf) for buf in self._pending_frame_buffers.values()}
+        for buf in self._model_frame_buffers:
+            if id(buf) not in in_use and buf.shape == frame.shape and buf.dtype == frame.dtype:
+                np.copyto(buf, frame)
+                return buf
+        buf = frame.copy()
+        # One buffer per model can be in flight, plus the one being filled
+        if len(self._model_frame_buffers) >= 3:
+            self._model_frame_buffers = [b for b in self._model_frame_buffers if id(b) in in_use]
+        self._model_frame_buffers.append(buf)
+        return buf
+
     def _detect_frame_changes_fast(self, prev_gray: np.ndarray, curr_gray: np.ndarray) -> List[ChangeRegion]:
         """Fast frame difference using minimal operations."""
         try:
@@ -2006,19 +2062,58 @@ class HybridIntelligenceTracker(BaseTracker):
         
         return intersection_area / union_area
     
-    def _compute_selective_flow(self, prev_gray: np.ndarray, curr_gray: np.ndarray) -> List[FlowAnalysis]:
-        """Compute optical flow for the entire masked DROI."""
-        if not self.flow_dense or prev_gray.shape[0] < 12 or prev_gray.shape[1] < 12:
+    def _compute_selective_flow(self, prev_gray: np.ndarray, curr_gray: np.ndarray,
+                                droi_box: Tuple[float, float, float, float]) -> List[FlowAnalysis]:
+        """
+        Compute optical flow for the DROI only: DIS runs on the padded DROI crop, resized so
+        its longest side is at most ``flow_roi_max_side``; the crops use buffers reused between frames.
+        Statistics are normalized to the full frame (flow outside the DROI counts as zero, as
+        with the previous masked full-frame flow) so signal thresholds keep their meaning.
+        """
+        if not self.flow_dense:
+            return []
+
+        h, w = curr_gray.shape
+        x1, y1 = max(0, int(droi_box[0])), max(0, int(droi_box[1]))
+        x2, y2 = min(w, int(droi_box[2])), min(h, int(droi_box[3]))
+        if x2 - x1 < 12 or y2 - y1 < 12:
             return []
 
         try:
-            flow = self.flow_dense.calc(prev_gray, curr_gray, None)
-            
-            magnitude = np.linalg.norm(flow, axis=2)
-            avg_magnitude = np.mean(magnitude)
-            avg_direction = np.mean(flow, axis=(0, 1))
-            
-            flow_std = np.std(magnitude)
+            pad_x = int((x2 - x1) * self.flow_roi_padding)
+            pad_y = int((y2 - y1) * self.flow_roi_padding)
+            cx1, cy1 = max(0, x1 - pad_x), max(0, y1 - pad_y)
+            cx2, cy2 = min(w, x2 + pad_x), min(h, y2 + pad_y)
+            crop_w, crop_h = cx2 - cx1, cy2 - cy1
+
+            # Working size from the DROI size, rounded to 8px so buffers survive small DROI changes
+            scale = min(1.0, self.flow_roi_max_side / max(crop_w, crop_h))
+            flow_w = max(16, int(round(crop_w * scale / 8.0)) * 8)
+            flow_h = max(16, int(round(crop_h * scale / 8.0)) * 8)
+            if self._flow_buffers is None or self._flow_buffers[0].shape != (flow_h, flow_w):
+                self._flow_buffers = (np.empty((flow_h, flow_w), dtype=np.uint8),
+                                      np.empty((flow_h, flow_w), dtype=np.uint8))
+            prev_small, curr_small = self._flow_buffers
+            cv2.resize(prev_gray[cy1:cy2, cx1:cx2], (flow_w, flow_h), dst=prev_small, interpolation=cv2.INTER_AREA)
+            cv2.resize(curr_gray[cy1:cy2, cx1:cx2], (flow_w, flow_h), dst=curr_small, interpolation=cv2.INTER_AREA)
+
+            # No flow argument: DIS would read a passed-in array as its initial estimate
+            flow = self.flow_dense.calc(prev_small, curr_small, None)
+
+            # Unpadded DROI in working coordinates, flow converted back to frame pixels
+            sx, sy = flow_w / crop_w, flow_h / crop_h
+            ix1, iy1 = int((x1 - cx1) * sx), int((y1 - cy1) * sy)
+            ix2, iy2 = max(ix1 + 1, int((x2 - cx1) * sx)), max(iy1 + 1, int((y2 - cy1) * sy))
+            fx = flow[iy1:iy2, ix1:ix2, 0] * (1.0 / sx)
+            fy = flow[iy1:iy2, ix1:ix2, 1] * (1.0 / sy)
+            magnitude = np.sqrt(fx * fx + fy * fy)
+
+            area_fraction = ((x2 - x1) * (y2 - y1)) / float(w * h)
+            avg_magnitude = float(np.mean(magnitude)) * area_fraction
+            mean_sq = float(np.mean(magnitude * magnitude)) * area_fraction
+            avg_direction = np.array([np.mean(fx), np.mean(fy)], dtype=np.float32) * area_fraction
+
+            flow_std = np.sqrt(max(mean_sq - avg_magnitude * avg_magnitude, 0.0))
             oscillation_strength = min(flow_std / (avg_magnitude + 1e-6), 2.0)
 
             analysis = FlowAnalysis(
@@ -2301,24 +2396,6 @@ class HybridIntelligenceTracker(BaseTracker):
             self.logger.info(f"DROI target updated. New Box: ({new_target_box[0]:.0f}, {new_target_box[1]:.0f}, {new_target_box[2]:.0f}, {new_target_box[3]:.0f}))")
             self.target_droi_box = new_target_box
 
-    def _create_droi_mask(self, frame_shape: Tuple[int, int]) -> Optional[np.ndarray]:
-        """Creates a binary mask from the current DROI box."""
-        if self.current_droi_box is None:
-            return None
-        
-        mask = np.zeros(frame_shape, dtype=np.uint8)
-        x1, y1, x2, y2 = self.current_droi_box
-        
-        # Clip coordinates to be within frame dimensions
-        h, w = frame_shape
-        x1, y1 = max(0, int(x1)), max(0, int(y1))
-        x2, y2 = min(w, int(x2)), min(h, int(y2))
-        
-        if x1 < x2 and y1 < y2:
-            mask[y1:y2, x1:x2] = 255
-        
-        return mask
-    
     def _fuse_signals(self, oscillation_signal: float, pose_data: Dict[str, Any] = None) -> Tuple[float, float]:
         """STATE-DRIVEN SIGNAL SELECTION for a clean, context-aware signal."""
         
@@ -6,5 +6,7 @@ to enhance their functionality without duplicating code.
 """
 
 from .signal_amplifier import SignalAmplifier
+from .async_detector import AsyncDetector
+from .flow_stats import FlowStats, gaussian_center_weights
 
-__all__ = ['SignalAmplifier']
\ No newline at end of file
+__all__ = ['SignalAmplifier', 'AsyncDetector', 'FlowStats', 'gaussian_center_weights']
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Async Detector Helper Module
+
+Runs an object detection callable on a background thread so a live tracker's
+per-frame path never waits for the model.
+
+- Only the most recent frame is kept: a frame submitted while the model is busy
+  replaces any frame still waiting.
+- Results are published with the stamp of the frame they were computed on, so the
+  tracker can tell how many frames late they arrive and re-align them.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+
+class AsyncDetector:
+    """
+    Single-worker detection pipeline with a one-slot input and a one-slot output.
+    """
+
+    def __init__(self, detect_fn: Callable[[Any], Any], name: str = "AsyncDetector",
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            detect_fn: Called on the worker thread with a submitted frame
+            name: Name of the worker thread
+            logger: Logger for detection errors
+        """
+        self.detect_fn = detect_fn
+        self.name = name
+        self.logger = logger or logging.getLogger(__name__)
+
+        self._cond = threading.Condition()
+        self._pending: Optional[Tuple[int, Any, int]] = None
+        self._result: Optional[Tuple[int, Any]] = None
+        self._running = False
+        self._generation = 0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a frame is waiting or being processed."""
+        with self._cond:
+            return self._running or self._pending is not None
+
+    def submit(self, stamp: int, frame: Any):
+        """Queues a frame for detection, replacing a frame that has not started yet."""
+        with self._cond:
+            if self._stopped:
+                return
+            self._pending = (stamp, frame, self._generation)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def poll(self) -> Optional[Tuple[int, Any]]:
+        """Returns (stamp, result) of the newest finished detection once, else None."""
+        with self._cond:
+            result, self._result = self._result, None
+            return result
+
+    def reset(self):
+        """Discards the waiting frame and any unread or in-flight result."""
+        with self._cond:
+            self._generation += 1
+            self._pending = None
+            self._result = None
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            self._stopped = True
+            self._pending = None
+            self._result = None
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                stamp, frame, generation = self._pending
+                self._pending = None
+                self._running = True
+
+            try:
+                result = self.detect_fn(frame)
+            except Exception as e:
+                self.logger.error(f"Background detection error: {e}", exc_info=True)
+                result = None
+
+            with self._cond:
+                self._running = False
+                if result is not None and generation == self._generation:
+                    self._result = (stamp, result)
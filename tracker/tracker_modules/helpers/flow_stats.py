@@ -0,0 +1,115 @@
+"""
+Flow Statistics Helper Module
+
+Per-frame reductions over dense optical flow patches for the live ROI trackers.
+
+- Gaussian centre-weight kernels are built once per ROI size and shared.
+- Magnitudes, weights and products are written into buffers owned by a
+  FlowStats instance with in-place ufuncs instead of fresh temporaries.
+- Medians come from an in-place selection (``ndarray.partition``) on a reused
+  buffer. This is the same selection np.median performs, so results are
+  identical to np.median (including NaN propagation); only the copy it
+  allocates on every call is avoided.
+
+Weighted means sum the same intermediate arrays with the same ``ndarray.sum``
+as the original ``np.sum(a * b)`` expressions, so they are bit-for-bit equal.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+GAUSSIAN_KERNEL_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=GAUSSIAN_KERNEL_CACHE_SIZE)
+def gaussian_center_weights(height: int, width: int) -> np.ndarray:
+    """
+    2D Gaussian weights (sigma = size / 4, centred on the patch) for a patch of
+    the given size. The returned array is cached and read-only.
+    """
+    center_x, sigma_x = width / 2, width / 4.0
+    center_y, sigma_y = height / 2, height / 4.0
+
+    x_coords = np.arange(width)
+    y_coords = np.arange(height)
+    weights_x = np.exp(-((x_coords - center_x) ** 2) / (2 * sigma_x ** 2))
+    weights_y = np.exp(-((y_coords - center_y) ** 2) / (2 * sigma_y ** 2))
+
+    weights = np.outer(weights_y, weights_x)
+    weights.setflags(write=False)
+    return weights
+
+
+class FlowStats:
+    """
+    Reductions over (h, w, 2) flow arrays using buffers that are reallocated only
+    when the patch size changes. Not thread-safe: use one instance per tracker.
+    """
+
+    def __init__(self):
+        self._buffers: Dict[str, np.ndarray] = {}
+
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+        return buf
+
+    def magnitudes(self, flow: np.ndarray) -> np.ndarray:
+        """Per-pixel flow magnitude. The result is a buffer reused by the next call."""
+        fx, fy = flow[..., 0], flow[..., 1]
+        mag = self._buffer("magnitude", fx.shape, fx.dtype)
+        tmp = self._buffer("magnitude_tmp", fx.shape, fx.dtype)
+        np.multiply(fx, fx, out=mag)
+        np.multiply(fy, fy, out=tmp)
+        np.add(mag, tmp, out=mag)
+        np.sqrt(mag, out=mag)
+        return mag
+
+    def weighted_mean(self, flow: np.ndarray, spatial_weights: Optional[np.ndarray] = None):
+        """
+        Magnitude-weighted (optionally also spatially weighted) mean flow as (dy, dx).
+        Falls back to the per-axis median when the total weight is not positive.
+        """
+        fx, fy = flow[..., 0], flow[..., 1]
+        weights = self.magnitudes(flow)
+        if spatial_weights is not None:
+            combined = self._buffer("weights", fx.shape, np.result_type(weights, spatial_weights))
+            np.multiply(weights, spatial_weights, out=combined)
+            weights = combined
+
+        total_weight = weights.sum()
+        if not total_weight > 0:
+            return self.median(fy), self.median(fx)
+
+        product = self._buffer("product", fx.shape, np.result_type(fx, weights))
+        np.multiply(fy, weights, out=product)
+        dy = product.sum() / total_weight
+        np.multiply(fx, weights, out=product)
+        dx = product.sum() / total_weight
+        return dy, dx
+
+    def median(self, values: np.ndarray, absolute: bool = False):
+        """Exact median of ``values`` (of ``|values|`` if absolute), equal to np.median."""
+        if values.size == 0:
+            return np.float64(np.nan)
+        buf = self._buffer("median", values.shape, values.dtype)
+        if absolute:
+            np.abs(values, out=buf)
+        else:
+            np.copyto(buf, values)
+        flat = buf.reshape(-1)
+
+        n = flat.size
+        k = n // 2
+        check_nan = np.issubdtype(flat.dtype, np.inexact)
+        kth = [k] if n % 2 else [k - 1, k]
+        if check_nan:
+            kth.append(n - 1)  # NaNs sort last; np.median propagates them
+        flat.partition(kth)
+        if check_nan and np.isnan(flat[-1]):
+            return flat[-1]
+        return flat[k:k + 1].mean() if n % 2 else flat[k - 1:k + 1].mean()
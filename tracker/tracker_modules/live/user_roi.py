@@ -20,9 +20,11 @@ from typing import Dict, Any, Optional, List, Tuple
 try:
     from ..core.base_tracker import BaseTracker, TrackerMetadata, TrackerResult
     from ..helpers.signal_amplifier import SignalAmplifier
+    from ..helpers.flow_stats import FlowStats
 except ImportError:
     from tracker.tracker_modules.core.base_tracker import BaseTracker, TrackerMetadata, TrackerResult
     from tracker.tracker_modules.helpers.signal_amplifier import SignalAmplifier
+    from tracker.tracker_modules.helpers.flow_stats import FlowStats
 
 
 class UserRoiTracker(BaseTracker):
@@ -53,6 +55,7 @@ class UserRoiTracker(BaseTracker):
         self.flow_dense = None
         self.prev_gray_user_roi_patch = None
         self.use_sparse_flow = False
+        self.flow_stats = FlowStats()  # Reusable buffers for per-frame flow reductions
         
         # Motion tracking and smoothing (matches original tracker)
         self.flow_history_window_smooth = 3  # Fixed at 3 frames for responsiveness
@@ -506,8 +509,8 @@ class UserRoiTracker(BaseTracker):
                 if box_x2_c > box_x1_c and box_y2_c > box_y1_c:
                     sub_flow = flow[box_y1_c:box_y2_c, box_x1_c:box_x2_c]
                     if sub_flow.size > 0:
-                        dx_raw = np.median(sub_flow[..., 0])
-                        dy_raw = np.median(sub_flow[..., 1])
+                        dx_raw = self.flow_stats.median(sub_flow[..., 0])
+                        dy_raw = self.flow_stats.median(sub_flow[..., 1])
             
             # Update tracked point position based on optical flow (for visualization)
             if self.user_roi_tracked_point_relative:
@@ -553,8 +556,8 @@ class UserRoiTracker(BaseTracker):
             )
             
             if flow is not None:
-                dx = np.median(flow[..., 0])
-                dy = np.median(flow[..., 1])
+                dx = self.flow_stats.median(flow[..., 0])
+                dy = self.flow_stats.median(flow[..., 1])
                 return dx, dy, None, None
             
         except Exception as e:
@@ -21,6 +21,7 @@ VR_ASPECT_RATIO_THRESHOLD = 1.8
 VR_ROI_MULTIPLIER_FACE_HAND = 2.5
 VR_ROI_MULTIPLIER_DEFAULT = 2
 FPS_UPDATE_FRAME_COUNT = 30
+ROI_SHIFT_HISTORY_SIZE = 120  # Frames of ROI flow kept to re-align late detections
 
 import logging
 import time
@@ -32,9 +33,13 @@ from typing import Dict, Any, Optional, List, Tuple
 try:
     from ..core.base_tracker import BaseTracker, TrackerMetadata, TrackerResult
     from ..helpers.signal_amplifier import SignalAmplifier
+    from ..helpers.async_detector import AsyncDetector
+    from ..helpers.flow_stats import FlowStats, gaussian_center_weights
 except ImportError:
     from tracker.tracker_modules.core.base_tracker import BaseTracker, TrackerMetadata, TrackerResult
     from tracker.tracker_modules.helpers.signal_amplifier import SignalAmplifier
+    from tracker.tracker_modules.helpers.async_detector import AsyncDetector
+    from tracker.tracker_modules.helpers.flow_stats import FlowStats, gaussian_center_weights
 
 
 class YoloRoiTracker(BaseTracker):
@@ -59,6 +64,15 @@ class YoloRoiTracker(BaseTracker):
         # YOLO model
         self.yolo_model = None
         self.yolo_model_path = None
+        self._detection_device = None  # Resolved on first detection (constants.DEVICE imports torch)
+
+        # Background detection: process_frame keeps flowing on the last good ROI while
+        # YOLO runs on the most recent frame; late results are re-aligned by ROI flow.
+        self.async_detection = True
+        self._async_detector = None
+        self._roi_shift_history = deque(maxlen=ROI_SHIFT_HISTORY_SIZE)  # (frame counter, dx, dy)
+        self._last_patch_shift = (0.0, 0.0)
+        self.last_detection_lag_frames = 0
         
         # ROI tracking state
         self.roi = None  # Current active ROI (x, y, w, h)
@@ -75,6 +89,7 @@ class YoloRoiTracker(BaseTracker):
         self.flow_dense = None
         self.prev_gray_main_roi = None
         self.prev_features_main_roi = None
+        self.flow_stats = FlowStats()  # Reusable buffers for per-frame flow reductions
         
         # Position tracking (minimal smoothing for responsiveness)
         self.flow_history_window_smooth = max(MIN_FLOW_HISTORY_WINDOW, constants.DEFAULT_FLOW_HISTORY_SMOOTHING_WINDOW)
@@ -179,6 +194,14 @@ class YoloRoiTracker(BaseTracker):
             supports_dual_axis=True
         )
     
+    @property
+    def detection_device(self) -> str:
+        """Device for YOLO inference, looked up once on first use."""
+        if self._detection_device is None:
+            from config import constants
+            self._detection_device = getattr(constants, 'DEVICE', 'auto')
+        return self._detection_device
+    
     def initialize(self, app_instance, **kwargs) -> bool:
         """Initialize the YOLO ROI tracker."""
         try:
@@ -218,6 +241,7 @@ class YoloRoiTracker(BaseTracker):
                 self.show_masks = settings.get('show_masks', True)
                 self.show_roi = settings.get('show_roi', True)
                 self.enable_inversion_detection = settings.get('enable_inversion_detection', False)
+                self.async_detection = settings.get('live_tracker_async_detection', True)
                 
                 # Update flow dense preset
                 if hasattr(self, 'flow_dense') and self.flow_dense:
@@ -344,6 +368,7 @@ class YoloRoiTracker(BaseTracker):
             self.roi_update_interval = settings.get('live_tracker_roi_update_interval', self.roi_update_interval)
             self.roi_smoothing_factor = settings.get('live_tracker_roi_smoothing_factor', self.roi_smoothing_factor)
             self.max_frames_for_roi_persistence = settings.get('live_tracker_roi_persistence_frames', self.max_frames_for_roi_persistence)
+            self.async_detection = settings.get('live_tracker_async_detection', self.async_detection)
             
             # Update optical flow settings
             self.use_sparse_flow = settings.get('live_tracker_use_sparse_flow', self.use_sparse_flow)
@@ -434,8 +459,25 @@ class YoloRoiTracker(BaseTracker):
             
             # Run object detection and ROI calculation
             if run_detection_this_frame:
-                detected_objects_this_frame = self._detect_objects(processed_frame)
-                self._process_detections(detected_objects_this_frame, processed_frame.shape[:2])
+                if self._use_async_detection():
+                    detector = self._get_async_detector()
+                    # While a frame is in flight the next tick submits a fresher one, so no copy is made now
+                    if not detector.busy:
+                        # The worker gets its own copy: visualizations are drawn on processed_frame
+                        detector.submit(self.internal_frame_counter, processed_frame.copy())
+                else:
+                    detected_objects_this_frame = self._detect_objects(processed_frame)
+                    self._process_detections(detected_objects_this_frame, processed_frame.shape[:2])
+
+            # Apply the newest background detection, moved to where its objects are now
+            if self._async_detector is not None:
+                published = self._async_detector.poll()
+                if published is not None:
+                    detection_stamp, detections = published
+                    self.last_detection_lag_frames = self.internal_frame_counter - detection_stamp
+                    detected_objects_this_frame = self._realign_detections(
+                        detections, detection_stamp, processed_frame.shape[:2])
+                    self._process_detections(detected_objects_this_frame, processed_frame.shape[:2])
             
             # Handle ROI persistence when target is lost
             if not self.penis_last_known_box and self.roi is not None:
@@ -465,6 +507,7 @@ class YoloRoiTracker(BaseTracker):
                 'main_interaction': self.main_interaction_class,
                 'frames_since_loss': self.frames_since_target_lost,
                 'detection_run': run_detection_this_frame,
+                'detection_lag_frames': self.last_detection_lag_frames,
                 'objects_detected': len(detected_objects_this_frame),
                 'tracking_active': self.tracking_active
             }
@@ -500,6 +543,7 @@ class YoloRoiTracker(BaseTracker):
         self.tracking_active = True
         self.frames_since_target_lost = 0
         self.penis_max_size_history.clear()
+        self._reset_async_detection()
         self.prev_gray_main_roi, self.prev_features_main_roi = None, None
         self.penis_last_known_box, self.main_interaction_class = None, None
 
@@ -523,6 +567,7 @@ class YoloRoiTracker(BaseTracker):
         """Stop YOLO ROI tracking."""
         self.tracking_active = False
         self.prev_gray_main_roi, self.prev_features_main_roi = None, None
+        self._reset_async_detection()
         
         # Reset motion mode to undetermined when stopping
         self.motion_mode = 'undetermined'
@@ -576,6 +621,9 @@ class YoloRoiTracker(BaseTracker):
     
     def cleanup(self):
         """Clean up resources."""
+        if self._async_detector is not None:
+            self._async_detector.stop()
+            self._async_detector = None
         self.yolo_model = None
         self.roi = None
         self.penis_last_known_box = None
@@ -606,6 +654,41 @@ class YoloRoiTracker(BaseTracker):
                 and self.internal_frame_counter % max(1, self.roi_update_interval // 3) == 0)
         )
     
+    def _use_async_detection(self) -> bool:
+        return self.async_detection and self.yolo_model is not None
+
+    def _get_async_detector(self) -> AsyncDetector:
+        if self._async_detector is None:
+            self._async_detector = AsyncDetector(self._detect_objects, name="YoloRoiDetection", logger=self.logger)
+        return self._async_detector
+
+    def _reset_async_detection(self):
+        """Drops detections of frames from before a tracking restart."""
+        if self._async_detector is not None:
+            self._async_detector.reset()
+        self._roi_shift_history.clear()
+        self.last_detection_lag_frames = 0
+
+    def _realign_detections(self, detections: List[Dict], detection_stamp: int,
+                            frame_shape: Tuple[int, int]) -> List[Dict]:
+        """Moves boxes detected on an earlier frame by the ROI flow accumulated since that frame."""
+        dx = dy = 0.0
+        for frame_counter, shift_x, shift_y in self._roi_shift_history:
+            if frame_counter > detection_stamp:
+                dx += shift_x
+                dy += shift_y
+        if abs(dx) < 0.5 and abs(dy) < 0.5:
+            return detections
+
+        frame_h, frame_w = frame_shape
+        realigned = []
+        for detection in detections:
+            x, y, w, h = detection["box"]
+            new_x = int(round(min(max(x + dx, 0), max(0, frame_w - w))))
+            new_y = int(round(min(max(y + dy, 0), max(0, frame_h - h))))
+            realigned.append(dict(detection, box=(new_x, new_y, w, h)))
+        return realigned
+
     def _detect_objects(self, frame: np.ndarray) -> List[Dict]:
         """
         Run YOLO object detection on the frame using the loaded model.
@@ -628,10 +711,7 @@ class YoloRoiTracker(BaseTracker):
 
         try:
             # Run YOLO detection - this is the actual detection call from original tracker
-            from config import constants as config_constants
-            device = getattr(config_constants, 'DEVICE', 'auto')
-            
-            results = self.yolo_model(frame, device=device, verbose=False, conf=confidence_threshold)
+            results = self.yolo_model(frame, device=self.detection_device, verbose=False, conf=confidence_threshold)
 
             for result in results:
                 for box in result.boxes:
@@ -911,8 +991,10 @@ class YoloRoiTracker(BaseTracker):
             return 50, 50
         
         # Call the original process_main_roi_content logic
+        self._last_patch_shift = (0.0, 0.0)
         final_primary_pos, final_secondary_pos, _, _, self.prev_features_main_roi = \
             self.process_main_roi_content(processed_frame, main_roi_patch_gray, self.prev_gray_main_roi, self.prev_features_main_roi)
+        self._roi_shift_history.append((self.internal_frame_counter, *self._last_patch_shift))
         
         self.prev_gray_main_roi = main_roi_patch_gray.copy()
         
@@ -929,6 +1011,7 @@ class YoloRoiTracker(BaseTracker):
             dx_raw, dy_raw, _, updated_sparse_features_out = self._calculate_flow_in_patch(
                 current_roi_patch_gray, prev_roi_patch_gray, use_sparse=True,
                 prev_features_for_sparse=prev_sparse_features)
+            self._last_patch_shift = (float(dx_raw), float(dy_raw))
         else:
             # Use our sub-region analysis method for dense flow
             dy_raw, dx_raw, lower_mag, upper_mag, flow_field_for_vis = self._calculate_flow_in_sub_regions(
@@ -1078,6 +1161,10 @@ class YoloRoiTracker(BaseTracker):
         if flow is None:
             return 0.0, 0.0, 0.0, 0.0, None
 
+        # Bulk displacement of the patch (subsampled median), used to re-align late detections
+        self._last_patch_shift = (float(self.flow_stats.median(flow[::4, ::4, 0])),
+                                  float(self.flow_stats.median(flow[::4, ::4, 1])))
+
         h, w, _ = flow.shape
         is_vr_video = self._is_vr_video()
 
@@ -1093,8 +1180,8 @@ class YoloRoiTracker(BaseTracker):
                 if lower_region_h > 0 and lower_region_h < h:
                     upper_region_flow_vertical = flow[0:h - lower_region_h, :, 1]
                     lower_region_flow_vertical = flow[h - lower_region_h:h, :, 1]
-                    upper_magnitude = np.median(np.abs(upper_region_flow_vertical))
-                    lower_magnitude = np.median(np.abs(lower_region_flow_vertical))
+                    upper_magnitude = self.flow_stats.median(upper_region_flow_vertical, absolute=True)
+                    lower_magnitude = self.flow_stats.median(lower_region_flow_vertical, absolute=True)
 
                     motion_threshold = getattr(self, 'motion_inversion_threshold', 1.5)
                     if lower_magnitude > upper_magnitude * motion_threshold:
@@ -1106,57 +1193,20 @@ class YoloRoiTracker(BaseTracker):
 
         # Perform robust calculation on the selected dominant region
         region_h, region_w, _ = dominant_flow_region.shape
-        overall_dx, overall_dy = 0.0, 0.0
 
         if is_vr_video:
             # VR-SPECIFIC: Magnitude-weighted flow with Gaussian spatial weighting
             # This combines magnitude weighting (to capture small moving objects like hands)
             # with Gaussian spatial weighting (to focus on center of ROI)
 
-            # Calculate magnitude weights (prioritize moving pixels)
-            magnitudes = np.sqrt(dominant_flow_region[..., 0]**2 + dominant_flow_region[..., 1]**2)
-
-            # Create 2D Gaussian spatial weights (prioritize center of ROI)
-            center_x, sigma_x = region_w / 2, region_w / 4.0
-            center_y, sigma_y = region_h / 2, region_h / 4.0
-
-            x_coords = np.arange(region_w)
-            y_coords = np.arange(region_h)
-            weights_x = np.exp(-((x_coords - center_x) ** 2) / (2 * sigma_x ** 2))
-            weights_y = np.exp(-((y_coords - center_y) ** 2) / (2 * sigma_y ** 2))
-
-            # Create 2D spatial weight matrix
-            spatial_weights = np.outer(weights_y, weights_x)
-
-            # Combine magnitude and spatial weights
-            # This ensures: (1) moving pixels dominate, (2) center pixels are prioritized
-            combined_weights = magnitudes * spatial_weights
-
-            total_weight = np.sum(combined_weights)
-            if total_weight > 0:
-                # Weighted average of flow vectors
-                overall_dy = np.sum(dominant_flow_region[..., 1] * combined_weights) / total_weight
-                overall_dx = np.sum(dominant_flow_region[..., 0] * combined_weights) / total_weight
-            else:
-                # Fallback if no motion detected
-                overall_dy = np.median(dominant_flow_region[..., 1])
-                overall_dx = np.median(dominant_flow_region[..., 0])
+            # The Gaussian kernel is built once per region size
+            spatial_weights = gaussian_center_weights(region_h, region_w)
+            overall_dy, overall_dx = self.flow_stats.weighted_mean(dominant_flow_region, spatial_weights)
         else:
             # 2D VIDEO: Magnitude-weighted average to capture small moving objects
             # This prevents motion dilution when small moving objects (hand, face) are
             # surrounded by large static regions (penis, background)
-            magnitudes = np.sqrt(dominant_flow_region[..., 0]**2 + dominant_flow_region[..., 1]**2)
-            total_magnitude = np.sum(magnitudes)
-
-            if total_magnitude > 0:
-                # Weight each flow vector by its magnitude - large motions dominate
-                # This ensures hand/face motion isn't diluted by static background
-                overall_dy = np.sum(dominant_flow_region[..., 1] * magnitudes) / total_magnitude
-                overall_dx = np.sum(dominant_flow_region[..., 0] * magnitudes) / total_magnitude
-            else:
-                # Fallback if no motion detected at all
-                overall_dy = np.median(dominant_flow_region[..., 1])
-                overall_dx = np.median(dominant_flow_region[..., 0])
+            overall_dy, overall_dx = self.flow_stats.weighted_mean(dominant_flow_region)
 
         return overall_dy, overall_dx, lower_magnitude, upper_magnitude, flow
 
@@ -1180,8 +1230,8 @@ class YoloRoiTracker(BaseTracker):
                 )
                 if flow is None:
                     return 50, 50
-                dx_raw = np.median(flow[..., 0])
-                dy_raw = np.median(flow[..., 1])
+                dx_raw = self.flow_stats.median(flow[..., 0])
+                dy_raw = self.flow_stats.median(flow[..., 1])
                 lower_mag, upper_mag = 0.0, 0.0
             else:
                 # Use sophisticated sub-region analysis
@@ -0,0 +1,351 @@
+"""
+Streaming, multi-resolution audio waveform envelopes.
+
+Audio is decoded by FFmpeg into a pipe and reduced chunk by chunk into
+min/max/RMS bins, so memory stays bounded regardless of video length. Several
+zoom levels are kept (each one a fixed factor coarser than the previous) so the
+timeline can draw at any zoom without touching raw samples. The finished
+envelope is cached next to the video and reloaded instantly on reopen.
+"""
+
+import os
+import sys
+import shlex
+import logging
+import threading
+import subprocess
+import collections
+from typing import Optional, Callable, List, Tuple
+
+import numpy as np
+
+
+# Decode rate for the envelope. Peaks/RMS at ~10ms resolution do not need 44.1kHz.
+WAVEFORM_SAMPLE_RATE = 22050
+# Samples per bin at the finest level (~11.6ms at 22050Hz).
+WAVEFORM_BASE_BIN = 256
+# Each level is this many bins of the previous level.
+WAVEFORM_LEVEL_FACTOR = 8
+WAVEFORM_NUM_LEVELS = 4
+# Base bins decoded per pipe read; a multiple of the coarsest level factor so
+# coarse bins never straddle two chunks.
+WAVEFORM_CHUNK_BINS = WAVEFORM_LEVEL_FACTOR ** (WAVEFORM_NUM_LEVELS - 1) * 8
+
+WAVEFORM_CACHE_SUFFIX = ".waveform.npz"
+WAVEFORM_CACHE_VERSION = 1
+# An envelope is only cached when the audio reaches the expected (container) duration
+# within this slack; audio tracks often end slightly before the video.
+WAVEFORM_COMPLETE_SLACK_S = 1.0
+WAVEFORM_COMPLETE_SLACK_FRACTION = 0.02
+# FFmpeg stderr lines kept for error reports
+WAVEFORM_STDERR_TAIL_LINES = 20
+
+
+def get_waveform_cache_path(video_path: str) -> str:
+    """Cache file lives next to the video: <video_stem>.waveform.npz"""
+    return os.path.splitext(video_path)[0] + WAVEFORM_CACHE_SUFFIX
+
+
+def _source_signature(video_path: str) -> Tuple[int, int]:
+    st = os.stat(video_path)
+    return int(st.st_size), int(st.st_mtime_ns)
+
+
+def _collect_stderr(stream, tail: collections.deque):
+    """Drains FFmpeg's stderr so it cannot block on a full pipe, keeping the last lines."""
+    for line in iter(stream.readline, b""):
+        decoded = line.decode("utf-8", errors="replace").strip()
+        if decoded:
+            tail.append(decoded)
+
+
+def _reaches_expected_duration(envelope: 'AudioWaveformEnvelope', expected_duration_s: float) -> bool:
+    if expected_duration_s <= 0:
+        return True
+    slack_s = max(WAVEFORM_COMPLETE_SLACK_S, expected_duration_s * WAVEFORM_COMPLETE_SLACK_FRACTION)
+    return envelope.duration_ms / 1000.0 >= expected_duration_s - slack_s
+
+
+class AudioWaveformEnvelope:
+    """
+    Multi-level min/max/RMS audio envelope.
+
+    Level ``i`` holds one bin per ``WAVEFORM_BASE_BIN * WAVEFORM_LEVEL_FACTOR**i``
+    samples, stored as a float32 array of shape (bins, 3) with columns
+    [min, max, rms] in the [-1, 1] range. While decoding, arrays are only valid
+    up to ``filled_bins[i]``; readers must slice with it (all accessors do).
+    """
+
+    def __init__(self, sample_rate: int = WAVEFORM_SAMPLE_RATE, expected_duration_s: float = 0.0):
+        self.sample_rate = sample_rate
+        self.bin_sizes = [WAVEFORM_BASE_BIN * (WAVEFORM_LEVEL_FACTOR ** i) for i in range(WAVEFORM_NUM_LEVELS)]
+        expected_base_bins = int(max(0.0, expected_duration_s) * sample_rate / WAVEFORM_BASE_BIN) + WAVEFORM_CHUNK_BINS
+        self.levels: List[np.ndarray] = [
+            np.zeros((-(-expected_base_bins // (WAVEFORM_LEVEL_FACTOR ** i)), 3), dtype=np.float32)
+            for i in range(WAVEFORM_NUM_LEVELS)
+        ]
+        self.filled_bins = [0] * WAVEFORM_NUM_LEVELS
+        self.total_samples = 0
+        self.peak = 0.0
+        self.complete = False
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ building
+
+    def _ensure_capacity(self, base_bins_needed: int):
+        for i in range(WAVEFORM_NUM_LEVELS):
+            needed = -(-base_bins_needed // (WAVEFORM_LEVEL_FACTOR ** i))
+            current = self.levels[i]
+            if needed > current.shape[0]:
+                grown = np.zeros((max(needed, int(current.shape[0] * 1.5)), 3), dtype=np.float32)
+                grown[:current.shape[0]] = current
+                self.levels[i] = grown
+
+    def append_samples(self, samples: np.ndarray):
+        """
+        Reduce a block of normalized float32 samples into the envelope.
+        The block must start on a base-chunk boundary (only the final block may be short).
+        """
+        n = samples.size
+        if n == 0:
+            return
+        n_bins = -(-n // WAVEFORM_BASE_BIN)
+        pad = n_bins * WAVEFORM_BASE_BIN - n
+        if pad:
+            # Edge-pad so the last partial bin does not pick up silence in min/max
+            samples = np.pad(samples, (0, pad), mode='edge')
+        blocks = samples.reshape(n_bins, WAVEFORM_BASE_BIN)
+
+        base = np.empty((n_bins, 3), dtype=np.float32)
+        np.min(blocks, axis=1, out=base[:, 0])
+        np.max(blocks, axis=1, out=base[:, 1])
+        sq = np.einsum('ij,ij->i', blocks, blocks) / WAVEFORM_BASE_BIN
+        np.sqrt(sq, out=base[:, 2])
+
+        with self._lock:
+            start = self.filled_bins[0]
+            self._ensure_capacity(start + n_bins)
+            self.levels[0][start:start + n_bins] = base
+
+            # Coarser levels are rebuilt from the bins of the level below; start is
+            # chunk-aligned so each coarse bin is written from complete inputs
+            # (except the trailing one, which is refreshed by the next block).
+            prev = base
+            for i in range(1, WAVEFORM_NUM_LEVELS):
+                f = WAVEFORM_LEVEL_FACTOR
+                c_start = (start // (f ** i))
+                c_bins = -(-prev.shape[0] // f)
+                c_pad = c_bins * f - prev.shape[0]
+                if c_pad:
+                    prev = np.concatenate([prev, np.repeat(prev[-1:], c_pad, axis=0)])
+                grouped = prev.reshape(c_bins, f, 3)
+                coarse = np.empty((c_bins, 3), dtype=np.float32)
+                coarse[:, 0] = grouped[:, :, 0].min(axis=1)
+                coarse[:, 1] = grouped[:, :, 1].max(axis=1)
+                coarse[:, 2] = np.sqrt(np.mean(np.square(grouped[:, :, 2]), axis=1))
+                self.levels[i][c_start:c_start + c_bins] = coarse
+                self.filled_bins[i] = c_start + c_bins
+                prev = coarse
+
+            self.total_samples += n
+            self.peak = max(self.peak, float(max(-base[:, 0].min(), base[:, 1].max())))
+            # Publish the base level last so readers never see unwritten coarse bins.
+            self.filled_bins[0] = start + n_bins
+
+    def finalize(self, complete: bool = True):
+        """Trims the levels to their filled bins; ``complete`` is False if decoding ended early."""
+        with self._lock:
+            for i in range(WAVEFORM_NUM_LEVELS):
+                self.levels[i] = self.levels[i][:self.filled_bins[i]].copy()
+            self.complete = complete
+
+    # ------------------------------------------------------------------ queries
+
+    @property
+    def duration_ms(self) -> float:
+        return self.total_samples * 1000.0 / self.sample_rate if self.sample_rate else 0.0
+
+    def bin_duration_ms(self, level: int) -> float:
+        return self.bin_sizes[level] * 1000.0 / self.sample_rate
+
+    def choose_level(self, ms_per_pixel: float) -> int:
+        """Coarsest level whose bins are still no wider than one pixel."""
+        level = 0
+        for i in range(WAVEFORM_NUM_LEVELS):
+            if self.bin_duration_ms(i) <= ms_per_pixel:
+                level = i
+        return level
+
+    def get_range(self, start_ms: float, end_ms: float, ms_per_pixel: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bins covering [start_ms, end_ms) at the level matching the given zoom.
+
+        Returns:
+            (times_ms, bins) where bins is an (N, 3) view of [min, max, rms]; empty
+            arrays if nothing has been decoded for that range yet.
+        """
+        level = self.choose_level(ms_per_pixel)
+        data = self.levels[level]
+        filled = self.filled_bins[level]
+        bin_ms = self.bin_duration_ms(level)
+        i0 = max(0, int(start_ms // bin_ms))
+        i1 = min(filled, int(end_ms // bin_ms) + 1)
+        if i1 <= i0:
+            return np.empty(0, dtype=np.float64), np.empty((0, 3), dtype=np.float32)
+        times = (np.arange(i0, i1, dtype=np.float64) + 0.5) * bin_ms
+        return times, data[i0:i1]
+
+    def peak_envelope(self, num_samples: int) -> Optional[np.ndarray]:
+        """Peak-normalized |amplitude| envelope resampled to ~num_samples points."""
+        filled = self.filled_bins[0]
+        if filled == 0:
+            return None
+        # Use the finest level that still has at least num_samples bins
+        level = 0
+        for i in range(WAVEFORM_NUM_LEVELS):
+            if self.filled_bins[i] >= num_samples:
+                level = i
+        bins = self.levels[level][:self.filled_bins[level]]
+        peaks = np.maximum(-bins[:, 0], bins[:, 1])
+        step = max(1, peaks.size // max(1, num_samples))
+        waveform = np.maximum.reduceat(peaks, np.arange(0, peaks.size, step))
+        max_val = float(waveform.max())
+        if max_val > 0:
+            waveform = waveform / max_val
+        return waveform.astype(np.float32)
+
+    # ------------------------------------------------------------------ caching
+
+    def save(self, cache_path: str, video_path: str) -> bool:
+        size, mtime_ns = _source_signature(video_path)
+        tmp_path = cache_path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, version=WAVEFORM_CACHE_VERSION, sample_rate=self.sample_rate,
+                         total_samples=self.total_samples, peak=self.peak,
+                         source_size=size, source_mtime_ns=mtime_ns,
+                         **{f"level_{i}": self.levels[i][:self.filled_bins[i]] for i in range(WAVEFORM_NUM_LEVELS)})
+            os.replace(tmp_path, cache_path)
+            return True
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+    @classmethod
+    def load(cls, cache_path: str, video_path: str) -> Optional['AudioWaveformEnvelope']:
+        """Load a cached envelope; returns None if missing or stale for video_path."""
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with np.load(cache_path) as data:
+                if int(data['version']) != WAVEFORM_CACHE_VERSION:
+                    return None
+                size, mtime_ns = _source_signature(video_path)
+                if int(data['source_size']) != size or int(data['source_mtime_ns']) != mtime_ns:
+                    return None
+                env = cls(sample_rate=int(data['sample_rate']))
+                env.levels = [data[f"level_{i}"].astype(np.float32) for i in range(WAVEFORM_NUM_LEVELS)]
+                env.filled_bins = [lvl.shape[0] for lvl in env.levels]
+                env.total_samples = int(data['total_samples'])
+                env.peak = float(data['peak'])
+                env.complete = True
+                return env
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+def stream_audio_waveform_envelope(video_path: str, expected_duration_s: float = 0.0,
+                                   logger: Optional[logging.Logger] = None,
+                                   on_progress: Optional[Callable[[AudioWaveformEnvelope], None]] = None,
+                                   stop_event: Optional[threading.Event] = None,
+                                   use_cache: bool = True) -> Optional[AudioWaveformEnvelope]:
+    """
+    Build (or load from cache) the waveform envelope for a video.
+
+    Audio is read from FFmpeg in fixed-size chunks; ``on_progress`` is called with
+    the partially filled envelope after each chunk so the UI can draw it while
+    decoding continues. The envelope is only cached when FFmpeg exits cleanly and
+    the audio reaches ``expected_duration_s``; a truncated decode is returned (marked
+    incomplete) so the partial waveform can still be shown, and decoded again next time.
+    """
+    logger = logger or logging.getLogger(__name__)
+    cache_path = get_waveform_cache_path(video_path)
+
+    if use_cache:
+        cached = AudioWaveformEnvelope.load(cache_path, video_path)
+        if cached is not None:
+            logger.info(f"Loaded cached audio waveform from {os.path.basename(cache_path)}.")
+            return cached
+
+    ffmpeg_cmd = [
+        'ffmpeg', '-hide_banner', '-nostats', '-loglevel', 'error',
+        '-i', video_path,
+        '-vn', '-ac', '1', '-ar', str(WAVEFORM_SAMPLE_RATE), '-c:a', 'pcm_s16le', '-f', 's16le', 'pipe:1'
+    ]
+    logger.info(f"Streaming audio for waveform: {' '.join(shlex.quote(str(x)) for x in ffmpeg_cmd)}")
+
+    envelope = AudioWaveformEnvelope(expected_duration_s=expected_duration_s)
+    chunk_bytes = WAVEFORM_CHUNK_BINS * WAVEFORM_BASE_BIN * 2
+    creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+    process = None
+    stderr_tail = collections.deque(maxlen=WAVEFORM_STDERR_TAIL_LINES)
+    stderr_thread = None
+    try:
+        process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   creationflags=creation_flags)
+        stderr_thread = threading.Thread(target=_collect_stderr, args=(process.stderr, stderr_tail),
+                                         daemon=True, name="WaveformStderr")
+        stderr_thread.start()
+        buf = bytearray(chunk_bytes)
+        view = memoryview(buf)
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                logger.info("Audio waveform generation cancelled.")
+                return None
+            # Fill a whole chunk so only the final block can be short
+            got = 0
+            while got < chunk_bytes:
+                n = process.stdout.readinto(view[got:])
+                if not n:
+                    break
+                got += n
+            got -= got % 2
+            if got == 0:
+                break
+            samples = np.frombuffer(buf, dtype=np.int16, count=got // 2).astype(np.float32)
+            samples *= (1.0 / 32768.0)
+            envelope.append_samples(samples)
+            if on_progress is not None:
+                on_progress(envelope)
+            if got < chunk_bytes:
+                break
+
+        process.wait(timeout=10)
+        stderr_thread.join(timeout=1.0)
+        return_code = process.returncode
+        if return_code != 0 and envelope.total_samples == 0:
+            logger.error(f"FFmpeg failed to extract audio (exit code {return_code}): {' | '.join(stderr_tail)}")
+            return None
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.error(f"Error streaming audio waveform: {e}", exc_info=True)
+        return None
+    finally:
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+
+    if envelope.total_samples == 0:
+        logger.warning("FFmpeg produced no audio data.")
+        return None
+
+    complete = return_code == 0 and _reaches_expected_duration(envelope, expected_duration_s)
+    envelope.finalize(complete)
+    if not complete:
+        logger.warning(f"Audio decode ended early (exit code {return_code}, {envelope.duration_ms / 1000.0:.1f}s "
+                       f"of {expected_duration_s:.1f}s); waveform not cached. {' | '.join(stderr_tail)}")
+    elif use_cache and envelope.save(cache_path, video_path):
+        logger.debug(f"Cached audio waveform to {cache_path}")
+    return envelope
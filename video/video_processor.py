@@ -1,5 +1,6 @@
 import time
 import threading
+import queue
 import subprocess
 import json
 import shlex
@@ -20,18 +21,15 @@ from video.vr_format_detector_ml_real import RealMLVRFormatDetector
 # Thumbnail extractor for fast random frame access
 from video.thumbnail_extractor import ThumbnailExtractor
 
-try:
-    from scipy.io import wavfile
-    SCIPY_AVAILABLE_FOR_AUDIO = True
-except ImportError:
-    SCIPY_AVAILABLE_FOR_AUDIO = False
+# Streaming multi-resolution audio envelope
+from video.audio_waveform import AudioWaveformEnvelope, stream_audio_waveform_envelope
 
 class VideoProcessor:
     def __init__(self, app_instance, tracker: Optional[type] = None, yolo_input_size=640,
                  video_type='auto', vr_input_format='he_sbs',  # Default VR to SBS Equirectangular
                  vr_fov=190, vr_pitch=-21,
                  fallback_logger_config: Optional[dict] = None,
-                 cache_size: int = 50):
+                 cache_size: int = 50, ffmpeg_decode_threads: int = 0):
         self.app = app_instance
         self.tracker = tracker
         logger_assigned_correctly = False
@@ -89,6 +87,8 @@ class VideoProcessor:
         self.frame_buffer_current = 0  # Current frames buffered
         self.total_frames = 0
         self.current_frame_index = 0
+        # Frame the live tracker is processing; ahead of current_frame_index (the presented frame)
+        self.tracking_frame_index: Optional[int] = None
         self.current_stream_start_frame_abs = 0
         self.frames_read_from_current_stream = 0
 
@@ -112,6 +112,10 @@ class VideoProcessor:
         if self.app and hasattr(self.app, 'app_settings'):
             self.vr_unwarp_method_override = self.app.app_settings.get('vr_unwarp_method', 'auto')
 
+        # FFmpeg decoder thread count for segment streaming (0 = let FFmpeg decide).
+        # Only Stage 1 producers pass the autotuned count; other stages run many decoders at once.
+        self.ffmpeg_decode_threads = int(ffmpeg_decode_threads or 0)
+
         # Thumbnail Extractor for fast random frame access (OpenCV-based)
         self.thumbnail_extractor = None
 
@@ -127,6 +131,10 @@ class VideoProcessor:
         self._yolo_samples = []
         self._last_timing_update = time.time()
 
+        # Live pipeline: presentation clock (anchor_time, anchor_frame, frame_delay) and Real Time drops
+        self._presentation_anchor: Optional[Tuple[float, int, float]] = None
+        self.live_frames_dropped = 0
+
         self.stop_event = threading.Event()
         self.processing_start_frame_limit = 0
         self.processing_end_frame_limit = -1
@@ -1233,64 +1241,34 @@ class VideoProcessor:
             self.logger.error(f"Error in _get_video_info for {filename}: {e}")
             return None
 
-    def get_audio_waveform(self, num_samples: int = 1000) -> Optional[np.ndarray]:
+    def get_audio_waveform_envelope(self, on_progress=None, stop_event: Optional[threading.Event] = None) -> Optional[AudioWaveformEnvelope]:
         """
-        [OPTIMIZED] Generates an audio waveform by streaming audio data directly
-        from FFmpeg into memory, avoiding the need for a temporary file.
+        Streams the audio track into a multi-resolution min/max/RMS envelope.
+        Uses the on-disk cache next to the video when it is still valid, so reopening is instant.
+        ``on_progress`` receives the partially built envelope after every decoded chunk.
         """
         if not self.video_path or not self.video_info.get("has_audio"):
             self.logger.info("No video loaded or video has no audio stream for waveform generation.")
             return None
-        if not SCIPY_AVAILABLE_FOR_AUDIO:
-            self.logger.warning("Scipy is not available. Cannot generate audio waveform.")
-            return None
-
-        process = None
-        try:
-            ffmpeg_cmd = [
-                'ffmpeg', '-hide_banner', '-nostats', '-loglevel', 'error',
-                '-i', self.video_path,
-                '-vn', '-ac', '1', '-ar', '44100', '-c:a', 'pcm_s16le', '-f', 's16le', 'pipe:1'
-            ]
-            self.logger.info(f"Extracting audio for waveform via memory pipe: {' '.join(shlex.quote(str(x)) for x in ffmpeg_cmd)}")
-
-            creation_flags = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-            process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=creation_flags)
-            raw_audio, stderr = process.communicate(timeout=60)
-
-            if process.returncode != 0:
-                self.logger.error(f"FFmpeg failed to extract audio: {stderr.decode(errors='ignore')}")
-                return None
-            if not raw_audio:
-                self.logger.error("FFmpeg produced no audio data.")
-                return None
-
-            data = np.frombuffer(raw_audio, dtype=np.int16)
-
-            if data.size == 0:
-                self.logger.warning("Audio data is empty after reading from FFmpeg pipe.")
-                return None
-
-            num_frames_audio = len(data)
-            step = max(1, num_frames_audio // num_samples)
-            waveform = [np.max(np.abs(data[i:i + step])) for i in range(0, num_frames_audio, step)]
-            waveform_np = np.array(waveform)
-            max_val = np.max(waveform_np)
-            if max_val > 0:
-                waveform_np = waveform_np / max_val
+        return stream_audio_waveform_envelope(
+            self.video_path,
+            expected_duration_s=self.video_info.get("duration", 0.0),
+            logger=self.logger,
+            on_progress=on_progress,
+            stop_event=stop_event)
 
-            self.logger.info(f"Generated waveform with {len(waveform_np)} samples.")
-            return waveform_np
-
-        except subprocess.TimeoutExpired:
-            self.logger.error("FFmpeg timed out during audio extraction.")
-            if process:
-                process.kill()
-                process.communicate()
-            return None
-        except Exception as e:
-            self.logger.error(f"Error generating audio waveform: {e}", exc_info=True)
+    def get_audio_waveform(self, num_samples: int = 1000) -> Optional[np.ndarray]:
+        """
+        Generates a peak-normalized audio waveform of ~num_samples points from the
+        streaming envelope (bounded memory, cached on disk).
+        """
+        envelope = self.get_audio_waveform_envelope()
+        if envelope is None:
             return None
+        waveform_np = envelope.peak_envelope(num_samples)
+        if waveform_np is not None:
+            self.logger.info(f"Generated waveform with {len(waveform_np)} samples.")
+        return waveform_np
 
     def _is_10bit_cuda_pipe_needed(self) -> bool:
         # TODO: Add bitshift processing for 10-bit videos (fast 10-bit to 8-bit conversion).
@@ -2170,207 +2148,124 @@ class VideoProcessor:
             # Deque automatically removes oldest when at maxlen
             self.arrow_nav_backward_buffer.append((frame_index, frame_data))
 
-    def _processing_loop(self):
-        if not self.ffmpeg_process or self.ffmpeg_process.stdout is None:
-            self.logger.error("_processing_loop: FFmpeg process/stdout not available. Exiting.")
-            self.is_processing = False
-            return
-
-        start_time = time.time()  # For calculating FPS and ETA in the callback
+    # --- Live processing pipeline ---
+    # Frames flow decode-ahead -> tracking -> presentation through bounded queues, so
+    # decoding overlaps tracking and a slow stage blocks the one before it instead of
+    # piling up frames. Items are ("frame", frame_index, frame) or
+    # ("end", reason, frame_index, message). Frame indices are assigned at decode time,
+    # so tracker timestamps stay exact even when Real Time mode drops late frames.
 
-        loop_ffmpeg_process = self.ffmpeg_process
-        next_frame_target_time = time.perf_counter()
-        self.last_processed_chapter_id = None
+    def _pipeline_put(self, q: queue.Queue, item: tuple, pipeline_stop: threading.Event) -> bool:
+        while not (pipeline_stop.is_set() or self.stop_event.is_set()):
+            try:
+                q.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
 
+    def _pipeline_get(self, q: queue.Queue, pipeline_stop: threading.Event) -> Optional[tuple]:
+        while not (pipeline_stop.is_set() or self.stop_event.is_set()):
+            try:
+                return q.get(timeout=0.05)
+            except queue.Empty:
+                continue
+        return None
+
+    def _get_target_frame_delay(self, speed_mode) -> float:
+        if speed_mode == constants.ProcessingSpeedMode.REALTIME:
+            return 1.0 / self.fps if self.fps > 0 else (1.0 / 30.0)
+        elif speed_mode == constants.ProcessingSpeedMode.SLOW_MOTION:
+            return 1.0 / 10.0  # Fixed 10 FPS for slow-mo
+        return 0.0  # Max Speed
+
+    def _read_live_frame(self, ffmpeg_process: subprocess.Popen) -> Tuple[Optional[np.ndarray], int]:
+        """Reads one raw frame into its own writable buffer. Returns (frame or None, bytes read)."""
+        if self.dual_output_enabled:
+            processing_frame = self.dual_output_processor.get_processing_frame()
+            if processing_frame is None:
+                return None, 0
+            # Private copy: the dual-output processor keeps reusing its latest frame
+            frame_np = np.array(processing_frame, dtype=np.uint8, copy=True)
+            return frame_np, frame_np.nbytes
+
+        stream = ffmpeg_process.stdout
+        if stream is None:
+            return None, 0
+        buffer = bytearray(self.frame_size_bytes)
+        view = memoryview(buffer)
+        bytes_read = 0
+        while bytes_read < self.frame_size_bytes:
+            n = stream.readinto(view[bytes_read:])
+            if not n:
+                break
+            bytes_read += n
+        if bytes_read < self.frame_size_bytes:
+            return None, bytes_read
+        return np.frombuffer(buffer, dtype=np.uint8), bytes_read
+
+    def _decode_ahead_stage(self, ffmpeg_process: subprocess.Popen, decode_queue: queue.Queue,
+                            pipeline_stop: threading.Event):
+        """Pipeline stage 1: reads (and GPU-unwarps) frames ahead of the tracker."""
+        end_item = None
         try:
-            # The main processing loop
-            while not self.stop_event.is_set():
-                while self.pause_event.is_set():
-                    if self.stop_event.is_set():
-                        break
-                    time.sleep(0.01)
-
-                # If a stop was requested while we were paused, break the main loop.
-                if self.stop_event.is_set():
-                    break
-
-                # The original logic of the loop continues below
-                speed_mode = self.app.app_state_ui.selected_processing_speed_mode
-                
-                # Debug: Log speed mode selection for MAX_SPEED troubleshooting
-                if hasattr(self, '_last_logged_speed_mode') and self._last_logged_speed_mode != speed_mode:
-                    self.logger.info(f"Processing speed mode changed to: {speed_mode}")
-                    self._last_logged_speed_mode = speed_mode
-                elif not hasattr(self, '_last_logged_speed_mode'):
-                    self.logger.info(f"Initial processing speed mode: {speed_mode}")
-                    self._last_logged_speed_mode = speed_mode
-                
-                if speed_mode == constants.ProcessingSpeedMode.REALTIME:
-                    target_delay = 1.0 / self.fps if self.fps > 0 else (1.0 / 30.0)
-                elif speed_mode == constants.ProcessingSpeedMode.SLOW_MOTION:
-                    target_delay = 1.0 / 10.0  # Fixed 10 FPS for slow-mo
-                else:  # Max Speed
-                    target_delay = 0.0
-                    
-                # Debug: Log target_delay for MAX_SPEED troubleshooting
-                if speed_mode == constants.ProcessingSpeedMode.MAX_SPEED and target_delay != 0.0:
-                    self.logger.error(f"MAX_SPEED mode but target_delay = {target_delay} (should be 0.0)")
-                elif speed_mode == constants.ProcessingSpeedMode.MAX_SPEED and not hasattr(self, '_max_speed_logged'):
-                    self.logger.info(f"MAX_SPEED mode active: target_delay = {target_delay}")
-                    self._max_speed_logged = True
-
-                current_chapter = self.app.funscript_processor.get_chapter_at_frame(self.current_frame_index)
-                current_chapter_id = current_chapter.unique_id if current_chapter else None
-
-                if current_chapter_id != self.last_processed_chapter_id:
-                    # Only auto-start/stop tracker if enable_tracker_processing is True
-                    # This prevents the play button from triggering live tracking after offline analysis
-                    if self.tracker and self.enable_tracker_processing:
-                        # Check if we should track in this chapter based on category
-                        from config.constants import POSITION_INFO_MAPPING
-                        should_track = True
-
-                        if current_chapter:
-                            # Check chapter category
-                            position_info = POSITION_INFO_MAPPING.get(current_chapter.position_short_name, {})
-                            category = position_info.get('category', 'Position')
-                            should_track = (category == "Position")  # Only track Position category
-
-                            # Reconfigure if chapter has user ROI
-                            if should_track and current_chapter.user_roi_fixed:
-                                self.tracker.reconfigure_for_chapter(current_chapter)
-                        # No chapter (unchaptered) = should track (default behavior)
-
-                        # Start/stop tracker based on category
-                        if should_track and not self.tracker.tracking_active:
-                            self.tracker.start_tracking()
-                            if current_chapter:
-                                self.logger.info(f"Tracker resumed for Position chapter: {current_chapter.position_short_name}")
-                            else:
-                                self.logger.info("Tracker active in unchaptered section")
-                        elif not should_track and self.tracker.tracking_active:
-                            self.tracker.stop_tracking()
-                            if current_chapter:
-                                self.logger.info(f"Tracker paused for Not Relevant chapter: {current_chapter.position_short_name}")
-
-                    self.last_processed_chapter_id = current_chapter_id
-
-                # Only auto-start tracker for user ROI if enable_tracker_processing is True
-                if current_chapter and self.tracker and self.enable_tracker_processing and not self.tracker.tracking_active and current_chapter.user_roi_fixed:
-                    self.tracker.start_tracking()
-
-                if self.ffmpeg_pipe1_process and self.ffmpeg_pipe1_process.poll() is not None:
+            while not (pipeline_stop.is_set() or self.stop_event.is_set()):
+                # An FFmpeg process that exited cleanly may still have frames in the pipe
+                if self.ffmpeg_pipe1_process and self.ffmpeg_pipe1_process.poll() not in (None, 0):
                     pipe1_stderr = self.ffmpeg_pipe1_process.stderr.read(4096).decode(
                         errors='ignore') if self.ffmpeg_pipe1_process.stderr else ""
-                    self.logger.warning(
-                        f"FFmpeg Pipe 1 died. Exit: {self.ffmpeg_pipe1_process.returncode}. Stderr: {pipe1_stderr.strip()}. Stopping.")
-                    self.is_processing = False
+                    end_item = ("end", "pipe1_died", -1,
+                                f"FFmpeg Pipe 1 died. Exit: {self.ffmpeg_pipe1_process.returncode}. Stderr: {pipe1_stderr.strip()}. Stopping.")
                     break
-
-                if loop_ffmpeg_process.poll() is not None:
-                    stderr_output = loop_ffmpeg_process.stderr.read(4096).decode(
-                        errors='ignore') if loop_ffmpeg_process.stderr else ""
-                    self.logger.info(
-                        f"FFmpeg output process died unexpectedly. Exit: {loop_ffmpeg_process.returncode}. Stderr: {stderr_output.strip()}. Stopping.")
-                    self.is_processing = False
+                if ffmpeg_process.poll() not in (None, 0):
+                    stderr_output = ffmpeg_process.stderr.read(4096).decode(
+                        errors='ignore') if ffmpeg_process.stderr else ""
+                    end_item = ("end", "died", -1,
+                                f"FFmpeg output process died unexpectedly. Exit: {ffmpeg_process.returncode}. Stderr: {stderr_output.strip()}. Stopping.")
                     break
 
-                # Get frame from dual output processor or standard FFmpeg
-                raw_frame_bytes = None
                 decode_start = time.perf_counter()
-                if self.dual_output_enabled:
-                    # Use dual output processor
-                    processing_frame = self.dual_output_processor.get_processing_frame()
-                    if processing_frame is not None:
-                        # Convert numpy array back to bytes for compatibility
-                        raw_frame_bytes = processing_frame.tobytes()
-                    else:
-                        raw_frame_bytes = None
-                    decode_time = (time.perf_counter() - decode_start) * 1000.0
-                    self._decode_samples.append(decode_time)
-                else:
-                    # Standard FFmpeg reading
-                    if loop_ffmpeg_process.stdout is not None:
-                        raw_frame_bytes = loop_ffmpeg_process.stdout.read(self.frame_size_bytes)
-                        decode_time = (time.perf_counter() - decode_start) * 1000.0
-                        self._decode_samples.append(decode_time)
-                    else:
-                        raw_frame_bytes = None
+                frame_np, raw_frame_len = self._read_live_frame(ffmpeg_process)
+                self._decode_samples.append((time.perf_counter() - decode_start) * 1000.0)
 
-                raw_frame_len = len(raw_frame_bytes) if raw_frame_bytes is not None else 0
-                if not raw_frame_bytes or raw_frame_len < self.frame_size_bytes:
+                if frame_np is None:
                     if self.dual_output_enabled:
-                        self.logger.info("End of dual-output stream or no frames available.")
+                        message = "End of dual-output stream or no frames available."
                     else:
-                        self.logger.info(
-                            f"End of FFmpeg GUI stream or incomplete frame (read {raw_frame_len}/{self.frame_size_bytes}).")
-                    self.is_processing = False
-                    # Clear tracker processing flag when stream ends naturally
-                    self.enable_tracker_processing = False
-                    if self.app:
-                        was_scripting_at_end = self.tracker and self.tracker.tracking_active
-                        end_range = (self.processing_start_frame_limit, self.current_frame_index)
-                        self.app.on_processing_stopped(was_scripting_session=was_scripting_at_end, scripted_frame_range=end_range)
+                        message = f"End of FFmpeg GUI stream or incomplete frame (read {raw_frame_len}/{self.frame_size_bytes})."
+                    end_item = ("end", "eos", -1, message)
                     break
 
-                self.current_frame_index = self.current_stream_start_frame_abs + self.frames_read_from_current_stream
+                frame_index = self.current_stream_start_frame_abs + self.frames_read_from_current_stream
                 self.frames_read_from_current_stream += 1
 
-                # Notify playback state observers (e.g., device_control)
-                if self._playback_state_callbacks:
-                    is_currently_playing = self.is_processing and not self.pause_event.is_set()
-                    current_time_ms = (self.current_frame_index / self.fps) * 1000.0 if self.fps > 0 else 0.0
-                    self._notify_playback_state_callbacks(is_currently_playing, current_time_ms)
-
-                if self.cli_progress_callback:
-                    # Throttle updates to avoid slowing down processing (e.g., update every 10 frames)
-                    if self.current_frame_index % 10 == 0 or self.current_frame_index == self.total_frames - 1:
-                        self.cli_progress_callback(self.current_frame_index, self.total_frames, start_time)
-
-                if self.processing_end_frame_limit != -1 and self.current_frame_index > self.processing_end_frame_limit:
-                    self.logger.info(f"Reached GUI end_frame_limit ({self.processing_end_frame_limit}). Stopping.")
-                    self.is_processing = False
-                    # Clear tracker processing flag when reaching end frame limit naturally
-                    self.enable_tracker_processing = False
-                    if self.app:
-                        was_scripting_at_end_limit = self.tracker and self.tracker.tracking_active
-                        end_range_limit = (self.processing_start_frame_limit, self.processing_end_frame_limit)
-                        self.app.on_processing_stopped(was_scripting_session=was_scripting_at_end_limit, scripted_frame_range=end_range_limit)
+                if self.processing_end_frame_limit != -1 and frame_index > self.processing_end_frame_limit:
+                    end_item = ("end", "end_limit", frame_index, None)
                     break
-                if self.total_frames > 0 and self.current_frame_index >= self.total_frames:
-                    self.logger.info("Reached end of video. Stopping GUI processing.")
-                    self.is_processing = False
-                    # Clear tracker processing flag when reaching end of video naturally
-                    self.enable_tracker_processing = False
-                    if self.app:
-                        was_scripting_at_eos = self.tracker and self.tracker.tracking_active
-                        end_range_eos = (self.processing_start_frame_limit, self.current_frame_index)
-                        self.app.on_processing_stopped(was_scripting_session=was_scripting_at_eos, scripted_frame_range=end_range_eos)
+                if self.total_frames > 0 and frame_index >= self.total_frames:
+                    end_item = ("end", "end_of_video", frame_index, None)
                     break
 
                 # Always use BGR24 format (3 bytes per pixel)
                 expected_size = self.yolo_input_size * self.yolo_input_size * 3
-                actual_bytes = len(raw_frame_bytes)
-
-                # Validate frame size
-                if actual_bytes != expected_size:
-                    self.logger.error(f"Invalid frame size: {actual_bytes} bytes (expected {expected_size}). Skipping frame.")
+                if raw_frame_len != expected_size:
+                    self.logger.error(f"Invalid frame size: {raw_frame_len} bytes (expected {expected_size}). Skipping frame.")
                     continue
 
-                frame_np = np.frombuffer(raw_frame_bytes, dtype=np.uint8).reshape(self.yolo_input_size, self.yolo_input_size, 3)
+                frame_np = frame_np.reshape(self.yolo_input_size, self.yolo_input_size, 3)
 
                 # Apply GPU unwarp for VR frames if enabled
                 if self.gpu_unwarp_enabled and self.gpu_unwarp_worker:
                     unwarp_start = time.perf_counter()
 
                     # Submit current frame to GPU worker (non-blocking)
-                    submit_success = self.gpu_unwarp_worker.submit_frame(self.current_frame_index, frame_np,
-                                                       timestamp_ms=self.current_frame_index * (1000.0 / self.fps) if self.fps > 0 else 0.0,
+                    submit_success = self.gpu_unwarp_worker.submit_frame(frame_index, frame_np,
+                                                       timestamp_ms=frame_index * (1000.0 / self.fps) if self.fps > 0 else 0.0,
                                                        timeout=0.05)
 
                     # For MAX_SPEED: wait synchronously for current frame
                     # For realtime: use async pattern (get previous frame from queue)
-                    is_max_speed = target_delay == 0.0
+                    is_max_speed = self._get_target_frame_delay(self.app.app_state_ui.selected_processing_speed_mode) == 0.0
                     timeout = 0.2 if is_max_speed else 0.01
 
                     if submit_success:
@@ -2379,21 +2274,257 @@ class VideoProcessor:
                             _, frame_np, _ = unwarp_result
                     # else: Use fisheye frame_np as-is (queue full or timeout)
 
-                    unwarp_time = (time.perf_counter() - unwarp_start) * 1000.0
-                    self._unwarp_samples.append(unwarp_time)
+                    self._unwarp_samples.append((time.perf_counter() - unwarp_start) * 1000.0)
+
+                if not self._pipeline_put(decode_queue, ("frame", frame_index, frame_np), pipeline_stop):
+                    return
+        except Exception as e:
+            self.logger.error(f"Error in decode-ahead stage: {e}", exc_info=True)
+            end_item = ("end", "error", -1, f"Decode-ahead stage failed: {e}")
+        if end_item is not None:
+            self._pipeline_put(decode_queue, end_item, pipeline_stop)
+
+    def _update_tracker_for_chapter(self, frame_index: int):
+        """Starts/stops/reconfigures the live tracker when playback enters a new chapter."""
+        current_chapter = self.app.funscript_processor.get_chapter_at_frame(frame_index)
+        current_chapter_id = current_chapter.unique_id if current_chapter else None
+
+        if current_chapter_id != self.last_processed_chapter_id:
+            # Only auto-start/stop tracker if enable_tracker_processing is True
+            # This prevents the play button from triggering live tracking after offline analysis
+            if self.tracker and self.enable_tracker_processing:
+                # Check if we should track in this chapter based on category
+                from config.constants import POSITION_INFO_MAPPING
+                should_track = True
+
+                if current_chapter:
+                    # Check chapter category
+                    position_info = POSITION_INFO_MAPPING.get(current_chapter.position_short_name, {})
+                    category = position_info.get('category', 'Position')
+                    should_track = (category == "Position")  # Only track Position category
+
+                    # Reconfigure if chapter has user ROI
+                    if should_track and current_chapter.user_roi_fixed:
+                        self.tracker.reconfigure_for_chapter(current_chapter)
+                # No chapter (unchaptered) = should track (default behavior)
+
+                # Start/stop tracker based on category
+                if should_track and not self.tracker.tracking_active:
+                    self.tracker.start_tracking()
+                    if current_chapter:
+                        self.logger.info(f"Tracker resumed for Position chapter: {current_chapter.position_short_name}")
+                    else:
+                        self.logger.info("Tracker active in unchaptered section")
+                elif not should_track and self.tracker.tracking_active:
+                    self.tracker.stop_tracking()
+                    if current_chapter:
+                        self.logger.info(f"Tracker paused for Not Relevant chapter: {current_chapter.position_short_name}")
+
+            self.last_processed_chapter_id = current_chapter_id
+
+        # Only auto-start tracker for user ROI if enable_tracker_processing is True
+        if current_chapter and self.tracker and self.enable_tracker_processing and not self.tracker.tracking_active and current_chapter.user_roi_fixed:
+            self.tracker.start_tracking()
+
+    def _is_frame_too_late(self, frame_index: int, decode_queue: queue.Queue) -> bool:
+        """
+        Real Time frame-drop policy: a frame is skipped when its presentation slot has
+        already passed by more than one frame interval and a newer decoded frame is
+        waiting. Never applies to Slow-mo or Max Speed.
+        """
+        if not constants.LIVE_REALTIME_DROP_LATE_FRAMES or decode_queue.empty():
+            return False
+        if self.app.app_state_ui.selected_processing_speed_mode != constants.ProcessingSpeedMode.REALTIME:
+            return False
+        anchor = self._presentation_anchor
+        if anchor is None:
+            return False
+        anchor_time, anchor_frame, frame_delay = anchor
+        deadline = anchor_time + (frame_index - anchor_frame) * frame_delay
+        return time.perf_counter() > deadline + frame_delay
+
+    def _tracking_stage(self, decode_queue: queue.Queue, present_queue: queue.Queue,
+                        pipeline_stop: threading.Event):
+        """Pipeline stage 2: chapter-aware tracker control and tracker.process_frame."""
+        try:
+            while True:
+                item = self._pipeline_get(decode_queue, pipeline_stop)
+                if item is None:
+                    return
+                if item[0] == "end":
+                    self._pipeline_put(present_queue, item, pipeline_stop)
+                    return
+
+                _, frame_index, frame_np = item
+                if not frame_np.flags.writeable:
+                    frame_np = frame_np.copy()
+                while self.pause_event.is_set() and not (pipeline_stop.is_set() or self.stop_event.is_set()):
+                    time.sleep(0.01)
+
+                self._update_tracker_for_chapter(frame_index)
+
+                if self._is_frame_too_late(frame_index, decode_queue):
+                    self.live_frames_dropped += 1
+                    continue
 
                 processed_frame_for_gui = frame_np
                 if self.tracker and self.tracker.tracking_active:
-                    timestamp_ms = int(self.current_frame_index * (1000.0 / self.fps)) if self.fps > 0 else int(
+                    timestamp_ms = int(frame_index * (1000.0 / self.fps)) if self.fps > 0 else int(
                         time.time() * 1000)
 
+                    self.tracking_frame_index = frame_index
                     try:
                         yolo_start = time.perf_counter()
-                        processed_frame_for_gui = self.tracker.process_frame(frame_np.copy(), timestamp_ms)[0]
+                        # The frame owns its buffer, so the tracker may draw on it directly
+                        processed_frame_for_gui = self.tracker.process_frame(frame_np, timestamp_ms)[0]
                         yolo_time = (time.perf_counter() - yolo_start) * 1000.0
                         self._yolo_samples.append(yolo_time)
                     except Exception as e:
                         self.logger.error(f"Error in tracker.process_frame during loop: {e}", exc_info=True)
+                    finally:
+                        self.tracking_frame_index = None
+
+                if not self._pipeline_put(present_queue, ("frame", frame_index, processed_frame_for_gui), pipeline_stop):
+                    return
+        except Exception as e:
+            self.logger.error(f"Error in tracking stage: {e}", exc_info=True)
+            self._pipeline_put(present_queue, ("end", "error", -1, f"Tracking stage failed: {e}"), pipeline_stop)
+
+    def _finish_live_stream(self, reason: str, frame_index: int, message: Optional[str]):
+        """Handles an end-of-stream item reaching the presentation stage."""
+        if reason in ("pipe1_died", "died", "error"):
+            if reason == "pipe1_died":
+                self.logger.warning(message)
+            elif reason == "died":
+                self.logger.info(message)
+            else:
+                self.logger.error(message)
+            self.is_processing = False
+            return
+
+        if reason == "eos":
+            self.logger.info(message)
+            end_range = (self.processing_start_frame_limit, self.current_frame_index)
+        elif reason == "end_limit":
+            self.current_frame_index = frame_index
+            self.logger.info(f"Reached GUI end_frame_limit ({self.processing_end_frame_limit}). Stopping.")
+            end_range = (self.processing_start_frame_limit, self.processing_end_frame_limit)
+        else:  # end_of_video
+            self.current_frame_index = frame_index
+            self.logger.info("Reached end of video. Stopping GUI processing.")
+            end_range = (self.processing_start_frame_limit, self.current_frame_index)
+
+        self.is_processing = False
+        # Clear tracker processing flag when the stream ends naturally
+        self.enable_tracker_processing = False
+        if self.app:
+            was_scripting_at_end = self.tracker and self.tracker.tracking_active
+            self.app.on_processing_stopped(was_scripting_session=was_scripting_at_end, scripted_frame_range=end_range)
+
+    def _processing_loop(self):
+        """Pipeline stage 3 (presentation) on the processing thread; owns the other two stages."""
+        if not self.ffmpeg_process or self.ffmpeg_process.stdout is None:
+            self.logger.error("_processing_loop: FFmpeg process/stdout not available. Exiting.")
+            self.is_processing = False
+            return
+
+        start_time = time.time()  # For calculating FPS and ETA in the callback
+
+        loop_ffmpeg_process = self.ffmpeg_process
+        self.last_processed_chapter_id = None
+        self._presentation_anchor = None
+        self.live_frames_dropped = 0
+
+        # Dual output only exposes its latest frame, so there is nothing to read ahead
+        decode_ahead = 1 if self.dual_output_enabled else constants.LIVE_DECODE_AHEAD_FRAMES
+        decode_queue = queue.Queue(maxsize=decode_ahead)
+        present_queue = queue.Queue(maxsize=constants.LIVE_PRESENT_QUEUE_FRAMES)
+        pipeline_stop = threading.Event()
+        stage_threads = [
+            threading.Thread(target=self._decode_ahead_stage, args=(loop_ffmpeg_process, decode_queue, pipeline_stop),
+                             name="VideoDecodeAheadThread", daemon=True),
+            threading.Thread(target=self._tracking_stage, args=(decode_queue, present_queue, pipeline_stop),
+                             name="VideoTrackingThread", daemon=True),
+        ]
+        for stage_thread in stage_threads:
+            stage_thread.start()
+
+        try:
+            # The presentation loop
+            while not self.stop_event.is_set():
+                resumed = False
+                while self.pause_event.is_set():
+                    if self.stop_event.is_set():
+                        break
+                    resumed = True
+                    time.sleep(0.01)
+
+                # If a stop was requested while we were paused, break the main loop.
+                if self.stop_event.is_set():
+                    break
+
+                speed_mode = self.app.app_state_ui.selected_processing_speed_mode
+                
+                # Debug: Log speed mode selection for MAX_SPEED troubleshooting
+                if hasattr(self, '_last_logged_speed_mode') and self._last_logged_speed_mode != speed_mode:
+                    self.logger.info(f"Processing speed mode changed to: {speed_mode}")
+                    self._last_logged_speed_mode = speed_mode
+                elif not hasattr(self, '_last_logged_speed_mode'):
+                    self.logger.info(f"Initial processing speed mode: {speed_mode}")
+                    self._last_logged_speed_mode = speed_mode
+                
+                target_delay = self._get_target_frame_delay(speed_mode)
+                    
+                if speed_mode == constants.ProcessingSpeedMode.MAX_SPEED and not hasattr(self, '_max_speed_logged'):
+                    self.logger.info(f"MAX_SPEED mode active: target_delay = {target_delay}")
+                    self._max_speed_logged = True
+
+                item = self._pipeline_get(present_queue, pipeline_stop)
+                if item is None:
+                    break
+                if item[0] == "end":
+                    self._finish_live_stream(item[1], item[2], item[3])
+                    break
+                _, frame_index, processed_frame_for_gui = item
+
+                # Pace presentation on a clock anchored to frame indices; Real Time mode tolerates
+                # a short lag (the tracking stage drops late frames to catch up) before re-syncing.
+                if target_delay > 0:
+                    current_time = time.perf_counter()
+                    anchor = self._presentation_anchor
+                    if resumed or anchor is None or anchor[2] != target_delay:
+                        anchor = (current_time, frame_index, target_delay)
+
+                    # Skip frame delay when the streamer reports we are behind by 3+ frames
+                    should_skip = False
+                    if hasattr(self, 'sync_server') and self.sync_server:
+                        should_skip = self.sync_server.should_skip_frame()
+
+                    max_lag = target_delay
+                    if speed_mode == constants.ProcessingSpeedMode.REALTIME and constants.LIVE_REALTIME_DROP_LATE_FRAMES:
+                        max_lag = max(target_delay, constants.LIVE_REALTIME_MAX_LAG_S)
+
+                    deadline = anchor[0] + (frame_index - anchor[1]) * target_delay
+                    if should_skip or current_time - deadline > max_lag:
+                        anchor = (current_time, frame_index, target_delay)
+                    elif deadline > current_time:
+                        time.sleep(deadline - current_time)
+                    self._presentation_anchor = anchor
+                else:
+                    self._presentation_anchor = None
+
+                self.current_frame_index = frame_index
+
+                # Notify playback state observers (e.g., device_control)
+                if self._playback_state_callbacks:
+                    is_currently_playing = self.is_processing and not self.pause_event.is_set()
+                    current_time_ms = (self.current_frame_index / self.fps) * 1000.0 if self.fps > 0 else 0.0
+                    self._notify_playback_state_callbacks(is_currently_playing, current_time_ms)
+
+                if self.cli_progress_callback:
+                    # Throttle updates to avoid slowing down processing (e.g., update every 10 frames)
+                    if self.current_frame_index % 10 == 0 or self.current_frame_index == self.total_frames - 1:
+                        self.cli_progress_callback(self.current_frame_index, self.total_frames, start_time)
 
                 # Update timing metrics display (once per second)
                 self._update_timing_metrics()
@@ -2408,35 +2539,21 @@ class VideoProcessor:
                     self.actual_fps = self.frames_for_fps_calc / elapsed
                     self.last_fps_update_time = current_time_fps_calc
                     self.frames_for_fps_calc = 0
-
-                # Apply timing control only if not in MAX_SPEED mode
-                if target_delay > 0:
-                    # Check if we should skip frame delay (when behind by 3+ frames)
-                    should_skip = False
-                    if hasattr(self, 'sync_server') and self.sync_server:
-                        should_skip = self.sync_server.should_skip_frame()
-
-                    if not should_skip:
-                        current_time = time.perf_counter()
-                        sleep_duration = next_frame_target_time - current_time
-
-                        if sleep_duration > 0:
-                            time.sleep(sleep_duration)
-
-                        if next_frame_target_time < current_time - target_delay:
-                            next_frame_target_time = current_time + target_delay
-                        else:
-                            next_frame_target_time += target_delay
-                    else:
-                        # Skipping frame delay to catch up
-                        current_time = time.perf_counter()
-                        next_frame_target_time = current_time + target_delay
         finally:
             self.logger.info(f"_processing_loop ending. is_processing: {self.is_processing}, stop_event: {self.stop_event.is_set()}")
+            pipeline_stop.set()
+            # Terminating FFmpeg unblocks a decode stage waiting on the pipe
             self._terminate_ffmpeg_processes()
+            for stage_thread in stage_threads:
+                stage_thread.join(timeout=2.0)
+                if stage_thread.is_alive():
+                    self.logger.warning(f"{stage_thread.name} did not exit cleanly.")
+            if self.live_frames_dropped:
+                self.logger.info(f"Real Time mode dropped {self.live_frames_dropped} late frames.")
             self.is_processing = False
             self.pause_event.set()
             self.last_processed_chapter_id = None
+            self._presentation_anchor = None
 
     def _start_ffmpeg_for_segment_streaming(self, start_frame_abs_idx: int, num_frames_to_stream_hint: Optional[int] = None) -> bool:
         self._terminate_ffmpeg_processes()
@@ -2461,11 +2578,13 @@ class VideoProcessor:
             # NOTE: -preset and -tune are encoding options, not decoding options
             common_ffmpeg_prefix.extend([
                 '-fflags', '+genpts+fastseek', 
-                '-threads', '0',
+                '-threads', str(self.ffmpeg_decode_threads),
                 '-probesize', '32',
                 '-analyzeduration', '1'
             ])
             self.logger.info("FFmpeg segment streaming optimized for MAX_SPEED with fast decode")
+        elif self.ffmpeg_decode_threads > 0:
+            common_ffmpeg_prefix.extend(['-threads', str(self.ffmpeg_decode_threads)])
 
         if self._is_10bit_cuda_pipe_needed():
             self.logger.info("Using 2-pipe FFmpeg command for 10-bit CUDA segment streaming.")